@@ -0,0 +1,112 @@
+"""Measure world-entity spawn throughput: one by one versus the pool.
+
+Run with ``uv run python benchmarks/bench_entity_spawn.py [counts...]``
+(default 1000 10000 100000). Each count spawns a grid of cube and sphere
+blueprints in four colours three ways: one ``MaterialRegistry.spawn`` call
+per blueprint, a fresh ``EntityPool.spawn_blueprints`` batch, and the same
+batch again after despawning it, so every entity is reused. The one-by-one
+path grows quadratically with the group size and is skipped above
+``ONE_BY_ONE_LIMIT``.
+"""
+
+import sys
+import time
+
+from panda3d.core import loadPrcFileData
+from ursina import color
+from ursina.shaders import unlit_shader
+
+from fooproj.game.entitypool import EntityPool
+from fooproj.game.materials import MaterialRegistry
+from fooproj.game.scene import EntityBlueprint, Vec3, blueprint_entity_name
+
+loadPrcFileData("", "window-type none")
+
+DEFAULT_COUNTS = (1_000, 10_000, 100_000)
+ONE_BY_ONE_LIMIT = 10_000
+MODELS = ("cube", "sphere")
+COLORS = ("orange", "azure", "lime", "magenta")
+
+
+def resolve_color(name: str) -> color.Color:
+    """Look up an Ursina colour by name."""
+    return getattr(color, name)
+
+
+def grid_blueprints(count: int) -> list[EntityBlueprint]:
+    """Return ``count`` blueprints on a square grid, cycling model and colour."""
+    side = max(1, round(count**0.5))
+    return [
+        EntityBlueprint(
+            model=MODELS[index % len(MODELS)],
+            color_name=COLORS[index % len(COLORS)],
+            scale=Vec3(1.0, 1.0 + (index % 3), 1.0),
+            position=Vec3(float(index % side) * 3.0, 0.5, float(index // side) * 3.0),
+        )
+        for index in range(count)
+    ]
+
+
+def spawn_one_by_one(blueprints: list[EntityBlueprint]) -> float:
+    """Spawn through ``MaterialRegistry.spawn``; return seconds taken."""
+    materials = MaterialRegistry(unlit_shader, "unlit", {})
+    started = time.perf_counter()
+    entities = [
+        materials.spawn(
+            blueprint_entity_name(blueprint),
+            blueprint.model,
+            blueprint.color_name,
+            resolve_color(blueprint.color_name),
+            position=(blueprint.position.x, blueprint.position.y, blueprint.position.z),
+            scale=(blueprint.scale.x, blueprint.scale.y, blueprint.scale.z),
+        )
+        for blueprint in blueprints
+    ]
+    elapsed = time.perf_counter() - started
+    for entity in entities:
+        entity.removeNode()
+    return elapsed
+
+
+def spawn_pooled(blueprints: list[EntityBlueprint]) -> tuple[float, float]:
+    """Spawn a fresh pool batch, despawn it, spawn again; return both times."""
+    pool = EntityPool(MaterialRegistry(unlit_shader, "unlit", {}), resolve_color)
+    started = time.perf_counter()
+    entities = pool.spawn_blueprints(blueprints)
+    fresh = time.perf_counter() - started
+    pool.despawn(entities)
+    started = time.perf_counter()
+    entities = pool.spawn_blueprints(blueprints)
+    reused = time.perf_counter() - started
+    if pool.reused != len(blueprints):
+        message = f"expected {len(blueprints)} reused entities, got {pool.reused}"
+        raise RuntimeError(message)
+    for entity in entities:
+        entity.removeNode()
+    return fresh, reused
+
+
+def report(name: str, count: int, seconds: float) -> None:
+    """Print a timing as total milliseconds and microseconds per entity."""
+    print(
+        f"{count:>7d} {name:12s} {seconds * 1e3:9.1f} ms "
+        f"{seconds / count * 1e6:7.1f} us/entity",
+    )
+
+
+def main() -> None:
+    """Print spawn timings for every requested blueprint count."""
+    counts = tuple(int(value) for value in sys.argv[1:]) or DEFAULT_COUNTS
+    for count in counts:
+        blueprints = grid_blueprints(count)
+        # Warm the model loader so the first timing is not a disk load.
+        spawn_pooled(blueprints[: len(MODELS) * len(COLORS)])
+        if count <= ONE_BY_ONE_LIMIT:
+            report("one by one", count, spawn_one_by_one(blueprints))
+        fresh, reused = spawn_pooled(blueprints)
+        report("pool fresh", count, fresh)
+        report("pool reuse", count, reused)
+
+
+if __name__ == "__main__":
+    main()
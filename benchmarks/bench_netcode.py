@@ -0,0 +1,132 @@
+"""Measure server tick cost and snapshot bandwidth with simulated clients.
+
+Run with ``uv run python benchmarks/bench_netcode.py [--input rec.npy]
+[--ticks N] [CLIENTS ...]``. The server and every client share this process
+and talk over loopback UDP; the server is stepped back to back so the tick
+time is pure simulation plus encode/send cost. Each client replays the
+recorded axes (``NetworkSettings.record_input`` saves one from a real
+session) from a different offset, or a deterministic synthetic drive.
+"""
+
+import argparse
+import statistics
+import time
+from math import tau
+from pathlib import Path
+
+import numpy as np
+
+from fooproj.game.config import (
+    QUALITY_PRESETS,
+    GameSettings,
+    apply_quality_preset,
+    override_settings,
+)
+from fooproj.game.netcode import (
+    SimulationClient,
+    SimulationServer,
+    create_server,
+    load_input_recording,
+)
+
+DEFAULT_CLIENTS = (1, 8, 32)
+DEFAULT_TICKS = 600
+CONNECT_TIMEOUT = 5.0
+
+
+def synthetic_recording(ticks: int) -> np.ndarray:
+    """Return throttle-heavy axes with a slow weave, one row per tick."""
+    phase = np.arange(ticks) * (tau / 240.0)
+    forward = np.where(np.sin(phase * 0.5) > -0.6, 1.0, -1.0)
+    turn = np.sin(phase)
+    return np.stack((forward, np.zeros(ticks), turn), axis=1).astype(np.float32)
+
+
+def connect_clients(server: SimulationServer, count: int) -> list[SimulationClient]:
+    """Join ``count`` clients, pumping the server between hello attempts."""
+    host, port = server.address
+    network = override_settings(server.settings, {"host": host, "port": port})
+    clients = [SimulationClient(network) for _ in range(count)]
+    deadline = time.perf_counter() + CONNECT_TIMEOUT
+    pending = list(clients)
+    while pending:
+        if time.perf_counter() > deadline:
+            message = "clients could not join the benchmark server"
+            raise TimeoutError(message)
+        server.receive()
+        for client in list(pending):
+            try:
+                client.connect(timeout=0.01)
+            except TimeoutError:
+                continue
+            pending.remove(client)
+    return clients
+
+
+def run_session(
+    settings: GameSettings,
+    client_count: int,
+    recording: np.ndarray,
+    ticks: int,
+) -> str:
+    """Drive one server with ``client_count`` clients and summarize it."""
+    server = create_server(settings)
+    clients = connect_clients(server, client_count)
+    server.stats.tick_times.clear()
+    sent_before = server.stats.bytes_sent
+    snapshots_before = server.stats.snapshots_sent
+    stride = max(1, len(recording) // client_count)
+    try:
+        for tick in range(ticks):
+            for index, client in enumerate(clients):
+                row = recording[(tick + index * stride) % len(recording)]
+                client.send_input((float(row[0]), float(row[1]), float(row[2])))
+            server.step()
+            for client in clients:
+                client.poll()
+    finally:
+        for client in clients:
+            client.close()
+        server.close()
+
+    tick_ms = sorted(1000.0 * value for value in server.stats.tick_times)
+    p99_ms = tick_ms[min(len(tick_ms) - 1, int(0.99 * len(tick_ms)))]
+    sent = server.stats.bytes_sent - sent_before
+    snapshots = max(1, server.stats.snapshots_sent - snapshots_before)
+    seconds = ticks / settings.network.tick_rate
+    kbit_per_client = 8.0 * sent / seconds / client_count / 1000.0
+    return (
+        f"{client_count:4d} clients  tick mean {statistics.fmean(tick_ms):6.2f} ms"
+        f"  p99 {p99_ms:6.2f} ms  snapshot {sent / snapshots:7.1f} B"
+        f"  {kbit_per_client:7.1f} kbit/s per client"
+    )
+
+
+def main() -> None:
+    """Print tick timings and bandwidth for each client count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("clients", type=int, nargs="*", default=DEFAULT_CLIENTS)
+    parser.add_argument("--input", type=Path, help="recorded axes (.npy)")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS)
+    parser.add_argument("--preset", choices=tuple(QUALITY_PRESETS), default="high")
+    args = parser.parse_args()
+
+    settings = override_settings(
+        apply_quality_preset(GameSettings(), args.preset),
+        {"network": {"port": 0, "max_players": max(args.clients)}},
+    )
+    recording = (
+        synthetic_recording(args.ticks)
+        if args.input is None
+        else load_input_recording(args.input)
+    )
+    print(
+        f"{args.ticks} ticks at {settings.network.tick_rate:.0f} Hz, snapshots at "
+        f"{settings.network.snapshot_rate:.0f} Hz",
+    )
+    for count in args.clients:
+        print(run_session(settings, count, recording, args.ticks))
+
+
+if __name__ == "__main__":
+    main()
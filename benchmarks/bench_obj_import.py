@@ -0,0 +1,86 @@
+"""Compare the project OBJ importer with Panda3D's loader on the car asset.
+
+Run with ``uv run python benchmarks/bench_obj_import.py [repeats]``. The model
+cache is disabled so both paths measure a cold load, and both include the
+centring/scaling step the runtime needs.
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from panda3d.core import (
+    CullFaceAttrib,
+    Filename,
+    Loader,
+    LoaderOptions,
+    NodePath,
+    loadPrcFileData,
+)
+
+from fooproj.game.objimport import load_obj
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+loadPrcFileData("", "model-cache-dir\nwindow-type none")
+
+ASSET = Path(__file__).resolve().parents[1] / "assets" / "De_Tomaso_P72_2020.obj"
+TARGET_LENGTH = 4.8
+DEFAULT_REPEATS = 10
+
+
+def load_with_panda_loader() -> NodePath:
+    """Load through Panda3D's OBJ loader, then normalize via tight bounds."""
+    model = NodePath(
+        Loader.getGlobalPtr().loadSync(
+            Filename.fromOsSpecific(str(ASSET)),
+            LoaderOptions(LoaderOptions.LF_no_cache),
+        ),
+    )
+    model.setAttrib(CullFaceAttrib.makeReverse())
+    min_point, max_point = model.getTightBounds()
+    size_x = max_point.x - min_point.x
+    size_z = max_point.z - min_point.z
+    scale = TARGET_LENGTH / max(size_x, size_z)
+    model.setScale(scale)
+    model.setPos(
+        -(min_point.x + size_x * 0.5) * scale,
+        -min_point.y * scale,
+        -(min_point.z + size_z * 0.5) * scale,
+    )
+    return model
+
+
+def load_with_project_importer() -> NodePath:
+    """Load through the memory-mapped NumPy importer."""
+    return load_obj(ASSET, TARGET_LENGTH, flip_winding=True)
+
+
+def time_loader(load: Callable[[], NodePath], repeats: int) -> list[float]:
+    """Return wall-clock seconds for each of several loads."""
+    timings: list[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    """Print median and best load times for both importers."""
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEATS
+    results = {
+        "panda3d loader.loadModel": time_loader(load_with_panda_loader, repeats),
+        "fooproj objimport.load_obj": time_loader(load_with_project_importer, repeats),
+    }
+    for name, timings in results.items():
+        median_ms = 1000.0 * statistics.median(timings)
+        best_ms = 1000.0 * min(timings)
+        print(f"{name:28s} median {median_ms:7.1f} ms  best {best_ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure the per-frame cost of impact particles under heavy impact load.
+
+Run with ``uv run python benchmarks/bench_particles.py [frames]``. Each run
+emits dust and sparks for a number of simultaneous impacts every frame, then
+steps both pools and uploads their point geoms, as the prop physics
+controller does. Pools have the default capacities, so the cost per frame
+should stay flat however many impacts there are.
+"""
+
+import sys
+import time
+
+import numpy as np
+from panda3d.core import NodePath
+
+from fooproj.game.config import ParticleSettings
+from fooproj.game.particles import SPARK_MIN_SPEED, ImpactEffects
+
+DEFAULT_FRAMES = 600
+IMPACT_COUNTS = (1, 10, 100, 500)
+FRAME_DT = 1.0 / 60.0
+
+
+def run(impacts: int, frames: int) -> tuple[float, int]:
+    """Return mean milliseconds per frame and the final live particle count."""
+    settings = ParticleSettings()
+    effects = ImpactEffects(
+        NodePath("bench"),
+        settings.dust_capacity,
+        settings.spark_capacity,
+    )
+    rng = np.random.default_rng(3)
+    angles = rng.uniform(0.0, 2.0 * np.pi, impacts)
+    props = np.column_stack(
+        (np.sin(angles) * 3.0, np.full(impacts, 0.6), np.cos(angles) * 3.0)
+    )
+    radii = np.full(impacts, 0.7)
+    player = np.zeros(3)
+    live = 0
+    started = time.perf_counter()
+    for _ in range(frames):
+        effects.emit_impacts(props, radii, player, SPARK_MIN_SPEED * 1.5)
+        live = effects.update(FRAME_DT)
+    elapsed = time.perf_counter() - started
+    return elapsed / frames * 1000.0, live
+
+
+def main() -> None:
+    """Print frame cost for each simultaneous-impact count."""
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FRAMES
+    for impacts in IMPACT_COUNTS:
+        frame_ms, live = run(impacts, frames)
+        print(f"{impacts:4d} impacts/frame  {frame_ms:6.3f} ms/frame  {live:5d} live")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Compare the single-threaded game loop with the simulation-thread split.
+
+Run with ``uv run python benchmarks/bench_simthread.py [seconds] [preset]``.
+Both loops keep the physics at its fixed rate in real time while a stand-in
+render pass runs as often as it can: it copies moved transforms onto Panda3D
+nodes (as the render thread does) and then walks every node's net transform.
+The reported frame rate is how often that pass ran. On the GIL build the
+threads take turns, and the split loop has measured slower; only the
+free-threaded build (``python3.14t``) can overlap them.
+"""
+
+import sys
+import time
+
+import numpy as np
+from panda3d.core import NodePath
+
+from fooproj.game.clock import FixedStepClock
+from fooproj.game.config import GameSettings, apply_quality_preset
+from fooproj.game.simthread import (
+    SimulationThread,
+    WorldFrame,
+    capture_world_frame,
+    create_world_frame,
+)
+from fooproj.game.simulation import (
+    Simulation,
+    create_simulation,
+    load_world,
+    set_player_axes,
+    step_simulation,
+)
+
+DEFAULT_SECONDS = 5.0
+DEFAULT_PRESET = "bench"
+AXES = (1.0, 0.0, 0.6)
+
+
+class RenderStandIn:
+    """Panda3D nodes for the car and props plus the per-frame render pass."""
+
+    def __init__(self, frame: WorldFrame) -> None:
+        """Create one node per prop under a shared root."""
+        self.root = NodePath("world")
+        self.car = self.root.attachNewNode("car")
+        self.props = [
+            self.root.attachNewNode(f"prop_{index}")
+            for index in range(frame.prop_position.shape[0])
+        ]
+        self.shown = frame.prop_position.copy()
+        self.frames = 0
+
+    def draw(self, frame: WorldFrame) -> None:
+        """Copy moved transforms, then touch every node's net transform."""
+        x_pos, y_pos, z_pos = (float(value) for value in frame.player_position[0])
+        self.car.setPosHpr(
+            x_pos,
+            y_pos,
+            z_pos,
+            float(np.degrees(frame.player_heading[0])),
+            0.0,
+            0.0,
+        )
+        moved = np.flatnonzero(np.any(frame.prop_position != self.shown, axis=1))
+        self.shown[moved] = frame.prop_position[moved]
+        for index in moved:
+            x_pos, y_pos, z_pos = (float(value) for value in self.shown[index])
+            self.props[index].setPos(x_pos, y_pos, z_pos)
+        for node in self.props:
+            node.getNetTransform()
+        self.frames += 1
+
+
+def create_bench_simulation(settings: GameSettings) -> Simulation:
+    """Create a one-player simulation of the preset's world."""
+    blueprints, terrain = load_world(settings)
+    simulation = create_simulation(
+        blueprints,
+        1,
+        settings.vehicle,
+        1.0 / settings.physics.rate,
+        terrain,
+    )
+    simulation.active[0] = True
+    return simulation
+
+
+def run_sequential(settings: GameSettings, seconds: float) -> tuple[int, int]:
+    """Step and draw on one thread; return frames drawn and steps taken."""
+    simulation = create_bench_simulation(settings)
+    clock = FixedStepClock(1.0 / settings.physics.rate, settings.physics.max_steps)
+    frame = create_world_frame(simulation)
+    render = RenderStandIn(frame)
+    set_player_axes(simulation, 0, AXES)
+    started = previous = time.perf_counter()
+    while (now := time.perf_counter()) - started < seconds:
+        for _ in range(clock.advance(now - previous)):
+            step_simulation(simulation)
+        previous = now
+        capture_world_frame(simulation, frame)
+        render.draw(frame)
+    return render.frames, simulation.tick
+
+
+def run_threaded(settings: GameSettings, seconds: float) -> tuple[int, int]:
+    """Step on a simulation thread and draw its published frames."""
+    simulation = create_bench_simulation(settings)
+    clock = FixedStepClock(1.0 / settings.physics.rate, settings.physics.max_steps)
+    simulation_thread = SimulationThread(simulation, clock)
+    simulation_thread.set_axes(AXES)
+    with simulation_thread.buffer.read() as frame:
+        render = RenderStandIn(frame)
+    simulation_thread.start()
+    started = time.perf_counter()
+    try:
+        while time.perf_counter() - started < seconds:
+            with simulation_thread.buffer.read() as frame:
+                render.draw(frame)
+    finally:
+        simulation_thread.stop()
+    return render.frames, simulation.tick
+
+
+def main() -> None:
+    """Print render frame rate and physics step rate for both loops."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECONDS
+    preset = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PRESET
+    settings = apply_quality_preset(GameSettings(), preset)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+        f"{settings.physics.rate:.0f} Hz physics, {preset} preset",
+    )
+    rates: list[float] = []
+    for name, run in (("single thread", run_sequential), ("sim thread", run_threaded)):
+        frames, steps = run(settings, seconds)
+        rates.append(frames / seconds)
+        print(
+            f"{name:14s} {frames / seconds:8.1f} frames/s  "
+            f"{steps / seconds:6.1f} physics steps/s",
+        )
+    print(f"speedup {rates[1] / rates[0]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare benchmark-suite results against a stored baseline.
+
+Run with ``uv run python benchmarks/compare_baseline.py baseline.json
+results.json [--max-regression PERCENT] [--metric median_ms|min_ms]``. Both
+files are written by ``uv run pytest benchmarks/suite --bench-passes 3
+--bench-json PATH``. Medians are compared by default; a minimum depends on
+how lucky the quietest round was, which varies far more between runs.
+Prints one row per benchmark and exits with status 1 when any benchmark in
+both files got slower than the baseline by more than ``PERCENT`` (default
+15). Benchmarks missing from either file are listed but never fail the run.
+Files recorded on different Python versions are not compared at all (exit
+status 2); re-record the baseline on the interpreter the results come from.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+DEFAULT_MAX_REGRESSION = 15.0
+METRICS = ("median_ms", "min_ms")
+
+
+def load_results(path: Path) -> tuple[str, dict[str, dict[str, float]]]:
+    """Return the Python version and per-benchmark timings of a results file.
+
+    The version is reduced to major.minor, which is what timings depend on.
+    """
+    document = json.loads(path.read_text(encoding="utf-8"))
+    version = ".".join(document["machine"]["python"].split(".")[:2])
+    return version, document["results"]
+
+
+def percent_change(baseline: float, current: float) -> float:
+    """Return how much slower ``current`` is than ``baseline``, in percent."""
+    return (current - baseline) / baseline * 100.0
+
+
+def compare(
+    baseline: dict[str, dict[str, float]],
+    current: dict[str, dict[str, float]],
+    metric: str,
+    max_regression: float,
+) -> list[str]:
+    """Print a comparison table; return the names that regressed."""
+    regressed: list[str] = []
+    width = max(len(name) for name in baseline.keys() | current.keys())
+    print(f"{'benchmark':{width}s} {'baseline':>10s} {'current':>10s} {'change':>8s}")
+    for name in sorted(baseline.keys() | current.keys()):
+        if name not in current:
+            print(f"{name:{width}s} {'':>10s} {'missing':>10s}")
+            continue
+        if name not in baseline:
+            print(f"{name:{width}s} {'new':>10s} {current[name][metric]:10.3f}")
+            continue
+        before = baseline[name][metric]
+        after = current[name][metric]
+        change = percent_change(before, after)
+        flag = ""
+        if change > max_regression:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:{width}s} {before:10.3f} {after:10.3f} {change:+7.1f}%{flag}")
+    return regressed
+
+
+def main() -> None:
+    """Compare two results files and exit non-zero on a regression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        metavar="PERCENT",
+        help="fail when a benchmark is this much slower (default: %(default)s)",
+    )
+    parser.add_argument("--metric", choices=METRICS, default=METRICS[0])
+    args = parser.parse_args()
+
+    baseline_python, baseline = load_results(args.baseline)
+    current_python, current = load_results(args.current)
+    if baseline_python != current_python:
+        print(
+            f"baseline was recorded on Python {baseline_python} and results on "
+            f"Python {current_python}; re-record the baseline",
+        )
+        sys.exit(2)
+
+    regressed = compare(baseline, current, args.metric, args.max_regression)
+    if regressed:
+        print(
+            f"{len(regressed)} benchmark(s) regressed by more than "
+            f"{args.max_regression:g}%: {', '.join(regressed)}",
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Timing fixture and JSON results for the hot-path benchmark suite.
+
+Run with ``uv run pytest benchmarks/suite --bench-json results.json``, then
+compare the file against a baseline recorded the same way with
+``uv run python benchmarks/compare_baseline.py``. Each test calls the
+``bench`` fixture once; its timings are stored under the test's node name,
+so parametrized sizes get one entry each.
+
+Like ``timeit``, each round repeats the benchmarked call until the round
+lasts at least ``MIN_ROUND_SECONDS`` and reports the time per call, so calls
+well under a millisecond are not dominated by timer and scheduler noise.
+A shared or throttled machine can still run a whole benchmark slow for
+seconds at a time, so ``--bench-passes N`` runs the suite ``N`` times in one
+session and keeps each benchmark's pass with the lowest median.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from ursina import Ursina
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_ROUNDS = 15
+MIN_ROUND_SECONDS = 0.1
+RESULTS_KEY = pytest.StashKey[dict[str, "BenchResult"]]()
+
+
+@dataclass(frozen=True, slots=True)
+class BenchResult:
+    """Wall-clock timings of one benchmark, in milliseconds per call.
+
+    Each of the ``rounds`` rounds made ``calls`` calls.
+    """
+
+    min_ms: float
+    median_ms: float
+    rounds: int
+    calls: int
+
+
+class Bench:
+    """Time a callable over several rounds and record it for the session."""
+
+    def __init__(self, name: str, results: dict[str, BenchResult]) -> None:
+        """Record under ``name`` into the session's ``results``."""
+        self._name = name
+        self._results = results
+
+    def __call__(
+        self,
+        run: Callable[[], object],
+        *,
+        setup: Callable[[], object] | None = None,
+        rounds: int = DEFAULT_ROUNDS,
+    ) -> BenchResult:
+        """Time ``rounds`` rounds of ``run`` after untimed calibration rounds.
+
+        Calibration, which also warms up ``run``, doubles the calls per round
+        until a round lasts ``MIN_ROUND_SECONDS``. ``setup`` runs untimed
+        before each call, to reset state ``run`` consumes. The garbage
+        collector is paused during each round, as in ``timeit``, so a
+        collection triggered by earlier garbage does not land in a random
+        round. An earlier pass's result is kept if its median was lower.
+        """
+        calls = 1
+        while _time_round(run, setup, calls) < MIN_ROUND_SECONDS:
+            calls *= 2
+        timings = [_time_round(run, setup, calls) / calls * 1e3 for _ in range(rounds)]
+        result = BenchResult(
+            min_ms=min(timings),
+            median_ms=statistics.median(timings),
+            rounds=rounds,
+            calls=calls,
+        )
+        previous = self._results.get(self._name)
+        if previous is None or result.median_ms < previous.median_ms:
+            self._results[self._name] = result
+        return result
+
+
+def _time_round(
+    run: Callable[[], object],
+    setup: Callable[[], object] | None,
+    calls: int,
+) -> float:
+    """Return the seconds ``calls`` calls of ``run`` took, excluding setup."""
+    elapsed = 0.0
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(calls):
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            run()
+            elapsed += time.perf_counter() - started
+    finally:
+        gc.enable()
+    return elapsed
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options that repeat the suite and write its timings."""
+    parser.addoption(
+        "--bench-json",
+        metavar="PATH",
+        help="write benchmark timings to PATH as JSON",
+    )
+    parser.addoption(
+        "--bench-passes",
+        type=int,
+        default=1,
+        metavar="N",
+        help="run the suite N times and keep each benchmark's fastest pass",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Collect timings in the config stash for the session."""
+    config.stash[RESULTS_KEY] = {}
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Queue the whole suite once per pass, so passes are spread over time."""
+    items[:] = items * config.getoption("--bench-passes")
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Write the collected timings when ``--bench-json`` is given."""
+    path = session.config.getoption("--bench-json")
+    results = session.config.stash[RESULTS_KEY]
+    if not path or not results:
+        return
+    document = {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "passes": session.config.getoption("--bench-passes"),
+        "results": {name: asdict(result) for name, result in sorted(results.items())},
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Bench:
+    """Return a timer that records under the requesting test's name."""
+    return Bench(request.node.name, request.config.stash[RESULTS_KEY])
+
+
+@pytest.fixture(scope="session")
+def offscreen_app() -> object:
+    """Open one offscreen Ursina app for benchmarks that need a window."""
+    return Ursina(window_type="offscreen", development_mode=False)
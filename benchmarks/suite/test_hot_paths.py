@@ -0,0 +1,217 @@
+"""Hot-path benchmarks: scene, physics, queries, input, OBJ, spawn, checkpoints.
+
+Each test times one hot path with the ``bench`` fixture; see ``conftest.py``
+for running the suite and saving its results.
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+import ursina
+from ursina import destroy
+
+from fooproj.game.checkpoint import (
+    WorldCheckpoint,
+    capture_prop_bodies,
+    decode_checkpoint,
+    encode_checkpoint,
+    restore_prop_bodies,
+)
+from fooproj.game.config import GameSettings
+from fooproj.game.objimport import load_obj
+from fooproj.game.physics import PropBodies, create_prop_bodies, step_prop_bodies
+from fooproj.game.runtime import (
+    OrbitControlState,
+    SpawnedWorld,
+    apply_player_input,
+    create_camera_orbit_rig,
+    create_material_registry,
+    create_physics_clock,
+    create_player_vehicle,
+    create_scene_query,
+    destroy_world,
+    spawn_primitive_player,
+    spawn_world_entities,
+)
+from fooproj.game.scene import starter_scene_blueprints
+from fooproj.game.scenequery import BoundingVolumeHierarchy
+
+if TYPE_CHECKING:
+    from conftest import Bench
+
+ASSET = Path(__file__).resolve().parents[2] / "assets" / "De_Tomaso_P72_2020.obj"
+TARGET_LENGTH = 4.6
+STEP_DT = 1.0 / 120.0
+INPUT_FRAMES = 60
+FRAME_DT = 1.0 / 60.0
+PROP_SPACING = 2.5
+QUERY_COUNT = 32
+QUERY_RADIUS = 2.25
+
+
+def falling_bodies(count: int) -> PropBodies:
+    """Return ``count`` awake props on a grid, dropping onto the ground."""
+    side = max(1, round(count**0.5))
+    index = np.arange(count)
+    positions = np.column_stack(
+        (
+            (index % side) * PROP_SPACING,
+            np.full(count, 2.0),
+            (index // side) * PROP_SPACING,
+        ),
+    )
+    return create_prop_bodies(positions, np.full(count, 0.5), np.ones(count))
+
+
+@pytest.mark.parametrize("props_per_ring", [14, 140, 1400])
+def test_starter_scene_blueprints(bench: Bench, props_per_ring: int) -> None:
+    """Build the starter scene's blueprints at scaled prop densities."""
+    bench(lambda: starter_scene_blueprints(props_per_ring))
+
+
+@pytest.mark.parametrize("count", [100, 10_000, 100_000])
+def test_prop_physics_step(bench: Bench, count: int) -> None:
+    """Step freshly dropped, awake props once."""
+    state: list[PropBodies] = []
+
+    def reset() -> None:
+        state[:] = [falling_bodies(count)]
+
+    bench(lambda: step_prop_bodies(state[0], STEP_DT), setup=reset)
+
+
+@pytest.mark.parametrize("count", [1_000, 8_000, 32_000])
+@pytest.mark.parametrize("path", ["flat", "tree"])
+def test_scene_query_crossover(bench: Bench, path: str, count: int) -> None:
+    """Raycast, overlap, and nearest queries among props, per query path.
+
+    ``FLAT_LEAF_LIMIT`` sits where the flat path stops winning.
+    """
+    bodies = falling_bodies(count)
+    tree = BoundingVolumeHierarchy(
+        bodies.position,
+        np.repeat(bodies.radius[:, None], 3, axis=1),
+        np.ones(count, dtype=np.bool_),
+        flat_leaf_limit=count if path == "flat" else 0,
+    )
+    rng = np.random.default_rng(5)
+    points = bodies.position[rng.integers(0, count, QUERY_COUNT)]
+    directions = rng.normal(size=(QUERY_COUNT, 3))
+
+    def query() -> None:
+        for point, direction in zip(points, directions, strict=True):
+            tree.raycast(point + (0.0, 1.5, 0.0), direction, 50.0)
+            tree.overlap_sphere(point, QUERY_RADIUS)
+            tree.nearest(point + (0.0, 1.5, 0.0))
+
+    bench(query)
+
+
+def prop_checkpoint(bodies: PropBodies) -> WorldCheckpoint:
+    """Return a checkpoint of ``bodies`` with a resting player and no vehicle."""
+    position, velocity, sleeping, rest_steps = capture_prop_bodies(bodies)
+    return WorldCheckpoint(
+        player_position=np.zeros(3),
+        player_rotation=np.zeros(3),
+        yaw_angle=0.0,
+        pitch_angle=18.0,
+        camera_distance=9.0,
+        view_distance=None,
+        vehicle=np.zeros(0),
+        prop_position=position,
+        prop_velocity=velocity,
+        prop_sleeping=sleeping,
+        prop_rest_steps=rest_steps,
+    )
+
+
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_save_checkpoint(bench: Bench, count: int) -> None:
+    """Capture and encode the state of falling props."""
+    bodies = falling_bodies(count)
+    bench(lambda: encode_checkpoint(prop_checkpoint(bodies)))
+
+
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_restore_checkpoint(bench: Bench, count: int) -> None:
+    """Decode an encoded checkpoint and copy it into live prop bodies."""
+    bodies = falling_bodies(count)
+    data = encode_checkpoint(prop_checkpoint(bodies))
+    bench(lambda: restore_prop_bodies(decode_checkpoint(data), bodies))
+
+
+@pytest.mark.usefixtures("offscreen_app")
+def test_apply_player_input(bench: Bench) -> None:
+    """Drive the car with throttle held and orbit the camera for 60 frames."""
+    settings = GameSettings()
+    world = spawn_world_entities(
+        starter_scene_blueprints(),
+        create_material_registry(),
+    )
+    scene_query = create_scene_query(world)
+    player = spawn_primitive_player()
+    orbit_rig = create_camera_orbit_rig(settings)
+    vehicle = create_player_vehicle(
+        player,
+        settings.vehicle,
+        create_physics_clock(settings.physics),
+    )
+    control_state = OrbitControlState(
+        yaw_angle=player.rotation_y,
+        pitch_angle=18.0,
+        camera_distance=settings.camera.distance,
+    )
+
+    def drive() -> None:
+        for _ in range(INPUT_FRAMES):
+            apply_player_input(
+                player,
+                orbit_rig,
+                settings.movement,
+                settings.camera,
+                control_state,
+                vehicle,
+                scene_query,
+            )
+
+    ursina.held_keys["up arrow"] = 1
+    ursina.time.dt = FRAME_DT
+    try:
+        bench(drive)
+    finally:
+        ursina.held_keys["up arrow"] = 0
+        ursina.camera.parent = ursina.scene
+        destroy(orbit_rig.yaw_pivot)
+        destroy(player)
+        destroy_world(world)
+
+
+def test_load_car_obj(bench: Bench) -> None:
+    """Parse and build the De Tomaso OBJ with the project importer."""
+    bench(
+        lambda: load_obj(ASSET, TARGET_LENGTH, flip_winding=True).removeNode(),
+        rounds=3,
+    )
+
+
+@pytest.mark.usefixtures("offscreen_app")
+@pytest.mark.parametrize("props_per_ring", [14, 140])
+def test_spawn_world_entities(bench: Bench, props_per_ring: int) -> None:
+    """Spawn the starter scene through the shared-material pool."""
+    blueprints = starter_scene_blueprints(props_per_ring)
+    spawned: list[SpawnedWorld] = []
+
+    def clear() -> None:
+        for world in spawned:
+            destroy_world(world)
+        spawned.clear()
+
+    def spawn() -> None:
+        spawned.append(spawn_world_entities(blueprints, create_material_registry()))
+
+    try:
+        bench(spawn, setup=clear)
+    finally:
+        clear()
@@ -1,11 +1,104 @@
 """Command-line entrypoint for fooproj."""
 
-from fooproj.game import run_game
+import argparse
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from fooproj.game import run_client, run_game, run_memory_stress, run_server
+from fooproj.game.config import (
+    QUALITY_PRESETS,
+    load_game_settings,
+    override_settings,
+)
+from fooproj.game.runtime import MIN_STRESS_CYCLES
 
-def main() -> None:
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the fooproj command."""
+    parser = argparse.ArgumentParser(
+        prog="fooproj",
+        description="Third-person 3D Ursina driving sandbox.",
+    )
+    parser.add_argument(
+        "--preset",
+        choices=tuple(QUALITY_PRESETS),
+        help="quality/performance preset (overrides the config file's preset)",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="TOML file with a preset and per-section setting overrides",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--server",
+        action="store_true",
+        help="run a headless simulation server instead of the local game",
+    )
+    mode.add_argument(
+        "--client",
+        action="store_true",
+        help="join a simulation server instead of simulating locally",
+    )
+    mode.add_argument(
+        "--memory-stress",
+        type=int,
+        metavar="CYCLES",
+        help="spawn and destroy the world CYCLES times offscreen and fail "
+        f"unless memory holds steady (at least {MIN_STRESS_CYCLES})",
+    )
+    parser.add_argument(
+        "--host",
+        help="server address to bind or join (overrides [network] host)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="server UDP port (overrides [network] port)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> None:
     """Run the CLI entrypoint."""
-    run_game()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.memory_stress is not None and args.memory_stress < MIN_STRESS_CYCLES:
+        parser.error(f"--memory-stress needs at least {MIN_STRESS_CYCLES} cycles")
+    network_overrides = {
+        name: value
+        for name, value in (("host", args.host), ("port", args.port))
+        if value is not None
+    }
+    try:
+        settings = load_game_settings(args.config, args.preset)
+        if network_overrides:
+            settings = override_settings(settings, {"network": network_overrides})
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    if args.server:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        try:
+            run_server(settings)
+        except (OSError, ValueError) as error:
+            parser.exit(1, f"{parser.prog}: {error}\n")
+    elif args.client:
+        try:
+            run_client(settings)
+        except (OSError, ValueError) as error:
+            parser.exit(1, f"{parser.prog}: {error}\n")
+    elif args.memory_stress is not None:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        problems = run_memory_stress(settings, args.memory_stress)
+        if problems:
+            parser.exit(1, "".join(f"{parser.prog}: {line}\n" for line in problems))
+    else:
+        run_game(settings)
 
 
 if __name__ == "__main__":
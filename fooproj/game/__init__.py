@@ -1,5 +1,6 @@
 """Game package for the Ursina starter sandbox."""
 
-from .runtime import run_game
+from .netcode import run_server
+from .runtime import run_client, run_game, run_memory_stress
 
-__all__ = ["run_game"]
+__all__ = ["run_client", "run_game", "run_memory_stress", "run_server"]
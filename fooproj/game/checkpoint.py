@@ -0,0 +1,229 @@
+"""Binary checkpoints of the local simulation for repros and warm starts.
+
+A ``WorldCheckpoint`` holds the player transform, the orbit camera state,
+the player vehicle's dynamics, and every prop body's position, velocity,
+and sleep state. ``encode_checkpoint`` writes it as one versioned little-
+endian buffer of raw arrays, with no per-entity records::
+
+    header   magic, version, reserved, prop count, vehicle value count
+    player   position xyz, rotation xyz                 (6 float64)
+    orbit    yaw, pitch, distance, view distance        (4 float64, NaN = None)
+    vehicle  every VehicleState field, flattened        (float64)
+    props    positions, velocities                      (n x 3 float64 each)
+             rest steps                                 (n int32)
+             sleeping                                   (n bits, packed)
+
+The float sections come first and keep 8-byte offsets, so decoding takes
+views of the buffer instead of copying, and restoring is one array copy per
+field, linear in the prop count.
+"""
+
+import struct
+from dataclasses import dataclass, fields
+from math import isnan, nan
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from .physics import PropBodies
+    from .vehicle import VehicleState
+
+type FloatArray = NDArray[np.float64]
+
+MAGIC = b"FPCK"
+CHECKPOINT_VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+PLAYER = struct.Struct("<6d")
+ORBIT = struct.Struct("<4d")
+FLOAT_SIZE = np.dtype("<f8").itemsize
+REST_STEPS_SIZE = np.dtype("<i4").itemsize
+
+
+class CheckpointError(ValueError):
+    """Raised for a checkpoint that cannot be read or does not fit the world."""
+
+
+@dataclass(frozen=True, slots=True)
+class WorldCheckpoint:
+    """Simulation state of the local game at one moment."""
+
+    player_position: FloatArray
+    player_rotation: FloatArray
+    yaw_angle: float
+    pitch_angle: float
+    camera_distance: float
+    view_distance: float | None
+    vehicle: FloatArray
+    prop_position: FloatArray
+    prop_velocity: FloatArray
+    prop_sleeping: NDArray[np.bool_]
+    prop_rest_steps: NDArray[np.int32]
+
+    @property
+    def prop_count(self) -> int:
+        """Return the number of props in the checkpoint."""
+        return int(self.prop_sleeping.shape[0])
+
+
+def pack_vehicle_state(state: VehicleState) -> FloatArray:
+    """Flatten every field of a vehicle batch into one array, in field order."""
+    return np.concatenate(
+        [
+            np.ravel(getattr(state, field.name)).astype(np.float64)
+            for field in fields(state)
+        ],
+    )
+
+
+def unpack_vehicle_state(values: FloatArray, state: VehicleState) -> None:
+    """Copy values written by ``pack_vehicle_state`` back into a vehicle batch.
+
+    Raises ``CheckpointError`` when the batch has a different size.
+    """
+    arrays = [getattr(state, field.name) for field in fields(state)]
+    expected = sum(array.size for array in arrays)
+    if values.size != expected:
+        message = f"checkpoint has {values.size} vehicle values, expected {expected}"
+        raise CheckpointError(message)
+    offset = 0
+    for array in arrays:
+        array[...] = values[offset : offset + array.size].reshape(array.shape)
+        offset += array.size
+
+
+def capture_prop_bodies(
+    bodies: PropBodies,
+) -> tuple[FloatArray, FloatArray, NDArray[np.bool_], NDArray[np.int32]]:
+    """Return copies of the body arrays a checkpoint stores."""
+    return (
+        bodies.position.copy(),
+        bodies.velocity.copy(),
+        bodies.sleeping.copy(),
+        bodies.rest_steps.copy(),
+    )
+
+
+def restore_prop_bodies(checkpoint: WorldCheckpoint, bodies: PropBodies) -> None:
+    """Copy checkpointed prop state into live bodies and mark them all moved.
+
+    Raises ``CheckpointError`` when the prop counts differ.
+    """
+    if checkpoint.prop_count != bodies.count:
+        message = (
+            f"checkpoint has {checkpoint.prop_count} props, "
+            f"the world has {bodies.count}"
+        )
+        raise CheckpointError(message)
+    np.copyto(bodies.position, checkpoint.prop_position)
+    np.copyto(bodies.velocity, checkpoint.prop_velocity)
+    np.copyto(bodies.sleeping, checkpoint.prop_sleeping)
+    np.copyto(bodies.rest_steps, checkpoint.prop_rest_steps)
+    bodies.dirty[:] = True
+    bodies.moved[:] = True
+
+
+def encode_checkpoint(checkpoint: WorldCheckpoint) -> bytes:
+    """Serialize a checkpoint to the versioned binary format."""
+    count = checkpoint.prop_count
+    return b"".join(
+        (
+            HEADER.pack(MAGIC, CHECKPOINT_VERSION, 0, count, checkpoint.vehicle.size),
+            PLAYER.pack(*checkpoint.player_position, *checkpoint.player_rotation),
+            ORBIT.pack(
+                checkpoint.yaw_angle,
+                checkpoint.pitch_angle,
+                checkpoint.camera_distance,
+                nan if checkpoint.view_distance is None else checkpoint.view_distance,
+            ),
+            checkpoint.vehicle.astype("<f8").tobytes(),
+            checkpoint.prop_position.reshape(count, 3).astype("<f8").tobytes(),
+            checkpoint.prop_velocity.reshape(count, 3).astype("<f8").tobytes(),
+            checkpoint.prop_rest_steps.astype("<i4").tobytes(),
+            np.packbits(checkpoint.prop_sleeping).tobytes(),
+        ),
+    )
+
+
+def decode_checkpoint(data: bytes) -> WorldCheckpoint:
+    """Parse a checkpoint; prop and vehicle arrays are read-only views of ``data``.
+
+    Raises ``CheckpointError`` for foreign data, another version, or a
+    truncated buffer.
+    """
+    if len(data) < HEADER.size:
+        message = "checkpoint is truncated"
+        raise CheckpointError(message)
+    magic, version, _, count, vehicle_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        message = "not a fooproj checkpoint"
+        raise CheckpointError(message)
+    if version != CHECKPOINT_VERSION:
+        message = (
+            f"checkpoint version {version} is not supported "
+            f"(expected {CHECKPOINT_VERSION})"
+        )
+        raise CheckpointError(message)
+    expected = (
+        HEADER.size
+        + PLAYER.size
+        + ORBIT.size
+        + FLOAT_SIZE * (vehicle_size + 6 * count)
+        + REST_STEPS_SIZE * count
+        + (count + 7) // 8
+    )
+    if len(data) != expected:
+        message = f"checkpoint is {len(data)} bytes, expected {expected}"
+        raise CheckpointError(message)
+
+    offset = HEADER.size
+    player = PLAYER.unpack_from(data, offset)
+    offset += PLAYER.size
+    yaw_angle, pitch_angle, camera_distance, view_distance = ORBIT.unpack_from(
+        data,
+        offset,
+    )
+    offset += ORBIT.size
+    vehicle = np.frombuffer(data, "<f8", vehicle_size, offset)
+    offset += vehicle.nbytes
+    position = np.frombuffer(data, "<f8", 3 * count, offset).reshape(count, 3)
+    offset += position.nbytes
+    velocity = np.frombuffer(data, "<f8", 3 * count, offset).reshape(count, 3)
+    offset += velocity.nbytes
+    rest_steps = np.frombuffer(data, "<i4", count, offset)
+    offset += rest_steps.nbytes
+    sleeping = np.unpackbits(
+        np.frombuffer(data, np.uint8, (count + 7) // 8, offset),
+        count=count,
+    ).astype(np.bool_)
+    return WorldCheckpoint(
+        player_position=np.array(player[:3]),
+        player_rotation=np.array(player[3:]),
+        yaw_angle=yaw_angle,
+        pitch_angle=pitch_angle,
+        camera_distance=camera_distance,
+        view_distance=None if isnan(view_distance) else view_distance,
+        vehicle=vehicle,
+        prop_position=position,
+        prop_velocity=velocity,
+        prop_sleeping=sleeping,
+        prop_rest_steps=rest_steps,
+    )
+
+
+def save_checkpoint(path: Path, checkpoint: WorldCheckpoint) -> None:
+    """Write a checkpoint file, replacing any previous one."""
+    path.write_bytes(encode_checkpoint(checkpoint))
+
+
+def load_checkpoint(path: Path) -> WorldCheckpoint:
+    """Read a checkpoint file.
+
+    Raises ``OSError`` when the file cannot be read and ``CheckpointError``
+    when it is not a valid checkpoint.
+    """
+    return decode_checkpoint(path.read_bytes())
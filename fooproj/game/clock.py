@@ -0,0 +1,27 @@
+"""Fixed-step simulation clock shared by the physics integrators."""
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class FixedStepClock:
+    """Accumulate variable frame time and emit whole fixed simulation steps."""
+
+    step: float
+    max_steps: int = 8
+    accumulator: float = 0.0
+
+    def advance(self, dt: float) -> int:
+        """Add frame time and return how many fixed steps to simulate now."""
+        if dt <= 0.0 or self.step <= 0.0:
+            return 0
+
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            # Drop the backlog instead of spiralling when a frame stalls.
+            self.accumulator = 0.0
+            return self.max_steps
+
+        self.accumulator -= steps * self.step
+        return steps
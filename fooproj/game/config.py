@@ -1,6 +1,14 @@
 """Runtime configuration for the Ursina sandbox."""
 
-from dataclasses import dataclass, field
+import tomllib
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from _typeshed import DataclassInstance
 
 
 @dataclass(frozen=True, slots=True)
@@ -9,6 +17,57 @@ class MovementSettings:
 
     move_speed: float = 20.0
     turn_speed: float = 90.0
+    vehicle_dynamics: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class VehicleSettings:
+    """Chassis, tyre, and suspension tuning for the vehicle-dynamics model."""
+
+    mass: float = 1200.0
+    yaw_inertia: float = 1800.0
+    engine_force: float = 4800.0
+    reverse_force: float = 3200.0
+    brake_force: float = 11000.0
+    drag: float = 0.8
+    rolling_resistance: float = 120.0
+    max_steer_angle: float = 32.0
+    steer_falloff_speed: float = 18.0
+    tyre_grip: float = 1.05
+    rear_grip_ratio: float = 1.3
+    tyre_stiffness: float = 8.0
+    tyre_shape: float = 1.4
+    wheel_radius: float = 0.31
+    suspension_rest_length: float = 0.25
+    suspension_max_travel: float = 0.2
+    suspension_stiffness: float = 36000.0
+    suspension_damping: float = 3200.0
+
+
+@dataclass(frozen=True, slots=True)
+class PhysicsSettings:
+    """Fixed-step rate shared by the vehicle and prop integrators."""
+
+    rate: float = 120.0
+    max_steps: int = 8
+    # Step the car and props on a simulation thread (always with vehicle
+    # dynamics) while the main thread renders the last published state.
+    threaded: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class CullingSettings:
+    """Frustum and per-category draw-distance culling for world entities."""
+
+    enabled: bool = True
+    # Categories without an entry (such as the ground) are never culled.
+    draw_distances: Mapping[str, float] = field(
+        default_factory=lambda: {"prop": 110.0, "column": 150.0, "landmark": 300.0},
+    )
+    frustum_margin: float = 6.0
+    cell_size: float = 32.0
+    # Leave casters outside the sun's shadow volume out of the shadow pass.
+    shadow_casters: bool = True
 
 
 @dataclass(frozen=True, slots=True)
@@ -21,6 +80,133 @@ class CameraSettings:
     min_distance: float = 4.0
     max_distance: float | None = None
     zoom_step: float = 1.0
+    occlusion: bool = True
+    occlusion_padding: float = 0.3
+    occlusion_return_speed: float = 12.0
+
+
+@dataclass(frozen=True, slots=True)
+class SceneSettings:
+    """How densely the starter scene is populated, and its dev reload mode."""
+
+    props_per_ring: int = 14
+    # Re-run the blueprints when fooproj/game/scene.py changes (local game,
+    # unthreaded physics only) and respawn just the entities that changed.
+    hot_reload: bool = False
+    hot_reload_interval: float = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class RenderSettings:
+    """Shadow quality, vsync, and render-state sharing for the world."""
+
+    shared_materials: bool = True
+    shadow_map_resolution: int = 8192
+    shadow_samples: int = 3
+    shadow_blur: float = 0.0008
+    vsync: bool = True
+    # Frames rendered after compiling shaders and preparing the scene, before
+    # the game loop starts; 0 skips the warm-up.
+    warm_up_frames: int = 2
+    # Directory where Panda3D caches compiled shader binaries; empty disables.
+    shader_cache_dir: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class TerrainSettings:
+    """Heightfield terrain source, shape, and chunk level of detail."""
+
+    enabled: bool = True
+    # Grayscale image to load heights from; empty generates noise terrain.
+    heightmap: str = ""
+    size: float = 260.0
+    resolution: int = 128
+    height_scale: float = 5.0
+    flat_radius: float = 28.0
+    seed: int = 7
+    chunk_cells: int = 16
+    lod_near: float = 70.0
+    lod_far: float = 150.0
+    color_name: str = "light_gray"
+
+
+@dataclass(frozen=True, slots=True)
+class ParticleSettings:
+    """Pooled dust and spark particles thrown up by player impacts."""
+
+    enabled: bool = True
+    dust_capacity: int = 2048
+    spark_capacity: int = 1024
+
+
+TELEMETRY_PROTOCOLS = ("statsd", "prometheus")
+
+
+@dataclass(frozen=True, slots=True)
+class TelemetrySettings:
+    """Background export of runtime gauges to a local metrics endpoint."""
+
+    enabled: bool = False
+    # "statsd" pushes UDP datagrams; "prometheus" serves /metrics over HTTP.
+    protocol: str = "statsd"
+    host: str = "127.0.0.1"
+    statsd_port: int = 8125
+    prometheus_port: int = 9464
+    prefix: str = "fooproj"
+    sample_interval: float = 1.0
+    # Samples waiting for the export thread; more are dropped, not blocked on.
+    queue_size: int = 64
+    batch_size: int = 16
+
+
+@dataclass(frozen=True, slots=True)
+class CheckpointSettings:
+    """Where the local game saves and restores binary simulation checkpoints."""
+
+    # Relative paths resolve against the working directory.
+    path: str = "fooproj.checkpoint"
+    # Restore the checkpoint at startup when the file exists.
+    restore_on_start: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class NetworkSettings:
+    """Authoritative server tick, snapshot rate, and client interpolation."""
+
+    host: str = "127.0.0.1"
+    port: int = 47800
+    tick_rate: float = 60.0
+    snapshot_rate: float = 30.0
+    max_players: int = 8
+    interpolation_delay: float = 0.1
+    client_timeout: float = 5.0
+    # File (.npy) the client saves its per-tick input axes to on exit.
+    record_input: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class ProfilingSettings:
+    """Profiler overlay and counter sampling options."""
+
+    overlay: bool = False
+    pstats: bool = False
+    sample_interval: float = 1.0
+    # Trace Python allocations and sample memory counters (slows Python).
+    memory: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class GovernorSettings:
+    """Frame-budget governor that lowers quality to hold a frame time."""
+
+    enabled: bool = True
+    target_frame_ms: float = 16.7
+    window: float = 1.0
+    downgrade_ratio: float = 1.15
+    upgrade_ratio: float = 1.03
+    upgrade_hold: float = 4.0
+    # Loading hitches in the first frames say nothing about steady-state load.
+    startup_grace: float = 2.0
 
 
 @dataclass(frozen=True, slots=True)
@@ -32,4 +218,181 @@ class GameSettings:
     fullscreen: bool = False
     development_mode: bool = True
     movement: MovementSettings = field(default_factory=MovementSettings)
+    vehicle: VehicleSettings = field(default_factory=VehicleSettings)
+    physics: PhysicsSettings = field(default_factory=PhysicsSettings)
+    culling: CullingSettings = field(default_factory=CullingSettings)
+    scene: SceneSettings = field(default_factory=SceneSettings)
+    terrain: TerrainSettings = field(default_factory=TerrainSettings)
+    render: RenderSettings = field(default_factory=RenderSettings)
+    profiling: ProfilingSettings = field(default_factory=ProfilingSettings)
+    governor: GovernorSettings = field(default_factory=GovernorSettings)
     camera: CameraSettings = field(default_factory=CameraSettings)
+    network: NetworkSettings = field(default_factory=NetworkSettings)
+    particles: ParticleSettings = field(default_factory=ParticleSettings)
+    telemetry: TelemetrySettings = field(default_factory=TelemetrySettings)
+    checkpoint: CheckpointSettings = field(default_factory=CheckpointSettings)
+
+
+@dataclass(frozen=True, slots=True)
+class QualityPreset:
+    """Performance knobs that scale the same build to weak or strong machines."""
+
+    shadow_map_resolution: int
+    shadow_samples: int
+    physics_rate: float
+    props_per_ring: int
+    draw_distance_scale: float
+    vsync: bool
+    frame_governor: bool = True
+
+
+DEFAULT_QUALITY_PRESET = "high"
+QUALITY_PRESETS: dict[str, QualityPreset] = {
+    "low": QualityPreset(
+        shadow_map_resolution=2048,
+        shadow_samples=1,
+        physics_rate=60.0,
+        props_per_ring=8,
+        draw_distance_scale=0.6,
+        vsync=True,
+    ),
+    "medium": QualityPreset(
+        shadow_map_resolution=4096,
+        shadow_samples=2,
+        physics_rate=90.0,
+        props_per_ring=14,
+        draw_distance_scale=0.8,
+        vsync=True,
+    ),
+    "high": QualityPreset(
+        shadow_map_resolution=8192,
+        shadow_samples=3,
+        physics_rate=120.0,
+        props_per_ring=14,
+        draw_distance_scale=1.0,
+        vsync=True,
+    ),
+    # Uncapped frame rate and a denser scene for repeatable measurements.
+    "bench": QualityPreset(
+        shadow_map_resolution=8192,
+        shadow_samples=3,
+        physics_rate=120.0,
+        props_per_ring=40,
+        draw_distance_scale=1.0,
+        vsync=False,
+        frame_governor=False,
+    ),
+}
+
+
+def apply_quality_preset(settings: GameSettings, name: str) -> GameSettings:
+    """Return settings with every knob of the named quality preset applied."""
+    preset = QUALITY_PRESETS.get(name)
+    if preset is None:
+        choices = ", ".join(QUALITY_PRESETS)
+        msg = f"unknown quality preset {name!r} (choose from {choices})"
+        raise ValueError(msg)
+
+    return replace(
+        settings,
+        physics=replace(settings.physics, rate=preset.physics_rate),
+        culling=replace(
+            settings.culling,
+            draw_distances={
+                category: distance * preset.draw_distance_scale
+                for category, distance in settings.culling.draw_distances.items()
+            },
+        ),
+        scene=replace(settings.scene, props_per_ring=preset.props_per_ring),
+        render=replace(
+            settings.render,
+            shadow_map_resolution=preset.shadow_map_resolution,
+            shadow_samples=preset.shadow_samples,
+            vsync=preset.vsync,
+        ),
+        governor=replace(settings.governor, enabled=preset.frame_governor),
+    )
+
+
+def _coerce_setting(name: str, current: object, value: object) -> object:
+    """Check a config-file value against the type of the field it replaces.
+
+    A table is merged into the mapping it overrides, so entries it leaves out
+    keep their current values; each entry is checked like a setting.
+    """
+    if isinstance(current, Mapping):
+        if not isinstance(value, Mapping):
+            msg = f"setting {name!r} expects a table"
+            raise ValueError(msg)
+        merged = dict(current)
+        for key, entry in value.items():
+            if key not in current:
+                msg = f"unknown key {key!r} in setting {name!r}"
+                raise ValueError(msg)
+            merged[key] = _coerce_setting(f"{name}.{key}", current[key], entry)
+        return merged
+    # TOML writes whole numbers as integers even for float-valued settings.
+    if isinstance(current, float) and type(value) is int:
+        return float(value)
+    if current is not None and type(value) is not type(current):
+        msg = (
+            f"setting {name!r} expects {type(current).__name__}, "
+            f"got {type(value).__name__}"
+        )
+        raise ValueError(msg)
+    return value
+
+
+def override_settings[SettingsT: DataclassInstance](
+    settings: SettingsT,
+    overrides: Mapping[str, object],
+) -> SettingsT:
+    """Return a copy of settings with (nested) fields replaced by overrides."""
+    known = {settings_field.name for settings_field in fields(settings)}
+    changes: dict[str, object] = {}
+    for name, value in overrides.items():
+        if name not in known:
+            msg = f"unknown setting {type(settings).__name__}.{name}"
+            raise ValueError(msg)
+        current = getattr(settings, name)
+        if (
+            is_dataclass(current)
+            and not isinstance(current, type)
+            and isinstance(value, Mapping)
+        ):
+            changes[name] = override_settings(current, value)
+        else:
+            changes[name] = _coerce_setting(name, current, value)
+    return replace(settings, **changes)
+
+
+def load_game_settings(
+    config_path: Path | None = None,
+    preset: str | None = None,
+) -> GameSettings:
+    """Build settings from a quality preset plus optional TOML overrides.
+
+    A preset passed here wins over the file's top-level ``preset`` key, and
+    the file's other values are applied on top of whichever preset is chosen.
+    """
+    overrides: dict[str, object] = {}
+    if config_path is not None:
+        with config_path.open("rb") as config_file:
+            overrides = tomllib.load(config_file)
+
+    file_preset = overrides.pop("preset", None)
+    if file_preset is not None and not isinstance(file_preset, str):
+        msg = "setting 'preset' expects str"
+        raise ValueError(msg)
+
+    chosen_preset = preset or file_preset or DEFAULT_QUALITY_PRESET
+    settings = apply_quality_preset(GameSettings(), chosen_preset)
+    settings = override_settings(settings, overrides)
+    if settings.telemetry.protocol not in TELEMETRY_PROTOCOLS:
+        choices = ", ".join(TELEMETRY_PROTOCOLS)
+        msg = (
+            f"unknown telemetry protocol {settings.telemetry.protocol!r} "
+            f"(choose from {choices})"
+        )
+        raise ValueError(msg)
+    return settings
@@ -0,0 +1,402 @@
+"""Frustum and draw-distance culling for spawned world entities.
+
+Entities are indexed in a uniform grid over the ground plane, so a cull pass
+only tests the cells around the camera instead of every entity in the world.
+Entities that fail the distance or frustum test are stashed, which removes
+them from both the main render pass and the shadow pass, and are unstashed
+again once they come back into view.
+
+Shadow casters are culled separately against the sun's shadow volume: those
+outside it are only hidden from the shadow camera, so they stay on screen but
+no longer cost a draw in the shadow-map pass.
+"""
+
+from dataclasses import dataclass
+from math import radians, tan
+from typing import TYPE_CHECKING, Protocol
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+type FloatArray = NDArray[np.float64]
+type BoolArray = NDArray[np.bool_]
+type IndexArray = NDArray[np.intp]
+
+UNCULLED_DISTANCE = float("inf")
+# Camera mask of the sun's shadow camera (Ursina's DirectionalLight).
+SHADOW_CAMERA_MASK = 0b0001
+
+
+class Stashable(Protocol):
+    """Scene node that can be removed from and restored to rendering."""
+
+    def stash(self) -> None:
+        """Remove the node from scene traversal."""
+
+    def unstash(self) -> None:
+        """Restore the node to scene traversal."""
+
+
+class ShadowCaster(Protocol):
+    """Scene node that can be hidden from a single camera mask."""
+
+    def hide(self, camera_mask: int) -> None:
+        """Stop drawing the node for cameras in the mask."""
+
+    def show(self, camera_mask: int) -> None:
+        """Draw the node again for cameras in the mask."""
+
+
+@dataclass(frozen=True, slots=True)
+class CameraFrustum:
+    """Camera position and six inward-facing frustum planes (nx, ny, nz, d)."""
+
+    position: FloatArray
+    planes: FloatArray
+
+
+# PLR0913 / pylint R0913,R0917: the camera basis vectors are passed
+# separately so callers can feed Ursina's forward/right/up directly.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def build_frustum(  # noqa: PLR0913
+    position: FloatArray,
+    forward: FloatArray,
+    right: FloatArray,
+    up: FloatArray,
+    fov: tuple[float, float],
+    clip: tuple[float, float],
+) -> CameraFrustum:
+    """Build frustum planes from a camera basis, (h, v) FOV, and near/far."""
+    half_x = radians(fov[0]) * 0.5
+    half_y = radians(fov[1]) * 0.5
+    tan_x, tan_y = tan(half_x), tan(half_y)
+    normals = np.array(
+        [
+            right + forward * tan_x,
+            -right + forward * tan_x,
+            up + forward * tan_y,
+            -up + forward * tan_y,
+            forward,
+            -forward,
+        ],
+    )
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    offsets = -(normals @ position)
+    offsets[4] -= clip[0]
+    offsets[5] += clip[1]
+    return CameraFrustum(
+        position=np.asarray(position, dtype=np.float64),
+        planes=np.column_stack((normals, offsets)),
+    )
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def frustum_from_planes(
+    corners: FloatArray,
+    outward_planes: FloatArray,
+) -> tuple[CameraFrustum, float]:
+    """Wrap a convex volume given as outward (a, b, c, d) planes and corners.
+
+    Returns the inward-facing frustum, positioned at the corners' centroid,
+    and the radius of the sphere around that centroid holding every corner.
+    """
+    lengths = np.linalg.norm(outward_planes[:, :3], axis=1)
+    planes = -outward_planes / lengths[:, None]
+    center = corners.mean(axis=0)
+    radius = float(np.linalg.norm(corners - center, axis=1).max(initial=0.0))
+    return CameraFrustum(position=center, planes=planes), radius
+
+
+def spheres_in_frustum(
+    frustum: CameraFrustum,
+    centers: FloatArray,
+    radii: FloatArray,
+    margin: float = 0.0,
+) -> BoolArray:
+    """Return which bounding spheres touch the (optionally grown) frustum."""
+    distances = centers @ frustum.planes[:, :3].T + frustum.planes[:, 3]
+    return np.all(distances >= -(radii + margin)[:, None], axis=1)
+
+
+class SpatialGrid:
+    """Uniform x/z grid over points, rebuilt in bulk with one sort."""
+
+    def __init__(self, cell_size: float) -> None:
+        """Create an empty grid with square cells of the given size."""
+        self.cell_size = cell_size
+        self._order: IndexArray = np.empty(0, dtype=np.intp)
+        self._sorted_keys: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _cell_keys(
+        cell_x: NDArray[np.int64], cell_z: NDArray[np.int64]
+    ) -> NDArray[np.int64]:
+        """Pack signed cell coordinates into one sortable integer key."""
+        return (cell_x << 32) + cell_z
+
+    def rebuild(self, points: FloatArray) -> None:
+        """Re-bucket every point; cost is one vectorized argsort."""
+        cells = np.floor(points[:, (0, 2)] / self.cell_size).astype(np.int64)
+        keys = self._cell_keys(cells[:, 0], cells[:, 1])
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    def query(self, x_pos: float, z_pos: float, radius: float) -> IndexArray:
+        """Return indices of points in cells overlapping a square around (x, z)."""
+        if self._order.size == 0:
+            return self._order
+
+        size = self.cell_size
+        x_cells = np.arange(
+            int(np.floor((x_pos - radius) / size)),
+            int(np.floor((x_pos + radius) / size)) + 1,
+            dtype=np.int64,
+        )
+        z_cells = np.arange(
+            int(np.floor((z_pos - radius) / size)),
+            int(np.floor((z_pos + radius) / size)) + 1,
+            dtype=np.int64,
+        )
+        if x_cells.size * z_cells.size >= self._order.size:
+            return self._order
+
+        keys = self._cell_keys(
+            np.repeat(x_cells, z_cells.size),
+            np.tile(z_cells, x_cells.size),
+        )
+        starts = np.searchsorted(self._sorted_keys, keys, side="left")
+        ends = np.searchsorted(self._sorted_keys, keys, side="right")
+        counts = ends - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.intp)
+
+        # Expand each [start, end) run into positions without a Python loop.
+        run_offsets = np.repeat(ends - counts.cumsum(), counts)
+        positions = run_offsets + np.arange(total)
+        return self._order[positions]
+
+
+class CullingManager:
+    """Hide entities that are off-screen or beyond their category's distance."""
+
+    # PLR0913 / pylint R0913,R0917: each argument is one column of the
+    # per-entity culling table.
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(  # noqa: PLR0913
+        self,
+        nodes: Sequence[Stashable],
+        centers: FloatArray,
+        radii: FloatArray,
+        categories: Sequence[str],
+        draw_distances: Mapping[str, float],
+        cell_size: float,
+        frustum_margin: float = 0.0,
+    ) -> None:
+        """Index culled entities; categories without a distance stay visible."""
+        self._draw_distances = dict(draw_distances)
+        self._distance_scale = 1.0
+        self.frustum_margin = frustum_margin
+        self._grid = SpatialGrid(cell_size)
+        self.reindex(nodes, centers, radii, categories)
+
+    def reindex(
+        self,
+        nodes: Sequence[Stashable],
+        centers: FloatArray,
+        radii: FloatArray,
+        categories: Sequence[str],
+    ) -> None:
+        """Replace the indexed entities, keeping draw distances and their scale.
+
+        Every new entity starts out shown; call ``release`` first so nodes
+        the old index stashed do not stay hidden.
+        """
+        max_distance = np.array(
+            [
+                self._draw_distances.get(category, UNCULLED_DISTANCE)
+                for category in categories
+            ],
+        )
+        self._culled = np.flatnonzero(np.isfinite(max_distance))
+        self._nodes = [nodes[int(index)] for index in self._culled]
+        self._local_index = np.full(len(nodes), -1, dtype=np.intp)
+        self._local_index[self._culled] = np.arange(self._culled.size)
+        self.centers = np.array(centers, dtype=np.float64).reshape(-1, 3)[self._culled]
+        self.radii = np.array(radii, dtype=np.float64)[self._culled]
+        self._base_distance = max_distance[self._culled]
+        self.visible_all = np.ones(len(nodes), dtype=np.bool_)
+        self._visible = np.ones(self._culled.size, dtype=np.bool_)
+        self._grid.rebuild(self.centers)
+        self._grid_stale = False
+        self.scale_draw_distances(self._distance_scale)
+
+    def release(self) -> None:
+        """Unstash every entity this manager has stashed."""
+        for local in np.flatnonzero(~self._visible):
+            self._nodes[local].unstash()
+        self._visible[:] = True
+        self.visible_all[:] = True
+
+    @property
+    def visible_count(self) -> int:
+        """Return how many entities (culled or not) are currently shown."""
+        return int(self.visible_all.sum())
+
+    def scale_draw_distances(self, scale: float) -> None:
+        """Scale every category's configured draw distance by one factor."""
+        self._distance_scale = scale
+        self.max_distance = self._base_distance * scale
+        self._query_radius = float(
+            (self.max_distance + self.radii).max(initial=0.0),
+        )
+
+    def move(self, indices: IndexArray, centers: FloatArray) -> None:
+        """Update centers for entities (by original index) that have moved."""
+        local = self._local_index[indices]
+        tracked = local >= 0
+        if not tracked.any():
+            return
+        self.centers[local[tracked]] = centers[tracked]
+        self._grid_stale = True
+
+    def compute_visibility(self, frustum: CameraFrustum) -> BoolArray:
+        """Return the desired visibility of every culled entity."""
+        if self._grid_stale:
+            self._grid.rebuild(self.centers)
+            self._grid_stale = False
+
+        camera_x, _, camera_z = (float(value) for value in frustum.position)
+        candidates = self._grid.query(camera_x, camera_z, self._query_radius)
+        visible = np.zeros(self._culled.size, dtype=np.bool_)
+        if candidates.size == 0:
+            return visible
+
+        offsets = self.centers[candidates] - frustum.position
+        in_range = (
+            np.einsum("ij,ij->i", offsets, offsets)
+            <= (self.max_distance[candidates] + self.radii[candidates]) ** 2
+        )
+        candidates = candidates[in_range]
+        visible[candidates] = spheres_in_frustum(
+            frustum,
+            self.centers[candidates],
+            self.radii[candidates],
+            self.frustum_margin,
+        )
+        return visible
+
+    def update(self, frustum: CameraFrustum) -> int:
+        """Stash/unstash entities whose visibility changed; return changes."""
+        visible = self.compute_visibility(frustum)
+        changed = np.flatnonzero(visible != self._visible)
+        for local in changed:
+            node = self._nodes[local]
+            if visible[local]:
+                node.unstash()
+            else:
+                node.stash()
+        self._visible = visible
+        self.visible_all[self._culled] = visible
+        return int(changed.size)
+
+
+class ShadowCasterCuller:
+    """Draw only shadow casters that touch the shadow volume into the shadow map."""
+
+    # PLR0913 / pylint R0913,R0917: each argument is one column of the
+    # per-entity caster table.
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(  # noqa: PLR0913
+        self,
+        nodes: Sequence[ShadowCaster],
+        centers: FloatArray,
+        radii: FloatArray,
+        casts_shadow: Sequence[bool],
+        cell_size: float,
+        camera_mask: int = SHADOW_CAMERA_MASK,
+    ) -> None:
+        """Index the casters, which start out drawn into the shadow map."""
+        self.camera_mask = camera_mask
+        self._grid = SpatialGrid(cell_size)
+        self.reindex(nodes, centers, radii, casts_shadow)
+
+    def reindex(
+        self,
+        nodes: Sequence[ShadowCaster],
+        centers: FloatArray,
+        radii: FloatArray,
+        casts_shadow: Sequence[bool],
+    ) -> None:
+        """Replace the indexed casters.
+
+        Every new caster starts out drawn; call ``release`` first so nodes
+        the old index hid do not stay out of the shadow map.
+        """
+        self._casters = np.flatnonzero(np.asarray(casts_shadow, dtype=np.bool_))
+        self._nodes = [nodes[int(index)] for index in self._casters]
+        self._local_index = np.full(len(nodes), -1, dtype=np.intp)
+        self._local_index[self._casters] = np.arange(self._casters.size)
+        self.centers = np.array(centers, dtype=np.float64).reshape(-1, 3)[self._casters]
+        self.radii = np.array(radii, dtype=np.float64)[self._casters]
+        self._casting = np.ones(self._casters.size, dtype=np.bool_)
+        self._grid.rebuild(self.centers)
+        self._grid_stale = False
+        self._max_radius = float(self.radii.max(initial=0.0))
+
+    def release(self) -> None:
+        """Draw every caster this culler hid back into the shadow map."""
+        for local in np.flatnonzero(~self._casting):
+            self._nodes[local].show(self.camera_mask)
+        self._casting[:] = True
+
+    @property
+    def caster_count(self) -> int:
+        """Return how many casters the shadow camera currently draws."""
+        return int(self._casting.sum())
+
+    def move(self, indices: IndexArray, centers: FloatArray) -> None:
+        """Update centers for entities (by original index) that have moved."""
+        local = self._local_index[indices]
+        tracked = local >= 0
+        if not tracked.any():
+            return
+        self.centers[local[tracked]] = centers[tracked]
+        self._grid_stale = True
+
+    def compute_casting(self, frustum: CameraFrustum, radius: float) -> BoolArray:
+        """Return which casters touch a volume centred on ``frustum.position``.
+
+        ``radius`` bounds the volume around that centre, which limits the
+        grid cells that need testing.
+        """
+        if self._grid_stale:
+            self._grid.rebuild(self.centers)
+            self._grid_stale = False
+
+        center_x, _, center_z = (float(value) for value in frustum.position)
+        candidates = self._grid.query(center_x, center_z, radius + self._max_radius)
+        casting = np.zeros(self._casters.size, dtype=np.bool_)
+        casting[candidates] = spheres_in_frustum(
+            frustum,
+            self.centers[candidates],
+            self.radii[candidates],
+        )
+        return casting
+
+    def update(self, frustum: CameraFrustum, radius: float) -> int:
+        """Hide/show casters whose overlap changed; return the caster count."""
+        casting = self.compute_casting(frustum, radius)
+        for local in np.flatnonzero(casting != self._casting):
+            node = self._nodes[local]
+            if casting[local]:
+                node.show(self.camera_mask)
+            else:
+                node.hide(self.camera_mask)
+        self._casting = casting
+        return self.caster_count
@@ -0,0 +1,142 @@
+"""Pooled world entities, spawned and despawned in bulk.
+
+Building an Ursina ``Entity`` one at a time is slow in two ways. Its setters
+(model, colour, shader, transform) each do Python-side work, and its parent
+setter checks the new parent's child list for duplicates, so spawning n
+entities under one material group costs O(n^2). The pool avoids both:
+
+- entities are created parentless and without model, colour, or shader, then
+  attached with ``NodePath.reparent_to`` and given an instance of the
+  group's shared geometry, so the per-entity work is constant;
+- transforms are written straight to the node with one
+  ``setPosHprScale`` call;
+- shadow participation follows the blueprint, so a reused entity never
+  inherits its previous owner's setting;
+- despawned entities are detached (not destroyed) onto a free list per
+  material and colour, and the next spawn of the same kind reuses them.
+
+Pooled entities live inside the ``MaterialRegistry`` groups like
+``MaterialRegistry.spawn`` instances, but their Ursina ``parent`` is left
+unset and their ``model`` is None; the geometry hangs off the entity node.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ursina import Entity
+
+from .culling import SHADOW_CAMERA_MASK
+from .materials import MaterialKey
+from .scene import blueprint_entity_name
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from ursina.color import Color
+
+    from .materials import MaterialRegistry
+    from .scene import EntityBlueprint
+
+
+@dataclass(frozen=True, slots=True)
+class PoolKey:
+    """Entities are interchangeable when material and baked colour match."""
+
+    material: MaterialKey
+    color_name: str
+
+
+class EntityPool:
+    """Spawn world entities from blueprints, reusing despawned ones."""
+
+    def __init__(
+        self,
+        materials: MaterialRegistry,
+        resolve_color: Callable[[str], Color],
+    ) -> None:
+        """Spawn into the registry's material groups."""
+        self._materials = materials
+        self._resolve_color = resolve_color
+        self._free: defaultdict[PoolKey, list[Entity]] = defaultdict(list)
+        self._keys: dict[Entity, PoolKey] = {}
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def free_count(self) -> int:
+        """Return how many despawned entities are waiting for reuse."""
+        return sum(len(entities) for entities in self._free.values())
+
+    def key_for(self, blueprint: EntityBlueprint) -> PoolKey:
+        """Return the pool a blueprint's entity comes from."""
+        material = MaterialKey(
+            model=blueprint.model,
+            shader_name=self._materials.shader_name,
+        )
+        return PoolKey(material=material, color_name=blueprint.color_name)
+
+    def spawn_blueprints(self, blueprints: Iterable[EntityBlueprint]) -> list[Entity]:
+        """Spawn one entity per blueprint, in order, reusing free entities."""
+        entities: list[Entity] = []
+        for blueprint in blueprints:
+            key = self.key_for(blueprint)
+            free = self._free[key]
+            if free:
+                entity = free.pop()
+                entity.setName(blueprint_entity_name(blueprint))
+                self.reused += 1
+            else:
+                entity = self._create(key, blueprint_entity_name(blueprint))
+                self._keys[entity] = key
+                self.created += 1
+            # Enable while parentless: Ursina only flips its flag, and the
+            # node never sits in the group's stashed list.
+            entity.enabled = True
+            entity.reparent_to(self._materials.group(key.material.model))
+            position = blueprint.position
+            scale = blueprint.scale
+            entity.setPosHprScale(
+                position.x,
+                position.y,
+                position.z,
+                0.0,
+                0.0,
+                0.0,
+                scale.x,
+                scale.y,
+                scale.z,
+            )
+            if blueprint.casts_shadow:
+                entity.show(SHADOW_CAMERA_MASK)
+            else:
+                entity.hide(SHADOW_CAMERA_MASK)
+            entities.append(entity)
+        return entities
+
+    def despawn(self, entities: Iterable[Entity]) -> None:
+        """Detach pooled entities and keep them for reuse.
+
+        Raises ``ValueError`` for entities this pool did not create.
+        """
+        for entity in entities:
+            key = self._keys.get(entity)
+            if key is None:
+                message = f"{entity.name} was not spawned by this pool"
+                raise ValueError(message)
+            entity.detachNode()
+            entity.enabled = False
+            self._free[key].append(entity)
+
+    def _create(self, key: PoolKey, name: str) -> Entity:
+        """Create a bare entity holding an instance of the shared geometry."""
+        # parent=None skips Ursina's duplicate-child scan; shader=None keeps
+        # the group's shader in effect, as for MaterialRegistry.spawn.
+        entity = Entity(name=name, parent=None, shader=None)
+        geometry = self._materials.geometry(
+            key.material.model,
+            key.color_name,
+            self._resolve_color(key.color_name),
+        )
+        geometry.instanceTo(entity)
+        return entity
@@ -0,0 +1,175 @@
+"""Frame-budget governor that trades render and physics quality for time.
+
+The governor watches a time-based rolling window of frame durations and
+steps through a ladder of quality levels: level 0 is the configured quality
+and each further level lowers shadow resolution, shadow update rate, draw
+distance, or physics rate. Hysteresis comes from three places: the window
+must refill after every change before the next decision, the downgrade and
+upgrade thresholds are separated, and an upgrade that is undone shortly
+afterwards doubles the time the governor waits before probing that level
+again.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+MIN_SHADOW_MAP_RESOLUTION = 512
+MIN_PHYSICS_RATE = 30.0
+MAX_UPGRADE_HOLD = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class QualityLevel:
+    """Scale factors applied to the configured quality at one governor level."""
+
+    shadow_scale: float
+    shadow_interval: int
+    distance_scale: float
+    physics_rate_scale: float
+
+
+GOVERNOR_LEVELS = (
+    QualityLevel(
+        shadow_scale=1.0,
+        shadow_interval=1,
+        distance_scale=1.0,
+        physics_rate_scale=1.0,
+    ),
+    QualityLevel(
+        shadow_scale=0.5,
+        shadow_interval=1,
+        distance_scale=0.9,
+        physics_rate_scale=1.0,
+    ),
+    QualityLevel(
+        shadow_scale=0.5,
+        shadow_interval=2,
+        distance_scale=0.8,
+        physics_rate_scale=0.75,
+    ),
+    QualityLevel(
+        shadow_scale=0.25,
+        shadow_interval=2,
+        distance_scale=0.7,
+        physics_rate_scale=0.75,
+    ),
+    QualityLevel(
+        shadow_scale=0.25,
+        shadow_interval=4,
+        distance_scale=0.6,
+        physics_rate_scale=0.5,
+    ),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedQuality:
+    """Concrete runtime values for one governor level."""
+
+    shadow_map_resolution: int
+    shadow_update_interval: int
+    distance_scale: float
+    physics_rate: float
+
+    def describe(self) -> str:
+        """Format the values for the profiler's event log."""
+        return (
+            f"shadows {self.shadow_map_resolution}px every "
+            f"{self.shadow_update_interval} frame(s), "
+            f"draw x{self.distance_scale:.2f}, physics {self.physics_rate:.0f} Hz"
+        )
+
+
+def resolve_quality(
+    level: QualityLevel,
+    shadow_map_resolution: int,
+    physics_rate: float,
+) -> ResolvedQuality:
+    """Apply a level's scale factors to the configured quality."""
+    return ResolvedQuality(
+        shadow_map_resolution=max(
+            MIN_SHADOW_MAP_RESOLUTION,
+            int(shadow_map_resolution * level.shadow_scale),
+        ),
+        shadow_update_interval=level.shadow_interval,
+        distance_scale=level.distance_scale,
+        physics_rate=max(MIN_PHYSICS_RATE, physics_rate * level.physics_rate_scale),
+    )
+
+
+@dataclass(slots=True)
+class FrameBudgetGovernor:
+    """Pick a quality level that keeps rolling frame time within a budget."""
+
+    target_ms: float
+    window: float = 1.0
+    downgrade_ratio: float = 1.15
+    upgrade_ratio: float = 1.03
+    upgrade_hold: float = 4.0
+    probe_window: float = 3.0
+    startup_grace: float = 0.0
+    level_count: int = len(GOVERNOR_LEVELS)
+    level: int = 0
+    _frame_times: deque[float] = field(default_factory=deque, init=False)
+    _window_sum: float = field(default=0.0, init=False)
+    _elapsed: float = field(default=0.0, init=False)
+    _headroom_time: float = field(default=0.0, init=False)
+    _since_upgrade: float = field(default=float("inf"), init=False)
+    _upgrade_holds: dict[int, float] = field(default_factory=dict, init=False)
+
+    @property
+    def mean_frame_ms(self) -> float:
+        """Return the mean frame time over the current window."""
+        if not self._frame_times:
+            return 0.0
+        return 1000.0 * self._window_sum / len(self._frame_times)
+
+    def update(self, dt: float) -> int | None:
+        """Record one frame; return the new level when it changes."""
+        self._elapsed += dt
+        if dt <= 0.0 or self._elapsed < self.startup_grace:
+            return None
+
+        self._since_upgrade += dt
+        self._frame_times.append(dt)
+        self._window_sum += dt
+        while self._window_sum - self._frame_times[0] >= self.window:
+            self._window_sum -= self._frame_times.popleft()
+        if self._window_sum < self.window:
+            return None
+
+        mean_ms = self.mean_frame_ms
+        if mean_ms > self.target_ms * self.downgrade_ratio:
+            return self._downgrade()
+
+        if mean_ms > self.target_ms * self.upgrade_ratio:
+            self._headroom_time = 0.0
+            return None
+
+        self._headroom_time += dt
+        upgrade_hold = self._upgrade_holds.get(self.level, self.upgrade_hold)
+        if self.level == 0 or self._headroom_time < upgrade_hold:
+            return None
+        self._since_upgrade = 0.0
+        return self._change_level(self.level - 1)
+
+    def _downgrade(self) -> int | None:
+        """Lower quality one level, backing off if an upgrade just failed."""
+        if self.level >= self.level_count - 1:
+            return None
+        if self._since_upgrade < self.probe_window:
+            # The level we just upgraded to could not hold the budget, so wait
+            # longer before probing it again from the level below.
+            lower = self.level + 1
+            hold = self._upgrade_holds.get(lower, self.upgrade_hold)
+            self._upgrade_holds[lower] = min(MAX_UPGRADE_HOLD, hold * 2.0)
+            self._since_upgrade = float("inf")
+        return self._change_level(self.level + 1)
+
+    def _change_level(self, level: int) -> int:
+        """Switch level and restart the window so the change can settle."""
+        self.level = level
+        self._frame_times.clear()
+        self._window_sum = 0.0
+        self._headroom_time = 0.0
+        return level
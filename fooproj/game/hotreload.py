@@ -0,0 +1,153 @@
+"""Hot-reload scene blueprints and diff them against the live world.
+
+In the ``[scene] hot_reload`` dev mode the runtime polls the modification
+time of ``fooproj/game/scene.py``; when it changes, ``reload_blueprints``
+re-imports the module and re-runs its blueprint generator. ``diff_blueprints``
+then matches old and new blueprints by stable identity (the entity name
+derived from model and x/z cell, see ``blueprint_entity_name``) so that the
+runtime only spawns, moves, or destroys the entities that actually changed.
+
+A reloaded module defines new ``EntityBlueprint`` and ``Vec3`` classes, so
+blueprints are compared by their field values rather than with ``==``.
+
+Only ``starter_scene_blueprints`` is looked up on the reloaded module. The
+helpers other modules imported from ``scene`` at startup
+(``is_dynamic_prop``, ``compute_prop_mass``, ``blueprint_entity_name``) are
+bound to the original module, so edits to them take effect on restart.
+"""
+
+import importlib
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from . import scene as scene_module
+from .scene import blueprint_entity_name
+from .terrain import place_blueprints_on_terrain
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .config import GameSettings
+    from .scene import EntityBlueprint
+    from .terrain import Heightfield
+
+type IndexPairs = tuple[tuple[int, int], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class BlueprintDiff:
+    """How a new blueprint set maps onto the live one, by blueprint index.
+
+    ``kept`` and ``moved`` pair an old index with a new one. Moved blueprints
+    keep their entity (same model and colour) but change position, scale, or
+    flags; every other change destroys the old entity and spawns a new one.
+    """
+
+    kept: IndexPairs
+    moved: IndexPairs
+    spawned: tuple[int, ...]
+    destroyed: tuple[int, ...]
+
+    @property
+    def unchanged(self) -> bool:
+        """Return whether every blueprint is kept at its old index."""
+        return (
+            not self.moved
+            and not self.spawned
+            and not self.destroyed
+            and all(old == new for old, new in self.kept)
+        )
+
+
+def blueprint_identities(blueprints: Sequence[EntityBlueprint]) -> list[str]:
+    """Return each blueprint's entity name, numbered when a name repeats."""
+    seen: dict[str, int] = {}
+    identities: list[str] = []
+    for blueprint in blueprints:
+        name = blueprint_entity_name(blueprint)
+        repeat = seen.get(name, 0)
+        seen[name] = repeat + 1
+        identities.append(name if repeat == 0 else f"{name}#{repeat}")
+    return identities
+
+
+def diff_blueprints(
+    old: Sequence[EntityBlueprint],
+    new: Sequence[EntityBlueprint],
+) -> BlueprintDiff:
+    """Match new blueprints to old ones by identity and classify each change."""
+    old_by_identity = {
+        identity: index for index, identity in enumerate(blueprint_identities(old))
+    }
+    kept: list[tuple[int, int]] = []
+    moved: list[tuple[int, int]] = []
+    spawned: list[int] = []
+    destroyed: list[int] = []
+    for new_index, identity in enumerate(blueprint_identities(new)):
+        old_index = old_by_identity.pop(identity, None)
+        if old_index is None:
+            spawned.append(new_index)
+            continue
+        before, after = old[old_index], new[new_index]
+        if astuple(before) == astuple(after):
+            kept.append((old_index, new_index))
+        elif before.color_name == after.color_name:
+            moved.append((old_index, new_index))
+        else:
+            destroyed.append(old_index)
+            spawned.append(new_index)
+    destroyed.extend(old_by_identity.values())
+    return BlueprintDiff(
+        kept=tuple(kept),
+        moved=tuple(moved),
+        spawned=tuple(spawned),
+        destroyed=tuple(sorted(destroyed)),
+    )
+
+
+def reload_blueprints(
+    settings: GameSettings,
+    terrain: Heightfield | None = None,
+) -> tuple[EntityBlueprint, ...]:
+    """Re-import the scene module and build its blueprints as ``load_world`` does.
+
+    Errors raised while importing or running the edited module propagate.
+    """
+    module = importlib.reload(scene_module)
+    blueprints = cast(
+        "tuple[EntityBlueprint, ...]",
+        module.starter_scene_blueprints(settings.scene.props_per_ring),
+    )
+    if terrain is not None:
+        blueprints = place_blueprints_on_terrain(blueprints, terrain)
+    return blueprints
+
+
+class SourceWatcher:
+    """Report when a source file's modification time changes."""
+
+    def __init__(self, path: Path) -> None:
+        """Remember the file's current modification time."""
+        self.path = path
+        self._mtime = self._read_mtime()
+
+    def changed(self) -> bool:
+        """Return whether the file changed since the last call."""
+        mtime = self._read_mtime()
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        return True
+
+    def _read_mtime(self) -> int:
+        """Return the modification time in nanoseconds, or -1 while missing."""
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return -1
+
+
+def scene_source_path() -> Path:
+    """Return the file that defines the scene blueprints."""
+    return Path(scene_module.__file__)
@@ -0,0 +1,157 @@
+"""Shared material groups so world entities share one render state.
+
+Every world entity used to carry its own shader attribute (with a private
+copy of the shader inputs) and its own colour scale, so the renderer saw one
+state per entity. The registry instead creates one group node per material
+(model + shader) that holds the shader and its inputs once, and bakes each
+entity's colour into the vertices of a per-colour copy of the model. Children
+of a group carry no render attributes of their own, so all of them resolve
+to the same ``RenderState`` and draw back-to-back in the state-sorted bin.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from panda3d.core import NodePath, RenderState
+from ursina import Entity, destroy, load_model
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from ursina.color import Color
+
+
+# Shader inputs that the scene root configures for the whole world.
+SCENE_LEVEL_INPUTS = frozenset(
+    {"shadow_color", "shadow_bias", "shadow_blur", "shadow_samples"},
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MaterialKey:
+    """Identity of a shared render state: model geometry plus shader."""
+
+    model: str
+    shader_name: str
+
+
+def collect_net_states(root: NodePath) -> list[RenderState]:
+    """Return the net render state of every visible geom under a root."""
+    states: list[RenderState] = []
+    for node_path in root.findAllMatches("**/+GeomNode"):
+        net_state = node_path.getNetState()
+        geom_node = node_path.node()
+        states.extend(
+            net_state.compose(geom_node.getGeomState(index))
+            for index in range(geom_node.getNumGeoms())
+        )
+    return states
+
+
+def frame_state_counters(root: NodePath) -> dict[str, float]:
+    """Measure render-state counters comparable to PStats' state changes.
+
+    Opaque geometry is drawn in Panda3D's state-sorted bin, so the number of
+    distinct net states among visible geoms is the number of state changes
+    issued per frame.
+    """
+    states = collect_net_states(root)
+    return {
+        "geoms": float(len(states)),
+        "state_changes": float(len(set(states))),
+        "render_states_total": float(RenderState.getNumStates()),
+    }
+
+
+class MaterialRegistry:
+    """Create material group nodes and vertex-coloured shared geometry."""
+
+    def __init__(
+        self,
+        shader: object,
+        shader_name: str,
+        shader_inputs: Mapping[str, object],
+    ) -> None:
+        """Share one shader (and its default inputs) across all groups."""
+        self._shader = shader
+        self._shader_name = shader_name
+        self._shader_inputs = {
+            name: value
+            for name, value in shader_inputs.items()
+            if name not in SCENE_LEVEL_INPUTS
+        }
+        self._groups: dict[MaterialKey, Entity] = {}
+        self._geometry: dict[tuple[str, str], NodePath] = {}
+
+    @property
+    def shader_name(self) -> str:
+        """Return the name of the shader every group carries."""
+        return self._shader_name
+
+    @property
+    def group_count(self) -> int:
+        """Return how many material groups have been created."""
+        return len(self._groups)
+
+    def group(self, model: str) -> Entity:
+        """Return (creating on demand) the group node for a model."""
+        key = MaterialKey(model=model, shader_name=self._shader_name)
+        group = self._groups.get(key)
+        if group is None:
+            # The group entity carries the shader, so Ursina refreshes its
+            # continuous inputs once per material instead of once per entity.
+            group = Entity(name=f"material_{model}_{self._shader_name}")
+            group.shader = self._shader
+            for name, value in self._shader_inputs.items():
+                group.set_shader_input(name, value)
+            group.show(0b0001)
+            self._groups[key] = group
+        return group
+
+    def geometry(self, model: str, color_name: str, color_value: Color) -> NodePath:
+        """Return shared model geometry with the colour baked into vertices."""
+        cache_key = (model, color_name)
+        geometry = self._geometry.get(cache_key)
+        if geometry is None:
+            geometry = NodePath(f"{model}_{color_name}")
+            template = load_model(model)
+            template.copyTo(geometry)
+            geometry.setColor(color_value)
+            geometry.flattenStrong()
+            self._geometry[cache_key] = geometry
+        return geometry
+
+    def spawn(
+        self,
+        name: str,
+        model: str,
+        color_name: str,
+        color_value: Color,
+        **transform: object,
+    ) -> Entity:
+        """Spawn an attribute-free entity instance inside its material group."""
+        # Copied geom nodes still reference the shared vertex data.
+        instance = NodePath(name)
+        self.geometry(model, color_name, color_value).copyTo(instance)
+        entity = Entity(
+            name=name,
+            parent=self.group(model),
+            model=instance,
+            shader=None,
+            **transform,
+        )
+        # Ursina re-applies colour and transparency on model assignment; drop
+        # them so the instance inherits the group's state unchanged.
+        entity.model.clearColorScale()
+        entity.model.clearTransparency()
+        entity.show(0b0001)
+        return entity
+
+    def destroy(self) -> None:
+        """Destroy every group (with the entities in it) and cached geometry."""
+        for group in self._groups.values():
+            destroy(group)
+        self._groups.clear()
+        for geometry in self._geometry.values():
+            geometry.removeNode()
+        self._geometry.clear()
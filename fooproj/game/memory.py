@@ -0,0 +1,179 @@
+"""Memory accounting: Python heap, Panda3D textures and geometry, entities.
+
+``measure_memory`` takes one ``MemoryReport`` of a scene: the Python heap as
+seen by ``tracemalloc`` (zero unless tracing was started), the estimated
+size of every texture under the scene or bound to a graphics output (such as
+the sun's shadow map), the vertex and index data of every geom, and how many
+nodes and Ursina entities exist. Instanced geometry and shared textures are
+counted once.
+
+``steady_state_problems`` compares reports taken at the same point of
+repeated spawn/destroy cycles: once the first cycles have filled caches,
+entity, node, texture, and geom counts must not change and the Python heap
+may only drift by a small tolerance, or something is leaking.
+"""
+
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ursina import scene
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from panda3d.core import (
+        GeomNode,
+        GeomVertexArrayData,
+        GraphicsOutput,
+        NodePath,
+        Texture,
+    )
+
+MEGABYTE = 1024 * 1024
+# Python heap growth per cycle tolerated by the steady-state check.
+DEFAULT_PYTHON_GROWTH_TOLERANCE = 64 * 1024
+TRACEBACK_FRAMES = 8
+# Report fields whose values must not change once the caches are warm.
+STEADY_COUNTS = ("texture_count", "geom_count", "node_count", "entity_count")
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryReport:
+    """Memory use of a scene at one moment, in bytes and counts."""
+
+    python_bytes: int
+    python_peak_bytes: int
+    texture_bytes: int
+    texture_count: int
+    geom_bytes: int
+    geom_count: int
+    node_count: int
+    entity_count: int
+    entities_by_category: Mapping[str, int] = field(default_factory=dict)
+
+    def counters(self) -> dict[str, float]:
+        """Return the report as profiler counters (sizes in MiB)."""
+        counters = {
+            "python_mb": round(self.python_bytes / MEGABYTE, 2),
+            "texture_mb": round(self.texture_bytes / MEGABYTE, 2),
+            "geom_mb": round(self.geom_bytes / MEGABYTE, 2),
+            "nodes": float(self.node_count),
+            "entities": float(self.entity_count),
+        }
+        for category, count in sorted(self.entities_by_category.items()):
+            counters[f"entities_{category}"] = float(count)
+        return counters
+
+
+def start_tracing(frames: int = TRACEBACK_FRAMES) -> None:
+    """Start ``tracemalloc`` unless it is already running."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def texture_memory(textures: Iterable[Texture]) -> tuple[int, int]:
+    """Return the estimated bytes and the number of distinct textures."""
+    unique = set(textures)
+    return sum(texture.estimateTextureMemory() for texture in unique), len(unique)
+
+
+def output_textures(outputs: Iterable[GraphicsOutput]) -> list[Texture]:
+    """Return the textures graphics outputs render into."""
+    return [
+        output.getTexture(index)
+        for output in outputs
+        for index in range(output.countTextures())
+    ]
+
+
+def geom_memory(root: NodePath) -> tuple[int, int]:
+    """Return the bytes of vertex and index data under a root and geom count.
+
+    Geom nodes, geoms, and data arrays shared between instances are counted
+    once.
+    """
+    arrays: set[GeomVertexArrayData] = set()
+    geom_nodes: set[GeomNode] = set()
+    geom_count = 0
+    geom_nodes.update(path.node() for path in root.findAllMatches("**/+GeomNode"))
+    for geom_node in geom_nodes:
+        for geom in geom_node.getGeoms():
+            geom_count += 1
+            vertex_data = geom.getVertexData()
+            arrays.update(
+                vertex_data.getArray(index)
+                for index in range(vertex_data.getNumArrays())
+            )
+            for primitive in geom.getPrimitives():
+                indices = primitive.getVertices()
+                if indices is not None:
+                    arrays.add(indices)
+    return sum(array.getDataSizeBytes() for array in arrays), geom_count
+
+
+def measure_memory(
+    root: NodePath,
+    outputs: Iterable[GraphicsOutput] = (),
+    entities_by_category: Mapping[str, int] | None = None,
+) -> MemoryReport:
+    """Measure the Python heap, textures, and geometry of a scene."""
+    python_bytes, python_peak_bytes = (
+        tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    )
+    texture_bytes, texture_count = texture_memory(
+        [*root.findAllTextures(), *output_textures(outputs)],
+    )
+    geom_bytes, geom_count = geom_memory(root)
+    return MemoryReport(
+        python_bytes=python_bytes,
+        python_peak_bytes=python_peak_bytes,
+        texture_bytes=texture_bytes,
+        texture_count=texture_count,
+        geom_bytes=geom_bytes,
+        geom_count=geom_count,
+        node_count=root.findAllMatches("**").getNumPaths(),
+        entity_count=len(scene.entities),
+        entities_by_category=dict(entities_by_category or {}),
+    )
+
+
+def steady_state_problems(
+    reports: Sequence[MemoryReport],
+    warmup: int = 1,
+    python_growth_tolerance: int = DEFAULT_PYTHON_GROWTH_TOLERANCE,
+) -> list[str]:
+    """Describe growth between cycle ``warmup`` and the last cycle.
+
+    ``reports`` holds one report per cycle, taken at the same point of each.
+    Returns an empty list when memory stayed steady.
+    """
+    if len(reports) <= warmup + 1:
+        return []
+    first, last = reports[warmup], reports[-1]
+    cycles = len(reports) - 1 - warmup
+    problems = [
+        f"{name} grew from {getattr(first, name)} to {getattr(last, name)}"
+        for name in STEADY_COUNTS
+        if getattr(last, name) > getattr(first, name)
+    ]
+    growth = (last.python_bytes - first.python_bytes) / cycles
+    if growth > python_growth_tolerance:
+        problems.append(
+            f"Python heap grew by {growth / 1024:.1f} KiB per cycle "
+            f"(tolerance {python_growth_tolerance / 1024:.1f} KiB)",
+        )
+    return problems
+
+
+def top_growth(
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+    limit: int = 10,
+) -> list[str]:
+    """Return the source lines whose allocations grew most between snapshots."""
+    return [
+        str(difference)
+        for difference in after.compare_to(before, "lineno")[:limit]
+        if difference.size_diff > 0
+    ]
@@ -0,0 +1,837 @@
+"""UDP snapshot protocol, authoritative server, and client for networked play.
+
+The server owns a headless ``Simulation`` and steps it at a fixed tick. Each
+client sends its keyboard axes every frame and receives periodic snapshots of
+every player's transform and every dynamic prop's position.
+
+Snapshots are quantized to integers (1/512 m for positions, 1/65536 of a turn
+for headings) and delta-compressed against the newest snapshot the client has
+acknowledged: a bitmask of changed rows is followed by only those rows'
+deltas, stored at the narrowest integer width that fits them all. Props at
+rest cost one bit each. Clients render a short, fixed delay behind the
+newest snapshot and interpolate between the two that bracket that time.
+
+A full snapshot must fit in one datagram, which caps the prop count (see
+``max_snapshot_size``). A client the server has timed out is told so when
+its next input arrives and says hello again.
+"""
+
+import logging
+import socket
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from math import tau
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .simulation import (
+    create_simulation,
+    load_world,
+    set_player_axes,
+    step_simulation,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from .config import GameSettings, NetworkSettings
+    from .simulation import Simulation
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = 1
+MSG_HELLO = 1
+MSG_WELCOME = 2
+MSG_REJECT = 3
+MSG_INPUT = 4
+MSG_SNAPSHOT = 5
+MSG_BYE = 6
+REJECT_FULL = 1
+REJECT_VERSION = 2
+REJECT_UNKNOWN = 3
+
+# type, protocol version
+HELLO = struct.Struct("<BH")
+# type, player slot, player slots, prop count, tick rate
+WELCOME = struct.Struct("<BHHIf")
+# type, reason
+REJECT = struct.Struct("<BB")
+# type, input sequence, acknowledged snapshot tick, forward/strafe/turn axes
+INPUT = struct.Struct("<BIIbbb")
+# type, tick, baseline tick, acknowledged input sequence, players, props,
+# delta width in bytes
+SNAPSHOT = struct.Struct("<BIIIHIB")
+BYE = struct.Struct("<B")
+
+NO_BASELINE = 0xFFFFFFFF
+NO_INPUT = 0xFFFFFFFF
+POSITION_SCALE = 512.0
+ANGLE_STEPS = 1 << 16
+AXIS_SCALE = 127.0
+PLAYER_COLUMNS = 4
+PROP_COLUMNS = 3
+HEADING_COLUMN = 3
+SNAPSHOT_HISTORY = 64
+MAX_DATAGRAM = 65507
+DELTA_DTYPES: dict[int, np.dtype[np.signedinteger]] = {
+    1: np.dtype("<i1"),
+    2: np.dtype("<i2"),
+    4: np.dtype("<i4"),
+}
+HELLO_RETRY_INTERVAL = 0.25
+CLOCK_SMOOTHING = 0.05
+CLOCK_RESYNC_ERROR = 0.25
+
+
+class ProtocolError(ValueError):
+    """Raised when a datagram cannot be decoded."""
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Quantized world state at one server tick.
+
+    ``players`` rows are (x, y, z, heading) and ``props`` rows are (x, y, z),
+    all as integers; see ``quantize_simulation``.
+    """
+
+    tick: int
+    players: NDArray[np.int32]
+    props: NDArray[np.int32]
+    active: NDArray[np.bool_]
+
+
+@dataclass(frozen=True, slots=True)
+class InputMessage:
+    """One client's axes, stamped with sequence and snapshot acknowledgement."""
+
+    sequence: int
+    acked_tick: int
+    axes: tuple[float, float, float]
+
+
+@dataclass(frozen=True, slots=True)
+class Welcome:
+    """What the server tells a client after accepting it."""
+
+    slot: int
+    player_count: int
+    prop_count: int
+    tick_rate: float
+
+
+@dataclass(slots=True)
+class ClientSession:
+    """Server-side bookkeeping for one connected client."""
+
+    slot: int
+    last_heard: float
+    input_sequence: int = NO_INPUT
+    acked_tick: int = NO_BASELINE
+
+
+@dataclass(slots=True)
+class ServerStats:
+    """Tick timings and traffic totals gathered while serving."""
+
+    tick_times: deque[float] = field(default_factory=lambda: deque(maxlen=4096))
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    snapshots_sent: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class InterpolatedState:
+    """World state at the client's render time, in world units."""
+
+    player_positions: NDArray[np.float64]
+    player_headings: NDArray[np.float64]
+    prop_positions: NDArray[np.float64]
+    active: NDArray[np.bool_]
+
+
+@dataclass(frozen=True, slots=True)
+class _Keyframe:
+    """Dequantized snapshot placed on the server's timeline."""
+
+    time: float
+    player_positions: NDArray[np.float64]
+    player_headings: NDArray[np.float64]
+    prop_positions: NDArray[np.float64]
+    active: NDArray[np.bool_]
+
+
+def quantize_positions(positions: NDArray[np.float64]) -> NDArray[np.int32]:
+    """Round world positions to fixed-point integers."""
+    return np.rint(positions * POSITION_SCALE).astype(np.int32)
+
+
+def quantize_headings(headings: NDArray[np.float64]) -> NDArray[np.int32]:
+    """Map headings in radians to integer angle steps in [0, ANGLE_STEPS)."""
+    steps = np.rint(headings * (ANGLE_STEPS / tau)).astype(np.int64)
+    return (steps % ANGLE_STEPS).astype(np.int32)
+
+
+def quantize_simulation(simulation: Simulation, tick: int) -> Snapshot:
+    """Capture the simulation's players and props as a quantized snapshot."""
+    players = np.empty((simulation.player_count, PLAYER_COLUMNS), dtype=np.int32)
+    players[:, :HEADING_COLUMN] = quantize_positions(simulation.vehicles.position)
+    players[:, HEADING_COLUMN] = quantize_headings(simulation.vehicles.heading)
+    return Snapshot(
+        tick=tick,
+        players=players,
+        props=quantize_positions(simulation.bodies.position),
+        active=simulation.active.copy(),
+    )
+
+
+def max_snapshot_size(player_count: int, prop_count: int) -> int:
+    """Return the largest snapshot datagram for these row counts, in bytes.
+
+    That is a full snapshot with every row changed at the widest delta.
+    """
+    rows = player_count + prop_count
+    values = player_count * PLAYER_COLUMNS + prop_count * PROP_COLUMNS
+    return (
+        SNAPSHOT.size
+        + (player_count + 7) // 8
+        + (rows + 7) // 8
+        + values * max(DELTA_DTYPES)
+    )
+
+
+def encode_snapshot(
+    snapshot: Snapshot,
+    baseline: Snapshot | None,
+    input_ack: int,
+) -> bytes:
+    """Encode a snapshot as a delta against a baseline the client holds.
+
+    Without a baseline the deltas are taken against zero, which makes a full
+    snapshot in the same format.
+    """
+    player_delta = snapshot.players.astype(np.int64)
+    prop_delta = snapshot.props.astype(np.int64)
+    if baseline is not None:
+        player_delta -= baseline.players
+        prop_delta -= baseline.props
+        # Headings wrap around, so take the short way round.
+        player_delta[:, HEADING_COLUMN] = (
+            player_delta[:, HEADING_COLUMN] + ANGLE_STEPS // 2
+        ) % ANGLE_STEPS - ANGLE_STEPS // 2
+
+    changed_players = np.any(player_delta != 0, axis=1)
+    changed_props = np.any(prop_delta != 0, axis=1)
+    values = np.concatenate(
+        (player_delta[changed_players].ravel(), prop_delta[changed_props].ravel()),
+    )
+    largest = int(np.abs(values).max()) if values.size else 0
+    width = next(
+        size
+        for size, dtype in DELTA_DTYPES.items()
+        if largest <= np.iinfo(dtype).max or size == max(DELTA_DTYPES)
+    )
+    header = SNAPSHOT.pack(
+        MSG_SNAPSHOT,
+        snapshot.tick,
+        NO_BASELINE if baseline is None else baseline.tick,
+        input_ack,
+        snapshot.players.shape[0],
+        snapshot.props.shape[0],
+        width,
+    )
+    return b"".join(
+        (
+            header,
+            np.packbits(snapshot.active).tobytes(),
+            np.packbits(np.concatenate((changed_players, changed_props))).tobytes(),
+            values.astype(DELTA_DTYPES[width]).tobytes(),
+        ),
+    )
+
+
+def decode_snapshot(
+    data: bytes,
+    baselines: Mapping[int, Snapshot],
+) -> tuple[Snapshot, int]:
+    """Decode a snapshot datagram into the full state and the input ack.
+
+    Raises ``ProtocolError`` for malformed datagrams and for deltas against a
+    baseline that is not in ``baselines``.
+    """
+    if len(data) < SNAPSHOT.size:
+        message = "truncated snapshot header"
+        raise ProtocolError(message)
+    message_type, tick, baseline_tick, input_ack, player_count, prop_count, width = (
+        SNAPSHOT.unpack_from(data)
+    )
+    if message_type != MSG_SNAPSHOT or width not in DELTA_DTYPES:
+        message = "not a snapshot datagram"
+        raise ProtocolError(message)
+
+    rows = player_count + prop_count
+    active_size = (player_count + 7) // 8
+    changed_size = (rows + 7) // 8
+    offset = SNAPSHOT.size
+    if len(data) < offset + active_size + changed_size:
+        message = "truncated snapshot masks"
+        raise ProtocolError(message)
+    active = np.unpackbits(
+        np.frombuffer(data, np.uint8, active_size, offset),
+        count=player_count,
+    ).astype(np.bool_)
+    offset += active_size
+    changed = np.unpackbits(
+        np.frombuffer(data, np.uint8, changed_size, offset),
+        count=rows,
+    ).astype(np.bool_)
+    offset += changed_size
+
+    changed_players = changed[:player_count]
+    changed_props = changed[player_count:]
+    player_values = int(changed_players.sum()) * PLAYER_COLUMNS
+    prop_values = int(changed_props.sum()) * PROP_COLUMNS
+    if len(data) != offset + (player_values + prop_values) * width:
+        message = "snapshot payload does not match its changed-row mask"
+        raise ProtocolError(message)
+    values = np.frombuffer(data, DELTA_DTYPES[width], offset=offset).astype(np.int64)
+
+    if baseline_tick == NO_BASELINE:
+        players = np.zeros((player_count, PLAYER_COLUMNS), dtype=np.int64)
+        props = np.zeros((prop_count, PROP_COLUMNS), dtype=np.int64)
+    else:
+        baseline = baselines.get(baseline_tick)
+        if baseline is None:
+            message = f"missing baseline snapshot {baseline_tick}"
+            raise ProtocolError(message)
+        if baseline.players.shape[0] != player_count:
+            message = "baseline snapshot has a different player count"
+            raise ProtocolError(message)
+        if baseline.props.shape[0] != prop_count:
+            message = "baseline snapshot has a different prop count"
+            raise ProtocolError(message)
+        players = baseline.players.astype(np.int64)
+        props = baseline.props.astype(np.int64)
+
+    players[changed_players] += values[:player_values].reshape(-1, PLAYER_COLUMNS)
+    props[changed_props] += values[player_values:].reshape(-1, PROP_COLUMNS)
+    players[:, HEADING_COLUMN] %= ANGLE_STEPS
+    snapshot = Snapshot(
+        tick=tick,
+        players=players.astype(np.int32),
+        props=props.astype(np.int32),
+        active=active,
+    )
+    return snapshot, input_ack
+
+
+def encode_input(
+    sequence: int,
+    acked_tick: int,
+    axes: tuple[float, float, float],
+) -> bytes:
+    """Encode one client input datagram with axes quantized to int8."""
+    forward, strafe, turn = (
+        round(max(-1.0, min(1.0, axis)) * AXIS_SCALE) for axis in axes
+    )
+    return INPUT.pack(MSG_INPUT, sequence, acked_tick, forward, strafe, turn)
+
+
+def decode_input(data: bytes) -> InputMessage:
+    """Decode a client input datagram."""
+    if len(data) != INPUT.size:
+        message = "input datagram has the wrong size"
+        raise ProtocolError(message)
+    _, sequence, acked_tick, forward, strafe, turn = INPUT.unpack(data)
+    return InputMessage(
+        sequence=sequence,
+        acked_tick=acked_tick,
+        axes=(forward / AXIS_SCALE, strafe / AXIS_SCALE, turn / AXIS_SCALE),
+    )
+
+
+def _sequence_newer(candidate: int, current: int) -> bool:
+    """Return whether a 32-bit sequence number is newer than another."""
+    if current == NO_INPUT:
+        return True
+    return 0 < (candidate - current) % (1 << 32) < (1 << 31)
+
+
+class SimulationServer:
+    """Authoritative simulation server on a non-blocking UDP socket."""
+
+    def __init__(
+        self,
+        simulation: Simulation,
+        settings: NetworkSettings,
+        steps_per_tick: int = 1,
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Bind the server socket; port 0 picks a free port.
+
+        Raises ``ValueError`` when a full snapshot of the simulation might not
+        fit in one datagram.
+        """
+        snapshot_size = max_snapshot_size(
+            simulation.player_count,
+            simulation.bodies.count,
+        )
+        if snapshot_size > MAX_DATAGRAM:
+            message = (
+                f"{simulation.bodies.count} props and {simulation.player_count} "
+                f"players need snapshots of up to {snapshot_size} bytes, more "
+                f"than one {MAX_DATAGRAM}-byte datagram; lower "
+                "[scene] props_per_ring or [network] max_players"
+            )
+            raise ValueError(message)
+        self.simulation = simulation
+        self.settings = settings
+        self.steps_per_tick = steps_per_tick
+        self.snapshot_interval = max(
+            1,
+            round(settings.tick_rate / settings.snapshot_rate),
+        )
+        self.tick = 0
+        self.stats = ServerStats()
+        self.sessions: dict[tuple[str, int], ClientSession] = {}
+        self._clock = clock
+        self._history: dict[int, Snapshot] = {}
+        self._history_ticks: deque[int] = deque()
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((settings.host, settings.port))
+        self._socket.setblocking(False)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Return the bound host and port."""
+        host, port = self._socket.getsockname()
+        return str(host), int(port)
+
+    def close(self) -> None:
+        """Close the server socket."""
+        self._socket.close()
+
+    def receive(self) -> None:
+        """Handle every datagram waiting on the socket."""
+        now = self._clock()
+        while True:
+            try:
+                data, address = self._socket.recvfrom(MAX_DATAGRAM)
+            except BlockingIOError:
+                return
+            except ConnectionResetError:
+                # Windows reports ICMP port-unreachable from an earlier send.
+                continue
+            self.stats.bytes_received += len(data)
+            if not data:
+                continue
+            try:
+                self._handle(data, address, now)
+            except ProtocolError:
+                logger.debug("Dropped malformed datagram from %s", address)
+
+    def _handle(self, data: bytes, address: tuple[str, int], now: float) -> None:
+        """Dispatch one datagram by its message type."""
+        message_type = data[0]
+        if message_type == MSG_HELLO:
+            self._handle_hello(data, address, now)
+            return
+        session = self.sessions.get(address)
+        if session is None:
+            if message_type == MSG_INPUT:
+                # Timed out (or never joined): have the client say hello.
+                self._send(REJECT.pack(MSG_REJECT, REJECT_UNKNOWN), address)
+            return
+        session.last_heard = now
+        if message_type == MSG_INPUT:
+            message = decode_input(data)
+            if _sequence_newer(message.sequence, session.input_sequence):
+                session.input_sequence = message.sequence
+                set_player_axes(self.simulation, session.slot, message.axes)
+            if message.acked_tick in self._history:
+                session.acked_tick = message.acked_tick
+        elif message_type == MSG_BYE:
+            self._disconnect(address)
+
+    def _handle_hello(
+        self,
+        data: bytes,
+        address: tuple[str, int],
+        now: float,
+    ) -> None:
+        """Accept a new client or repeat the welcome to a known one."""
+        if len(data) != HELLO.size:
+            message = "hello datagram has the wrong size"
+            raise ProtocolError(message)
+        _, version = HELLO.unpack(data)
+        if version != PROTOCOL_VERSION:
+            self._send(REJECT.pack(MSG_REJECT, REJECT_VERSION), address)
+            return
+
+        session = self.sessions.get(address)
+        if session is None:
+            taken = {other.slot for other in self.sessions.values()}
+            free = [
+                slot
+                for slot in range(self.simulation.player_count)
+                if slot not in taken
+            ]
+            if not free:
+                self._send(REJECT.pack(MSG_REJECT, REJECT_FULL), address)
+                return
+            session = ClientSession(slot=free[0], last_heard=now)
+            self.sessions[address] = session
+            self.simulation.active[session.slot] = True
+            logger.info("Player %d joined from %s", session.slot, address)
+        session.last_heard = now
+        self._send(
+            WELCOME.pack(
+                MSG_WELCOME,
+                session.slot,
+                self.simulation.player_count,
+                self.simulation.bodies.count,
+                self.settings.tick_rate,
+            ),
+            address,
+        )
+
+    def _disconnect(self, address: tuple[str, int]) -> None:
+        """Forget a client and park its vehicle."""
+        session = self.sessions.pop(address)
+        self.simulation.active[session.slot] = False
+        set_player_axes(self.simulation, session.slot, (0.0, 0.0, 0.0))
+        logger.info("Player %d left", session.slot)
+
+    def _send(self, payload: bytes, address: tuple[str, int]) -> None:
+        """Send one datagram, dropping it if the socket refuses it."""
+        try:
+            self.stats.bytes_sent += self._socket.sendto(payload, address)
+        except (BlockingIOError, ConnectionResetError) as error:
+            logger.debug("Dropped datagram to %s: %s", address, error)
+        except OSError as error:
+            logger.warning("Dropped datagram to %s: %s", address, error)
+
+    def step(self) -> None:
+        """Run one server tick: read input, simulate, maybe broadcast."""
+        started = self._clock()
+        self.receive()
+        timeout = self.settings.client_timeout
+        for address, session in list(self.sessions.items()):
+            if started - session.last_heard > timeout:
+                self._disconnect(address)
+        for _ in range(self.steps_per_tick):
+            step_simulation(self.simulation)
+        self.tick += 1
+        if self.tick % self.snapshot_interval == 0:
+            self.broadcast()
+        self.stats.tick_times.append(self._clock() - started)
+
+    def broadcast(self) -> None:
+        """Send every client a snapshot delta against its acknowledged one."""
+        snapshot = quantize_simulation(self.simulation, self.tick)
+        self._history[snapshot.tick] = snapshot
+        self._history_ticks.append(snapshot.tick)
+        if len(self._history_ticks) > SNAPSHOT_HISTORY:
+            del self._history[self._history_ticks.popleft()]
+
+        for address, session in self.sessions.items():
+            payload = encode_snapshot(
+                snapshot,
+                self._history.get(session.acked_tick),
+                session.input_sequence,
+            )
+            self._send(payload, address)
+            self.stats.snapshots_sent += 1
+
+    def serve(self, duration: float | None = None) -> None:
+        """Tick at the configured rate until ``duration`` seconds have passed."""
+        interval = 1.0 / self.settings.tick_rate
+        started = self._clock()
+        next_tick = started
+        while duration is None or next_tick - started < duration:
+            self.step()
+            next_tick += interval
+            delay = next_tick - self._clock()
+            if delay > 0.0:
+                time.sleep(delay)
+            elif -delay > SNAPSHOT_HISTORY * interval:
+                # Far behind (e.g. the process was suspended): skip ahead
+                # rather than burst-simulating the backlog.
+                next_tick = self._clock()
+
+
+class SimulationClient:
+    """Client end of the protocol: sends input, decodes snapshots."""
+
+    def __init__(
+        self,
+        settings: NetworkSettings,
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Open a non-blocking socket aimed at the configured server."""
+        self.settings = settings
+        self.welcome: Welcome | None = None
+        self.interpolator: SnapshotInterpolator | None = None
+        self.latest: Snapshot | None = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._clock = clock
+        self._input_sequence = 0
+        self._hello_at = 0.0
+        self._baselines: dict[int, Snapshot] = {}
+        self._baseline_ticks: deque[int] = deque()
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.connect((settings.host, settings.port))
+        self._socket.setblocking(False)
+
+    def connect(self, timeout: float | None = None) -> Welcome:
+        """Say hello until the server welcomes or rejects this client."""
+        limit = self.settings.client_timeout if timeout is None else timeout
+        deadline = self._clock() + limit
+        while self._clock() < deadline:
+            self._send(HELLO.pack(MSG_HELLO, PROTOCOL_VERSION))
+            retry_at = min(deadline, self._clock() + HELLO_RETRY_INTERVAL)
+            while self._clock() < retry_at:
+                data = self._receive()
+                if data is None:
+                    time.sleep(0.005)
+                elif (welcome := self._handle_admission(data)) is not None:
+                    return welcome
+        message = f"no answer from {self.settings.host}:{self.settings.port}"
+        raise TimeoutError(message)
+
+    def _handle_admission(self, data: bytes) -> Welcome | None:
+        """Apply a welcome or reject; return the welcome if it was one.
+
+        A server that no longer knows this client gets a hello, at most every
+        ``HELLO_RETRY_INTERVAL``. Other rejects raise ``ConnectionRefusedError``.
+        """
+        if data[0] == MSG_WELCOME and len(data) == WELCOME.size:
+            _, slot, player_count, prop_count, tick_rate = WELCOME.unpack(data)
+            welcome = Welcome(slot, player_count, prop_count, tick_rate)
+            if self.welcome is not None and self.welcome.slot != slot:
+                logger.info("Rejoined the server as player %d", slot)
+            if self.interpolator is None or self.interpolator.tick_rate != tick_rate:
+                self.interpolator = SnapshotInterpolator(
+                    tick_rate,
+                    self.settings.interpolation_delay,
+                )
+            self.welcome = welcome
+            return welcome
+        if data[0] != MSG_REJECT or len(data) != REJECT.size:
+            return None
+        if data[1] == REJECT_UNKNOWN:
+            now = self._clock()
+            if self.welcome is not None and now >= self._hello_at:
+                logger.info("Server dropped this client; saying hello again")
+                self._send(HELLO.pack(MSG_HELLO, PROTOCOL_VERSION))
+                self._hello_at = now + HELLO_RETRY_INTERVAL
+            return None
+        reason = "server is full" if data[1] == REJECT_FULL else "version"
+        message = f"server rejected the connection: {reason}"
+        raise ConnectionRefusedError(message)
+
+    def close(self) -> None:
+        """Tell the server this client is leaving and close the socket."""
+        if self.welcome is not None:
+            self._send(BYE.pack(MSG_BYE))
+        self._socket.close()
+
+    def send_input(self, axes: tuple[float, float, float]) -> None:
+        """Send the current axes, acknowledging the newest snapshot."""
+        acked_tick = NO_BASELINE if self.latest is None else self.latest.tick
+        self._send(encode_input(self._input_sequence, acked_tick, axes))
+        self._input_sequence = (self._input_sequence + 1) % (1 << 32)
+
+    def poll(self) -> int:
+        """Decode every waiting snapshot; return how many were new.
+
+        Also handles the server forgetting this client (see
+        ``_handle_admission``), which can change ``welcome.slot``.
+        """
+        received = 0
+        while (data := self._receive()) is not None:
+            if data[0] != MSG_SNAPSHOT:
+                self._handle_admission(data)
+                continue
+            try:
+                snapshot, _ = decode_snapshot(data, self._baselines)
+            except ProtocolError:
+                # The server falls back to a baseline we do hold as soon as
+                # our next input acknowledges it.
+                continue
+            if self.latest is not None and snapshot.tick <= self.latest.tick:
+                continue
+            self.latest = snapshot
+            self._baselines[snapshot.tick] = snapshot
+            self._baseline_ticks.append(snapshot.tick)
+            if len(self._baseline_ticks) > SNAPSHOT_HISTORY:
+                del self._baselines[self._baseline_ticks.popleft()]
+            if self.interpolator is not None:
+                self.interpolator.push(snapshot, self._clock())
+            received += 1
+        return received
+
+    def _send(self, payload: bytes) -> None:
+        """Send one datagram to the server."""
+        try:
+            self.bytes_sent += self._socket.send(payload)
+        except (BlockingIOError, ConnectionRefusedError) as error:
+            logger.debug("Dropped datagram to the server: %s", error)
+
+    def _receive(self) -> bytes | None:
+        """Return the next waiting datagram, if any."""
+        try:
+            data = self._socket.recv(MAX_DATAGRAM)
+        except BlockingIOError:
+            return None
+        except ConnectionRefusedError:
+            # Nothing listens yet; the hello loop keeps retrying.
+            return None
+        self.bytes_received += len(data)
+        return data or None
+
+
+class SnapshotInterpolator:
+    """Buffer snapshots and sample them a fixed delay behind the server."""
+
+    def __init__(self, tick_rate: float, delay: float, capacity: int = 32) -> None:
+        """Create an empty buffer for snapshots stamped at ``tick_rate``."""
+        self.tick_rate = tick_rate
+        self.delay = delay
+        self._keyframes: deque[_Keyframe] = deque(maxlen=capacity)
+        self._clock_offset: float | None = None
+
+    def push(self, snapshot: Snapshot, received_at: float) -> None:
+        """Add a snapshot and refine the local-to-server clock offset."""
+        server_time = snapshot.tick / self.tick_rate
+        offset = server_time - received_at
+        if (
+            self._clock_offset is None
+            or abs(offset - self._clock_offset) > CLOCK_RESYNC_ERROR
+        ):
+            self._clock_offset = offset
+        else:
+            self._clock_offset += CLOCK_SMOOTHING * (offset - self._clock_offset)
+        self._keyframes.append(
+            _Keyframe(
+                time=server_time,
+                player_positions=snapshot.players[:, :HEADING_COLUMN] / POSITION_SCALE,
+                player_headings=snapshot.players[:, HEADING_COLUMN].astype(np.float64)
+                * (tau / ANGLE_STEPS),
+                prop_positions=snapshot.props / POSITION_SCALE,
+                active=snapshot.active,
+            ),
+        )
+
+    def sample(self, now: float) -> InterpolatedState | None:
+        """Return the interpolated state at ``now`` minus the delay.
+
+        Holds the oldest or newest snapshot outside the buffered range rather
+        than extrapolating.
+        """
+        if self._clock_offset is None or not self._keyframes:
+            return None
+        render_time = now + self._clock_offset - self.delay
+        keyframes = self._keyframes
+        later_index = next(
+            (
+                index
+                for index, keyframe in enumerate(keyframes)
+                if keyframe.time >= render_time
+            ),
+            len(keyframes) - 1,
+        )
+        later = keyframes[later_index]
+        earlier = keyframes[max(later_index - 1, 0)]
+        span = later.time - earlier.time
+        alpha = 1.0 if span <= 0.0 else (render_time - earlier.time) / span
+        alpha = min(max(alpha, 0.0), 1.0)
+
+        heading_delta = (later.player_headings - earlier.player_headings + tau / 2) % (
+            tau
+        ) - tau / 2
+        return InterpolatedState(
+            player_positions=earlier.player_positions
+            + (later.player_positions - earlier.player_positions) * alpha,
+            player_headings=earlier.player_headings + heading_delta * alpha,
+            prop_positions=earlier.prop_positions
+            + (later.prop_positions - earlier.prop_positions) * alpha,
+            active=later.active,
+        )
+
+
+class InputRecorder:
+    """Sample input axes once per server tick for later replay."""
+
+    def __init__(self, tick_rate: float) -> None:
+        """Create an empty recording at ``tick_rate`` samples per second."""
+        self.interval = 1.0 / tick_rate
+        self._elapsed = 0.0
+        self._samples: list[tuple[float, float, float]] = []
+
+    def record(self, axes: tuple[float, float, float], dt: float) -> None:
+        """Hold ``axes`` for ``dt`` seconds of the recording."""
+        self._elapsed += dt
+        while self._elapsed >= self.interval:
+            self._elapsed -= self.interval
+            self._samples.append(axes)
+
+    def save(self, path: Path) -> None:
+        """Write the samples as a (ticks, 3) float32 ``.npy`` array."""
+        np.save(path, np.array(self._samples, dtype=np.float32).reshape(-1, 3))
+
+
+def load_input_recording(path: Path) -> NDArray[np.float32]:
+    """Load a recording saved by ``InputRecorder``."""
+    recording: NDArray[np.float32] = np.load(path)
+    if recording.ndim != 2 or recording.shape[1] != 3:
+        message = f"{path} is not a (ticks, 3) input recording"
+        raise ValueError(message)
+    return recording.astype(np.float32)
+
+
+def create_server(settings: GameSettings) -> SimulationServer:
+    """Create a server simulating the world the settings describe.
+
+    The physics rate is rounded to a whole number of steps per server tick.
+    """
+    network = settings.network
+    steps_per_tick = max(1, round(settings.physics.rate / network.tick_rate))
+    blueprints, terrain = load_world(settings)
+    simulation = create_simulation(
+        blueprints,
+        network.max_players,
+        settings.vehicle,
+        1.0 / (network.tick_rate * steps_per_tick),
+        terrain,
+    )
+    return SimulationServer(simulation, network, steps_per_tick)
+
+
+def run_server(settings: GameSettings) -> None:
+    """Serve the simulation until interrupted."""
+    server = create_server(settings)
+    host, port = server.address
+    logger.info(
+        "Serving %d props for up to %d players on %s:%d at %.0f Hz",
+        server.simulation.bodies.count,
+        server.simulation.player_count,
+        host,
+        port,
+        settings.network.tick_rate,
+    )
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    finally:
+        server.close()
@@ -0,0 +1,593 @@
+"""Memory-mapped Wavefront OBJ/MTL importer that builds Panda3D geometry.
+
+The file is mapped into memory and classified line by line with NumPy, so
+the ``v``/``vt``/``vn``/``f`` records are each parsed in a single bulk
+conversion instead of one Python call per token. Polygons are fan
+triangulated and OBJ corners (position/texcoord/normal triples) are
+deduplicated with array operations, then written straight into a
+``GeomVertexData`` buffer. Centring, scaling, and winding reversal are
+applied to the arrays, so no scene-graph traversal is needed afterwards.
+"""
+
+import mmap
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+from panda3d.core import (
+    Filename,
+    Geom,
+    GeomEnums,
+    GeomNode,
+    GeomTriangles,
+    GeomVertexArrayFormat,
+    GeomVertexData,
+    GeomVertexFormat,
+    InternalName,
+    Material,
+    NodePath,
+    Texture,
+    TexturePool,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+type FloatArray = NDArray[np.float32]
+type IndexArray = NDArray[np.int64]
+
+NEWLINE = ord("\n")
+SPACE = ord(" ")
+SLASH = ord("/")
+WHITESPACE = (ord(" "), ord("\t"), ord("\r"), ord("\n"))
+IS_BLANK = np.isin(np.arange(256), WHITESPACE)
+RGB_COMPONENTS = 3
+MIN_POLYGON_CORNERS = 3
+
+LINE_OTHER = 0
+LINE_POSITION = 1
+LINE_TEXCOORD = 2
+LINE_NORMAL = 3
+LINE_FACE = 4
+LINE_STATEMENT = 5
+
+# Statements that switch the material or group of the faces that follow.
+STATEMENT_KEYWORDS = frozenset({b"usemtl", b"g", b"o"})
+# A statement line is a keyword followed by one name.
+STATEMENT_FIELDS = 2
+DEFAULT_MATERIAL = "default"
+DEFAULT_GROUP = "default"
+# Optional per-vertex float column that tags vertices for vertex shaders.
+WHEEL_COLUMN = "wheel"
+
+
+class ObjImportError(ValueError):
+    """Raised when an OBJ file cannot be parsed into a triangle mesh."""
+
+
+@dataclass(frozen=True, slots=True)
+class ObjMaterial:
+    """Subset of an MTL material that the lit shader can use."""
+
+    name: str
+    diffuse: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    specular: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    shininess: float = 0.0
+    diffuse_map: Path | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ObjMesh:
+    """Indexed triangle mesh with per-triangle material and group ids."""
+
+    positions: FloatArray
+    normals: FloatArray
+    texcoords: FloatArray
+    triangles: NDArray[np.uint32]
+    triangle_materials: IndexArray
+    triangle_groups: IndexArray
+    material_names: tuple[str, ...]
+    group_names: tuple[str, ...]
+    material_library: str | None
+    bounds_min: FloatArray
+    bounds_max: FloatArray
+
+
+@dataclass(frozen=True, slots=True)
+class _LineTable:
+    """Start/end offsets and record kind of every line in a mapped file."""
+
+    starts: IndexArray
+    ends: IndexArray
+    kinds: NDArray[np.int8]
+    line_of_byte: IndexArray
+
+
+def _classify_lines(buffer: NDArray[np.uint8]) -> _LineTable:
+    """Split a byte buffer into lines and tag each line's record kind."""
+    newlines = np.flatnonzero(buffer == NEWLINE)
+    starts = np.concatenate(([0], newlines + 1)).astype(np.int64)
+    ends = np.concatenate((newlines, [buffer.size])).astype(np.int64)
+
+    # Pad so looking at the first three bytes of an empty last line is safe.
+    padded = np.concatenate((buffer, np.zeros(3, dtype=np.uint8)))
+    first, second, third = (padded[starts + offset] for offset in range(3))
+    second_blank = IS_BLANK[second]
+    third_blank = IS_BLANK[third]
+
+    kinds = np.full(starts.size, LINE_OTHER, dtype=np.int8)
+    is_v = first == ord("v")
+    kinds[is_v & second_blank] = LINE_POSITION
+    kinds[is_v & (second == ord("t")) & third_blank] = LINE_TEXCOORD
+    kinds[is_v & (second == ord("n")) & third_blank] = LINE_NORMAL
+    kinds[(first == ord("f")) & second_blank] = LINE_FACE
+    kinds[np.isin(first, (ord("u"), ord("g"), ord("o"), ord("m")))] = LINE_STATEMENT
+    line_of_byte = np.repeat(np.arange(starts.size), ends - starts + 1)[: buffer.size]
+    return _LineTable(
+        starts=starts,
+        ends=ends,
+        kinds=kinds,
+        line_of_byte=line_of_byte,
+    )
+
+
+def _record_text(
+    buffer: NDArray[np.uint8],
+    table: _LineTable,
+    lines: IndexArray,
+    prefix_length: int,
+) -> tuple[NDArray[np.uint8], IndexArray]:
+    """Gather the given lines' fields and the record index of every byte."""
+    keep = np.zeros(table.starts.size, dtype=np.bool_)
+    keep[lines] = True
+    text = buffer[keep[table.line_of_byte]]
+
+    # Lengths include the newline, except on an unterminated last line.
+    lengths = table.ends[lines] - table.starts[lines] + 1
+    lengths[-1] = text.size - int(lengths[:-1].sum())
+    record_starts = np.cumsum(lengths) - lengths
+    text[(record_starts[:, None] + np.arange(prefix_length)).ravel()] = SPACE
+    return text, np.repeat(np.arange(lines.size), lengths)
+
+
+def _tokens_per_record(
+    text: NDArray[np.uint8],
+    record_of_byte: IndexArray,
+    record_count: int,
+) -> IndexArray:
+    """Count whitespace-separated tokens in every gathered record."""
+    blank = IS_BLANK[text]
+    token_start = ~blank
+    token_start[1:] &= blank[:-1]
+    return np.bincount(record_of_byte[token_start], minlength=record_count)
+
+
+def _parse_floats(
+    buffer: NDArray[np.uint8],
+    table: _LineTable,
+    kind: int,
+    width: int,
+) -> FloatArray:
+    """Parse every record of one kind into an (N, width) float array."""
+    lines = np.flatnonzero(table.kinds == kind)
+    if lines.size == 0:
+        return np.empty((0, width), dtype=np.float32)
+
+    # "v" is followed by one separator, "vt" and "vn" by one more letter.
+    prefix_length = 2 if kind == LINE_POSITION else 3
+    text, record_of_byte = _record_text(buffer, table, lines, prefix_length)
+    values = np.fromstring(text.tobytes(), dtype=np.float64, sep=" ")
+    # Optional components (vertex colours, w, or 3D texcoords) are dropped
+    # in bulk when every record has the same width.
+    record_widths = np.unique(_tokens_per_record(text, record_of_byte, lines.size))
+    if record_widths.size == 1 and int(record_widths[0]) >= width:
+        record_width = int(record_widths[0])
+        rows_array = values.reshape(lines.size, record_width)[:, :width]
+        return rows_array.astype(np.float32)
+
+    # Mixed record widths fall back to parsing records one at a time.
+    rows = [
+        np.array(bytes(buffer[start:end]).split()[1 : width + 1], dtype=np.float64)
+        for start, end in zip(table.starts[lines], table.ends[lines])
+    ]
+    if any(row.size < width for row in rows):
+        msg = f"record with fewer than {width} components"
+        raise ObjImportError(msg)
+    return np.array(rows, dtype=np.float32)
+
+
+def _parse_faces(
+    buffer: NDArray[np.uint8],
+    table: _LineTable,
+) -> tuple[IndexArray, IndexArray, IndexArray]:
+    """Return face line ids, corner counts, and (C, 3) v/vt/vn corner ids."""
+    lines = np.flatnonzero(table.kinds == LINE_FACE)
+    if lines.size == 0:
+        msg = "OBJ file has no faces"
+        raise ObjImportError(msg)
+
+    first_line = bytes(buffer[table.starts[lines[0]] : table.ends[lines[0]]])
+    first_corner = first_line.split()[1]
+    slash_count = first_corner.count(b"/")
+    has_texcoord = slash_count >= 1 and b"//" not in first_corner
+    has_normal = slash_count == 2 or b"//" in first_corner
+    fields = 1 + int(has_texcoord) + int(has_normal)
+
+    text, record_of_byte = _record_text(buffer, table, lines, prefix_length=2)
+    text[text == SLASH] = SPACE
+    values = np.fromstring(text.tobytes(), dtype=np.int64, sep=" ")
+
+    counts = _tokens_per_record(text, record_of_byte, lines.size) // fields
+    valid_layout = values.size == int(counts.sum()) * fields
+    if not valid_layout or int(counts.min()) < MIN_POLYGON_CORNERS:
+        msg = "faces must use one v, v/vt, v//vn, or v/vt/vn layout"
+        raise ObjImportError(msg)
+
+    # Missing texcoord/normal ids become 1 so they resolve to index 0.
+    corners = np.ones((int(counts.sum()), 3), dtype=np.int64)
+    per_field = values.reshape(-1, fields)
+    corners[:, 0] = per_field[:, 0]
+    if has_texcoord:
+        corners[:, 1] = per_field[:, 1]
+    if has_normal:
+        corners[:, 2] = per_field[:, -1]
+    return lines, counts, corners
+
+
+def _resolve_indices(
+    corners: IndexArray,
+    corner_lines: IndexArray,
+    table: _LineTable,
+) -> IndexArray:
+    """Convert 1-based and negative (relative) OBJ indices to 0-based ids."""
+    resolved = corners - 1
+    for column, kind in enumerate((LINE_POSITION, LINE_TEXCOORD, LINE_NORMAL)):
+        negative = corners[:, column] < 0
+        if negative.any():
+            declared = np.cumsum(table.kinds == kind)
+            resolved[negative, column] = (
+                declared[corner_lines[negative]] + corners[negative, column]
+            )
+    return resolved
+
+
+def _fan_triangles(counts: IndexArray) -> IndexArray:
+    """Fan-triangulate polygons given their corner counts."""
+    polygon_start = np.cumsum(counts) - counts
+    triangle_counts = counts - 2
+    polygon_of_triangle = np.repeat(np.arange(counts.size), triangle_counts)
+    first_triangle = np.cumsum(triangle_counts) - triangle_counts
+    step = np.arange(int(triangle_counts.sum())) - first_triangle[polygon_of_triangle]
+    apex = polygon_start[polygon_of_triangle]
+    return np.column_stack((apex, apex + step + 1, apex + step + 2))
+
+
+def _statement_ids(
+    buffer: NDArray[np.uint8],
+    table: _LineTable,
+    face_lines: IndexArray,
+) -> tuple[IndexArray, IndexArray, list[str], list[str], str | None]:
+    """Assign each face the material and group active on its line."""
+    material_names = [DEFAULT_MATERIAL]
+    group_names = [DEFAULT_GROUP]
+    material_changes: list[tuple[int, int]] = [(-1, 0)]
+    group_changes: list[tuple[int, int]] = [(-1, 0)]
+    library: str | None = None
+
+    for line in np.flatnonzero(table.kinds == LINE_STATEMENT):
+        parts = bytes(buffer[table.starts[line] : table.ends[line]]).split(maxsplit=1)
+        if len(parts) != STATEMENT_FIELDS:
+            continue
+        keyword, name = parts[0], parts[1].strip().decode("utf-8", "replace")
+        if keyword == b"mtllib":
+            library = library or name
+        elif keyword == b"usemtl":
+            if name not in material_names:
+                material_names.append(name)
+            material_changes.append((int(line), material_names.index(name)))
+        elif keyword in STATEMENT_KEYWORDS:
+            if name not in group_names:
+                group_names.append(name)
+            group_changes.append((int(line), group_names.index(name)))
+
+    def ids_for(changes: list[tuple[int, int]]) -> IndexArray:
+        change_lines = np.array([line for line, _ in changes])
+        change_ids = np.array([index for _, index in changes])
+        return change_ids[np.searchsorted(change_lines, face_lines, "right") - 1]
+
+    return (
+        ids_for(material_changes),
+        ids_for(group_changes),
+        material_names,
+        group_names,
+        library,
+    )
+
+
+def _smooth_normals(positions: FloatArray, triangles: IndexArray) -> FloatArray:
+    """Average area-weighted face normals onto vertices."""
+    corners = positions[triangles]
+    face_normals = np.cross(
+        corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+    )
+    normals = np.zeros_like(positions)
+    for column in range(3):
+        np.add.at(normals, triangles[:, column], face_normals)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return (normals / np.maximum(lengths, 1e-12)).astype(np.float32)
+
+
+def parse_obj(path: Path) -> ObjMesh:
+    """Parse an OBJ file into a deduplicated, triangulated mesh."""
+    try:
+        with (
+            path.open("rb") as obj_file,
+            mmap.mmap(obj_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            # One copy out of the map; NumPy views must not outlive it.
+            buffer = np.frombuffer(mapped, dtype=np.uint8).copy()
+    except OSError as error:
+        msg = f"cannot read {path}: {error}"
+        raise ObjImportError(msg) from error
+
+    table = _classify_lines(buffer)
+    positions = _parse_floats(buffer, table, LINE_POSITION, 3)
+    texcoords = _parse_floats(buffer, table, LINE_TEXCOORD, 2)
+    normals = _parse_floats(buffer, table, LINE_NORMAL, 3)
+    if positions.size == 0:
+        msg = f"{path} has no vertex positions"
+        raise ObjImportError(msg)
+
+    face_lines, counts, corners = _parse_faces(buffer, table)
+    corners = _resolve_indices(corners, np.repeat(face_lines, counts), table)
+    limits = (positions.shape[0], texcoords.shape[0], normals.shape[0])
+    for column, limit in enumerate(limits):
+        if limit == 0:
+            corners[:, column] = 0
+        elif corners[:, column].min() < 0 or corners[:, column].max() >= limit:
+            msg = f"{path} has face indices outside the declared records"
+            raise ObjImportError(msg)
+
+    # One output vertex per distinct position/texcoord/normal triple; packing
+    # the triple into one integer key keeps the dedup a flat sort.
+    radix = np.array([max(limit, 1) for limit in limits], dtype=np.int64)
+    keys = (corners[:, 0] * radix[1] + corners[:, 1]) * radix[2] + corners[:, 2]
+    _, first_corner, corner_vertex = np.unique(
+        keys,
+        return_index=True,
+        return_inverse=True,
+    )
+    unique_corners = corners[first_corner]
+    triangles = corner_vertex.reshape(-1)[_fan_triangles(counts)]
+    polygon_of_triangle = np.repeat(np.arange(counts.size), counts - 2)
+
+    vertex_positions = positions[unique_corners[:, 0]]
+    vertex_texcoords = (
+        texcoords[unique_corners[:, 1]]
+        if texcoords.size
+        else np.zeros((unique_corners.shape[0], 2), dtype=np.float32)
+    )
+    vertex_normals = (
+        normals[unique_corners[:, 2]]
+        if normals.size
+        else _smooth_normals(vertex_positions, triangles)
+    )
+
+    material_ids, group_ids, material_names, group_names, library = _statement_ids(
+        buffer,
+        table,
+        face_lines,
+    )
+    return ObjMesh(
+        positions=vertex_positions,
+        normals=vertex_normals,
+        texcoords=vertex_texcoords,
+        triangles=triangles.astype(np.uint32),
+        triangle_materials=material_ids[polygon_of_triangle],
+        triangle_groups=group_ids[polygon_of_triangle],
+        material_names=tuple(material_names),
+        group_names=tuple(group_names),
+        material_library=library,
+        bounds_min=vertex_positions.min(axis=0),
+        bounds_max=vertex_positions.max(axis=0),
+    )
+
+
+def _color(values: list[bytes]) -> tuple[float, float, float]:
+    """Parse an MTL colour statement's three components."""
+    red, green, blue = (float(value) for value in values[:RGB_COMPONENTS])
+    return (red, green, blue)
+
+
+def parse_mtl(path: Path) -> dict[str, ObjMaterial]:
+    """Parse the material statements of an MTL library."""
+    try:
+        lines = path.read_bytes().splitlines()
+    except OSError as error:
+        msg = f"cannot read {path}: {error}"
+        raise ObjImportError(msg) from error
+
+    materials: dict[str, ObjMaterial] = {}
+    current: ObjMaterial | None = None
+    for line_number, raw_line in enumerate(lines, start=1):
+        parts = raw_line.split()
+        if not parts or parts[0].startswith(b"#"):
+            continue
+        keyword, values = parts[0], parts[1:]
+        try:
+            if keyword == b"newmtl" and values:
+                current = ObjMaterial(name=values[0].decode("utf-8", "replace"))
+            elif current is None:
+                continue
+            elif keyword == b"Kd" and len(values) >= RGB_COMPONENTS:
+                current = replace(current, diffuse=_color(values))
+            elif keyword == b"Ks" and len(values) >= RGB_COMPONENTS:
+                current = replace(current, specular=_color(values))
+            elif keyword == b"Ns" and values:
+                current = replace(current, shininess=float(values[0]))
+            elif keyword == b"map_Kd" and values:
+                texture_name = values[-1].decode("utf-8", "replace")
+                current = replace(current, diffuse_map=path.parent / texture_name)
+            else:
+                continue
+        except ValueError as error:
+            msg = f"{path}:{line_number}: malformed number in {keyword.decode()!r}"
+            raise ObjImportError(msg) from error
+        materials[current.name] = current
+    return materials
+
+
+def normalize_mesh(mesh: ObjMesh, target_length: float) -> ObjMesh:
+    """Centre the mesh on x/z, rest it on y=0, and scale its length."""
+    size = mesh.bounds_max - mesh.bounds_min
+    base_length = float(max(size[0], size[2]))
+    if base_length <= 0.0:
+        return mesh
+
+    scale = np.float32(target_length / base_length)
+    origin = np.array(
+        [
+            mesh.bounds_min[0] + size[0] * 0.5,
+            mesh.bounds_min[1],
+            mesh.bounds_min[2] + size[2] * 0.5,
+        ],
+        dtype=np.float32,
+    )
+    return replace(
+        mesh,
+        positions=(mesh.positions - origin) * scale,
+        bounds_min=(mesh.bounds_min - origin) * scale,
+        bounds_max=(mesh.bounds_max - origin) * scale,
+    )
+
+
+def reverse_winding(mesh: ObjMesh) -> ObjMesh:
+    """Flip triangle winding for assets exported with inverted faces."""
+    return replace(mesh, triangles=np.ascontiguousarray(mesh.triangles[:, ::-1]))
+
+
+def _wheel_format() -> GeomVertexFormat:
+    """Return the v3n3t2 format plus a second array with the wheel column."""
+    wheel_array = GeomVertexArrayFormat()
+    wheel_array.addColumn(
+        InternalName.make(WHEEL_COLUMN),
+        1,
+        Geom.NT_float32,
+        Geom.C_other,
+    )
+    vertex_format = GeomVertexFormat(GeomVertexFormat.getV3n3t2())
+    vertex_format.addArray(wheel_array)
+    return GeomVertexFormat.registerFormat(vertex_format)
+
+
+def _vertex_data(
+    mesh: ObjMesh,
+    name: str,
+    wheels: NDArray[np.float32] | None = None,
+) -> GeomVertexData:
+    """Write positions, normals, and texcoords into one interleaved buffer.
+
+    ``wheels`` adds a per-vertex ``WHEEL_COLUMN`` in a second array.
+    """
+    vertex_count = mesh.positions.shape[0]
+    interleaved = np.empty((vertex_count, 8), dtype=np.float32)
+    interleaved[:, 0:3] = mesh.positions
+    interleaved[:, 3:6] = mesh.normals
+    interleaved[:, 6:8] = mesh.texcoords
+
+    vertex_format = GeomVertexFormat.getV3n3t2() if wheels is None else _wheel_format()
+    vertex_data = GeomVertexData(name, vertex_format, Geom.UHStatic)
+    vertex_data.uncleanSetNumRows(vertex_count)
+    memoryview(vertex_data.modifyArray(0)).cast("B")[:] = interleaved.tobytes()
+    if wheels is not None:
+        column = np.ascontiguousarray(wheels, dtype=np.float32)
+        memoryview(vertex_data.modifyArray(1)).cast("B")[:] = column.tobytes()
+    return vertex_data
+
+
+def _triangles(indices: NDArray[np.uint32]) -> GeomTriangles:
+    """Create an indexed triangle primitive from a flat uint32 index array."""
+    primitive = GeomTriangles(Geom.UHStatic)
+    primitive.setIndexType(GeomEnums.NT_uint32)
+    index_array = primitive.modifyVertices()
+    index_array.uncleanSetNumRows(indices.size)
+    memoryview(index_array).cast("B")[:] = indices.tobytes()
+    return primitive
+
+
+def _material_state(node_path: NodePath, material: ObjMaterial) -> None:
+    """Apply an MTL material (and diffuse texture if present) to a node."""
+    panda_material = Material(material.name)
+    panda_material.setDiffuse((*material.diffuse, 1.0))
+    panda_material.setSpecular((*material.specular, 1.0))
+    panda_material.setShininess(material.shininess)
+    node_path.setMaterial(panda_material)
+    if material.diffuse_map is not None and material.diffuse_map.exists():
+        texture: Texture = TexturePool.loadTexture(
+            Filename.fromOsSpecific(str(material.diffuse_map)),
+        )
+        node_path.setTexture(texture)
+
+
+def build_obj_node(
+    mesh: ObjMesh,
+    name: str,
+    materials: dict[str, ObjMaterial] | None = None,
+    wheels: NDArray[np.float32] | None = None,
+) -> NodePath:
+    """Build a node with one geom per material sharing one vertex buffer.
+
+    ``wheels`` holds one ``WHEEL_COLUMN`` value per mesh vertex.
+    """
+    vertex_data = _vertex_data(mesh, name, wheels)
+    root = NodePath(name)
+    for material_id, material_name in enumerate(mesh.material_names):
+        selected = mesh.triangles[mesh.triangle_materials == material_id]
+        if selected.size == 0:
+            continue
+        geom = Geom(vertex_data)
+        geom.addPrimitive(_triangles(selected.reshape(-1)))
+        geom_node = GeomNode(f"{name}_{material_name}")
+        geom_node.addGeom(geom)
+        geom_path = root.attachNewNode(geom_node)
+        material = (materials or {}).get(material_name)
+        if material is not None:
+            _material_state(geom_path, material)
+    return root
+
+
+def load_obj_mesh(
+    path: Path,
+    target_length: float | None = None,
+    *,
+    flip_winding: bool = False,
+) -> tuple[ObjMesh, dict[str, ObjMaterial]]:
+    """Parse and normalize an OBJ and read the materials of its MTL library."""
+    mesh = parse_obj(path)
+    if target_length is not None:
+        mesh = normalize_mesh(mesh, target_length)
+    if flip_winding:
+        mesh = reverse_winding(mesh)
+
+    materials: dict[str, ObjMaterial] = {}
+    if mesh.material_library is not None:
+        library_path = path.parent / mesh.material_library
+        if library_path.exists():
+            materials = parse_mtl(library_path)
+    return mesh, materials
+
+
+def load_obj(
+    path: Path,
+    target_length: float | None = None,
+    *,
+    flip_winding: bool = False,
+) -> NodePath:
+    """Import an OBJ (and its MTL library) as a ready-to-render node."""
+    mesh, materials = load_obj_mesh(
+        path,
+        target_length,
+        flip_winding=flip_winding,
+    )
+    return build_obj_node(mesh, path.stem, materials)
@@ -0,0 +1,282 @@
+"""Pooled impact particles: dust and sparks simulated as arrays.
+
+Each emitter type owns a fixed-capacity ``ParticlePool`` (positions,
+velocities, and ages in NumPy arrays) and one ``ParticleBatch``, a single
+dynamic point geom that draws every live particle of that type as a
+perspective-sized point sprite. Emitting writes into the pool as a ring
+buffer, so a burst of hundreds of impacts overwrites the oldest particles
+instead of allocating entities, and a frame costs one vectorized step plus
+one vertex upload per emitter type regardless of how many impacts occurred.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from panda3d.core import (
+    Geom,
+    GeomNode,
+    GeomPoints,
+    GeomVertexArrayFormat,
+    GeomVertexData,
+    GeomVertexFormat,
+    NodePath,
+    OmniBoundingVolume,
+    TransparencyAttrib,
+)
+
+from .culling import SHADOW_CAMERA_MASK
+from .vehicle import flat_ground
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .vehicle import GroundSampler
+
+type FloatArray = NDArray[np.float64]
+
+# Impacts at or above this player speed (m/s) throw sparks as well as dust.
+SPARK_MIN_SPEED = 7.0
+# Player speed (m/s) at which particles leave at their emitter's base speed.
+REFERENCE_IMPACT_SPEED = 10.0
+NORMALIZE_EPSILON = 1e-6
+PARTICLE_FORMAT = GeomVertexFormat.registerFormat(
+    GeomVertexFormat(
+        GeomVertexArrayFormat(
+            "vertex",
+            3,
+            Geom.NT_float32,
+            Geom.C_point,
+            "color",
+            4,
+            Geom.NT_float32,
+            Geom.C_color,
+        ),
+    ),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class EmitterType:
+    """How one kind of particle is emitted, moves, and looks."""
+
+    name: str
+    burst: int
+    lifetime: float
+    speed: tuple[float, float]
+    # Random offset added to the unit emit direction before normalizing.
+    spread: float
+    lift: float
+    gravity: float
+    drag: float
+    bounce: float
+    size: float
+    color: tuple[float, float, float, float]
+
+
+DUST = EmitterType(
+    name="dust",
+    burst=10,
+    lifetime=0.9,
+    speed=(1.0, 3.0),
+    spread=0.9,
+    lift=0.6,
+    gravity=1.5,
+    drag=2.5,
+    bounce=0.0,
+    size=0.35,
+    color=(0.62, 0.58, 0.52, 0.55),
+)
+SPARKS = EmitterType(
+    name="sparks",
+    burst=14,
+    lifetime=0.45,
+    speed=(5.0, 11.0),
+    spread=0.6,
+    lift=0.8,
+    gravity=14.0,
+    drag=0.4,
+    bounce=0.35,
+    size=0.07,
+    color=(1.0, 0.78, 0.3, 1.0),
+)
+
+
+class ParticlePool:
+    """Fixed-capacity particle arrays for one emitter type, used as a ring."""
+
+    def __init__(self, emitter: EmitterType, capacity: int, seed: int = 0) -> None:
+        """Allocate every particle up front; all start dead."""
+        self.emitter = emitter
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 3))
+        self.velocity = np.zeros((capacity, 3))
+        self.age = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self._cursor = 0
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def alive(self) -> NDArray[np.bool_]:
+        """Return which slots hold a live particle."""
+        return self.age < self.lifetime
+
+    @property
+    def alive_count(self) -> int:
+        """Return how many particles are live."""
+        return int(np.count_nonzero(self.alive))
+
+    def emit(
+        self,
+        origins: FloatArray,
+        directions: FloatArray,
+        strength: float = 1.0,
+    ) -> int:
+        """Emit one burst per origin around its direction; return slots used.
+
+        ``strength`` scales launch speed. When the bursts outnumber the pool,
+        only the last ``capacity`` particles are kept.
+        """
+        emitter = self.emitter
+        count = origins.shape[0] * emitter.burst
+        if count == 0 or self.capacity == 0:
+            return 0
+
+        rng = self._rng
+        source = np.repeat(np.arange(origins.shape[0]), emitter.burst)[-self.capacity :]
+        count = source.size
+        heading = directions[source] + rng.uniform(
+            -emitter.spread,
+            emitter.spread,
+            (count, 3),
+        )
+        heading[:, 1] += emitter.lift
+        heading /= np.maximum(
+            np.linalg.norm(heading, axis=1),
+            NORMALIZE_EPSILON,
+        )[:, None]
+        speed = rng.uniform(*emitter.speed, count) * strength
+
+        slots = (self._cursor + np.arange(count)) % self.capacity
+        self._cursor = int((self._cursor + count) % self.capacity)
+        self.position[slots] = origins[source]
+        self.velocity[slots] = heading * speed[:, None]
+        self.age[slots] = 0.0
+        self.lifetime[slots] = emitter.lifetime * rng.uniform(0.6, 1.0, count)
+        return count
+
+    def step(self, dt: float, ground: GroundSampler = flat_ground) -> None:
+        """Advance live particles by ``dt``, bouncing or settling on the ground."""
+        live = np.flatnonzero(self.alive)
+        if live.size == 0:
+            return
+
+        emitter = self.emitter
+        velocity = self.velocity[live]
+        velocity[:, 1] -= emitter.gravity * dt
+        velocity *= np.exp(-emitter.drag * dt)
+        position = self.position[live] + velocity * dt
+        floor = ground(position[:, 0], position[:, 2])
+        below = position[:, 1] < floor
+        position[below, 1] = floor[below]
+        velocity[below, 1] = -velocity[below, 1] * emitter.bounce
+        velocity[below, 0::2] *= 0.5
+        self.position[live] = position
+        self.velocity[live] = velocity
+        self.age[live] += dt
+
+
+class ParticleBatch:
+    """One dynamic point geom drawing every live particle of a pool."""
+
+    def __init__(self, pool: ParticlePool, parent: NodePath) -> None:
+        """Create the geom under ``parent`` sized for the whole pool."""
+        self.pool = pool
+        emitter = pool.emitter
+        vertex_data = GeomVertexData(emitter.name, PARTICLE_FORMAT, Geom.UHDynamic)
+        vertex_data.uncleanSetNumRows(pool.capacity)
+        points = GeomPoints(Geom.UHDynamic)
+        points.setNonindexedVertices(0, 0)
+        geom = Geom(vertex_data)
+        geom.addPrimitive(points)
+        self._geom_node = GeomNode(f"particles_{emitter.name}")
+        self._geom_node.addGeom(geom)
+        # Particles stay near the player; skip recomputing their bounds.
+        self._geom_node.setBounds(OmniBoundingVolume())
+        self._geom_node.setFinal(True)
+        self._rows = np.empty((pool.capacity, 7), dtype=np.float32)
+        self._rows[:, 3:6] = emitter.color[:3]
+
+        self.node = parent.attachNewNode(self._geom_node)
+        self.node.setRenderModeThickness(emitter.size)
+        self.node.setRenderModePerspective(True)
+        self.node.setTransparency(TransparencyAttrib.M_alpha)
+        self.node.setDepthWrite(False)
+        self.node.setLightOff(1)
+        self.node.setShaderOff(1)
+        self.node.hide(SHADOW_CAMERA_MASK)
+
+    def sync(self) -> int:
+        """Upload live particles, fading with age; return how many are drawn."""
+        pool = self.pool
+        live = np.flatnonzero(pool.alive)
+        count = live.size
+        rows = self._rows[:count]
+        rows[:, 0:3] = pool.position[live]
+        rows[:, 6] = pool.emitter.color[3] * (
+            1.0 - pool.age[live] / pool.lifetime[live]
+        )
+
+        geom = self._geom_node.modifyGeom(0)
+        if count:
+            vertex_array = geom.modifyVertexData().modifyArray(0)
+            memoryview(vertex_array).cast("B")[: rows.nbytes] = rows.tobytes()
+        geom.modifyPrimitive(0).setNonindexedVertices(0, count)
+        return int(count)
+
+
+class ImpactEffects:
+    """Dust on every player impact, plus sparks on fast ones."""
+
+    def __init__(
+        self,
+        parent: NodePath,
+        dust_capacity: int,
+        spark_capacity: int,
+    ) -> None:
+        """Create one pool and point batch per emitter type."""
+        self.dust = ParticleBatch(ParticlePool(DUST, dust_capacity, seed=1), parent)
+        self.sparks = ParticleBatch(
+            ParticlePool(SPARKS, spark_capacity, seed=2),
+            parent,
+        )
+
+    def emit_impacts(
+        self,
+        prop_positions: FloatArray,
+        prop_radii: FloatArray,
+        player_position: FloatArray,
+        player_speed: float,
+    ) -> None:
+        """Emit from each hit prop's surface, facing back toward the player."""
+        if prop_positions.shape[0] == 0:
+            return
+        normals = player_position - prop_positions
+        normals[:, 1] = 0.0
+        normals /= np.maximum(
+            np.linalg.norm(normals, axis=1),
+            NORMALIZE_EPSILON,
+        )[:, None]
+        contacts = prop_positions + normals * prop_radii[:, None]
+        strength = float(np.clip(player_speed / REFERENCE_IMPACT_SPEED, 0.3, 1.5))
+        self.dust.pool.emit(contacts, normals, strength)
+        if player_speed >= SPARK_MIN_SPEED:
+            self.sparks.pool.emit(contacts, normals, strength)
+
+    def update(self, dt: float, ground: GroundSampler = flat_ground) -> int:
+        """Step and redraw every emitter type; return live particle count."""
+        drawn = 0
+        for batch in (self.dust, self.sparks):
+            batch.pool.step(dt, ground)
+            drawn += batch.sync()
+        return drawn
@@ -0,0 +1,245 @@
+"""Batched prop physics for player impacts, gravity, and ground contact.
+
+Props are stored as arrays and stepped together. Props that come to rest on
+the ground fall asleep and are skipped until the player hits them again, and
+a ``dirty`` mask records which bodies moved since their entity was last
+updated so render write-back can be deferred for props nobody can see. A
+separate ``moved`` mask records which bodies moved since the spatial indexes
+were last told, so a prop that stays dirty while culled is indexed once.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .terrain import Heightfield
+
+type FloatArray = NDArray[np.float64]
+type BoolArray = NDArray[np.bool_]
+
+GRAVITY = 9.81
+CAR_IMPACT_RADIUS = 1.75
+BOUNCE_DAMPING = 0.35
+MIN_BOUNCE_SPEED = 0.25
+MIN_IMPACT_SPEED = 0.1
+MIN_IMPACT_LIFT = 1.6
+IMPACT_PUSH_OUT = 0.4
+IMPACT_TRANSFER = 0.8
+NORMALIZE_EPSILON = 0.0001
+GROUND_EPSILON = 0.001
+# Friction was tuned as a per-frame factor at 60 FPS.
+GROUND_FRICTION = 0.97
+FRICTION_REFERENCE_RATE = 60.0
+SLEEP_SPEED = 0.05
+# Slow props stay put on slopes up to about 25 degrees.
+STATIC_FRICTION_NORMAL_Y = 0.9
+SLEEP_STEPS = 30
+
+
+@dataclass(slots=True)
+class PropBodies:
+    """Structure-of-arrays state for every dynamic prop in the world."""
+
+    position: FloatArray
+    velocity: FloatArray
+    radius: FloatArray
+    mass: FloatArray
+    sleeping: BoolArray
+    rest_steps: NDArray[np.int32]
+    dirty: BoolArray
+    moved: BoolArray
+
+    @property
+    def count(self) -> int:
+        """Return the number of bodies."""
+        return int(self.radius.shape[0])
+
+
+def create_prop_bodies(
+    positions: FloatArray,
+    radii: FloatArray,
+    masses: FloatArray,
+) -> PropBodies:
+    """Create awake, motionless bodies so props settle before sleeping."""
+    count = int(radii.shape[0])
+    return PropBodies(
+        position=np.array(positions, dtype=np.float64).reshape(count, 3),
+        velocity=np.zeros((count, 3)),
+        radius=np.array(radii, dtype=np.float64),
+        mass=np.array(masses, dtype=np.float64),
+        sleeping=np.zeros(count, dtype=np.bool_),
+        rest_steps=np.zeros(count, dtype=np.int32),
+        dirty=np.zeros(count, dtype=np.bool_),
+        moved=np.zeros(count, dtype=np.bool_),
+    )
+
+
+def carry_prop_bodies(
+    source: PropBodies,
+    target: PropBodies,
+    source_rows: NDArray[np.intp],
+    target_rows: NDArray[np.intp],
+) -> None:
+    """Copy the motion state of ``source_rows`` into ``target_rows``.
+
+    Position, velocity, sleeping and rest steps are copied, so a prop keeps
+    moving (or stays asleep) when its bodies are rebuilt. Radius and mass
+    stay as ``target`` computed them.
+    """
+    target.position[target_rows] = source.position[source_rows]
+    target.velocity[target_rows] = source.velocity[source_rows]
+    target.sleeping[target_rows] = source.sleeping[source_rows]
+    target.rest_steps[target_rows] = source.rest_steps[source_rows]
+
+
+def apply_player_impacts(
+    bodies: PropBodies,
+    player_position: FloatArray,
+    player_velocity: FloatArray,
+    player_forward: FloatArray,
+    candidates: NDArray[np.intp] | None = None,
+) -> NDArray[np.intp]:
+    """Push props the player drives into and return the hit body indices.
+
+    ``candidates`` limits the test to bodies a broad phase (such as a scene
+    query around the player) reported as nearby; by default every body is
+    tested.
+    """
+    player_speed = float(np.linalg.norm(player_velocity))
+    if player_speed <= MIN_IMPACT_SPEED or bodies.count == 0:
+        return np.empty(0, dtype=np.intp)
+
+    indices = (
+        np.arange(bodies.count, dtype=np.intp)
+        if candidates is None
+        else np.asarray(candidates, dtype=np.intp)
+    )
+    to_prop = bodies.position[indices] - player_position
+    distance = np.linalg.norm(to_prop, axis=1)
+    impact_radius = CAR_IMPACT_RADIUS + bodies.radius[indices]
+    close = np.flatnonzero(distance < impact_radius)
+    hit = indices[close]
+    if hit.size == 0:
+        return hit
+
+    hit_distance = distance[close]
+    push_dir = np.where(
+        (hit_distance > NORMALIZE_EPSILON)[:, None],
+        to_prop[close] / np.maximum(hit_distance, NORMALIZE_EPSILON)[:, None],
+        player_forward,
+    )
+    penetration = impact_radius[close] - hit_distance
+    bodies.position[hit] += push_dir * (penetration * IMPACT_PUSH_OUT)[:, None]
+    bodies.velocity[hit] += (
+        push_dir * (player_speed * IMPACT_TRANSFER / bodies.mass[hit])[:, None]
+    )
+    bodies.velocity[hit, 1] = np.maximum(bodies.velocity[hit, 1], MIN_IMPACT_LIFT)
+    bodies.sleeping[hit] = False
+    bodies.rest_steps[hit] = 0
+    bodies.dirty[hit] = True
+    bodies.moved[hit] = True
+    return hit
+
+
+def resolve_ground_contacts(
+    position: FloatArray,
+    velocity: FloatArray,
+    radius: FloatArray,
+    ground_y: FloatArray,
+    ground_normal: FloatArray,
+) -> BoolArray:
+    """Lift sunk props onto the ground, bounce them, and return contacts.
+
+    Positions and velocities are updated in place. Bounces reflect the
+    velocity along the ground normal, so flat ground reduces to clamping y
+    and damping a downward ``velocity_y``.
+    """
+    # A sphere resting on a slope sits radius / normal_y above the ground.
+    floor_y = ground_y + radius / ground_normal[:, 1]
+    below = position[:, 1] < floor_y
+    position[:, 1] = np.where(below, floor_y, position[:, 1])
+
+    into_ground = np.einsum("ij,ij->i", velocity, ground_normal)
+    bounce = -into_ground * BOUNCE_DAMPING
+    bounce = np.where(np.abs(bounce) < MIN_BOUNCE_SPEED, 0.0, bounce)
+    impact = below & (into_ground < 0.0)
+    velocity += np.where(impact, bounce - into_ground, 0.0)[:, None] * ground_normal
+    return position[:, 1] <= floor_y + GROUND_EPSILON
+
+
+def _apply_ground_friction(
+    velocity: FloatArray,
+    ground_normal: FloatArray,
+    on_ground: BoolArray,
+    dt: float,
+) -> None:
+    """Slow sliding along the ground and hold slow props on gentle slopes."""
+    along = np.einsum("ij,ij->i", velocity, ground_normal)
+    tangential = velocity - along[:, None] * ground_normal
+    sliding_speed = np.linalg.norm(tangential, axis=1)
+    friction = np.where(
+        on_ground,
+        GROUND_FRICTION ** (dt * FRICTION_REFERENCE_RATE),
+        1.0,
+    )
+    holds = (
+        on_ground
+        & (ground_normal[:, 1] >= STATIC_FRICTION_NORMAL_Y)
+        & (sliding_speed < SLEEP_SPEED)
+    )
+    friction = np.where(holds, 0.0, friction)
+    velocity[:] = along[:, None] * ground_normal + tangential * friction[:, None]
+
+
+def step_prop_bodies(
+    bodies: PropBodies,
+    dt: float,
+    terrain: Heightfield | None = None,
+) -> None:
+    """Integrate awake props by one step and put resting props to sleep.
+
+    Without a terrain the ground is the flat plane y=0; with one, every awake
+    body samples its height and normal in a single batched call.
+    """
+    if dt <= 0.0:
+        return
+
+    awake = np.flatnonzero(~bodies.sleeping)
+    if awake.size == 0:
+        return
+
+    position = bodies.position[awake]
+    velocity = bodies.velocity[awake]
+    radius = bodies.radius[awake]
+
+    velocity[:, 1] -= GRAVITY * dt
+    position += velocity * dt
+    if terrain is None:
+        ground_y = np.zeros(awake.size)
+        ground_normal = np.zeros((awake.size, 3))
+        ground_normal[:, 1] = 1.0
+    else:
+        ground_y, ground_normal = terrain.sample(position[:, 0], position[:, 2])
+    on_ground = resolve_ground_contacts(
+        position,
+        velocity,
+        radius,
+        ground_y,
+        ground_normal,
+    )
+    _apply_ground_friction(velocity, ground_normal, on_ground, dt)
+
+    at_rest = on_ground & (np.linalg.norm(velocity, axis=1) < SLEEP_SPEED)
+    rest_steps = np.where(at_rest, bodies.rest_steps[awake] + 1, 0)
+    falling_asleep = rest_steps >= SLEEP_STEPS
+    velocity[falling_asleep] = 0.0
+
+    bodies.position[awake] = position
+    bodies.velocity[awake] = velocity
+    bodies.rest_steps[awake] = rest_steps
+    bodies.sleeping[awake] = falling_asleep
+    bodies.dirty[awake] = True
+    bodies.moved[awake] = True
@@ -0,0 +1,84 @@
+"""Frame timing, named counters, and logged events for runtime profiling."""
+
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRAME_WINDOW = 120
+DEFAULT_EVENT_HISTORY = 8
+DEFAULT_STARTUP_WINDOW = 5.0
+
+
+@dataclass(slots=True)
+class Profiler:
+    """Rolling frame times plus counters and events shown on the overlay.
+
+    The longest frame of the first ``startup_window`` seconds is kept apart
+    from the rolling window, so start-up hitches stay measurable afterwards.
+    """
+
+    frame_window: int = DEFAULT_FRAME_WINDOW
+    startup_window: float = DEFAULT_STARTUP_WINDOW
+    counters: dict[str, float] = field(default_factory=dict)
+    frame_times: deque[float] = field(init=False)
+    startup_elapsed: float = field(default=0.0, init=False)
+    startup_worst: float = field(default=0.0, init=False)
+    events: deque[str] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_EVENT_HISTORY),
+    )
+
+    def __post_init__(self) -> None:
+        """Size the frame-time ring buffer from the configured window."""
+        self.frame_times = deque(maxlen=self.frame_window)
+
+    def record_frame(self, dt: float) -> None:
+        """Record one frame's duration in seconds."""
+        if dt <= 0.0:
+            return
+        self.frame_times.append(dt)
+        if self.startup_elapsed >= self.startup_window:
+            return
+        self.startup_worst = max(self.startup_worst, dt)
+        self.startup_elapsed += dt
+        if self.startup_elapsed >= self.startup_window:
+            worst_ms = self.startup_worst_frame_ms()
+            self.set_counter("startup_worst_ms", round(worst_ms, 2))
+            self.event(
+                f"longest frame in first {self.startup_window:g} s: {worst_ms:.1f} ms",
+            )
+
+    def set_counter(self, name: str, value: float) -> None:
+        """Store the latest value of a named counter."""
+        self.counters[name] = value
+
+    def event(self, message: str) -> None:
+        """Log a notable runtime change and keep it for the overlay."""
+        logger.info("profiler: %s", message)
+        self.events.append(message)
+
+    def mean_frame_ms(self) -> float:
+        """Return the rolling mean frame time in milliseconds."""
+        if not self.frame_times:
+            return 0.0
+        return 1000.0 * sum(self.frame_times) / len(self.frame_times)
+
+    def worst_frame_ms(self) -> float:
+        """Return the longest frame in the rolling window in milliseconds."""
+        return 1000.0 * max(self.frame_times, default=0.0)
+
+    def startup_worst_frame_ms(self) -> float:
+        """Return the longest frame seen so far in the start-up window."""
+        return 1000.0 * self.startup_worst
+
+    def summary_lines(self) -> list[str]:
+        """Format frame timing, counters, and recent events for display."""
+        mean_ms = self.mean_frame_ms()
+        worst_ms = self.worst_frame_ms()
+        lines = [f"frame: {mean_ms:.2f} ms avg, {worst_ms:.2f} ms worst"]
+        lines.extend(
+            f"{name}: {value:g}" for name, value in sorted(self.counters.items())
+        )
+        lines.extend(f"> {message}" for message in self.events)
+        return lines
@@ -1,11 +1,16 @@
 """Ursina runtime bootstrap functions."""
 
+import gc
 import importlib
-from contextlib import suppress
+import logging
+import time
+import tracemalloc
 from dataclasses import dataclass
+from math import degrees, radians
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
+import numpy as np
 import ursina
 import ursina.color as color_module
 import ursina.shaders as ursina_shaders
@@ -19,21 +24,136 @@ from ursina import (
     Vec3,
     application,
     camera,
+    destroy,
     mouse,
     scene,
     window,
 )
 from ursina.main import Ursina
-
-from .config import CameraSettings, GameSettings, MovementSettings
-from .scene import EntityBlueprint, starter_scene_blueprints
+from ursina.shader import imported_shaders
+
+from .checkpoint import (
+    CheckpointError,
+    WorldCheckpoint,
+    capture_prop_bodies,
+    load_checkpoint,
+    pack_vehicle_state,
+    restore_prop_bodies,
+    save_checkpoint,
+    unpack_vehicle_state,
+)
+from .clock import FixedStepClock
+from .config import (
+    CameraSettings,
+    CheckpointSettings,
+    CullingSettings,
+    GameSettings,
+    MovementSettings,
+    PhysicsSettings,
+    ProfilingSettings,
+    RenderSettings,
+    TelemetrySettings,
+    TerrainSettings,
+    VehicleSettings,
+)
+from .culling import (
+    SHADOW_CAMERA_MASK,
+    CameraFrustum,
+    CullingManager,
+    ShadowCasterCuller,
+    build_frustum,
+    frustum_from_planes,
+)
+from .entitypool import EntityPool
+from .governor import GOVERNOR_LEVELS, FrameBudgetGovernor, resolve_quality
+from .hotreload import (
+    SourceWatcher,
+    diff_blueprints,
+    reload_blueprints,
+    scene_source_path,
+)
+from .materials import MaterialRegistry, frame_state_counters
+from .memory import (
+    MemoryReport,
+    measure_memory,
+    start_tracing,
+    steady_state_problems,
+    top_growth,
+)
+from .netcode import InputRecorder, SimulationClient
+from .objimport import ObjImportError
+from .particles import ImpactEffects
+from .physics import (
+    BOUNCE_DAMPING,
+    CAR_IMPACT_RADIUS,
+    MIN_BOUNCE_SPEED,
+    PropBodies,
+    apply_player_impacts,
+    carry_prop_bodies,
+    create_prop_bodies,
+    step_prop_bodies,
+)
+from .profiling import Profiler
+from .scene import (
+    EntityBlueprint,
+    blueprint_entity_name,
+    compute_prop_mass,
+    compute_prop_radius,
+    is_dynamic_prop,
+)
+from .scenequery import BoundingVolumeHierarchy, SceneQuery
+from .simthread import SimulationThread
+from .simulation import create_simulation, load_world
+from .telemetry import TelemetryExporter, create_telemetry_exporter
+from .terrain import Heightfield, build_terrain_node
+from .vehicle import (
+    CHASSIS_RIDE_HEIGHT,
+    FRONT_AXLE_DISTANCE,
+    REAR_AXLE_DISTANCE,
+    WHEEL_OFFSET_X,
+    WHEEL_OFFSETS,
+    GroundSampler,
+    VehicleInputs,
+    VehicleState,
+    compute_vehicle_inputs,
+    create_vehicle_inputs,
+    create_vehicle_state,
+    flat_ground,
+    step_vehicles,
+    wheel_world_positions,
+)
+from .warmup import use_shader_cache, warm_up_scene
+from .wheels import WHEEL_SHADER, WheelUniforms, load_wheeled_obj, wheel_uniforms
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from numpy.typing import NDArray
+    from panda3d.core import DirectionalLight as PandaDirectionalLight
+    from panda3d.core import GraphicsOutput
     from ursina.color import Color
 
+    from .hotreload import BlueprintDiff, IndexPairs
+
+logger = logging.getLogger(__name__)
 
 LIT_SHADER = cast("object", ursina_shaders.lit_with_shadows_shader)
-CAR_IMPACT_RADIUS = 1.75
+LIT_SHADER_NAME = "lit_with_shadows"
+# Shaders used by the world, the sky, and Ursina's default entities and UI.
+CACHED_SHADERS = (
+    ursina_shaders.lit_with_shadows_shader,
+    ursina_shaders.unlit_shader,
+    Entity.default_shader,
+    WHEEL_SHADER,
+)
+PROFILER_TOGGLE_KEY = "f3"
+# Ursina's development mode claims F5-F9 for its own hot reloader.
+CHECKPOINT_SAVE_KEY = "f2"
+CHECKPOINT_RESTORE_KEY = "f4"
+# Spawn/destroy cycles that fill caches before memory must hold steady.
+STRESS_WARMUP_CYCLES = 1
+# The steady-state check compares the first settled cycle with a later one.
+MIN_STRESS_CYCLES = STRESS_WARMUP_CYCLES + 2
 CAR_MODEL_FILE = (
     Path(__file__).resolve().parents[2] / "assets" / "De_Tomaso_P72_2020.obj"
 )
@@ -45,12 +165,8 @@ CAR_BASE_TEXTURE_FILE = (
 )
 CAR_BASE_TEXTURE_PATH = "assets/De_Tomaso_Textures/Detomasop72_Base_Color.png"
 CAR_TARGET_LENGTH = 4.8
-BOUNCE_DAMPING = 0.35
-MIN_BOUNCE_SPEED = 0.25
-MIN_IMPACT_SPEED = 0.1
-NORMALIZE_EPSILON = 0.0001
-GROUND_FRICTION = 0.97
 SCROLL_DIRECTION_BY_KEY = {"scroll up": 1, "scroll down": -1}
+MIN_OCCLUDED_CAMERA_DISTANCE = 0.5
 
 
 @dataclass(slots=True)
@@ -60,6 +176,7 @@ class OrbitControlState:
     yaw_angle: float
     pitch_angle: float
     camera_distance: float
+    view_distance: float | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -70,6 +187,36 @@ class OrbitRig:
     pitch_pivot: Entity
 
 
+@dataclass(slots=True)
+class PlayerVehicle:
+    """Single-vehicle dynamics batch that drives the player entity."""
+
+    state: VehicleState
+    inputs: VehicleInputs
+    clock: FixedStepClock
+    settings: VehicleSettings
+    height_offset: float
+    ground: GroundSampler = flat_ground
+    wheels: WheelUniforms | None = None
+
+
+@dataclass(slots=True)
+class PlayerControls:
+    """Orbit camera state and optional vehicle driven by player input."""
+
+    control_state: OrbitControlState
+    vehicle: PlayerVehicle | None = None
+
+
+@dataclass(slots=True)
+class ShadowRig:
+    """Shadow-casting sun light plus how often its shadow map is re-rendered."""
+
+    light: DirectionalLight
+    bounds: Entity
+    update_interval: int = 1
+
+
 @dataclass(slots=True)
 class DynamicProp:
     """Simple dynamic prop state for lightweight physics interactions."""
@@ -80,6 +227,32 @@ class DynamicProp:
     mass: float
 
 
+@dataclass(slots=True)
+class CarEntity:
+    """A car entity driven from vehicle state, plus its chassis offset."""
+
+    entity: Entity
+    height_offset: float
+
+
+@dataclass(slots=True)
+class SpawnedWorld:
+    """World entities in blueprint order plus their dynamic-prop subset."""
+
+    blueprints: tuple[EntityBlueprint, ...]
+    entities: list[Entity]
+    props: list[DynamicProp]
+    prop_entity_indices: list[int]
+    pool: EntityPool | None = None
+    shadow_casters: ShadowCasterCuller | None = None
+    materials: MaterialRegistry | None = None
+    # Set by the prop physics controller that simulates the props.
+    bodies: PropBodies | None = None
+    # Where that controller last saw the player, to derive its velocity; a
+    # teleport resets it so the jump does not register as an impact.
+    player_position: Vec3 | None = None
+
+
 def resolve_color(color_name: str) -> Color:
     """Resolve a color name from Ursina's built-in color palette."""
     return cast("Color", getattr(color_module, color_name, color_module.white))
@@ -88,7 +261,7 @@ def resolve_color(color_name: str) -> Color:
 def mark_lit_shadowed(entity: Entity) -> Entity:
     """Apply the project-default lit shader and shadow camera mask."""
     entity.shader = LIT_SHADER
-    entity.show(0b0001)
+    entity.show(SHADOW_CAMERA_MASK)
     return entity
 
 
@@ -110,22 +283,46 @@ def get_frame_dt() -> float:
     return cast("float", getattr(getattr(ursina, "time"), "dt", 0.0))  # noqa: B009
 
 
-def spawn_entity(blueprint: EntityBlueprint) -> Entity:
+def spawn_entity(
+    blueprint: EntityBlueprint,
+    materials: MaterialRegistry | None = None,
+) -> Entity:
     """Spawn one entity from a scene blueprint and return it."""
     # Stable names make runtime inspection in Ursina's entity list easier.
-    entity_name = (
-        f"world_{blueprint.model}_"
-        f"{round(blueprint.position.x)}_"
-        f"{round(blueprint.position.z)}"
-    )
-    entity = Entity(
-        name=entity_name,
-        model=blueprint.model,
-        color=resolve_color(blueprint.color_name),
-        scale=Vec3(blueprint.scale.x, blueprint.scale.y, blueprint.scale.z),
-        position=Vec3(blueprint.position.x, blueprint.position.y, blueprint.position.z),
+    entity_name = blueprint_entity_name(blueprint)
+    scale = Vec3(blueprint.scale.x, blueprint.scale.y, blueprint.scale.z)
+    position = Vec3(blueprint.position.x, blueprint.position.y, blueprint.position.z)
+    if materials is not None:
+        entity = materials.spawn(
+            entity_name,
+            blueprint.model,
+            blueprint.color_name,
+            resolve_color(blueprint.color_name),
+            scale=scale,
+            position=position,
+        )
+    else:
+        entity = mark_lit_shadowed(
+            Entity(
+                name=entity_name,
+                model=blueprint.model,
+                color=resolve_color(blueprint.color_name),
+                scale=scale,
+                position=position,
+            ),
+        )
+    if not blueprint.casts_shadow:
+        entity.hide(SHADOW_CAMERA_MASK)
+    return entity
+
+
+def create_material_registry() -> MaterialRegistry:
+    """Create the shared-material registry for the project-default shader."""
+    default_input = cast(
+        "dict[str, object]",
+        getattr(LIT_SHADER, "default_input", {}),
     )
-    return mark_lit_shadowed(entity)
+    return MaterialRegistry(LIT_SHADER, LIT_SHADER_NAME, default_input)
 
 
 def configure_window(settings: GameSettings) -> None:
@@ -166,7 +363,10 @@ def add_car_part(  # noqa: PLR0913
 
 def spawn_primitive_player() -> Entity:
     """Create a richer low-poly sports car as the player entity."""
-    car = Entity(name="player_car_primitive_root", position=Vec3(0.0, 0.48, 0.0))
+    car = Entity(
+        name="player_car_primitive_root",
+        position=Vec3(0.0, CHASSIS_RIDE_HEIGHT, 0.0),
+    )
 
     # Car body: base shell, mid shell, nose, rear deck.
     add_car_part(
@@ -331,8 +531,7 @@ def spawn_primitive_player() -> Entity:
     )
 
     # Wheels, hubs, and wheel bars.
-    wheel_offsets = ((-1.12, 1.55), (1.12, 1.55), (-1.12, -1.55), (1.12, -1.55))
-    for x_pos, z_pos in wheel_offsets:
+    for x_pos, z_pos in WHEEL_OFFSETS:
         wheel_name = wheel_label(x_pos, z_pos)
         add_car_part(
             parent=car,
@@ -362,70 +561,34 @@ def spawn_primitive_player() -> Entity:
     return car
 
 
-def normalize_loaded_car_model(model: object) -> None:
-    """Scale and center imported car mesh to a consistent gameplay size."""
-    get_tight_bounds = getattr(model, "getTightBounds", None)
-    set_scale = getattr(model, "setScale", None)
-    set_pos = getattr(model, "setPos", None)
-    if not callable(get_tight_bounds):
-        return
-    if not callable(set_scale) or not callable(set_pos):
-        return
-
-    bounds = cast("tuple[Vec3, Vec3] | None", get_tight_bounds())
-    if bounds is None:
-        return
-
-    min_point, max_point = bounds
-    size_x = float(max_point.x - min_point.x)
-    size_z = float(max_point.z - min_point.z)
-    base_length = max(size_x, size_z)
-    if base_length <= 0.0:
-        return
-
-    scale_factor = CAR_TARGET_LENGTH / base_length
-    set_scale(scale_factor)
-    set_pos(
-        -(float(min_point.x) + size_x * 0.5) * scale_factor,
-        -float(min_point.y) * scale_factor,
-        -(float(min_point.z) + size_z * 0.5) * scale_factor,
-    )
-
-
 def spawn_imported_player() -> Entity | None:
     """Try to spawn imported car model and return None on load failure."""
     if not CAR_MODEL_FILE.exists():
         return None
 
-    loader = getattr(getattr(application, "base", None), "loader", None)
-    if loader is None:
-        return None
-
-    with suppress(Exception):
-        model = loader.loadModel(str(CAR_MODEL_FILE))
-        is_empty_callable = getattr(model, "isEmpty", None)
-        is_empty = bool(is_empty_callable()) if callable(is_empty_callable) else False
-        if is_empty:
-            return None
-
+    try:
         # Imported OBJ has inverted winding in this asset pack.
-        panda3d_core = importlib.import_module("panda3d.core")
-        cull_face_attrib = getattr(panda3d_core, "CullFaceAttrib", None)
-        if cull_face_attrib is not None:
-            model.setAttrib(cull_face_attrib.makeReverse())
-
-        normalize_loaded_car_model(model)
-
-        car = Entity(
-            name="player_car_imported_root",
-            model=model,
-            position=Vec3(0.0, 0.0, 0.0),
+        model, wheels = load_wheeled_obj(
+            CAR_MODEL_FILE,
+            CAR_TARGET_LENGTH,
+            flip_winding=True,
         )
-        if CAR_BASE_TEXTURE_FILE.exists():
-            car.texture = CAR_BASE_TEXTURE_PATH
-        return mark_lit_shadowed(car)
+    except ObjImportError, OSError:
+        return None
 
-    return None
+    car = Entity(
+        name="player_car_imported_root",
+        model=model,
+        position=Vec3(0.0, 0.0, 0.0),
+    )
+    if CAR_BASE_TEXTURE_FILE.exists():
+        car.texture = CAR_BASE_TEXTURE_PATH
+    mark_lit_shadowed(car)
+    if wheels is not None:
+        # The wheels turn in the vertex shader, driven by vehicle state.
+        car.shader = WHEEL_SHADER
+        wheels.attach(car)
+    return car
 
 
 def spawn_player() -> Entity:
@@ -436,24 +599,16 @@ def spawn_player() -> Entity:
     return spawn_primitive_player()
 
 
-def compute_prop_mass(scale: Vec3) -> float:
-    """Approximate prop mass from visual volume."""
-    volume = max(0.1, float(scale.x) * float(scale.y) * float(scale.z))
-    return max(0.6, volume)
-
-
 def blueprint_to_dynamic_prop(
     entity: Entity,
     blueprint: EntityBlueprint,
 ) -> DynamicProp:
     """Create dynamic-physics state for a spawned scene entity."""
-    scale = Vec3(blueprint.scale.x, blueprint.scale.y, blueprint.scale.z)
-    radius = max(scale.x, scale.z) * 0.5
     return DynamicProp(
         entity=entity,
         velocity=Vec3(0.0, 0.0, 0.0),
-        radius=radius,
-        mass=compute_prop_mass(scale),
+        radius=compute_prop_radius(blueprint.scale),
+        mass=compute_prop_mass(blueprint.scale),
     )
 
 
@@ -483,8 +638,9 @@ def create_controls_hint() -> None:
     """Render controls help text."""
     Text(
         text=(
-            "Move: arrow keys (forward/back + strafe)\n"
-            "Turn: page up/down + mouse (captured)\n"
+            "Drive: up/down arrows (throttle, brake/reverse)\n"
+            "Steer: left/right arrows or page up/down\n"
+            "Look: mouse (captured)\n"
             "Zoom: mouse wheel"
         ),
         x=-0.86,
@@ -494,10 +650,14 @@ def create_controls_hint() -> None:
     )
 
 
-def configure_lighting(focus_entity: Entity) -> None:
+def configure_lighting(focus_entity: Entity, settings: RenderSettings) -> ShadowRig:
     """Create one shadow-casting sun light and stable local shadow bounds."""
     sun_direction = Vec3(0.8, -1.2, -0.5).normalized()
-    key_light = DirectionalLight(shadows=True, shadow_map_resolution=Vec2(8192, 8192))
+    resolution = settings.shadow_map_resolution
+    key_light = DirectionalLight(
+        shadows=True,
+        shadow_map_resolution=Vec2(resolution, resolution),
+    )
     key_light.color = color_module.white
     key_light.look_at(sun_direction)
 
@@ -505,9 +665,9 @@ def configure_lighting(focus_entity: Entity) -> None:
     ambient_light.color = color_module.rgba(0.22, 0.24, 0.28, 1.0)
 
     scene.set_shader_input("shadow_color", color_module.black66)
-    scene.set_shader_input("shadow_blur", 0.0008)
+    scene.set_shader_input("shadow_blur", settings.shadow_blur)
     scene.set_shader_input("shadow_bias", 0.0005)
-    scene.set_shader_input("shadow_samples", 3)
+    scene.set_shader_input("shadow_samples", settings.shadow_samples)
 
     shadow_bounds = Entity(
         name="shadow_bounds_focus",
@@ -519,13 +679,60 @@ def configure_lighting(focus_entity: Entity) -> None:
         unlit=True,
     )
     key_light.update_bounds(shadow_bounds)
+    shadow_rig = ShadowRig(light=key_light, bounds=shadow_bounds)
 
     shadow_controller = Entity(name="shadow_bounds_controller")
+    frame_index = 0
 
     def update_shadow_bounds() -> None:
-        key_light.update_bounds(shadow_bounds)
+        nonlocal frame_index
+
+        frame_index += 1
+        # Moving the shadow camera without re-rendering its map would shift
+        # stale shadows, so bounds only follow the player on render frames.
+        render_shadows = frame_index % shadow_rig.update_interval == 0
+        shadow_buffer = get_shadow_buffer(shadow_rig)
+        if shadow_buffer is not None:
+            shadow_buffer.setActive(render_shadows)
+        if render_shadows:
+            key_light.update_bounds(shadow_bounds)
 
     shadow_controller.update = update_shadow_bounds
+    return shadow_rig
+
+
+def get_panda_light(shadow_rig: ShadowRig) -> PandaDirectionalLight:
+    """Return the Panda3D light node wrapped by Ursina's DirectionalLight."""
+    # B009: getattr-with-constant; Ursina keeps the Panda3D node private.
+    return cast("PandaDirectionalLight", getattr(shadow_rig.light, "_light"))  # noqa: B009
+
+
+def get_shadow_buffer(shadow_rig: ShadowRig) -> GraphicsOutput | None:
+    """Return the sun's shadow-map buffer once Panda3D has created it."""
+    base = getattr(application, "base", None)
+    window_output = getattr(base, "win", None)
+    if window_output is None:
+        return None
+    return cast(
+        "GraphicsOutput | None",
+        get_panda_light(shadow_rig).getShadowBuffer(window_output.getGsg()),
+    )
+
+
+def set_shadow_map_resolution(shadow_rig: ShadowRig, resolution: int) -> None:
+    """Resize the sun's shadow map; Panda3D rebuilds the buffer on demand."""
+    shadow_rig.light.shadow_map_resolution = Vec2(resolution, resolution)
+    get_panda_light(shadow_rig).setShadowBufferSize((resolution, resolution))
+
+
+def read_shadow_frustum(shadow_rig: ShadowRig) -> tuple[CameraFrustum, float]:
+    """Return the sun's shadow volume in world space and its bounding radius."""
+    lens_bounds = get_panda_light(shadow_rig).getLens().makeBounds()
+    lens_bounds.xform(shadow_rig.light.getMat(scene))
+    return frustum_from_planes(
+        np.array([tuple(lens_bounds.getPoint(index)) for index in range(8)]),
+        np.array([tuple(lens_bounds.getPlane(index)) for index in range(6)]),
+    )
 
 
 def compute_keyboard_axes(held: dict[str, float]) -> tuple[float, float, float]:
@@ -564,6 +771,36 @@ def compute_zoom_distance(
     return max(min_distance, min(max_distance, next_distance))
 
 
+def compute_occluded_distance(
+    scene_query: SceneQuery,
+    pivot: NDArray[np.float64],
+    direction: NDArray[np.float64],
+    desired_distance: float,
+    padding: float,
+) -> float | None:
+    """Return how far the camera can sit from its pivot, or None if clear."""
+    hit = scene_query.raycast(pivot, direction, desired_distance + padding)
+    if hit is None:
+        return None
+
+    return max(
+        MIN_OCCLUDED_CAMERA_DISTANCE, min(desired_distance, hit.distance - padding)
+    )
+
+
+def compute_view_distance(
+    current_distance: float | None,
+    target_distance: float,
+    return_speed: float,
+    dt: float,
+) -> float:
+    """Snap the camera in to its target and ease it back out."""
+    if current_distance is None or target_distance <= current_distance:
+        return target_distance
+
+    return min(target_distance, current_distance + return_speed * dt)
+
+
 def compute_player_velocity(
     current_position: Vec3,
     previous_position: Vec3,
@@ -600,70 +837,273 @@ def resolve_ground_contact(
     return next_y, next_velocity_y
 
 
-def install_prop_physics_controller(player: Entity, props: list[DynamicProp]) -> Entity:
-    """Attach simple prop physics and player impact responses."""
+def create_bodies_from_props(props: list[DynamicProp]) -> PropBodies:
+    """Copy dynamic-prop entity state into batched physics bodies."""
+    bodies = create_prop_bodies(
+        np.array([tuple(prop.entity.position) for prop in props]).reshape(-1, 3),
+        np.array([prop.radius for prop in props]),
+        np.array([prop.mass for prop in props]),
+    )
+    bodies.velocity[:] = np.array(
+        [tuple(prop.velocity) for prop in props],
+    ).reshape(-1, 3)
+    return bodies
+
+
+def write_back_prop_bodies(
+    props: list[DynamicProp],
+    bodies: PropBodies,
+    visible: NDArray[np.bool_] | None = None,
+) -> int:
+    """Copy moved bodies to their entities, skipping ones nobody can see."""
+    pending = bodies.dirty if visible is None else bodies.dirty & visible
+    indices = np.flatnonzero(pending)
+    for index in indices:
+        x_pos, y_pos, z_pos = (float(value) for value in bodies.position[index])
+        props[index].entity.position = Vec3(x_pos, y_pos, z_pos)
+    bodies.dirty[indices] = False
+    return int(indices.size)
+
+
+def take_moved_bodies(bodies: PropBodies) -> NDArray[np.intp]:
+    """Return bodies that moved since the last call and clear their flags.
+
+    Unlike ``dirty``, which stays set while a moved prop is culled, these
+    flags are cleared as soon as the spatial indexes have been updated.
+    """
+    moved = np.flatnonzero(bodies.moved)
+    bodies.moved[moved] = False
+    return moved
+
+
+def create_physics_clock(settings: PhysicsSettings) -> FixedStepClock:
+    """Create a fixed-step clock at the configured physics rate."""
+    return FixedStepClock(step=1.0 / settings.rate, max_steps=settings.max_steps)
+
+
+# PLR0913 / pylint R0913,R0917: the controller threads settings and state
+# objects explicitly instead of hiding them behind a context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def install_prop_physics_controller(  # noqa: PLR0913
+    player: Entity,
+    world: SpawnedWorld,
+    clock: FixedStepClock,
+    culler: CullingManager | None = None,
+    scene_query: SceneQuery | None = None,
+    terrain: Heightfield | None = None,
+    effects: ImpactEffects | None = None,
+    profiler: Profiler | None = None,
+) -> Entity:
+    """Attach batched prop physics and player impact responses.
+
+    The bodies are published as ``world.bodies`` for checkpoints, and the
+    player position the impact velocity is measured from as
+    ``world.player_position``. With a profiler, each frame sets the
+    ``physics_ms`` step time and the ``props_awake`` and ``props_sleeping``
+    counts.
+    """
     controller = Entity(name="prop_physics_controller")
-    previous_player_position = Vec3(player.position)
+    world.player_position = Vec3(player.position)
+    props = world.props
+    bodies = create_bodies_from_props(props)
+    world.bodies = bodies
+    prop_entity_indices = np.array(world.prop_entity_indices, dtype=np.intp)
+    query_radius = CAR_IMPACT_RADIUS + float(bodies.radius.max(initial=0.0))
+    ground = flat_ground if terrain is None else terrain.heights_at
 
     def controller_update() -> None:
-        nonlocal previous_player_position
-
         dt = get_frame_dt()
+        previous = world.player_position
         player_velocity = compute_player_velocity(
             player.position,
-            previous_player_position,
+            player.position if previous is None else previous,
             dt,
         )
-        previous_player_position = Vec3(player.position)
-
-        for prop in props:
-            prop.velocity.y -= 9.81 * dt
+        world.player_position = Vec3(player.position)
+        player_position = np.array(tuple(player.position))
 
-            to_prop = prop.entity.position - player.position
-            distance = to_prop.length()
-            impact_radius = CAR_IMPACT_RADIUS + prop.radius
-            player_speed = player_velocity.length()
-            if distance < impact_radius and player_speed > MIN_IMPACT_SPEED:
-                push_dir = (
-                    to_prop.normalized()
-                    if distance > NORMALIZE_EPSILON
-                    else player.forward
-                )
-                penetration = impact_radius - distance
-                if penetration > 0.0:
-                    prop.entity.position += push_dir * (penetration * 0.4)
-                prop.velocity += push_dir * (player_speed * (0.8 / prop.mass))
-                prop.velocity.y = max(prop.velocity.y, 1.6)
-
-            prop.entity.position += prop.velocity * dt
-
-            next_y, next_velocity_y = resolve_ground_contact(
-                prop.entity.y,
-                prop.velocity.y,
-                prop.radius,
+        candidates = (
+            None
+            if scene_query is None
+            else scene_query.dynamic.overlap_sphere(player_position, query_radius)
+        )
+        hit = apply_player_impacts(
+            bodies,
+            player_position,
+            np.array(tuple(player_velocity)),
+            np.array(tuple(player.forward)),
+            candidates,
+        )
+        if effects is not None:
+            effects.emit_impacts(
+                bodies.position[hit],
+                bodies.radius[hit],
+                player_position,
+                float(player_velocity.length()),
             )
-            prop.entity.y = next_y
-            prop.velocity.y = next_velocity_y
-            if next_y <= prop.radius + 0.001:
-                prop.velocity.x *= GROUND_FRICTION
-                prop.velocity.z *= GROUND_FRICTION
+            effects.update(dt, ground)
+        moving = hit.size > 0 or not bodies.sleeping.all()
+        started = time.perf_counter()
+        for _ in range(clock.advance(dt)):
+            step_prop_bodies(bodies, clock.step, terrain)
+        if profiler is not None:
+            sleeping = int(np.count_nonzero(bodies.sleeping))
+            profiler.set_counter(
+                "physics_ms",
+                round((time.perf_counter() - started) * 1000.0, 3),
+            )
+            profiler.set_counter("props_awake", bodies.count - sleeping)
+            profiler.set_counter("props_sleeping", sleeping)
+        if scene_query is not None and moving:
+            scene_query.dynamic.refit(bodies.position)
+
+        moved = take_moved_bodies(bodies)
+        if moved.size:
+            moved_entities = prop_entity_indices[moved]
+            moved_centers = bodies.position[moved]
+            if world.shadow_casters is not None:
+                world.shadow_casters.move(moved_entities, moved_centers)
+            if culler is not None:
+                culler.move(moved_entities, moved_centers)
+        if culler is None:
+            write_back_prop_bodies(props, bodies)
+            return
+
+        write_back_prop_bodies(
+            props,
+            bodies,
+            culler.visible_all[prop_entity_indices],
+        )
 
     controller.update = controller_update
     return controller
 
 
-def install_movement_controller(
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def create_player_vehicle(
+    player: Entity,
+    settings: VehicleSettings,
+    clock: FixedStepClock,
+    terrain: Heightfield | None = None,
+) -> PlayerVehicle:
+    """Create a one-vehicle dynamics batch at the player's current transform."""
+    position = player.position
+    ground = flat_ground if terrain is None else terrain.heights_at
+    ground_y = float(ground(np.array([position.x]), np.array([position.z]))[0])
+    state = create_vehicle_state(
+        np.array([[position.x, ground_y + CHASSIS_RIDE_HEIGHT, position.z]]),
+        np.array([radians(player.rotation_y)]),
+    )
+    return PlayerVehicle(
+        state=state,
+        inputs=create_vehicle_inputs(1),
+        clock=clock,
+        settings=settings,
+        height_offset=float(position.y) - CHASSIS_RIDE_HEIGHT,
+        ground=ground,
+        wheels=wheel_uniforms(player),
+    )
+
+
+def compute_vehicle_tilt(
+    state: VehicleState,
+    ground: GroundSampler,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Return per-vehicle rotation_x/rotation_z degrees resting on the wheels."""
+    wheel_x, wheel_z = wheel_world_positions(state)
+    wheel_y = ground(wheel_x, wheel_z)
+    front_left, front_right, rear_left, rear_right = wheel_y.T
+    rise = 0.5 * (front_left + front_right - rear_left - rear_right)
+    bank = 0.5 * (front_left + rear_left - front_right - rear_right)
+    wheelbase = FRONT_AXLE_DISTANCE + REAR_AXLE_DISTANCE
+    track = float(WHEEL_OFFSET_X[1] - WHEEL_OFFSET_X[0])
+    # Ursina pitches the nose down for positive rotation_x and lowers the
+    # right side for positive rotation_z.
+    return (
+        -np.degrees(np.arctan2(rise, wheelbase)),
+        np.degrees(np.arctan2(bank, track)),
+    )
+
+
+def drive_player_vehicle(
+    player: Entity,
+    vehicle: PlayerVehicle,
+    axes: tuple[float, float, float],
+    dt: float,
+) -> None:
+    """Step the player's vehicle dynamics and copy the result to the entity."""
+    throttle, brake, steer = compute_vehicle_inputs(*axes)
+    vehicle.inputs.throttle[0] = throttle
+    vehicle.inputs.brake[0] = brake
+    vehicle.inputs.steer[0] = steer
+    for _ in range(vehicle.clock.advance(dt)):
+        step_vehicles(
+            vehicle.state,
+            vehicle.inputs,
+            vehicle.settings,
+            vehicle.clock.step,
+            vehicle.ground,
+        )
+
+    x_pos, y_pos, z_pos = (float(value) for value in vehicle.state.position[0])
+    player.position = Vec3(x_pos, y_pos + vehicle.height_offset, z_pos)
+    player.rotation_y = degrees(float(vehicle.state.heading[0]))
+    rotation_x, rotation_z = compute_vehicle_tilt(vehicle.state, vehicle.ground)
+    player.rotation_x = float(rotation_x[0])
+    player.rotation_z = float(rotation_z[0])
+    if vehicle.wheels is not None:
+        vehicle.wheels.update(
+            vehicle.state.wheel_spin[0],
+            float(vehicle.state.steer_angle[0]),
+            vehicle.settings.wheel_radius,
+        )
+
+
+def create_player_controls(
+    player: Entity,
+    settings: GameSettings,
+    physics_clock: FixedStepClock,
+    terrain: Heightfield | None = None,
+) -> PlayerControls:
+    """Create orbit state behind the player and, if enabled, its vehicle."""
+    return PlayerControls(
+        control_state=OrbitControlState(
+            yaw_angle=player.rotation_y,
+            pitch_angle=18.0,
+            camera_distance=settings.camera.distance,
+        ),
+        vehicle=(
+            create_player_vehicle(player, settings.vehicle, physics_clock, terrain)
+            if settings.movement.vehicle_dynamics
+            else None
+        ),
+    )
+
+
+# PLR0913 / pylint R0913,R0917: the controller threads settings and state
+# objects explicitly instead of hiding them behind a context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def install_movement_controller(  # noqa: PLR0913
     player: Entity,
     orbit_rig: OrbitRig,
     settings: GameSettings,
+    physics_clock: FixedStepClock,
+    scene_query: SceneQuery | None = None,
+    terrain: Heightfield | None = None,
+    controls: PlayerControls | None = None,
 ) -> Entity:
-    """Attach per-frame movement handling to a controller entity."""
+    """Attach per-frame movement handling to a controller entity.
+
+    Pass ``controls`` to keep a handle on the state the controller drives;
+    by default fresh controls are created.
+    """
     controller = Entity(name="player_input_controller")
-    control_state = OrbitControlState(
-        yaw_angle=player.rotation_y,
-        pitch_angle=18.0,
-        camera_distance=settings.camera.distance,
-    )
+    if controls is None:
+        controls = create_player_controls(player, settings, physics_clock, terrain)
+    control_state = controls.control_state
+    vehicle = controls.vehicle
 
     def controller_update() -> None:
         apply_player_input(
@@ -672,47 +1112,104 @@ def install_movement_controller(
             settings.movement,
             settings.camera,
             control_state,
+            vehicle,
+            scene_query,
+            terrain,
         )
 
     def controller_input(key: str) -> None:
-        scroll_direction = SCROLL_DIRECTION_BY_KEY.get(key)
-        if scroll_direction is None:
-            return
-
-        control_state.camera_distance = compute_zoom_distance(
-            control_state.camera_distance,
-            scroll_direction=scroll_direction,
-            min_distance=settings.camera.min_distance,
-            max_distance=settings.camera.max_distance,
-            zoom_step=settings.camera.zoom_step,
-        )
+        apply_zoom_key(key, control_state, settings.camera)
 
     controller.update = controller_update
     controller.input = controller_input
     return controller
 
 
-def apply_player_input(
+def apply_zoom_key(
+    key: str,
+    control_state: OrbitControlState,
+    camera_settings: CameraSettings,
+) -> None:
+    """Zoom the orbit camera when ``key`` is a scroll-wheel event."""
+    scroll_direction = SCROLL_DIRECTION_BY_KEY.get(key)
+    if scroll_direction is None:
+        return
+
+    control_state.camera_distance = compute_zoom_distance(
+        control_state.camera_distance,
+        scroll_direction=scroll_direction,
+        min_distance=camera_settings.min_distance,
+        max_distance=camera_settings.max_distance,
+        zoom_step=camera_settings.zoom_step,
+    )
+
+
+def apply_player_input(  # noqa: PLR0913
     player: Entity,
     orbit_rig: OrbitRig,
     movement_settings: MovementSettings,
     camera_settings: CameraSettings,
     control_state: OrbitControlState,
+    vehicle: PlayerVehicle | None = None,
+    scene_query: SceneQuery | None = None,
+    terrain: Heightfield | None = None,
 ) -> None:
-    """Apply keyboard movement and rotation to the player."""
+    """Apply keyboard movement and rotation to the player.
+
+    Without vehicle dynamics the player follows the terrain's height as it
+    moves. The camera then orbits the player (see ``update_orbit_camera``).
+    """
     held = cast("dict[str, float]", getattr(ursina, "held_keys", {}))
     forward_amount, strafe_amount, turn_amount = compute_keyboard_axes(held)
-    mouse_velocity = cast("Vec3", getattr(mouse, "velocity", Vec3(0.0, 0.0, 0.0)))
 
     dt = get_frame_dt()
-    player.position += player.forward * (
-        forward_amount * movement_settings.move_speed * dt
-    )
-    player.position += player.right * (
-        strafe_amount * movement_settings.move_speed * dt
+    if vehicle is not None:
+        drive_player_vehicle(
+            player,
+            vehicle,
+            (forward_amount, strafe_amount, turn_amount),
+            dt,
+        )
+    else:
+        previous_position = Vec3(player.position)
+        player.position += player.forward * (
+            forward_amount * movement_settings.move_speed * dt
+        )
+        player.position += player.right * (
+            strafe_amount * movement_settings.move_speed * dt
+        )
+        player.rotation_y += turn_amount * movement_settings.turn_speed * dt
+        if terrain is not None:
+            previous_ground, ground = terrain.heights_at(
+                np.array([previous_position.x, player.x]),
+                np.array([previous_position.z, player.z]),
+            )
+            player.y += float(ground - previous_ground)
+
+    update_orbit_camera(
+        player,
+        orbit_rig,
+        camera_settings,
+        control_state,
+        dt,
+        scene_query,
     )
-    player.rotation_y += turn_amount * movement_settings.turn_speed * dt
 
+
+def update_orbit_camera(  # noqa: PLR0913
+    focus: Entity,
+    orbit_rig: OrbitRig,
+    camera_settings: CameraSettings,
+    control_state: OrbitControlState,
+    dt: float,
+    scene_query: SceneQuery | None = None,
+) -> None:
+    """Orbit the camera around ``focus`` from mouse look and zoom state.
+
+    With a scene query, the orbit camera is pulled in towards its pivot when
+    world geometry blocks the line of sight to the focus.
+    """
+    mouse_velocity = cast("Vec3", getattr(mouse, "velocity", Vec3(0.0, 0.0, 0.0)))
     control_state.yaw_angle, control_state.pitch_angle = compute_look_angles(
         control_state.yaw_angle,
         control_state.pitch_angle,
@@ -720,47 +1217,1376 @@ def apply_player_input(
         camera_settings.mouse_look_speed,
     )
 
-    orbit_rig.yaw_pivot.world_position = player.world_position + Vec3(
+    orbit_rig.yaw_pivot.world_position = focus.world_position + Vec3(
         0.0,
         camera_settings.height,
         0.0,
     )
     orbit_rig.yaw_pivot.rotation = Vec3(0.0, control_state.yaw_angle, 0.0)
     orbit_rig.pitch_pivot.rotation = Vec3(control_state.pitch_angle, 0.0, 0.0)
-    camera.z = -control_state.camera_distance
+
+    target_distance = control_state.camera_distance
+    if scene_query is not None and camera_settings.occlusion:
+        occluded_distance = compute_occluded_distance(
+            scene_query,
+            np.array(tuple(orbit_rig.pitch_pivot.world_position)),
+            np.array(tuple(orbit_rig.pitch_pivot.back)),
+            target_distance,
+            camera_settings.occlusion_padding,
+        )
+        if occluded_distance is not None:
+            target_distance = occluded_distance
+    control_state.view_distance = compute_view_distance(
+        control_state.view_distance,
+        target_distance,
+        camera_settings.occlusion_return_speed,
+        dt,
+    )
+    camera.z = -control_state.view_distance
     camera.rotation_z = 0.0
 
 
-def spawn_world_entities() -> list[DynamicProp]:
-    """Spawn static scene entities and return dynamic-physics props."""
-    dynamic_props: list[DynamicProp] = []
-    for blueprint in starter_scene_blueprints():
-        entity = spawn_entity(blueprint)
-        if blueprint.model != "plane":
-            dynamic_props.append(blueprint_to_dynamic_prop(entity, blueprint))
-    return dynamic_props
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def spawn_terrain(terrain: Heightfield, settings: TerrainSettings) -> Entity:
+    """Spawn the chunked, level-of-detail terrain mesh."""
+    entity = Entity(
+        name="world_terrain",
+        model=build_terrain_node(
+            terrain,
+            settings.chunk_cells,
+            (settings.lod_near, settings.lod_far),
+        ),
+        color=resolve_color(settings.color_name),
+    )
+    return mark_lit_shadowed(entity)
+
+
+def spawn_world_entities(
+    blueprints: tuple[EntityBlueprint, ...],
+    materials: MaterialRegistry | None = None,
+) -> SpawnedWorld:
+    """Spawn scene entities and collect the ones driven by prop physics.
+
+    With shared materials the entities come from an ``EntityPool`` in one
+    bulk call; otherwise each is built with its own material.
+    """
+    pool = None if materials is None else EntityPool(materials, resolve_color)
+    world = SpawnedWorld(
+        blueprints=blueprints,
+        entities=(
+            [spawn_entity(blueprint) for blueprint in blueprints]
+            if pool is None
+            else pool.spawn_blueprints(blueprints)
+        ),
+        props=[],
+        prop_entity_indices=[],
+        pool=pool,
+        materials=materials,
+    )
+    for index, (blueprint, entity) in enumerate(
+        zip(blueprints, world.entities, strict=True),
+    ):
+        if is_dynamic_prop(blueprint):
+            world.props.append(blueprint_to_dynamic_prop(entity, blueprint))
+            world.prop_entity_indices.append(index)
+    return world
+
+
+def destroy_world(world: SpawnedWorld) -> None:
+    """Destroy a world's entities and material groups and drop its handles.
+
+    Ursina drops destroyed entities from ``scene.entities`` on its next
+    update.
+    """
+    for entity in world.entities:
+        destroy(entity)
+    if world.materials is not None:
+        world.materials.destroy()
+    world.entities.clear()
+    world.props.clear()
+    world.prop_entity_indices.clear()
+    world.pool = None
+    world.shadow_casters = None
+    world.materials = None
+
+
+def world_entity_counts(world: SpawnedWorld) -> dict[str, int]:
+    """Count a world's live entities by blueprint category."""
+    counts: dict[str, int] = {}
+    for blueprint, entity in zip(world.blueprints, world.entities):
+        if not entity.isEmpty():
+            counts[blueprint.category] = counts.get(blueprint.category, 0) + 1
+    return counts
+
+
+def place_entity(entity: Entity, blueprint: EntityBlueprint) -> None:
+    """Move an existing world entity to a blueprint's transform and shadow flag."""
+    position = blueprint.position
+    scale = blueprint.scale
+    entity.setPosHprScale(
+        position.x,
+        position.y,
+        position.z,
+        0.0,
+        0.0,
+        0.0,
+        scale.x,
+        scale.y,
+        scale.z,
+    )
+    if blueprint.casts_shadow:
+        entity.show(SHADOW_CAMERA_MASK)
+    else:
+        entity.hide(SHADOW_CAMERA_MASK)
+
+
+def apply_blueprint_diff(
+    world: SpawnedWorld,
+    blueprints: tuple[EntityBlueprint, ...],
+    diff: BlueprintDiff,
+) -> IndexPairs:
+    """Update a spawned world in place to match new blueprints.
+
+    Kept entities and their ``DynamicProp`` records carry over untouched,
+    moved ones are re-placed, and the rest are destroyed and spawned; with a
+    pool the destroyed entities are despawned for reuse. Indexes built from
+    the world (culling, shadow casters, scene query, prop bodies) are stale
+    afterwards and must be rebuilt. Returns ``(old, new)`` prop index pairs
+    for the kept props, so the caller can carry their physics state into the
+    rebuilt bodies.
+    """
+    old_entities = world.entities
+    old_props = world.props
+    old_rows = {index: row for row, index in enumerate(world.prop_entity_indices)}
+    entities: list[Entity | None] = [None] * len(blueprints)
+    carried: dict[int, int] = {}
+    for old_index, new_index in diff.kept:
+        entities[new_index] = old_entities[old_index]
+        carried[new_index] = old_index
+    for old_index, new_index in diff.moved:
+        entities[new_index] = old_entities[old_index]
+        place_entity(old_entities[old_index], blueprints[new_index])
+
+    doomed = [old_entities[index] for index in diff.destroyed]
+    spawned = [blueprints[index] for index in diff.spawned]
+    if world.pool is None:
+        for entity in doomed:
+            destroy(entity)
+        fresh = [spawn_entity(blueprint) for blueprint in spawned]
+    else:
+        world.pool.despawn(doomed)
+        fresh = world.pool.spawn_blueprints(spawned)
+    for new_index, entity in zip(diff.spawned, fresh, strict=True):
+        entities[new_index] = entity
+
+    world.blueprints = blueprints
+    world.entities = cast("list[Entity]", entities)
+    world.props = []
+    world.prop_entity_indices = []
+    kept_props: list[tuple[int, int]] = []
+    for index, (blueprint, entity) in enumerate(
+        zip(blueprints, world.entities, strict=True),
+    ):
+        if not is_dynamic_prop(blueprint):
+            continue
+        old_row = old_rows.get(carried.get(index, -1))
+        if old_row is None:
+            world.props.append(blueprint_to_dynamic_prop(entity, blueprint))
+        else:
+            kept_props.append((old_row, len(world.props)))
+            world.props.append(old_props[old_row])
+        world.prop_entity_indices.append(index)
+    return tuple(kept_props)
+
+
+def blueprint_bounding_radius(blueprint: EntityBlueprint) -> float:
+    """Return a bounding-sphere radius that encloses the blueprint's box."""
+    scale = blueprint.scale
+    return 0.5 * float(np.linalg.norm((scale.x, scale.y, scale.z)))
+
+
+def blueprint_query_shape(blueprint: EntityBlueprint) -> tuple[Vec3, bool]:
+    """Return a blueprint's query half extents and whether it is a sphere."""
+    scale = blueprint.scale
+    if blueprint.model == "sphere":
+        radius = 0.5 * max(scale.x, scale.y, scale.z)
+        return Vec3(radius, radius, radius), True
+    if blueprint.model == "plane":
+        return Vec3(0.5 * scale.x, 0.0, 0.5 * scale.z), False
+    return Vec3(0.5 * scale.x, 0.5 * scale.y, 0.5 * scale.z), False
+
+
+def build_blueprint_hierarchy(
+    blueprints: list[EntityBlueprint],
+) -> BoundingVolumeHierarchy:
+    """Build a query tree over blueprints at their spawn positions."""
+    shapes = [blueprint_query_shape(blueprint) for blueprint in blueprints]
+    return BoundingVolumeHierarchy(
+        centers=np.array(
+            [
+                (blueprint.position.x, blueprint.position.y, blueprint.position.z)
+                for blueprint in blueprints
+            ],
+        ).reshape(-1, 3),
+        half_extents=np.array(
+            [(half.x, half.y, half.z) for half, _ in shapes],
+        ).reshape(-1, 3),
+        spherical=np.array([spherical for _, spherical in shapes], dtype=np.bool_),
+    )
+
+
+def create_scene_query(
+    world: SpawnedWorld,
+    terrain: Heightfield | None = None,
+) -> SceneQuery:
+    """Index static world geometry and dynamic props for scene queries.
+
+    Dynamic-tree indices match body indices in the prop physics batch.
+    """
+    prop_indices = set(world.prop_entity_indices)
+    return SceneQuery(
+        terrain=terrain,
+        static=build_blueprint_hierarchy(
+            [
+                blueprint
+                for index, blueprint in enumerate(world.blueprints)
+                if index not in prop_indices
+            ],
+        ),
+        dynamic=build_blueprint_hierarchy(
+            [world.blueprints[index] for index in world.prop_entity_indices],
+        ),
+    )
+
+
+def blueprint_centers(
+    blueprints: tuple[EntityBlueprint, ...],
+) -> NDArray[np.float64]:
+    """Return every blueprint's position as an (n, 3) array."""
+    return np.array(
+        [
+            (blueprint.position.x, blueprint.position.y, blueprint.position.z)
+            for blueprint in blueprints
+        ],
+    ).reshape(-1, 3)
+
+
+def blueprint_radii(blueprints: tuple[EntityBlueprint, ...]) -> NDArray[np.float64]:
+    """Return every blueprint's bounding-sphere radius."""
+    return np.array([blueprint_bounding_radius(blueprint) for blueprint in blueprints])
+
+
+def create_world_culling(
+    world: SpawnedWorld,
+    settings: CullingSettings,
+) -> CullingManager:
+    """Index spawned world entities for frustum and distance culling."""
+    return CullingManager(
+        nodes=world.entities,
+        centers=blueprint_centers(world.blueprints),
+        radii=blueprint_radii(world.blueprints),
+        categories=[blueprint.category for blueprint in world.blueprints],
+        draw_distances=settings.draw_distances,
+        cell_size=settings.cell_size,
+        frustum_margin=settings.frustum_margin,
+    )
+
+
+def read_camera_frustum() -> CameraFrustum | None:
+    """Build the current orbit-camera frustum, or None without a lens."""
+    lens = getattr(camera, "perspective_lens", None)
+    if lens is None:
+        return None
+
+    fov = lens.getFov()
+    return build_frustum(
+        np.array(tuple(camera.world_position)),
+        np.array(tuple(camera.forward)),
+        np.array(tuple(camera.right)),
+        np.array(tuple(camera.up)),
+        fov=(float(fov[0]), float(fov[1])),
+        clip=(float(lens.getNear()), float(lens.getFar())),
+    )
+
+
+def install_culling_controller(culler: CullingManager) -> Entity:
+    """Re-cull world entities against the camera frustum every frame."""
+    controller = Entity(name="world_culling_controller")
+
+    def controller_update() -> None:
+        frustum = read_camera_frustum()
+        if frustum is not None:
+            culler.update(frustum)
+
+    controller.update = controller_update
+    return controller
+
+
+def create_shadow_caster_culler(
+    world: SpawnedWorld,
+    settings: CullingSettings,
+) -> ShadowCasterCuller:
+    """Index the world's shadow casters and attach them to the world."""
+    world.shadow_casters = ShadowCasterCuller(
+        nodes=world.entities,
+        centers=blueprint_centers(world.blueprints),
+        radii=blueprint_radii(world.blueprints),
+        casts_shadow=[blueprint.casts_shadow for blueprint in world.blueprints],
+        cell_size=settings.cell_size,
+    )
+    return world.shadow_casters
+
+
+def install_shadow_caster_controller(
+    caster_culler: ShadowCasterCuller,
+    shadow_rig: ShadowRig,
+    profiler: Profiler,
+) -> Entity:
+    """Re-cull shadow casters on frames that render the shadow map."""
+    controller = Entity(name="shadow_caster_controller")
+
+    def controller_update() -> None:
+        shadow_buffer = get_shadow_buffer(shadow_rig)
+        if shadow_buffer is not None and not shadow_buffer.isActive():
+            return
+        frustum, radius = read_shadow_frustum(shadow_rig)
+        profiler.set_counter("shadow_casters", caster_culler.update(frustum, radius))
+
+    controller.update = controller_update
+    return controller
+
+
+def capture_checkpoint(
+    player: Entity,
+    controls: PlayerControls,
+    world: SpawnedWorld,
+) -> WorldCheckpoint:
+    """Copy the player, orbit camera, vehicle, and prop state into a checkpoint.
+
+    Props come from ``world.bodies`` when prop physics runs, else from the
+    entities (all awake).
+    """
+    control_state = controls.control_state
+    bodies = (
+        create_bodies_from_props(world.props) if world.bodies is None else world.bodies
+    )
+    position, velocity, sleeping, rest_steps = capture_prop_bodies(bodies)
+    return WorldCheckpoint(
+        player_position=np.array(tuple(player.position)),
+        player_rotation=np.array(tuple(player.rotation)),
+        yaw_angle=control_state.yaw_angle,
+        pitch_angle=control_state.pitch_angle,
+        camera_distance=control_state.camera_distance,
+        view_distance=control_state.view_distance,
+        vehicle=(
+            np.zeros(0)
+            if controls.vehicle is None
+            else pack_vehicle_state(controls.vehicle.state)
+        ),
+        prop_position=position,
+        prop_velocity=velocity,
+        prop_sleeping=sleeping,
+        prop_rest_steps=rest_steps,
+    )
+
+
+def restore_checkpoint(
+    checkpoint: WorldCheckpoint,
+    player: Entity,
+    controls: PlayerControls,
+    world: SpawnedWorld,
+    scene_query: SceneQuery | None = None,
+) -> None:
+    """Put a checkpoint's state back into the running game.
+
+    Prop bodies are overwritten in place and written to their entities by
+    the prop physics controller's next update, which also moves them in the
+    culling grids. The player's teleport is not counted as movement, so it
+    does not knock props around. Raises ``CheckpointError`` when the
+    checkpoint's prop count or vehicle layout does not match this world;
+    nothing is changed then.
+    """
+    bodies = world.bodies
+    if bodies is None:
+        message = "the world has no prop physics to restore into"
+        raise CheckpointError(message)
+    vehicle = controls.vehicle
+    vehicle_size = 0 if vehicle is None else pack_vehicle_state(vehicle.state).size
+    if checkpoint.vehicle.size != vehicle_size:
+        message = (
+            f"checkpoint has {checkpoint.vehicle.size} vehicle values, "
+            f"expected {vehicle_size}"
+        )
+        raise CheckpointError(message)
+    restore_prop_bodies(checkpoint, bodies)
+    if vehicle is not None:
+        unpack_vehicle_state(checkpoint.vehicle, vehicle.state)
+    if scene_query is not None:
+        scene_query.dynamic.refit(bodies.position)
+
+    x_pos, y_pos, z_pos = (float(value) for value in checkpoint.player_position)
+    player.position = Vec3(x_pos, y_pos, z_pos)
+    x_rot, y_rot, z_rot = (float(value) for value in checkpoint.player_rotation)
+    player.rotation = Vec3(x_rot, y_rot, z_rot)
+    world.player_position = Vec3(player.position)
+    control_state = controls.control_state
+    control_state.yaw_angle = checkpoint.yaw_angle
+    control_state.pitch_angle = checkpoint.pitch_angle
+    control_state.camera_distance = checkpoint.camera_distance
+    control_state.view_distance = checkpoint.view_distance
+
+
+# PLR0913 / pylint R0913,R0917: the controller threads settings and state
+# objects explicitly instead of hiding them behind a context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def install_checkpoint_controller(  # noqa: PLR0913
+    player: Entity,
+    controls: PlayerControls,
+    world: SpawnedWorld,
+    settings: CheckpointSettings,
+    profiler: Profiler,
+    scene_query: SceneQuery | None = None,
+) -> Entity:
+    """Save a checkpoint on F2 and restore it on F4.
+
+    With ``settings.restore_on_start`` an existing checkpoint file is
+    restored on the first update. A missing, unreadable, or mismatched file
+    is logged and the game carries on.
+    """
+    controller = Entity(name="checkpoint_controller")
+    path = Path(settings.path)
+    pending_restore = settings.restore_on_start and path.exists()
+
+    def restore() -> None:
+        started = time.perf_counter()
+        try:
+            restore_checkpoint(
+                load_checkpoint(path),
+                player,
+                controls,
+                world,
+                scene_query,
+            )
+        except (OSError, CheckpointError) as error:
+            logger.warning("checkpoint: cannot restore %s: %s", path, error)
+            return
+        profiler.event(
+            f"checkpoint restored from {path} in "
+            f"{(time.perf_counter() - started) * 1000.0:.1f} ms",
+        )
+
+    def controller_update() -> None:
+        nonlocal pending_restore
+
+        if pending_restore:
+            pending_restore = False
+            restore()
+
+    def controller_input(key: str) -> None:
+        if key == CHECKPOINT_RESTORE_KEY:
+            restore()
+        elif key == CHECKPOINT_SAVE_KEY:
+            try:
+                save_checkpoint(path, capture_checkpoint(player, controls, world))
+            except OSError as error:
+                logger.warning("checkpoint: cannot save %s: %s", path, error)
+                return
+            profiler.event(f"checkpoint saved to {path}")
+
+    controller.update = controller_update
+    controller.input = controller_input
+    return controller
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def world_centers(world: SpawnedWorld) -> NDArray[np.float64]:
+    """Return blueprint positions, with props at their simulated positions."""
+    centers = blueprint_centers(world.blueprints)
+    if world.props:
+        centers[world.prop_entity_indices] = [
+            tuple(prop.entity.position) for prop in world.props
+        ]
+    return centers
+
+
+# PLR0913 / pylint R0913,R0917: the controller threads settings and state
+# objects explicitly instead of hiding them behind a context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def install_hot_reload_controller(  # noqa: PLR0913
+    world: SpawnedWorld,
+    settings: GameSettings,
+    install_props: Callable[[], Entity],
+    profiler: Profiler,
+    culler: CullingManager | None = None,
+    scene_query: SceneQuery | None = None,
+    terrain: Heightfield | None = None,
+) -> Entity:
+    """Respawn the world entities that changed when the scene module is edited.
+
+    Polls ``scene.py`` every ``[scene] hot_reload_interval`` seconds. On a
+    change the blueprints are rebuilt and diffed against the live world,
+    only the changed entities are spawned, moved, or destroyed, and the
+    culling grids, scene query, and prop physics batch are rebuilt from the
+    updated world. Kept props carry their velocity and sleep state into the
+    rebuilt batch, so a crate knocked flying keeps flying. ``install_props``
+    installs the prop physics controller; it is called once now and again
+    after every reload. A module that fails to import or run is logged and
+    the world is left as it was.
+    """
+    controller = Entity(name="hot_reload_controller")
+    watcher = SourceWatcher(scene_source_path())
+    props_controller = install_props()
+    elapsed = 0.0
+
+    def reload_world() -> None:
+        nonlocal props_controller
+
+        started = time.perf_counter()
+        try:
+            blueprints = reload_blueprints(settings, terrain)
+        # Any error in the edited module must not take the running game down.
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("hot reload: %s failed", watcher.path.name)
+            return
+        diff = diff_blueprints(world.blueprints, blueprints)
+        if diff.unchanged:
+            return
+        if culler is not None:
+            culler.release()
+        if world.shadow_casters is not None:
+            world.shadow_casters.release()
+        old_bodies = world.bodies
+        if old_bodies is not None:
+            # Culled props may still have unwritten moves; flush them so the
+            # rebuilt indexes and bodies start from where the props really are.
+            write_back_prop_bodies(world.props, old_bodies)
+        kept_props = apply_blueprint_diff(world, blueprints, diff)
+
+        centers = world_centers(world)
+        radii = blueprint_radii(world.blueprints)
+        if culler is not None:
+            culler.reindex(
+                world.entities,
+                centers,
+                radii,
+                [blueprint.category for blueprint in world.blueprints],
+            )
+        if world.shadow_casters is not None:
+            world.shadow_casters.reindex(
+                world.entities,
+                centers,
+                radii,
+                [blueprint.casts_shadow for blueprint in world.blueprints],
+            )
+        if scene_query is not None:
+            rebuilt = create_scene_query(world, terrain)
+            rebuilt.dynamic.refit(centers[world.prop_entity_indices])
+            scene_query.static = rebuilt.static
+            scene_query.dynamic = rebuilt.dynamic
+        destroy(props_controller)
+        props_controller = install_props()
+        if old_bodies is not None and world.bodies is not None and kept_props:
+            rows = np.array(kept_props, dtype=np.intp)
+            carry_prop_bodies(old_bodies, world.bodies, rows[:, 0], rows[:, 1])
+        profiler.event(
+            f"scene reloaded: +{len(diff.spawned)} ~{len(diff.moved)} "
+            f"-{len(diff.destroyed)} in "
+            f"{(time.perf_counter() - started) * 1000.0:.1f} ms",
+        )
+
+    def controller_update() -> None:
+        nonlocal elapsed
+
+        elapsed += get_frame_dt()
+        if elapsed < settings.scene.hot_reload_interval:
+            return
+        elapsed = 0.0
+        if watcher.changed():
+            reload_world()
+
+    controller.update = controller_update
+    return controller
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def install_profiler_controller(
+    profiler: Profiler,
+    settings: ProfilingSettings,
+    world: SpawnedWorld | None = None,
+) -> Entity:
+    """Record frame times, sample render counters, and drive the overlay.
+
+    With ``settings.memory`` the samples also include a memory report (see
+    ``fooproj/game/memory.py``) with the world's entities by category.
+    """
+    controller = Entity(name="profiler_controller")
+    overlay = Text(
+        text="",
+        x=0.42,
+        y=0.47,
+        scale=0.8,
+        background=True,
+        enabled=settings.overlay,
+    )
+    since_sample = settings.sample_interval
+    if settings.memory:
+        start_tracing()
+
+    def controller_update() -> None:
+        nonlocal since_sample
+
+        dt = get_frame_dt()
+        profiler.record_frame(dt)
+        since_sample += dt
+        if since_sample < settings.sample_interval:
+            return
+
+        since_sample = 0.0
+        for name, value in frame_state_counters(scene).items():
+            profiler.set_counter(name, value)
+        if settings.memory:
+            report = measure_memory(
+                scene,
+                graphics_outputs(),
+                None if world is None else world_entity_counts(world),
+            )
+            for name, value in report.counters().items():
+                profiler.set_counter(name, value)
+        if overlay.enabled:
+            overlay.text = "\n".join(profiler.summary_lines())
+
+    def controller_input(key: str) -> None:
+        if key == PROFILER_TOGGLE_KEY:
+            overlay.enabled = not overlay.enabled
+
+    controller.update = controller_update
+    controller.input = controller_input
+    return controller
+
+
+def install_telemetry_controller(
+    exporter: TelemetryExporter,
+    profiler: Profiler,
+    world: SpawnedWorld,
+    settings: TelemetrySettings,
+) -> Entity:
+    """Hand frame times, profiler counters, and entity counts to the exporter.
+
+    The main loop only builds one dict per sample interval; formatting and
+    I/O happen on the exporter's thread.
+    """
+    controller = Entity(name="telemetry_controller")
+    since_sample = 0.0
+
+    def controller_update() -> None:
+        nonlocal since_sample
+
+        since_sample += get_frame_dt()
+        if since_sample < settings.sample_interval:
+            return
+
+        since_sample = 0.0
+        gauges = {
+            "frame_ms": profiler.mean_frame_ms(),
+            "frame_worst_ms": profiler.worst_frame_ms(),
+            **profiler.counters,
+            "entities": float(len(scene.entities)),
+            "telemetry_dropped": float(exporter.dropped),
+        }
+        for category, count in world_entity_counts(world).items():
+            gauges[f"entities_{category}"] = float(count)
+        exporter.submit(gauges)
+
+    controller.update = controller_update
+    return controller
+
+
+def start_telemetry(
+    settings: TelemetrySettings,
+    profiler: Profiler,
+    world: SpawnedWorld,
+) -> TelemetryExporter | None:
+    """Start exporting gauges when telemetry is enabled.
+
+    A sink that cannot be opened (say, the Prometheus port is taken) is logged
+    and the game runs without telemetry.
+    """
+    if not settings.enabled:
+        return None
+    try:
+        exporter = create_telemetry_exporter(settings)
+    except OSError as error:
+        logger.warning(
+            "telemetry: cannot open the %s sink: %s", settings.protocol, error
+        )
+        return None
+    install_telemetry_controller(exporter, profiler, world, settings)
+    exporter.start()
+    return exporter
+
+
+# PLR0913 / pylint R0913,R0917: the governor adjusts each subsystem through
+# its own handle rather than a shared context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def install_frame_governor(  # noqa: PLR0913
+    settings: GameSettings,
+    profiler: Profiler,
+    shadow_rig: ShadowRig,
+    culler: CullingManager | None,
+    physics_clocks: list[FixedStepClock],
+) -> Entity:
+    """Lower or restore quality to hold the frame budget, logging each change."""
+    controller = Entity(name="frame_governor_controller")
+    governor_settings = settings.governor
+    governor = FrameBudgetGovernor(
+        target_ms=governor_settings.target_frame_ms,
+        window=governor_settings.window,
+        downgrade_ratio=governor_settings.downgrade_ratio,
+        upgrade_ratio=governor_settings.upgrade_ratio,
+        upgrade_hold=governor_settings.upgrade_hold,
+        startup_grace=governor_settings.startup_grace,
+    )
+    profiler.set_counter("quality_level", governor.level)
+
+    def controller_update() -> None:
+        mean_ms = governor.mean_frame_ms
+        level = governor.update(get_frame_dt())
+        if level is None:
+            return
+
+        quality = resolve_quality(
+            GOVERNOR_LEVELS[level],
+            settings.render.shadow_map_resolution,
+            settings.physics.rate,
+        )
+        set_shadow_map_resolution(shadow_rig, quality.shadow_map_resolution)
+        shadow_rig.update_interval = quality.shadow_update_interval
+        if culler is not None:
+            culler.scale_draw_distances(quality.distance_scale)
+        for clock in physics_clocks:
+            clock.step = 1.0 / quality.physics_rate
+
+        profiler.set_counter("quality_level", level)
+        profiler.event(
+            f"quality {level} at {mean_ms:.1f} ms: {quality.describe()}",
+        )
+
+    controller.update = controller_update
+    return controller
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def graphics_outputs() -> list[GraphicsOutput]:
+    """Return the window and every offscreen buffer, such as the shadow map."""
+    base = getattr(application, "base", None)
+    if base is None:
+        return []
+    return list(base.graphicsEngine.getWindows())
+
+
+def connect_pstats() -> None:
+    """Stream Panda3D's native collectors (including state changes) to PStats."""
+    panda3d_core = importlib.import_module("panda3d.core")
+    pstat_client = getattr(panda3d_core, "PStatClient", None)
+    if pstat_client is not None:
+        pstat_client.connect()
+
+
+def create_app(settings: GameSettings, window_type: str = "onscreen") -> object:
+    """Open the Ursina window and apply window and profiling settings."""
+    app = cast(
+        "object",
+        Ursina(
+            development_mode=settings.development_mode,
+            vsync=settings.render.vsync,
+            window_type=window_type,
+        ),
+    )
+    application.asset_folder = Path(__file__).resolve().parents[2]
+
+    if window_type == "onscreen":
+        configure_window(settings)
+
+    if settings.render.shader_cache_dir:
+        use_shader_cache(Path(settings.render.shader_cache_dir), CACHED_SHADERS)
+    if settings.profiling.pstats:
+        connect_pstats()
+    return app
+
+
+def warm_up_renderer(settings: RenderSettings, profiler: Profiler) -> None:
+    """Compile shaders and upload the scene before the game loop starts."""
+    base = getattr(application, "base", None)
+    window_output = getattr(base, "win", None)
+    if settings.warm_up_frames <= 0 or window_output is None:
+        return
+
+    started = time.perf_counter()
+    prepared = warm_up_scene(
+        scene,
+        window_output.getGsg(),
+        getattr(base, "graphicsEngine"),  # noqa: B009  # B009: getattr-with-constant
+        imported_shaders.values(),
+        settings.warm_up_frames,
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    profiler.event(
+        f"warm-up: {prepared} shaders, {settings.warm_up_frames} frames "
+        f"in {elapsed_ms:.0f} ms",
+    )
+
+
+def run_app(app: object) -> None:
+    """Hand control to Ursina's main loop."""
+    # Ursina's app proxy is typed as object here, so dynamic access is needed.
+    run_callable = getattr(app, "run")  # noqa: B009  # B009: getattr-with-constant
+    run_callable()
+
+
+def step_app(app: object) -> None:
+    """Run one frame of Ursina's main loop: update tasks, then render."""
+    # Ursina's app proxy is typed as object here, so dynamic access is needed.
+    step_callable = getattr(app, "step")  # noqa: B009  # B009: getattr-with-constant
+    step_callable()
+
+
+@dataclass(slots=True)
+class SimulationView:
+    """Entities that show cars and props simulated outside the render loop."""
+
+    cars: dict[int, CarEntity]
+    world: SpawnedWorld
+    shown_props: NDArray[np.float64]
+    prop_entity_indices: NDArray[np.intp]
+    ground: GroundSampler
+    local_slot: int = 0
+    culler: CullingManager | None = None
+    scene_query: SceneQuery | None = None
+
+
+# PLR0913 / pylint R0913,R0917: the view threads the optional render-side
+# subsystems explicitly instead of hiding them behind a context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def create_simulation_view(  # noqa: PLR0913
+    player: Entity,
+    world: SpawnedWorld,
+    local_slot: int = 0,
+    terrain: Heightfield | None = None,
+    culler: CullingManager | None = None,
+    scene_query: SceneQuery | None = None,
+) -> SimulationView:
+    """Show the local player's simulated car with ``player``."""
+    return SimulationView(
+        cars={local_slot: CarEntity(player, float(player.y) - CHASSIS_RIDE_HEIGHT)},
+        world=world,
+        shown_props=np.array(
+            [tuple(prop.entity.position) for prop in world.props],
+        ).reshape(-1, 3),
+        prop_entity_indices=np.array(world.prop_entity_indices, dtype=np.intp),
+        ground=flat_ground if terrain is None else terrain.heights_at,
+        local_slot=local_slot,
+        culler=culler,
+        scene_query=scene_query,
+    )
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def show_simulated_cars(
+    view: SimulationView,
+    positions: NDArray[np.float64],
+    headings: NDArray[np.float64],
+    active: NDArray[np.bool_],
+) -> None:
+    """Place every active car, spawning cars for newly active players."""
+    rotation_x, rotation_z = compute_vehicle_tilt(
+        create_vehicle_state(positions, headings),
+        view.ground,
+    )
+    for slot in range(active.size):
+        car = view.cars.get(slot)
+        if car is None:
+            if not active[slot]:
+                continue
+            entity = spawn_primitive_player()
+            car = view.cars[slot] = CarEntity(
+                entity,
+                float(entity.y) - CHASSIS_RIDE_HEIGHT,
+            )
+        car.entity.enabled = bool(active[slot]) or slot == view.local_slot
+        x_pos, y_pos, z_pos = (float(value) for value in positions[slot])
+        car.entity.position = Vec3(x_pos, y_pos + car.height_offset, z_pos)
+        car.entity.rotation_y = degrees(float(headings[slot]))
+        car.entity.rotation_x = float(rotation_x[slot])
+        car.entity.rotation_z = float(rotation_z[slot])
+
+
+def move_local_car(view: SimulationView, slot: int) -> None:
+    """Show the local player's car in ``slot`` after the server re-admitted it."""
+    remote = view.cars.pop(slot, None)
+    if remote is not None:
+        destroy(remote.entity)
+    view.cars[slot] = view.cars.pop(view.local_slot)
+    view.local_slot = slot
+
+
+def show_simulated_props(
+    view: SimulationView,
+    positions: NDArray[np.float64],
+) -> int:
+    """Move prop entities whose position changed; return how many moved."""
+    moved = np.flatnonzero(np.any(positions != view.shown_props, axis=1))
+    if moved.size == 0:
+        return 0
+    view.shown_props[moved] = positions[moved]
+    props = view.world.props
+    for index in moved:
+        x_pos, y_pos, z_pos = (float(value) for value in positions[index])
+        props[index].entity.position = Vec3(x_pos, y_pos, z_pos)
+    moved_entities = view.prop_entity_indices[moved]
+    if view.culler is not None:
+        view.culler.move(moved_entities, positions[moved])
+    if view.world.shadow_casters is not None:
+        view.world.shadow_casters.move(moved_entities, positions[moved])
+    if view.scene_query is not None:
+        view.scene_query.dynamic.refit(positions)
+    return int(moved.size)
+
+
+# PLR0913 / pylint R0913,R0917: the controller threads settings and state
+# objects explicitly instead of hiding them behind a context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def install_simulation_thread_controller(  # noqa: PLR0913
+    simulation_thread: SimulationThread,
+    player: Entity,
+    world: SpawnedWorld,
+    orbit_rig: OrbitRig,
+    settings: GameSettings,
+    scene_query: SceneQuery | None = None,
+    culler: CullingManager | None = None,
+    terrain: Heightfield | None = None,
+) -> Entity:
+    """Feed input to the simulation thread and show what it last published."""
+    controller = Entity(name="simulation_thread_controller")
+    control_state = OrbitControlState(
+        yaw_angle=player.rotation_y,
+        pitch_angle=18.0,
+        camera_distance=settings.camera.distance,
+    )
+    view = create_simulation_view(
+        player,
+        world,
+        simulation_thread.player,
+        terrain,
+        culler,
+        scene_query,
+    )
+    shown_tick = -1
+
+    def controller_update() -> None:
+        nonlocal shown_tick
+
+        held = cast("dict[str, float]", getattr(ursina, "held_keys", {}))
+        simulation_thread.set_axes(compute_keyboard_axes(held))
+        with simulation_thread.buffer.read() as frame:
+            if frame.tick != shown_tick:
+                shown_tick = frame.tick
+                show_simulated_cars(
+                    view,
+                    frame.player_position,
+                    frame.player_heading,
+                    frame.active,
+                )
+                show_simulated_props(view, frame.prop_position)
+
+        update_orbit_camera(
+            player,
+            orbit_rig,
+            settings.camera,
+            control_state,
+            get_frame_dt(),
+            scene_query,
+        )
+
+    def controller_input(key: str) -> None:
+        apply_zoom_key(key, control_state, settings.camera)
+
+    controller.update = controller_update
+    controller.input = controller_input
+    return controller
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def create_simulation_thread(
+    blueprints: tuple[EntityBlueprint, ...],
+    settings: GameSettings,
+    clock: FixedStepClock,
+    terrain: Heightfield | None = None,
+) -> SimulationThread:
+    """Create a one-player simulation thread for the local sandbox."""
+    simulation = create_simulation(
+        blueprints,
+        1,
+        settings.vehicle,
+        clock.step,
+        terrain,
+    )
+    simulation.active[0] = True
+    return SimulationThread(simulation, clock)
+
+
+# PLR0913 / pylint R0913,R0917: the controller threads settings and state
+# objects explicitly instead of hiding them behind a context object.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def install_network_client_controller(  # noqa: PLR0913
+    client: SimulationClient,
+    player: Entity,
+    world: SpawnedWorld,
+    orbit_rig: OrbitRig,
+    settings: GameSettings,
+    scene_query: SceneQuery | None = None,
+    culler: CullingManager | None = None,
+    terrain: Heightfield | None = None,
+    recorder: InputRecorder | None = None,
+) -> Entity:
+    """Send keyboard input to the server and show its interpolated world.
+
+    Other players' cars are spawned the first time they show up as active.
+    """
+    controller = Entity(name="network_client_controller")
+    welcome = client.welcome
+    if welcome is None:
+        message = "connect the client before installing its controller"
+        raise ValueError(message)
+    control_state = OrbitControlState(
+        yaw_angle=0.0,
+        pitch_angle=18.0,
+        camera_distance=settings.camera.distance,
+    )
+    view = create_simulation_view(
+        player,
+        world,
+        welcome.slot,
+        terrain,
+        culler,
+        scene_query,
+    )
+
+    def controller_update() -> None:
+        dt = get_frame_dt()
+        held = cast("dict[str, float]", getattr(ursina, "held_keys", {}))
+        axes = compute_keyboard_axes(held)
+        client.send_input(axes)
+        if recorder is not None:
+            recorder.record(axes, dt)
+
+        client.poll()
+        if client.welcome is not None and client.welcome.slot != view.local_slot:
+            move_local_car(view, client.welcome.slot)
+        interpolator = client.interpolator
+        state = (
+            None if interpolator is None else interpolator.sample(time.perf_counter())
+        )
+        if state is not None:
+            show_simulated_cars(
+                view,
+                state.player_positions,
+                state.player_headings,
+                state.active,
+            )
+            show_simulated_props(view, state.prop_positions)
+
+        update_orbit_camera(
+            player,
+            orbit_rig,
+            settings.camera,
+            control_state,
+            dt,
+            scene_query,
+        )
+
+    def controller_input(key: str) -> None:
+        apply_zoom_key(key, control_state, settings.camera)
+
+    controller.update = controller_update
+    controller.input = controller_input
+    return controller
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
 
 
 def run_game(settings: GameSettings | None = None) -> None:
     """Run the Ursina starter sandbox."""
     active_settings = GameSettings() if settings is None else settings
-    app = cast("object", Ursina(development_mode=active_settings.development_mode))
-    application.asset_folder = Path(__file__).resolve().parents[2]
-
-    configure_window(active_settings)
+    app = create_app(active_settings)
 
-    dynamic_props = spawn_world_entities()
+    materials = (
+        create_material_registry() if active_settings.render.shared_materials else None
+    )
+    blueprints, terrain = load_world(active_settings)
+    if terrain is not None:
+        spawn_terrain(terrain, active_settings.terrain)
+    world = spawn_world_entities(blueprints, materials)
 
     player = spawn_player()
     configure_camera()
     orbit_rig = create_camera_orbit_rig(active_settings)
     configure_mouse_capture()
     create_controls_hint()
-    configure_lighting(player)
-    install_movement_controller(player, orbit_rig, active_settings)
-    install_prop_physics_controller(player, dynamic_props)
+    shadow_rig = configure_lighting(player, active_settings.render)
+    scene_query = create_scene_query(world, terrain)
+    physics_clocks = [
+        create_physics_clock(active_settings.physics),
+        create_physics_clock(active_settings.physics),
+    ]
+    culler = (
+        create_world_culling(world, active_settings.culling)
+        if active_settings.culling.enabled
+        else None
+    )
+    simulation_thread = None
+    controls = None
+    if active_settings.physics.threaded:
+        simulation_thread = create_simulation_thread(
+            blueprints,
+            active_settings,
+            physics_clocks[0],
+            terrain,
+        )
+        install_simulation_thread_controller(
+            simulation_thread,
+            player,
+            world,
+            orbit_rig,
+            active_settings,
+            scene_query,
+            culler,
+            terrain,
+        )
+    else:
+        controls = create_player_controls(
+            player,
+            active_settings,
+            physics_clocks[0],
+            terrain,
+        )
+        install_movement_controller(
+            player,
+            orbit_rig,
+            active_settings,
+            physics_clocks[0],
+            scene_query,
+            terrain,
+            controls,
+        )
+    # Cull after the camera moved this frame.
+    if culler is not None:
+        install_culling_controller(culler)
+    profiler = Profiler()
+    if simulation_thread is None:
+        particles = active_settings.particles
+        effects = (
+            ImpactEffects(scene, particles.dust_capacity, particles.spark_capacity)
+            if particles.enabled
+            else None
+        )
+
+        def install_props() -> Entity:
+            return install_prop_physics_controller(
+                player,
+                world,
+                physics_clocks[1],
+                culler,
+                scene_query,
+                terrain,
+                effects,
+                profiler,
+            )
+
+        if active_settings.scene.hot_reload:
+            install_hot_reload_controller(
+                world,
+                active_settings,
+                install_props,
+                profiler,
+                culler,
+                scene_query,
+                terrain,
+            )
+        else:
+            install_props()
+        if controls is not None:
+            install_checkpoint_controller(
+                player,
+                controls,
+                world,
+                active_settings.checkpoint,
+                profiler,
+                scene_query,
+            )
+    elif active_settings.scene.hot_reload:
+        logger.warning("hot reload: not available with threaded physics")
+    if active_settings.culling.shadow_casters:
+        install_shadow_caster_controller(
+            create_shadow_caster_culler(world, active_settings.culling),
+            shadow_rig,
+            profiler,
+        )
+    install_profiler_controller(profiler, active_settings.profiling, world)
+    if active_settings.governor.enabled:
+        install_frame_governor(
+            active_settings,
+            profiler,
+            shadow_rig,
+            culler,
+            physics_clocks,
+        )
 
     Sky()
-    # Ursina's app proxy is typed as object here, so dynamic access is needed.
-    run_callable = getattr(app, "run")  # noqa: B009  # B009: getattr-with-constant
-    run_callable()
+    warm_up_renderer(active_settings.render, profiler)
+    telemetry = start_telemetry(active_settings.telemetry, profiler, world)
+    if simulation_thread is not None:
+        simulation_thread.start()
+    try:
+        run_app(app)
+    finally:
+        if simulation_thread is not None:
+            simulation_thread.stop()
+        if telemetry is not None:
+            telemetry.stop()
+
+
+def run_client(settings: GameSettings | None = None) -> None:
+    """Join a simulation server and render the world it simulates.
+
+    Both ends build the world from their own settings, so the client must use
+    the same preset and config as the server; a prop-count mismatch is
+    rejected. The client says hello only once the world is loaded and the
+    renderer warmed up, so a slow first load cannot outlast the server's
+    client timeout.
+    """
+    active_settings = GameSettings() if settings is None else settings
+    network = active_settings.network
+    blueprints, terrain = load_world(active_settings)
+    app = create_app(active_settings)
+    materials = (
+        create_material_registry() if active_settings.render.shared_materials else None
+    )
+    if terrain is not None:
+        spawn_terrain(terrain, active_settings.terrain)
+    world = spawn_world_entities(blueprints, materials)
+
+    player = spawn_player()
+    configure_camera()
+    orbit_rig = create_camera_orbit_rig(active_settings)
+    configure_mouse_capture()
+    create_controls_hint()
+    shadow_rig = configure_lighting(player, active_settings.render)
+    scene_query = create_scene_query(world, terrain)
+    culler = (
+        create_world_culling(world, active_settings.culling)
+        if active_settings.culling.enabled
+        else None
+    )
+    profiler = Profiler()
+    Sky()
+    warm_up_renderer(active_settings.render, profiler)
+
+    client = SimulationClient(network)
+    try:
+        welcome = client.connect()
+        if welcome.prop_count != len(world.props):
+            message = (
+                f"server simulates {welcome.prop_count} props but these settings "
+                f"create {len(world.props)}; use the server's preset and config"
+            )
+            raise ValueError(message)
+    except Exception:
+        client.close()
+        raise
+
+    if culler is not None:
+        install_culling_controller(culler)
+    recorder = InputRecorder(welcome.tick_rate) if network.record_input else None
+    install_network_client_controller(
+        client,
+        player,
+        world,
+        orbit_rig,
+        active_settings,
+        scene_query,
+        culler,
+        terrain,
+        recorder,
+    )
+    if active_settings.culling.shadow_casters:
+        install_shadow_caster_controller(
+            create_shadow_caster_culler(world, active_settings.culling),
+            shadow_rig,
+            profiler,
+        )
+    install_profiler_controller(profiler, active_settings.profiling, world)
+    telemetry = start_telemetry(active_settings.telemetry, profiler, world)
+    try:
+        run_app(app)
+    finally:
+        client.close()
+        if telemetry is not None:
+            telemetry.stop()
+        if recorder is not None:
+            recorder.save(Path(network.record_input))
+
+
+def run_memory_stress(settings: GameSettings, cycles: int) -> list[str]:
+    """Spawn and destroy the world and the player car ``cycles`` times.
+
+    Runs offscreen, renders one frame per spawn, and logs a memory report
+    after every spawn and every destroy. Returns the steady-state problems
+    found in the after-destroy reports (see ``steady_state_problems``).
+
+    Raises ``ValueError`` for fewer than ``MIN_STRESS_CYCLES`` cycles, which
+    would leave nothing to compare.
+    """
+    if cycles < MIN_STRESS_CYCLES:
+        message = f"memory stress needs at least {MIN_STRESS_CYCLES} cycles"
+        raise ValueError(message)
+    app = create_app(settings, window_type="offscreen")
+    start_tracing()
+    blueprints, _ = load_world(settings)
+    settled: list[MemoryReport] = []
+    snapshots: list[tracemalloc.Snapshot] = []
+    for cycle in range(cycles):
+        materials = (
+            create_material_registry() if settings.render.shared_materials else None
+        )
+        world = spawn_world_entities(blueprints, materials)
+        player = spawn_player()
+        step_app(app)
+        spawned = measure_memory(scene, graphics_outputs(), world_entity_counts(world))
+        logger.info("cycle %d spawned: %s", cycle, spawned.counters())
+
+        destroy_world(world)
+        destroy(player)
+        step_app(app)
+        gc.collect()
+        settled.append(measure_memory(scene, graphics_outputs()))
+        logger.info("cycle %d destroyed: %s", cycle, settled[-1].counters())
+        if cycle in {STRESS_WARMUP_CYCLES, cycles - 1}:
+            snapshots.append(tracemalloc.take_snapshot())
+
+    problems = steady_state_problems(settled, STRESS_WARMUP_CYCLES)
+    if problems and len(snapshots) == 2:
+        problems.extend(top_growth(snapshots[0], snapshots[1]))
+    return problems
@@ -21,9 +21,41 @@ class EntityBlueprint:
     color_name: str
     scale: Vec3
     position: Vec3
+    category: str = "prop"
+    casts_shadow: bool = True
 
 
-def starter_scene_blueprints() -> tuple[EntityBlueprint, ...]:
+DEFAULT_PROPS_PER_RING = 14
+
+
+def blueprint_entity_name(blueprint: EntityBlueprint) -> str:
+    """Return the stable entity name for a blueprint (model and x/z cell)."""
+    return (
+        f"world_{blueprint.model}_"
+        f"{round(blueprint.position.x)}_"
+        f"{round(blueprint.position.z)}"
+    )
+
+
+def is_dynamic_prop(blueprint: EntityBlueprint) -> bool:
+    """Return whether prop physics drives a blueprint (everything but planes)."""
+    return blueprint.model != "plane"
+
+
+def compute_prop_radius(scale: Vec3) -> float:
+    """Approximate a prop's horizontal contact radius from its scale."""
+    return max(scale.x, scale.z) * 0.5
+
+
+def compute_prop_mass(scale: Vec3) -> float:
+    """Approximate prop mass from visual volume."""
+    volume = max(0.1, float(scale.x) * float(scale.y) * float(scale.z))
+    return max(0.6, volume)
+
+
+def starter_scene_blueprints(
+    props_per_ring: int = DEFAULT_PROPS_PER_RING,
+) -> tuple[EntityBlueprint, ...]:
     """Return entities for the expanded sandbox scene."""
     blueprints: list[EntityBlueprint] = [
         EntityBlueprint(
@@ -31,11 +63,13 @@ def starter_scene_blueprints() -> tuple[EntityBlueprint, ...]:
             color_name="light_gray",
             scale=Vec3(260.0, 1.0, 260.0),
             position=Vec3(0.0, 0.0, 0.0),
+            category="ground",
+            casts_shadow=False,
         ),
     ]
 
     blueprints.extend(_perimeter_columns())
-    blueprints.extend(_orbital_props())
+    blueprints.extend(_orbital_props(props_per_ring))
     blueprints.extend(_cardinal_landmarks())
     return tuple(blueprints)
 
@@ -61,6 +95,7 @@ def _perimeter_columns() -> list[EntityBlueprint]:
                     color_name=colors[color_index % len(colors)],
                     scale=Vec3(2.4, 6.2, 2.4),
                     position=Vec3(x_pos, 3.1, z_pos),
+                    category="column",
                 ),
             )
             color_index += 1
@@ -81,13 +116,12 @@ def orbital_prop_scale(model_name: str, ring_index: int) -> Vec3:
     )
 
 
-def _orbital_props() -> list[EntityBlueprint]:
+def _orbital_props(points_per_ring: int) -> list[EntityBlueprint]:
     """Create large concentric rings of mixed-shape dynamic props."""
     props: list[EntityBlueprint] = []
     models = ("cube", "sphere")
     colors = ("red", "azure", "orange", "violet", "lime", "yellow", "cyan", "magenta")
     radii = (18.0, 34.0, 52.0, 72.0, 94.0)
-    points_per_ring = 14
 
     for ring_index, radius in enumerate(radii):
         for point_index in range(points_per_ring):
@@ -132,6 +166,7 @@ def _cardinal_landmarks() -> list[EntityBlueprint]:
                 color_name=color_name,
                 scale=scale,
                 position=position,
+                category="landmark",
             ),
         )
 
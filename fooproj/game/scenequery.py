@@ -0,0 +1,588 @@
+"""Bounding volume hierarchies for raycast, overlap, and nearest queries.
+
+Scene items are axis-aligned boxes or spheres. Each hierarchy is a binary
+tree built by median splits along the longest centroid axis, stored as flat
+arrays so queries walk it one level at a time: every step tests the whole
+frontier of nodes with a few vectorized operations, so a query costs a
+handful of NumPy calls per tree level rather than one Python call per node.
+Trees over moving items are refit in place from new centers (leaves by one
+``reduceat``, then each level bottom-up) and rebuilt once refitting has
+loosened them too much.
+
+Each level of the walk costs a fixed few NumPy calls, which is more than
+testing every item at once until a tree has many leaves. Trees with at most
+``FLAT_LEAF_LIMIT`` leaves therefore skip the hierarchy and answer each query
+with one vectorized pass over all items (``test_scene_query_crossover`` in
+the benchmark suite measures both).
+"""
+
+from dataclasses import dataclass, replace
+from functools import cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .terrain import Heightfield
+
+type FloatArray = NDArray[np.float64]
+type BoolArray = NDArray[np.bool_]
+type IndexArray = NDArray[np.intp]
+
+DEFAULT_LEAF_SIZE = 8
+# Up to this many leaves (about 8k items at the default leaf size), testing
+# every item beats walking the tree; see ``test_scene_query_crossover``.
+FLAT_LEAF_LIMIT = 1024
+# Rebuild once refit leaves have grown this much past their built size.
+REBUILD_GROWTH = 2.0
+DIRECTION_EPSILON = 1e-12
+TERRAIN_INDEX = -1
+
+
+@dataclass(frozen=True, slots=True)
+class RayHit:
+    """Closest ray intersection with one scene item."""
+
+    index: int
+    distance: float
+    point: FloatArray
+    normal: FloatArray
+    dynamic: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class NearestItem:
+    """Closest scene item to a point, by distance to the item's surface."""
+
+    index: int
+    distance: float
+    dynamic: bool = False
+
+
+def _surface_area(lower: FloatArray, upper: FloatArray) -> float:
+    """Return the summed surface area of a batch of boxes."""
+    size = np.maximum(upper - lower, 0.0)
+    return float(
+        2.0
+        * (
+            size[:, 0] * size[:, 1] + size[:, 1] * size[:, 2] + size[:, 2] * size[:, 0]
+        ).sum(),
+    )
+
+
+def _ray_box(
+    origin: FloatArray,
+    inverse_direction: FloatArray,
+    lower: FloatArray,
+    upper: FloatArray,
+) -> tuple[FloatArray, FloatArray, IndexArray]:
+    """Slab test; return entry distance, exit distance, and entry axis."""
+    near = (lower - origin) * inverse_direction
+    far = (upper - origin) * inverse_direction
+    entry = np.minimum(near, far)
+    exit_ = np.maximum(near, far)
+    return entry.max(axis=1), exit_.min(axis=1), entry.argmax(axis=1)
+
+
+def _ray_spheres(
+    origin: FloatArray,
+    direction: FloatArray,
+    centers: FloatArray,
+    radius: FloatArray,
+) -> FloatArray:
+    """Return where a unit ray enters each sphere, or inf where it misses."""
+    offset = origin - centers
+    along = offset @ direction
+    discriminant = along**2 - np.einsum("ij,ij->i", offset, offset) + radius**2
+    root = np.sqrt(np.maximum(discriminant, 0.0))
+    # Rays starting inside a sphere hit it at distance zero.
+    valid = (discriminant >= 0.0) & (-along + root >= 0.0)
+    distance: FloatArray = np.where(valid, np.maximum(-along - root, 0.0), np.inf)
+    return distance
+
+
+# PLR0913 / pylint R0913,R0917: the ray and the item arrays stay separate so
+# callers can pass either every item or a gathered subset.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def _ray_items(  # noqa: PLR0913
+    origin: FloatArray,
+    direction: FloatArray,
+    inverse_direction: FloatArray,
+    centers: FloatArray,
+    half_extents: FloatArray,
+    spherical: BoolArray,
+) -> tuple[FloatArray, IndexArray]:
+    """Return each item's hit distance (inf on a miss) and box entry axis."""
+    if spherical.all():
+        distance = _ray_spheres(origin, direction, centers, half_extents[:, 0])
+        return distance, np.zeros(distance.shape[0], dtype=np.intp)
+
+    # Slabs measured from the box centers are already ordered near to far.
+    to_center = (centers - origin) * inverse_direction
+    reach = half_extents * np.abs(inverse_direction)
+    near = to_center - reach
+    start = np.maximum(near.max(axis=1), 0.0)
+    distance = np.where((to_center + reach).min(axis=1) >= start, start, np.inf)
+    if spherical.any():
+        distance[spherical] = _ray_spheres(
+            origin,
+            direction,
+            centers[spherical],
+            half_extents[spherical, 0],
+        )
+    return distance, near.argmax(axis=1)
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def _surface_distances(
+    point: FloatArray,
+    centers: FloatArray,
+    half_extents: FloatArray,
+    spherical: BoolArray,
+) -> FloatArray:
+    """Return distances from a point to item surfaces (zero inside)."""
+    if spherical.all():
+        delta = centers - point
+        distance: FloatArray = np.maximum(
+            np.sqrt(np.einsum("ij,ij->i", delta, delta)) - half_extents[:, 0],
+            0.0,
+        )
+        return distance
+    offset = np.maximum(np.abs(centers - point) - half_extents, 0.0)
+    distance = np.sqrt(np.einsum("ij,ij->i", offset, offset))
+    if spherical.any():
+        distance[spherical] = _surface_distances(
+            point,
+            centers[spherical],
+            half_extents[spherical],
+            spherical[spherical],
+        )
+    return distance
+
+
+@cache
+def _leaf_count(count: int, leaf_size: int) -> int:
+    """Return how many leaves a median-split tree over ``count`` items has."""
+    if count <= leaf_size:
+        return 1
+    half = count // 2
+    return _leaf_count(half, leaf_size) + _leaf_count(count - half, leaf_size)
+
+
+def _point_box_distance(
+    point: FloatArray,
+    lower: FloatArray,
+    upper: FloatArray,
+) -> FloatArray:
+    """Return distances from a point to boxes (zero inside)."""
+    offset = np.maximum(np.maximum(lower - point, point - upper), 0.0)
+    distance: FloatArray = np.sqrt(np.einsum("ij,ij->i", offset, offset))
+    return distance
+
+
+class BoundingVolumeHierarchy:
+    """Flat binary BVH over boxes and spheres given as centers + half extents."""
+
+    def __init__(
+        self,
+        centers: FloatArray,
+        half_extents: FloatArray,
+        spherical: BoolArray | None = None,
+        leaf_size: int = DEFAULT_LEAF_SIZE,
+        flat_leaf_limit: int = FLAT_LEAF_LIMIT,
+    ) -> None:
+        """Build the tree; spheres pass their radius as every half extent.
+
+        Trees that would have at most ``flat_leaf_limit`` leaves are not
+        built, and every query tests all items instead.
+        """
+        self.leaf_size = leaf_size
+        self.centers = np.array(centers, dtype=np.float64).reshape(-1, 3)
+        self.half_extents = np.array(half_extents, dtype=np.float64).reshape(-1, 3)
+        count = self.centers.shape[0]
+        self.spherical = (
+            np.zeros(count, dtype=np.bool_)
+            if spherical is None
+            else np.array(spherical, dtype=np.bool_)
+        )
+        self.flat = _leaf_count(count, leaf_size) <= flat_leaf_limit
+        self._all_items = np.arange(count, dtype=np.intp)
+        self.rebuild()
+
+    @property
+    def count(self) -> int:
+        """Return the number of items in the tree."""
+        return int(self.centers.shape[0])
+
+    def rebuild(self) -> None:
+        """Rebuild the topology from the current item centers."""
+        if self.flat:
+            return
+        count = self.count
+        order = np.arange(count, dtype=np.intp)
+        starts: list[int] = []
+        sizes: list[int] = []
+        left: list[int] = []
+        depth: list[int] = []
+
+        # Breadth-first build keeps every child after its parent, which is
+        # the order the level-by-level refit and traversal rely on.
+        queue = [(0, count, 0)]
+        head = 0
+        while head < len(queue):
+            start, size, node_depth = queue[head]
+            head += 1
+            starts.append(start)
+            sizes.append(size)
+            depth.append(node_depth)
+            if size <= self.leaf_size:
+                left.append(-1)
+                continue
+
+            members = order[start : start + size]
+            member_centers = self.centers[members]
+            axis = int(np.ptp(member_centers, axis=0).argmax())
+            half = size // 2
+            split = np.argpartition(member_centers[:, axis], half)
+            order[start : start + size] = members[split]
+            left.append(len(queue))
+            queue.append((start, half, node_depth + 1))
+            queue.append((start + half, size - half, node_depth + 1))
+
+        self._order = order
+        self._ordered_half = np.take(self.half_extents, order, axis=0)
+        self._node_start = np.array(starts, dtype=np.intp)
+        self._node_count = np.array(sizes, dtype=np.intp)
+        self._left = np.array(left, dtype=np.intp)
+        self._is_leaf = self._left < 0
+        node_depth_array = np.array(depth, dtype=np.intp)
+        self._leaves = np.flatnonzero(self._is_leaf)
+        self._leaves = self._leaves[np.argsort(self._node_start[self._leaves])]
+        internal = np.flatnonzero(~self._is_leaf)
+        self._levels = [
+            internal[node_depth_array[internal] == level]
+            for level in range(int(node_depth_array.max(initial=0)), -1, -1)
+        ]
+        self.node_lower = np.zeros((len(starts), 3))
+        self.node_upper = np.zeros((len(starts), 3))
+        self._refit_bounds()
+        self._built_leaf_area = max(self._leaf_area(), DIRECTION_EPSILON)
+
+    def _leaf_area(self) -> float:
+        """Return the summed surface area of all leaf boxes."""
+        return _surface_area(
+            self.node_lower[self._leaves],
+            self.node_upper[self._leaves],
+        )
+
+    def _refit_bounds(self) -> None:
+        """Recompute leaf bounds from items and internal bounds bottom-up."""
+        if self.count == 0:
+            return
+        # ``take`` gathers whole rows several times faster than indexing.
+        ordered_centers = np.take(self.centers, self._order, axis=0)
+        leaf_starts = self._node_start[self._leaves]
+        self.node_lower[self._leaves] = np.minimum.reduceat(
+            ordered_centers - self._ordered_half,
+            leaf_starts,
+        )
+        self.node_upper[self._leaves] = np.maximum.reduceat(
+            ordered_centers + self._ordered_half,
+            leaf_starts,
+        )
+        for nodes in self._levels:
+            left = self._left[nodes]
+            self.node_lower[nodes] = np.minimum(
+                self.node_lower[left],
+                self.node_lower[left + 1],
+            )
+            self.node_upper[nodes] = np.maximum(
+                self.node_upper[left],
+                self.node_upper[left + 1],
+            )
+
+    def refit(self, centers: FloatArray) -> bool:
+        """Move items to new centers; return True if the tree was rebuilt."""
+        self.centers[:] = centers
+        if self.flat:
+            return False
+        self._refit_bounds()
+        if self._leaf_area() > self._built_leaf_area * REBUILD_GROWTH:
+            self.rebuild()
+            return True
+        return False
+
+    def item_bounds(self, items: IndexArray) -> tuple[FloatArray, FloatArray]:
+        """Return the bounding boxes of the given items."""
+        half = self.half_extents[items]
+        return self.centers[items] - half, self.centers[items] + half
+
+    def _leaf_items(self, leaves: IndexArray) -> IndexArray:
+        """Expand leaf node ranges into item indices."""
+        counts = self._node_count[leaves]
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.intp)
+        ends = self._node_start[leaves] + counts
+        positions = np.repeat(ends - counts.cumsum(), counts) + np.arange(total)
+        return self._order[positions]
+
+    def _children(self, nodes: IndexArray) -> IndexArray:
+        """Return both children of internal nodes."""
+        left = self._left[nodes]
+        return np.concatenate((left, left + 1))
+
+    def raycast(
+        self,
+        origin: FloatArray,
+        direction: FloatArray,
+        max_distance: float = float("inf"),
+    ) -> RayHit | None:
+        """Return the closest item hit by a ray, within max_distance."""
+        if self.count == 0:
+            return None
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+        safe = np.where(
+            np.abs(direction) < DIRECTION_EPSILON,
+            DIRECTION_EPSILON,
+            direction,
+        )
+        inverse = 1.0 / safe
+
+        if self.flat:
+            items = self._all_items
+            distance, axis = _ray_items(
+                origin,
+                direction,
+                inverse,
+                self.centers,
+                self.half_extents,
+                self.spherical,
+            )
+        else:
+            items = self._ray_candidates(origin, inverse, max_distance)
+            if items.size == 0:
+                return None
+            distance, axis = _ray_items(
+                origin,
+                direction,
+                inverse,
+                self.centers[items],
+                self.half_extents[items],
+                self.spherical[items],
+            )
+
+        best = int(distance.argmin())
+        best_distance = float(distance[best])
+        if not np.isfinite(best_distance) or best_distance > max_distance:
+            return None
+
+        item = int(items[best])
+        point = origin + direction * best_distance
+        if self.spherical[item]:
+            normal = point - self.centers[item]
+        else:
+            normal = np.zeros(3)
+            entry_axis = int(axis[best])
+            normal[entry_axis] = -np.sign(direction[entry_axis])
+        norm = float(np.linalg.norm(normal))
+        return RayHit(
+            index=item,
+            distance=best_distance,
+            point=point,
+            normal=normal / norm if norm > 0.0 else -direction,
+        )
+
+    def _ray_candidates(
+        self,
+        origin: FloatArray,
+        inverse_direction: FloatArray,
+        max_distance: float,
+    ) -> IndexArray:
+        """Return the items in leaves a ray crosses within max_distance."""
+        frontier = np.zeros(1, dtype=np.intp)
+        leaves: list[IndexArray] = []
+        while frontier.size:
+            entry, exit_, _ = _ray_box(
+                origin,
+                inverse_direction,
+                self.node_lower[frontier],
+                self.node_upper[frontier],
+            )
+            hit = frontier[(exit_ >= np.maximum(entry, 0.0)) & (entry <= max_distance)]
+            leaves.append(hit[self._is_leaf[hit]])
+            frontier = self._children(hit[~self._is_leaf[hit]])
+        return self._leaf_items(np.concatenate(leaves))
+
+    def overlap_sphere(self, center: FloatArray, radius: float) -> IndexArray:
+        """Return indices of items that intersect a sphere."""
+        if self.count == 0:
+            return np.empty(0, dtype=np.intp)
+        center = np.asarray(center, dtype=np.float64)
+        if self.flat:
+            return np.flatnonzero(self._surface_distance(center) <= radius)
+
+        frontier = np.zeros(1, dtype=np.intp)
+        leaves: list[IndexArray] = []
+        while frontier.size:
+            near = _point_box_distance(
+                center,
+                self.node_lower[frontier],
+                self.node_upper[frontier],
+            )
+            hit = frontier[near <= radius]
+            leaves.append(hit[self._is_leaf[hit]])
+            frontier = self._children(hit[~self._is_leaf[hit]])
+
+        items = self._leaf_items(np.concatenate(leaves))
+        return items[self._surface_distance(center, items) <= radius]
+
+    def _surface_distance(
+        self,
+        point: FloatArray,
+        items: IndexArray | None = None,
+    ) -> FloatArray:
+        """Return distances from a point to item surfaces (zero inside).
+
+        Without ``items``, every item is measured.
+        """
+        if items is None:
+            return _surface_distances(
+                point,
+                self.centers,
+                self.half_extents,
+                self.spherical,
+            )
+        return _surface_distances(
+            point,
+            self.centers[items],
+            self.half_extents[items],
+            self.spherical[items],
+        )
+
+    def nearest(
+        self,
+        point: FloatArray,
+        max_distance: float = float("inf"),
+    ) -> NearestItem | None:
+        """Return the item whose surface is closest to a point."""
+        if self.count == 0:
+            return None
+        point = np.asarray(point, dtype=np.float64)
+        if self.flat:
+            distance = self._surface_distance(point)
+            best = int(distance.argmin())
+            if float(distance[best]) > max_distance:
+                return None
+            return NearestItem(index=best, distance=float(distance[best]))
+
+        bound = max_distance
+        frontier = np.zeros(1, dtype=np.intp)
+        leaves: list[IndexArray] = []
+        while frontier.size:
+            lower = self.node_lower[frontier]
+            upper = self.node_upper[frontier]
+            near = _point_box_distance(point, lower, upper)
+            # Every item in a box lies within its farthest corner, so that
+            # distance caps the answer and prunes boxes that start beyond it.
+            farthest = np.maximum(np.abs(point - lower), np.abs(upper - point))
+            bound = min(bound, float(np.linalg.norm(farthest, axis=1).min()))
+            hit = frontier[near <= bound]
+            leaves.append(hit[self._is_leaf[hit]])
+            frontier = self._children(hit[~self._is_leaf[hit]])
+
+        items = self._leaf_items(np.concatenate(leaves))
+        if items.size == 0:
+            return None
+        distance = self._surface_distance(point, items)
+        best = int(distance.argmin())
+        if float(distance[best]) > max_distance:
+            return None
+        return NearestItem(index=int(items[best]), distance=float(distance[best]))
+
+
+class SceneQuery:
+    """Queries over a static-world tree and a refit-able dynamic-prop tree."""
+
+    def __init__(
+        self,
+        static: BoundingVolumeHierarchy,
+        dynamic: BoundingVolumeHierarchy,
+        terrain: Heightfield | None = None,
+    ) -> None:
+        """Combine the two trees; item indices stay local to each tree.
+
+        Rays also stop at the terrain surface, reported with index
+        ``TERRAIN_INDEX``.
+        """
+        self.static = static
+        self.dynamic = dynamic
+        self.terrain = terrain
+
+    def raycast(
+        self,
+        origin: FloatArray,
+        direction: FloatArray,
+        max_distance: float = float("inf"),
+    ) -> RayHit | None:
+        """Return the closest terrain, static, or dynamic hit along a ray."""
+        static_hit = self._terrain_raycast(origin, direction, max_distance)
+        limit = max_distance if static_hit is None else static_hit.distance
+        static_hit = self.static.raycast(origin, direction, limit) or static_hit
+        limit = max_distance if static_hit is None else static_hit.distance
+        dynamic_hit = self.dynamic.raycast(origin, direction, limit)
+        if dynamic_hit is not None:
+            return replace(dynamic_hit, dynamic=True)
+        return static_hit
+
+    def _terrain_raycast(
+        self,
+        origin: FloatArray,
+        direction: FloatArray,
+        max_distance: float,
+    ) -> RayHit | None:
+        """Return where a ray meets the terrain, if there is one in range."""
+        if self.terrain is None or not np.isfinite(max_distance):
+            return None
+        unit = np.asarray(direction, dtype=np.float64)
+        unit = unit / np.linalg.norm(unit)
+        distance = self.terrain.raycast(origin, unit, max_distance)
+        if distance is None:
+            return None
+        point = np.asarray(origin, dtype=np.float64) + unit * distance
+        _, normal = self.terrain.sample(point[0:1], point[2:3])
+        return RayHit(
+            index=TERRAIN_INDEX,
+            distance=distance,
+            point=point,
+            normal=normal[0],
+        )
+
+    def overlap_sphere(
+        self,
+        center: FloatArray,
+        radius: float,
+    ) -> tuple[IndexArray, IndexArray]:
+        """Return (static, dynamic) indices of items touching a sphere."""
+        return (
+            self.static.overlap_sphere(center, radius),
+            self.dynamic.overlap_sphere(center, radius),
+        )
+
+    def nearest(
+        self,
+        point: FloatArray,
+        max_distance: float = float("inf"),
+    ) -> NearestItem | None:
+        """Return the closest static or dynamic item to a point."""
+        static_item = self.static.nearest(point, max_distance)
+        limit = max_distance if static_item is None else static_item.distance
+        dynamic_item = self.dynamic.nearest(point, limit)
+        if dynamic_item is not None:
+            return replace(dynamic_item, dynamic=True)
+        return static_item
@@ -0,0 +1,177 @@
+"""Run the headless simulation on its own thread behind a double buffer.
+
+The simulation thread owns a ``Simulation`` outright: it steps it at the
+physics rate and copies each result into the back one of two preallocated
+``WorldFrame`` buffers, then swaps it to the front. The render thread only
+ever reads the front frame, inside ``FrameBuffer.read``; a swap is deferred
+until that read has finished, so neither side sees a frame being overwritten.
+
+Keyboard axes travel the other way through a lock-protected slot. The
+locking is the same on the GIL and free-threaded builds; only the latter lets
+the two threads actually run Python code at the same time.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .simulation import set_player_axes, step_simulation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import NDArray
+
+    from .clock import FixedStepClock
+    from .simulation import Simulation
+
+STOP_TIMEOUT = 1.0
+
+
+@dataclass(slots=True)
+class WorldFrame:
+    """Copy of the simulation's renderable state after one batch of steps."""
+
+    tick: int
+    player_position: NDArray[np.float64]
+    player_heading: NDArray[np.float64]
+    prop_position: NDArray[np.float64]
+    active: NDArray[np.bool_]
+
+
+def create_world_frame(simulation: Simulation) -> WorldFrame:
+    """Allocate a frame sized for the simulation and fill it."""
+    return WorldFrame(
+        tick=simulation.tick,
+        player_position=simulation.vehicles.position.copy(),
+        player_heading=simulation.vehicles.heading.copy(),
+        prop_position=simulation.bodies.position.copy(),
+        active=simulation.active.copy(),
+    )
+
+
+def capture_world_frame(simulation: Simulation, frame: WorldFrame) -> None:
+    """Copy the simulation's current state into an existing frame."""
+    frame.tick = simulation.tick
+    np.copyto(frame.player_position, simulation.vehicles.position)
+    np.copyto(frame.player_heading, simulation.vehicles.heading)
+    np.copyto(frame.prop_position, simulation.bodies.position)
+    np.copyto(frame.active, simulation.active)
+
+
+class FrameBuffer:
+    """Two world frames: one being written, one published for reading."""
+
+    def __init__(self, simulation: Simulation) -> None:
+        """Allocate both frames from the simulation's current state."""
+        self._frames = (create_world_frame(simulation), create_world_frame(simulation))
+        self._front = 0
+        self._reading = False
+        self._swap_pending = False
+        self._condition = threading.Condition()
+        self.published = 0
+
+    @property
+    def back(self) -> WorldFrame:
+        """Return the frame the writer fills; only the writer may call this."""
+        return self._frames[self._front ^ 1]
+
+    def publish(self) -> None:
+        """Swap the filled back frame to the front.
+
+        If a read is in progress the swap is left to the reader, which makes
+        it when the read ends, and this call waits for that. A reader that
+        reads back to back therefore cannot starve the writer.
+        """
+        with self._condition:
+            if self._reading:
+                self._swap_pending = True
+                self._condition.wait_for(lambda: not self._swap_pending)
+            else:
+                self._swap()
+
+    def _swap(self) -> None:
+        """Make the back frame the front one; call with the lock held."""
+        self._front ^= 1
+        self._swap_pending = False
+        self.published += 1
+        self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[WorldFrame]:
+        """Hold the front frame for reading; keep the block short."""
+        with self._condition:
+            self._reading = True
+            frame = self._frames[self._front]
+        try:
+            yield frame
+        finally:
+            with self._condition:
+                self._reading = False
+                if self._swap_pending:
+                    self._swap()
+
+
+class SimulationThread:
+    """Step a simulation in real time on a background thread."""
+
+    def __init__(
+        self,
+        simulation: Simulation,
+        clock: FixedStepClock,
+        player: int = 0,
+    ) -> None:
+        """Prepare the thread; ``clock.step`` may be changed while it runs."""
+        self.simulation = simulation
+        self.clock = clock
+        self.player = player
+        self.buffer = FrameBuffer(simulation)
+        self.batch_times: deque[float] = deque(maxlen=1024)
+        self._axes = (0.0, 0.0, 0.0)
+        self._input_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="fooproj-simulation",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        """Start stepping the simulation."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the thread to finish its current batch and wait for it."""
+        self._stopping.set()
+        if self._thread.is_alive():
+            self._thread.join(STOP_TIMEOUT)
+
+    def set_axes(self, axes: tuple[float, float, float]) -> None:
+        """Hand the latest keyboard axes to the simulation thread."""
+        with self._input_lock:
+            self._axes = axes
+
+    def _run(self) -> None:
+        """Advance the clock by wall time, step, publish, then sleep."""
+        clock = self.clock
+        previous = time.perf_counter()
+        while not self._stopping.is_set():
+            now = time.perf_counter()
+            steps = clock.advance(now - previous)
+            previous = now
+            if steps:
+                with self._input_lock:
+                    axes = self._axes
+                set_player_axes(self.simulation, self.player, axes)
+                self.simulation.step = clock.step
+                for _ in range(steps):
+                    step_simulation(self.simulation)
+                capture_world_frame(self.simulation, self.buffer.back)
+                self.buffer.publish()
+                self.batch_times.append(time.perf_counter() - now)
+            self._stopping.wait(max(clock.step - clock.accumulator, 0.0))
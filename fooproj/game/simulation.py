@@ -0,0 +1,171 @@
+"""Headless simulation of player vehicles and dynamic props.
+
+This is the same vehicle and prop physics the sandbox runs inside Ursina's
+``update`` callbacks, without any entities: players are rows of a batched
+``VehicleState`` and props are rows of ``PropBodies``, both built straight
+from scene blueprints. A dedicated server steps it at a fixed tick.
+"""
+
+from dataclasses import dataclass
+from math import tau
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .physics import (
+    PropBodies,
+    apply_player_impacts,
+    create_prop_bodies,
+    step_prop_bodies,
+)
+from .scene import (
+    compute_prop_mass,
+    compute_prop_radius,
+    is_dynamic_prop,
+    starter_scene_blueprints,
+)
+from .terrain import create_terrain, place_blueprints_on_terrain
+from .vehicle import (
+    CHASSIS_RIDE_HEIGHT,
+    VehicleInputs,
+    VehicleState,
+    compute_vehicle_inputs,
+    create_vehicle_inputs,
+    create_vehicle_state,
+    flat_ground,
+    step_vehicles,
+    vehicle_velocities,
+)
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from .config import GameSettings, VehicleSettings
+    from .scene import EntityBlueprint
+    from .terrain import Heightfield
+
+PLAYER_SPAWN_RADIUS = 6.0
+
+
+@dataclass(slots=True)
+class Simulation:
+    """Player vehicles plus dynamic props, advanced in fixed steps."""
+
+    vehicles: VehicleState
+    inputs: VehicleInputs
+    active: NDArray[np.bool_]
+    bodies: PropBodies
+    vehicle_settings: VehicleSettings
+    step: float
+    terrain: Heightfield | None = None
+    tick: int = 0
+
+    @property
+    def player_count(self) -> int:
+        """Return the number of player slots, active or not."""
+        return self.vehicles.count
+
+
+def player_spawn_positions(count: int) -> NDArray[np.float64]:
+    """Spread player spawn points on a ring around the origin (x, z pairs)."""
+    if count == 1:
+        return np.zeros((1, 2))
+    angle = np.arange(count) * (tau / count)
+    return PLAYER_SPAWN_RADIUS * np.stack((np.sin(angle), np.cos(angle)), axis=1)
+
+
+def load_world(
+    settings: GameSettings,
+) -> tuple[tuple[EntityBlueprint, ...], Heightfield | None]:
+    """Build the scene blueprints and terrain, with props resting on the terrain.
+
+    Every peer of a networked session calls this with the same settings, so
+    prop rows line up between the server's simulation and each client's scene.
+    """
+    blueprints = starter_scene_blueprints(settings.scene.props_per_ring)
+    terrain = create_terrain(settings.terrain)
+    if terrain is not None:
+        blueprints = place_blueprints_on_terrain(blueprints, terrain)
+    return blueprints, terrain
+
+
+def create_blueprint_bodies(blueprints: tuple[EntityBlueprint, ...]) -> PropBodies:
+    """Create prop bodies for every dynamic-prop blueprint, in order."""
+    props = [blueprint for blueprint in blueprints if is_dynamic_prop(blueprint)]
+    return create_prop_bodies(
+        np.array(
+            [(prop.position.x, prop.position.y, prop.position.z) for prop in props],
+        ).reshape(-1, 3),
+        np.array([compute_prop_radius(prop.scale) for prop in props]),
+        np.array([compute_prop_mass(prop.scale) for prop in props]),
+    )
+
+
+def create_simulation(
+    blueprints: tuple[EntityBlueprint, ...],
+    player_count: int,
+    vehicle_settings: VehicleSettings,
+    step: float,
+    terrain: Heightfield | None = None,
+) -> Simulation:
+    """Create a simulation with inactive players parked at their spawns."""
+    spawn = player_spawn_positions(player_count)
+    ground = flat_ground if terrain is None else terrain.heights_at
+    ground_y = ground(spawn[:, 0], spawn[:, 1])
+    vehicles = create_vehicle_state(
+        np.stack(
+            (spawn[:, 0], ground_y + CHASSIS_RIDE_HEIGHT, spawn[:, 1]),
+            axis=1,
+        ),
+        np.zeros(player_count),
+    )
+    return Simulation(
+        vehicles=vehicles,
+        inputs=create_vehicle_inputs(player_count),
+        active=np.zeros(player_count, dtype=np.bool_),
+        bodies=create_blueprint_bodies(blueprints),
+        vehicle_settings=vehicle_settings,
+        step=step,
+        terrain=terrain,
+    )
+
+
+def set_player_axes(
+    simulation: Simulation,
+    player: int,
+    axes: tuple[float, float, float],
+) -> None:
+    """Drive one player from keyboard axes (see ``compute_keyboard_axes``)."""
+    throttle, brake, steer = compute_vehicle_inputs(*axes)
+    simulation.inputs.throttle[player] = throttle
+    simulation.inputs.brake[player] = brake
+    simulation.inputs.steer[player] = steer
+
+
+def step_simulation(simulation: Simulation) -> None:
+    """Advance vehicles, player impacts, and props by one fixed step."""
+    terrain = simulation.terrain
+    step_vehicles(
+        simulation.vehicles,
+        simulation.inputs,
+        simulation.vehicle_settings,
+        simulation.step,
+        flat_ground if terrain is None else terrain.heights_at,
+    )
+
+    vehicles = simulation.vehicles
+    velocities = vehicle_velocities(vehicles)
+    forward = np.stack(
+        (np.sin(vehicles.heading), np.zeros(vehicles.count), np.cos(vehicles.heading)),
+        axis=1,
+    )
+    for player in np.flatnonzero(simulation.active):
+        apply_player_impacts(
+            simulation.bodies,
+            vehicles.position[player],
+            velocities[player],
+            forward[player],
+        )
+
+    step_prop_bodies(simulation.bodies, simulation.step, terrain)
+    simulation.tick += 1
@@ -0,0 +1,245 @@
+"""Export runtime gauges to StatsD or a Prometheus text endpoint.
+
+The main loop only samples: every ``[telemetry] sample_interval`` seconds it
+hands a dict of gauges to ``TelemetryExporter.submit``, which puts it on a
+bounded queue without blocking. When the queue is full (the sink cannot keep
+up) the sample is dropped and counted instead of stalling the frame. A
+background thread drains the queue in batches and writes them to a sink:
+
+- ``StatsdSink`` packs the gauge lines of a batch into as few UDP datagrams
+  as fit ``MAX_DATAGRAM_BYTES``;
+- ``PrometheusSink`` keeps the latest value of every gauge and serves them in
+  the text exposition format from an HTTP server on its own thread.
+"""
+
+import logging
+import queue
+import re
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Protocol
+
+from .config import TELEMETRY_PROTOCOLS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from .config import TelemetrySettings
+
+logger = logging.getLogger(__name__)
+
+type Gauges = Mapping[str, float]
+
+# Fits one Ethernet MTU after IP and UDP headers, as StatsD clients assume.
+MAX_DATAGRAM_BYTES = 1432
+POLL_INTERVAL = 0.25
+STOP_TIMEOUT = 1.0
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+INVALID_NAME_CHARACTERS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def metric_name(prefix: str, name: str) -> str:
+    """Return ``prefix_name`` with characters metric backends reject replaced."""
+    full_name = f"{prefix}_{name}" if prefix else name
+    return INVALID_NAME_CHARACTERS.sub("_", full_name)
+
+
+def format_statsd(samples: Iterable[Gauges], prefix: str) -> list[bytes]:
+    """Pack every gauge of every sample into StatsD datagrams, in order."""
+    datagrams: list[bytes] = []
+    pending = b""
+    for gauges in samples:
+        for name, value in gauges.items():
+            line = f"{metric_name(prefix, name)}:{value:g}|g".encode()
+            if pending and len(pending) + 1 + len(line) > MAX_DATAGRAM_BYTES:
+                datagrams.append(pending)
+                pending = b""
+            pending = line if not pending else pending + b"\n" + line
+    if pending:
+        datagrams.append(pending)
+    return datagrams
+
+
+def format_prometheus(gauges: Gauges, prefix: str) -> str:
+    """Render gauges in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for name, value in sorted(gauges.items()):
+        full_name = metric_name(prefix, name)
+        lines.extend((f"# TYPE {full_name} gauge", f"{full_name} {value:g}"))
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class TelemetrySink(Protocol):
+    """Destination for batches of gauge samples."""
+
+    def write(self, samples: Sequence[Gauges]) -> None:
+        """Deliver a batch of samples, oldest first."""
+
+    def close(self) -> None:
+        """Release sockets and threads."""
+
+
+class StatsdSink:
+    """Send gauges as StatsD lines over UDP."""
+
+    def __init__(self, host: str, port: int, prefix: str) -> None:
+        """Open an unconnected UDP socket for ``host:port``."""
+        self._address = (host, port)
+        self._prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def write(self, samples: Sequence[Gauges]) -> None:
+        """Send the batch; a datagram the OS refuses is lost, like any UDP."""
+        for datagram in format_statsd(samples, self._prefix):
+            try:
+                self._socket.sendto(datagram, self._address)
+            except OSError as error:
+                logger.debug("telemetry: StatsD send failed: %s", error)
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._socket.close()
+
+
+class PrometheusSink:
+    """Serve the latest gauges for Prometheus to scrape."""
+
+    def __init__(self, host: str, port: int, prefix: str) -> None:
+        """Start serving ``/metrics`` on ``host:port`` (port 0 picks one)."""
+        self._prefix = prefix
+        self._latest: dict[str, float] = {}
+        self._lock = threading.Lock()
+        sink = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """Answer every GET with the current exposition text."""
+
+            # http.server dispatches on this exact method name.
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """Write the latest gauges."""
+                body = sink.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            # pylint: disable-next=redefined-builtin
+            def log_message(self, format: str, *args: object) -> None:
+                """Keep scrapes out of the game's output."""
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            args=(POLL_INTERVAL,),
+            name="fooproj-prometheus",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Return the host and port the endpoint listens on."""
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def exposition(self) -> str:
+        """Return the latest gauges as exposition text."""
+        with self._lock:
+            latest = dict(self._latest)
+        return format_prometheus(latest, self._prefix)
+
+    def write(self, samples: Sequence[Gauges]) -> None:
+        """Keep each gauge's most recent value."""
+        with self._lock:
+            for gauges in samples:
+                self._latest.update(gauges)
+
+    def close(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(STOP_TIMEOUT)
+
+
+class TelemetryExporter:
+    """Queue gauge samples on the main loop; write them on a background thread."""
+
+    def __init__(self, sink: TelemetrySink, queue_size: int, batch_size: int) -> None:
+        """Prepare the thread; ``start`` begins draining the queue."""
+        self.sink = sink
+        self.batch_size = max(1, batch_size)
+        self.submitted = 0
+        self.dropped = 0
+        self._queue: queue.Queue[Gauges] = queue.Queue(maxsize=max(1, queue_size))
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="fooproj-telemetry",
+            daemon=True,
+        )
+
+    def submit(self, gauges: Gauges) -> bool:
+        """Queue a sample without blocking; return False if it was dropped."""
+        try:
+            self._queue.put_nowait(gauges)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def start(self) -> None:
+        """Start draining the queue."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write what is still queued, then stop the thread and the sink."""
+        self._stopping.set()
+        if self._thread.is_alive():
+            self._thread.join(STOP_TIMEOUT)
+        self.sink.close()
+
+    def drain(self, limit: int) -> list[Gauges]:
+        """Take up to ``limit`` queued samples without waiting."""
+        batch: list[Gauges] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Wait for a sample, then write it with whatever queued behind it."""
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            self.sink.write([first, *self.drain(self.batch_size - 1)])
+        while batch := self.drain(self.batch_size):
+            self.sink.write(batch)
+
+
+def create_telemetry_exporter(settings: TelemetrySettings) -> TelemetryExporter:
+    """Create an exporter writing to the configured sink (not yet started).
+
+    Raises ``ValueError`` for an unknown protocol.
+    """
+    if settings.protocol == "statsd":
+        sink: TelemetrySink = StatsdSink(
+            settings.host,
+            settings.statsd_port,
+            settings.prefix,
+        )
+    elif settings.protocol == "prometheus":
+        sink = PrometheusSink(settings.host, settings.prometheus_port, settings.prefix)
+    else:
+        choices = ", ".join(TELEMETRY_PROTOCOLS)
+        message = (
+            f"unknown telemetry protocol {settings.protocol!r} (choose from {choices})"
+        )
+        raise ValueError(message)
+    return TelemetryExporter(sink, settings.queue_size, settings.batch_size)
@@ -0,0 +1,477 @@
+"""Chunked heightfield terrain with batched height and normal sampling.
+
+The terrain is a regular grid of heights, generated from layered value noise
+or loaded from a grayscale image. Physics samples it for every body at once:
+``sample`` bilinearly interpolates heights and returns the matching surface
+normals for whole arrays of x/z positions in a handful of NumPy operations.
+Rendering splits the grid into square chunks, each a ``LODNode`` with a few
+progressively coarser static meshes; skirts along chunk edges hide the cracks
+where neighbouring chunks show different levels.
+"""
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+from panda3d.core import (
+    Geom,
+    GeomEnums,
+    GeomNode,
+    GeomTriangles,
+    GeomVertexData,
+    GeomVertexFormat,
+    LODNode,
+    NodePath,
+)
+from PIL import Image
+
+if TYPE_CHECKING:
+    from .config import TerrainSettings
+    from .scene import EntityBlueprint
+
+type FloatArray = NDArray[np.float64]
+
+DEFAULT_OCTAVES = 4
+BASE_NOISE_CELLS = 4
+# Skirts hang this many grid spacings below the chunk edge.
+SKIRT_DEPTH_CELLS = 2.0
+MAX_LOD_LEVELS = 3
+# Switch-out distance for the coarsest level, which never fades out.
+MAX_LOD_DISTANCE = 1.0e6
+
+
+class TerrainError(ValueError):
+    """Raised when a heightmap cannot be loaded or chunked."""
+
+
+@dataclass(frozen=True, slots=True)
+class Heightfield:
+    """Heights on a regular x/z grid; rows run along z, columns along x."""
+
+    heights: FloatArray
+    spacing: float
+    origin_x: float
+    origin_z: float
+
+    @property
+    def rows(self) -> int:
+        """Return the number of samples along z."""
+        return int(self.heights.shape[0])
+
+    @property
+    def columns(self) -> int:
+        """Return the number of samples along x."""
+        return int(self.heights.shape[1])
+
+    def _cells(
+        self,
+        x_pos: FloatArray,
+        z_pos: FloatArray,
+    ) -> tuple[NDArray[np.intp], NDArray[np.intp], FloatArray, FloatArray]:
+        """Return each point's cell (row, column) and offsets inside it."""
+        grid_x = np.clip(
+            (np.asarray(x_pos, dtype=np.float64) - self.origin_x) / self.spacing,
+            0.0,
+            self.columns - 1,
+        )
+        grid_z = np.clip(
+            (np.asarray(z_pos, dtype=np.float64) - self.origin_z) / self.spacing,
+            0.0,
+            self.rows - 1,
+        )
+        column = np.minimum(grid_x.astype(np.intp), self.columns - 2)
+        row = np.minimum(grid_z.astype(np.intp), self.rows - 2)
+        return row, column, grid_x - column, grid_z - row
+
+    def heights_at(self, x_pos: FloatArray, z_pos: FloatArray) -> FloatArray:
+        """Return bilinearly interpolated heights; matches ``GroundSampler``."""
+        row, column, frac_x, frac_z = self._cells(x_pos, z_pos)
+        heights = self.heights
+        near = heights[row, column] + frac_x * (
+            heights[row, column + 1] - heights[row, column]
+        )
+        far = heights[row + 1, column] + frac_x * (
+            heights[row + 1, column + 1] - heights[row + 1, column]
+        )
+        interpolated: FloatArray = near + frac_z * (far - near)
+        return interpolated
+
+    def sample(
+        self,
+        x_pos: FloatArray,
+        z_pos: FloatArray,
+    ) -> tuple[FloatArray, FloatArray]:
+        """Return heights and unit surface normals (shape ``(..., 3)``)."""
+        row, column, frac_x, frac_z = self._cells(x_pos, z_pos)
+        heights = self.heights
+        h00 = heights[row, column]
+        h01 = heights[row, column + 1]
+        h10 = heights[row + 1, column]
+        h11 = heights[row + 1, column + 1]
+        near = h00 + frac_x * (h01 - h00)
+        far = h10 + frac_x * (h11 - h10)
+
+        # Normals are the exact gradient of the same bilinear patch.
+        slope_x = ((h01 - h00) + frac_z * (h11 - h10 - h01 + h00)) / self.spacing
+        slope_z = (far - near) / self.spacing
+        normals = np.stack((-slope_x, np.ones_like(slope_x), -slope_z), axis=-1)
+        normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+        return near + frac_z * (far - near), normals
+
+    def grid_normals(self) -> FloatArray:
+        """Return per-sample normals from central differences, ``(R, C, 3)``."""
+        slope_z, slope_x = np.gradient(self.heights, self.spacing)
+        normals = np.stack(
+            (-slope_x, np.ones_like(slope_x), -slope_z),
+            axis=-1,
+        )
+        normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+        return normals
+
+    def raycast(
+        self,
+        origin: FloatArray,
+        direction: FloatArray,
+        max_distance: float,
+    ) -> float | None:
+        """March a ray at half-cell steps; return where it first dips below."""
+        direction = np.asarray(direction, dtype=np.float64)
+        direction = direction / np.linalg.norm(direction)
+        steps = max(2, int(np.ceil(max_distance / (0.5 * self.spacing))) + 1)
+        distance = np.linspace(0.0, max_distance, steps)
+        points = np.asarray(origin, dtype=np.float64) + distance[:, None] * direction
+        clearance = points[:, 1] - self.heights_at(points[:, 0], points[:, 2])
+        below = np.flatnonzero(clearance < 0.0)
+        if below.size == 0:
+            return None
+
+        first = int(below[0])
+        if first == 0:
+            return 0.0
+        # Interpolate between the last sample above and the first below.
+        above_clearance = clearance[first - 1]
+        fraction = above_clearance / (above_clearance - clearance[first])
+        return float(
+            distance[first - 1] + fraction * (distance[first] - distance[first - 1]),
+        )
+
+
+def _upsample(grid: FloatArray, samples: int) -> FloatArray:
+    """Smoothly interpolate a square noise grid up to ``samples`` per side."""
+    cells = grid.shape[0] - 1
+    coords = np.linspace(0.0, cells, samples)
+    lower = np.minimum(coords.astype(np.intp), cells - 1)
+    fraction = coords - lower
+    fraction = fraction * fraction * (3.0 - 2.0 * fraction)
+    rows = grid[lower] + fraction[:, None] * (grid[lower + 1] - grid[lower])
+    upsampled: FloatArray = rows[:, lower] + fraction[None, :] * (
+        rows[:, lower + 1] - rows[:, lower]
+    )
+    return upsampled
+
+
+# PLR0913 / pylint R0913,R0917: generation knobs mirror TerrainSettings.
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def generate_heightfield(  # noqa: PLR0913
+    size: float,
+    resolution: int,
+    height_scale: float,
+    seed: int = 0,
+    flat_radius: float = 0.0,
+    octaves: int = DEFAULT_OCTAVES,
+) -> Heightfield:
+    """Generate rolling value-noise terrain centred on the origin.
+
+    Heights span roughly ``[-height_scale, height_scale]``; inside
+    ``flat_radius`` of the centre they blend down to zero so the spawn area
+    stays level.
+    """
+    rng = np.random.default_rng(seed)
+    samples = resolution + 1
+    heights = np.zeros((samples, samples))
+    amplitude = 1.0
+    total_amplitude = 0.0
+    for octave in range(octaves):
+        cells = BASE_NOISE_CELLS * 2**octave
+        noise = rng.uniform(-1.0, 1.0, (cells + 1, cells + 1))
+        heights += amplitude * _upsample(noise, samples)
+        total_amplitude += amplitude
+        amplitude *= 0.5
+    heights *= height_scale / total_amplitude
+
+    spacing = size / resolution
+    half = 0.5 * size
+    if flat_radius > 0.0:
+        axis = np.linspace(-half, half, samples)
+        radius = np.hypot(axis[None, :], axis[:, None])
+        blend = np.clip((radius - flat_radius) / flat_radius, 0.0, 1.0)
+        heights *= blend * blend * (3.0 - 2.0 * blend)
+    return Heightfield(
+        heights=heights,
+        spacing=spacing,
+        origin_x=-half,
+        origin_z=-half,
+    )
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def load_heightfield_image(path: Path, size: float, height_scale: float) -> Heightfield:
+    """Load a grayscale heightmap image centred on the origin.
+
+    Black maps to zero and white to ``height_scale``; 16-bit images keep their
+    full precision. The top image row is the far (+z) edge of the terrain.
+    """
+    try:
+        with Image.open(path) as image:
+            full_scale = 65535.0 if image.mode.startswith("I") else 255.0
+            pixels = np.asarray(image.convert("F"), dtype=np.float64)
+    except OSError as error:
+        msg = f"cannot read heightmap {path}: {error}"
+        raise TerrainError(msg) from error
+    if min(pixels.shape) < 2:
+        msg = f"heightmap {path} must be at least 2x2 pixels"
+        raise TerrainError(msg)
+
+    rows, columns = pixels.shape
+    spacing = size / (columns - 1)
+    return Heightfield(
+        heights=pixels[::-1] * (height_scale / full_scale),
+        spacing=spacing,
+        origin_x=-0.5 * size,
+        origin_z=-0.5 * spacing * (rows - 1),
+    )
+
+
+def create_terrain(settings: TerrainSettings) -> Heightfield | None:
+    """Load or generate the terrain heightfield, or None when disabled."""
+    if not settings.enabled:
+        return None
+    if settings.heightmap:
+        return load_heightfield_image(
+            Path(settings.heightmap),
+            settings.size,
+            settings.height_scale,
+        )
+    return generate_heightfield(
+        size=settings.size,
+        resolution=settings.resolution,
+        height_scale=settings.height_scale,
+        seed=settings.seed,
+        flat_radius=settings.flat_radius,
+    )
+
+
+def place_blueprints_on_terrain(
+    blueprints: tuple[EntityBlueprint, ...],
+    terrain: Heightfield,
+) -> tuple[EntityBlueprint, ...]:
+    """Drop the flat ground plane and raise blueprints onto the terrain."""
+    placed = [blueprint for blueprint in blueprints if blueprint.category != "ground"]
+    ground_y = terrain.heights_at(
+        np.array([blueprint.position.x for blueprint in placed]),
+        np.array([blueprint.position.z for blueprint in placed]),
+    )
+    return tuple(
+        replace(
+            blueprint,
+            position=replace(
+                blueprint.position,
+                y=blueprint.position.y + float(height),
+            ),
+        )
+        for blueprint, height in zip(placed, ground_y, strict=True)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkMesh:
+    """Vertex and triangle arrays for one terrain chunk at one LOD."""
+
+    positions: NDArray[np.float32]
+    normals: NDArray[np.float32]
+    texcoords: NDArray[np.float32]
+    triangles: NDArray[np.uint32]
+
+
+def _grid_triangles(rows: int, columns: int) -> NDArray[np.uint32]:
+    """Return two upward-facing triangles per cell of a vertex grid."""
+    row, column = np.meshgrid(
+        np.arange(rows - 1, dtype=np.uint32),
+        np.arange(columns - 1, dtype=np.uint32),
+        indexing="ij",
+    )
+    a = (row * columns + column).reshape(-1)
+    b = a + 1
+    c = a + columns
+    d = c + 1
+    # Same winding as Ursina's procedural plane in its y-up-left system.
+    return np.stack((d, c, a, a, b, d), axis=1).reshape(-1, 3)
+
+
+def _skirt_triangles(ring: NDArray[np.uint32], first_skirt: int) -> NDArray[np.uint32]:
+    """Join an edge ring to its lowered copy, double-sided."""
+    count = ring.size
+    top = ring
+    top_next = np.roll(ring, -1)
+    bottom = np.arange(first_skirt, first_skirt + count, dtype=np.uint32)
+    bottom_next = np.roll(bottom, -1)
+    front = np.stack(
+        (top, bottom, top_next, top_next, bottom, bottom_next),
+        axis=1,
+    ).reshape(-1, 3)
+    return np.concatenate((front, front[:, ::-1]))
+
+
+def build_chunk_mesh(
+    heightfield: Heightfield,
+    normals: FloatArray,
+    origin: tuple[int, int],
+    cells: int,
+    step: int,
+) -> ChunkMesh:
+    """Build one chunk from ``cells`` grid cells at every ``step``-th sample.
+
+    ``origin`` is the chunk's first (row, column) sample and ``normals`` the
+    heightfield's ``grid_normals``.
+    """
+    first_row, first_column = origin
+    last_row = min(first_row + cells, heightfield.rows - 1)
+    last_column = min(first_column + cells, heightfield.columns - 1)
+    rows = np.unique(np.append(np.arange(first_row, last_row, step), last_row))
+    columns = np.unique(
+        np.append(np.arange(first_column, last_column, step), last_column),
+    )
+    grid_row, grid_column = np.meshgrid(rows, columns, indexing="ij")
+    grid_row = grid_row.reshape(-1)
+    grid_column = grid_column.reshape(-1)
+
+    spacing = heightfield.spacing
+    positions = np.stack(
+        (
+            heightfield.origin_x + grid_column * spacing,
+            heightfield.heights[grid_row, grid_column],
+            heightfield.origin_z + grid_row * spacing,
+        ),
+        axis=1,
+    )
+    vertex_normals = normals[grid_row, grid_column]
+    texcoords = np.stack(
+        (
+            grid_column / (heightfield.columns - 1),
+            grid_row / (heightfield.rows - 1),
+        ),
+        axis=1,
+    )
+    triangles = _grid_triangles(rows.size, columns.size)
+
+    # Walk the chunk's edge once around and hang a skirt below it.
+    row_count, column_count = rows.size, columns.size
+    grid_index = np.arange(row_count * column_count, dtype=np.uint32).reshape(
+        row_count,
+        column_count,
+    )
+    ring = np.concatenate(
+        (
+            grid_index[0, :-1],
+            grid_index[:-1, -1],
+            grid_index[-1, :0:-1],
+            grid_index[:0:-1, 0],
+        ),
+    )
+    skirt = positions[ring].copy()
+    skirt[:, 1] -= SKIRT_DEPTH_CELLS * spacing * step
+    triangles = np.concatenate(
+        (triangles, _skirt_triangles(ring, positions.shape[0])),
+    )
+
+    return ChunkMesh(
+        positions=np.concatenate((positions, skirt)).astype(np.float32),
+        normals=np.concatenate((vertex_normals, vertex_normals[ring])).astype(
+            np.float32,
+        ),
+        texcoords=np.concatenate((texcoords, texcoords[ring])).astype(np.float32),
+        triangles=triangles.astype(np.uint32),
+    )
+
+
+def _chunk_geom_node(mesh: ChunkMesh, name: str) -> GeomNode:
+    """Upload one chunk mesh into a static, indexed Panda3D geom."""
+    vertex_count = mesh.positions.shape[0]
+    interleaved = np.empty((vertex_count, 8), dtype=np.float32)
+    interleaved[:, 0:3] = mesh.positions
+    interleaved[:, 3:6] = mesh.normals
+    interleaved[:, 6:8] = mesh.texcoords
+
+    vertex_data = GeomVertexData(name, GeomVertexFormat.getV3n3t2(), Geom.UHStatic)
+    vertex_data.uncleanSetNumRows(vertex_count)
+    memoryview(vertex_data.modifyArray(0)).cast("B")[:] = interleaved.tobytes()
+
+    primitive = GeomTriangles(Geom.UHStatic)
+    primitive.setIndexType(GeomEnums.NT_uint32)
+    index_array = primitive.modifyVertices()
+    index_array.uncleanSetNumRows(mesh.triangles.size)
+    memoryview(index_array).cast("B")[:] = mesh.triangles.tobytes()
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(primitive)
+    geom_node = GeomNode(name)
+    geom_node.addGeom(geom)
+    return geom_node
+
+
+def build_terrain_node(
+    heightfield: Heightfield,
+    chunk_cells: int,
+    lod_distances: tuple[float, ...],
+    name: str = "terrain",
+) -> NodePath:
+    """Build one ``LODNode`` per chunk under a single root node.
+
+    Level ``i`` samples every ``2**i``-th grid point and is shown up to
+    ``lod_distances[i]`` from the camera; the last level has no far limit.
+    """
+    if chunk_cells < 1:
+        msg = f"chunk_cells must be positive, got {chunk_cells}"
+        raise TerrainError(msg)
+
+    normals = heightfield.grid_normals()
+    switches = (0.0, *lod_distances[: MAX_LOD_LEVELS - 1], MAX_LOD_DISTANCE)
+    root = NodePath(name)
+    for first_row in range(0, heightfield.rows - 1, chunk_cells):
+        for first_column in range(0, heightfield.columns - 1, chunk_cells):
+            chunk_name = f"{name}_{first_row}_{first_column}"
+            lod_node = LODNode(chunk_name)
+            lod_path = root.attachNewNode(lod_node)
+            for level in range(len(switches) - 1):
+                mesh = build_chunk_mesh(
+                    heightfield,
+                    normals,
+                    (first_row, first_column),
+                    chunk_cells,
+                    2**level,
+                )
+                lod_path.attachNewNode(
+                    _chunk_geom_node(mesh, f"{chunk_name}_lod{level}"),
+                )
+                lod_node.addSwitch(switches[level + 1], switches[level])
+            last_row = min(first_row + chunk_cells, heightfield.rows - 1)
+            last_column = min(first_column + chunk_cells, heightfield.columns - 1)
+            lod_node.setCenter(
+                (
+                    heightfield.origin_x
+                    + 0.5 * (first_column + last_column) * heightfield.spacing,
+                    float(
+                        heightfield.heights[
+                            first_row : last_row + 1,
+                            first_column : last_column + 1,
+                        ].mean(),
+                    ),
+                    heightfield.origin_z
+                    + 0.5 * (first_row + last_row) * heightfield.spacing,
+                ),
+            )
+    return root
@@ -0,0 +1,289 @@
+"""Batched vehicle-dynamics integrator for the driving sandbox.
+
+All vehicles are stored as arrays so one integration step advances every car
+at once. The model is a planar bicycle model with saturating tyre slip forces,
+driven by throttle/brake/steer inputs, on top of four independent spring-damper
+suspension raycasts placed at the primitive car's wheel offsets.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from math import radians
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .config import VehicleSettings
+
+type FloatArray = NDArray[np.float64]
+type GroundSampler = Callable[[FloatArray, FloatArray], FloatArray]
+
+GRAVITY = 9.81
+LOW_SPEED_FLOOR = 2.0
+REVERSE_SWITCH_SPEED = 0.5
+WHEEL_COUNT = 4
+# Chassis origin height above flat ground for the primitive car prefab.
+CHASSIS_RIDE_HEIGHT = 0.48
+# Wheel x (right) and z (forward) offsets shared with the primitive car prefab.
+WHEEL_OFFSETS: tuple[tuple[float, float], ...] = (
+    (-1.12, 1.55),
+    (1.12, 1.55),
+    (-1.12, -1.55),
+    (1.12, -1.55),
+)
+WHEEL_OFFSET_X = np.array([offset[0] for offset in WHEEL_OFFSETS])
+WHEEL_OFFSET_Z = np.array([offset[1] for offset in WHEEL_OFFSETS])
+FRONT_AXLE_DISTANCE = float(WHEEL_OFFSET_Z[:2].mean())
+REAR_AXLE_DISTANCE = float(-WHEEL_OFFSET_Z[2:].mean())
+
+
+@dataclass(slots=True)
+class VehicleState:
+    """Structure-of-arrays state for a batch of vehicles.
+
+    Headings are radians, clockwise from +z, matching Ursina's ``rotation_y``.
+    Speeds are in the vehicle's local frame: ``forward_speed`` along the
+    heading and ``lateral_speed`` towards the vehicle's right side.
+    """
+
+    position: FloatArray
+    heading: FloatArray
+    forward_speed: FloatArray
+    lateral_speed: FloatArray
+    yaw_rate: FloatArray
+    vertical_speed: FloatArray
+    suspension_compression: FloatArray
+    wheel_load: FloatArray
+    wheel_spin: FloatArray
+    steer_angle: FloatArray
+
+    @property
+    def count(self) -> int:
+        """Return the number of vehicles in the batch."""
+        return int(self.heading.shape[0])
+
+
+@dataclass(slots=True)
+class VehicleInputs:
+    """Per-vehicle driver inputs, each in the range [-1, 1] or [0, 1]."""
+
+    throttle: FloatArray
+    brake: FloatArray
+    steer: FloatArray
+
+
+def flat_ground(x_pos: FloatArray, z_pos: FloatArray) -> FloatArray:
+    """Return ground heights for a flat world at y=0."""
+    return np.zeros(np.broadcast(x_pos, z_pos).shape)
+
+
+def compute_vehicle_inputs(
+    forward_amount: float,
+    strafe_amount: float,
+    turn_amount: float,
+) -> tuple[float, float, float]:
+    """Map keyboard axes to vehicle throttle, brake, and steering inputs."""
+    throttle = max(0.0, forward_amount)
+    brake = max(0.0, -forward_amount)
+    steer = max(-1.0, min(1.0, strafe_amount + turn_amount))
+    return throttle, brake, steer
+
+
+def create_vehicle_state(
+    positions: FloatArray,
+    headings: FloatArray,
+) -> VehicleState:
+    """Create resting state for vehicles at (N, 3) positions and N headings."""
+    count = int(headings.shape[0])
+    return VehicleState(
+        position=np.array(positions, dtype=np.float64).reshape(count, 3),
+        heading=np.array(headings, dtype=np.float64),
+        forward_speed=np.zeros(count),
+        lateral_speed=np.zeros(count),
+        yaw_rate=np.zeros(count),
+        vertical_speed=np.zeros(count),
+        suspension_compression=np.zeros((count, WHEEL_COUNT)),
+        wheel_load=np.zeros((count, WHEEL_COUNT)),
+        wheel_spin=np.zeros((count, WHEEL_COUNT)),
+        steer_angle=np.zeros(count),
+    )
+
+
+def create_vehicle_inputs(count: int) -> VehicleInputs:
+    """Create neutral inputs for a batch of vehicles."""
+    return VehicleInputs(
+        throttle=np.zeros(count),
+        brake=np.zeros(count),
+        steer=np.zeros(count),
+    )
+
+
+def wheel_world_positions(state: VehicleState) -> tuple[FloatArray, FloatArray]:
+    """Return (N, 4) world x/z positions of every wheel contact point."""
+    sin_h = np.sin(state.heading)[:, None]
+    cos_h = np.cos(state.heading)[:, None]
+    wheel_x = state.position[:, 0:1] + WHEEL_OFFSET_X * cos_h + WHEEL_OFFSET_Z * sin_h
+    wheel_z = state.position[:, 2:3] - WHEEL_OFFSET_X * sin_h + WHEEL_OFFSET_Z * cos_h
+    return wheel_x, wheel_z
+
+
+def vehicle_velocities(state: VehicleState) -> FloatArray:
+    """Return (N, 3) world-space velocities from the body-frame speeds."""
+    sin_h = np.sin(state.heading)
+    cos_h = np.cos(state.heading)
+    return np.stack(
+        (
+            state.forward_speed * sin_h + state.lateral_speed * cos_h,
+            state.vertical_speed,
+            state.forward_speed * cos_h - state.lateral_speed * sin_h,
+        ),
+        axis=1,
+    )
+
+
+def _tyre_force(
+    slip_angle: FloatArray,
+    grip: FloatArray,
+    settings: VehicleSettings,
+) -> FloatArray:
+    """Return saturating lateral tyre force from a simplified magic formula."""
+    return -(
+        grip
+        * np.sin(settings.tyre_shape * np.arctan(settings.tyre_stiffness * slip_angle))
+    )
+
+
+def _step_suspension(
+    state: VehicleState,
+    settings: VehicleSettings,
+    dt: float,
+    ground: GroundSampler,
+) -> None:
+    """Cast one ray per wheel and integrate the body's vertical motion."""
+    wheel_x, wheel_z = wheel_world_positions(state)
+    ground_y = ground(wheel_x, wheel_z)
+    ray_length = state.position[:, 1:2] - ground_y - settings.wheel_radius
+    compression = np.clip(
+        settings.suspension_rest_length - ray_length,
+        0.0,
+        settings.suspension_max_travel,
+    )
+    compression_rate = (compression - state.suspension_compression) / dt
+    state.suspension_compression = compression
+
+    in_contact = ray_length < settings.suspension_rest_length
+    spring_force = (
+        settings.suspension_stiffness * compression
+        + settings.suspension_damping * compression_rate
+    )
+    state.wheel_load = np.where(in_contact, np.maximum(spring_force, 0.0), 0.0)
+
+    vertical_accel = state.wheel_load.sum(axis=1) / settings.mass - GRAVITY
+    state.vertical_speed += vertical_accel * dt
+    state.position[:, 1] += state.vertical_speed * dt
+
+    # Bump stops: never let the chassis sink past full suspension travel.
+    floor_y = (ground_y + settings.wheel_radius).max(axis=1) + (
+        settings.suspension_rest_length - settings.suspension_max_travel
+    )
+    bottomed_out = state.position[:, 1] < floor_y
+    state.position[:, 1] = np.where(bottomed_out, floor_y, state.position[:, 1])
+    state.vertical_speed = np.where(
+        bottomed_out,
+        np.maximum(state.vertical_speed, 0.0),
+        state.vertical_speed,
+    )
+
+
+def step_vehicles(
+    state: VehicleState,
+    inputs: VehicleInputs,
+    settings: VehicleSettings,
+    dt: float,
+    ground: GroundSampler = flat_ground,
+) -> None:
+    """Advance every vehicle in the batch by one fixed step in place."""
+    if dt <= 0.0 or state.count == 0:
+        return
+
+    _step_suspension(state, settings, dt, ground)
+
+    front_load = state.wheel_load[:, 0] + state.wheel_load[:, 1]
+    rear_load = state.wheel_load[:, 2] + state.wheel_load[:, 3]
+    forward_speed = state.forward_speed
+    lateral_speed = state.lateral_speed
+    yaw_rate = state.yaw_rate
+
+    # Speed-sensitive steering keeps full keyboard lock drivable at speed.
+    steer_limit = radians(settings.max_steer_angle) / (
+        1.0 + np.abs(forward_speed) / settings.steer_falloff_speed
+    )
+    steer = np.clip(inputs.steer, -1.0, 1.0) * steer_limit
+    direction = np.where(forward_speed >= 0.0, 1.0, -1.0)
+    effective_speed = np.maximum(np.abs(forward_speed), LOW_SPEED_FLOOR)
+    front_slip = (
+        np.arctan2(lateral_speed + FRONT_AXLE_DISTANCE * yaw_rate, effective_speed)
+        - steer * direction
+    )
+    rear_slip = np.arctan2(
+        lateral_speed - REAR_AXLE_DISTANCE * yaw_rate,
+        effective_speed,
+    )
+    # Wider rear tyres give the car a stable, slightly understeering balance.
+    front_grip = settings.tyre_grip * front_load
+    rear_grip = settings.tyre_grip * settings.rear_grip_ratio * rear_load
+    front_lateral = _tyre_force(front_slip, front_grip, settings)
+    rear_lateral = _tyre_force(rear_slip, rear_grip, settings)
+
+    # Brake slows a forward-moving car and drives it in reverse once stopped.
+    throttle = np.clip(inputs.throttle, 0.0, 1.0)
+    brake = np.clip(inputs.brake, 0.0, 1.0)
+    is_braking = forward_speed > REVERSE_SWITCH_SPEED
+    drive_force = np.where(
+        is_braking,
+        throttle * settings.engine_force,
+        throttle * settings.engine_force - brake * settings.reverse_force,
+    )
+    brake_force = np.where(is_braking, brake * settings.brake_force, 0.0)
+
+    # Combined slip: the rear axle's traction budget is shared between
+    # driving force and cornering force.
+    drive_force = np.clip(drive_force, -rear_grip, rear_grip)
+    rear_lateral_limit = np.sqrt(np.maximum(rear_grip**2 - drive_force**2, 0.0))
+    rear_lateral = np.clip(rear_lateral, -rear_lateral_limit, rear_lateral_limit)
+
+    has_traction = (front_load + rear_load) > 0.0
+    resistance = (
+        settings.drag * forward_speed * np.abs(forward_speed)
+        + settings.rolling_resistance * forward_speed * has_traction
+    )
+    longitudinal_force = (
+        drive_force - front_lateral * np.sin(steer) - resistance
+    ) * has_traction
+    longitudinal_force -= np.minimum(
+        brake_force * has_traction,
+        np.abs(forward_speed) * settings.mass / dt,
+    ) * np.sign(forward_speed)
+    lateral_force = front_lateral * np.cos(steer) + rear_lateral
+    yaw_moment = (
+        FRONT_AXLE_DISTANCE * front_lateral * np.cos(steer)
+        - REAR_AXLE_DISTANCE * rear_lateral
+    )
+
+    # Rigid-body equations in the (forward, right, down) body frame.
+    forward_speed += (
+        longitudinal_force / settings.mass + yaw_rate * lateral_speed
+    ) * dt
+    lateral_speed += (lateral_force / settings.mass - yaw_rate * forward_speed) * dt
+    yaw_rate += (yaw_moment / settings.yaw_inertia) * dt
+    state.heading += yaw_rate * dt
+
+    sin_h = np.sin(state.heading)
+    cos_h = np.cos(state.heading)
+    state.position[:, 0] += (forward_speed * sin_h + lateral_speed * cos_h) * dt
+    state.position[:, 2] += (forward_speed * cos_h - lateral_speed * sin_h) * dt
+
+    state.steer_angle = steer
+    state.wheel_spin += (forward_speed / settings.wheel_radius)[:, None] * dt
@@ -0,0 +1,107 @@
+"""Compile shaders and upload the scene before the first timed frame.
+
+Panda3D compiles a shader, creates the sun's shadow buffer, and uploads
+textures and vertex data the first time a frame needs them, so the opening
+frames of a session hitch. ``warm_up_scene`` does that work up front: it
+compiles every Ursina shader in use, prepares the scene graph on the GSG
+(``NodePath.prepareScene``), and renders a few frames so the shadow pass
+and its buffer exist before the game loop starts.
+
+``use_shader_cache`` backs Ursina's in-memory shader sources with files in a
+cache directory and turns on Panda3D's model cache for compiled shaders, so
+drivers that can export program binaries (``GL_ARB_get_program_binary``)
+load them from disk on later runs instead of recompiling.
+"""
+
+import hashlib
+from typing import TYPE_CHECKING, cast
+
+from panda3d.core import BamCache, Filename
+from panda3d.core import Shader as PandaShader
+from ursina.shader import do_shader_includes
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from panda3d.core import GraphicsEngine, GraphicsStateGuardian, NodePath
+    from ursina.shader import Shader
+
+SHADER_STAGES = ("vertex", "fragment", "geometry")
+SOURCE_SUFFIXES = {"vertex": ".vert", "fragment": ".frag", "geometry": ".geom"}
+
+
+def write_shader_sources(shader: Shader, directory: Path) -> dict[str, Path]:
+    """Write a shader's stages to content-addressed files; return them by stage.
+
+    File names carry a hash of the source, so an edited shader gets new files
+    (and a fresh cache entry) instead of a stale binary.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: dict[str, Path] = {}
+    for stage in SHADER_STAGES:
+        source = do_shader_includes(getattr(shader, stage, "") or "")
+        if not source:
+            continue
+        digest = hashlib.sha1(source.encode(), usedforsecurity=False).hexdigest()
+        path = directory / f"{shader.name}_{digest[:12]}{SOURCE_SUFFIXES[stage]}"
+        if not path.exists():
+            path.write_text(source, encoding="utf-8")
+        paths[stage] = path
+    return paths
+
+
+def use_shader_cache(cache_dir: Path, shaders: Iterable[Shader]) -> int:
+    """Cache compiled binaries of the given shaders; return how many were moved.
+
+    Call this before any entity uses the shaders: only shaders that Ursina
+    has not compiled yet are switched to file-backed Panda3D shaders.
+    """
+    cache = BamCache.getGlobalPtr()
+    cache.setRoot(Filename.fromOsSpecific(str(cache_dir)))
+    cache.setActive(True)
+    cache.setCacheCompiledShaders(True)
+    moved = 0
+    for shader in shaders:
+        if shader.compiled or shader.language != PandaShader.SL_GLSL:
+            continue
+        paths = write_shader_sources(shader, cache_dir / "sources")
+        if "vertex" not in paths or "fragment" not in paths:
+            continue
+        stages = {
+            stage: Filename.fromOsSpecific(str(path)) for stage, path in paths.items()
+        }
+        loaded = PandaShader.load(PandaShader.SL_GLSL, **stages)
+        if loaded is None:
+            continue
+        # Ursina's entity shader setter uses the private _shader once
+        # compiled is set. B010: setattr-with-constant; the field is private.
+        setattr(shader, "_shader", loaded)  # noqa: B010
+        shader.compiled = True
+        moved += 1
+    return moved
+
+
+def warm_up_scene(
+    root: NodePath,
+    gsg: GraphicsStateGuardian,
+    engine: GraphicsEngine,
+    shaders: Iterable[Shader],
+    frames: int,
+) -> int:
+    """Compile shaders, prepare ``root`` on the GSG, then render ``frames``.
+
+    Returns how many compiled shaders were prepared.
+    """
+    prepared_objects = gsg.getPreparedObjects()
+    prepared = 0
+    for shader in shaders:
+        if shader.compiled:
+            # B009: getattr-with-constant; Ursina keeps the Panda3D shader private.
+            compiled = cast("PandaShader", getattr(shader, "_shader"))  # noqa: B009
+            compiled.prepareNow(prepared_objects, gsg)
+            prepared += 1
+    root.prepareScene(gsg)
+    for _ in range(frames):
+        engine.renderFrame()
+    return prepared
@@ -0,0 +1,327 @@
+"""Split car wheels out of an imported mesh and turn them in the vertex shader.
+
+An imported car is one static mesh, so its wheels cannot spin or steer on
+their own. At import time ``find_wheels`` tags every mesh vertex with the
+wheel it belongs to (0 for the body, 1-4 for the wheels in ``WHEEL_OFFSETS``
+order):
+
+- faces in OBJ groups named like a wheel (``WHEEL_GROUP_PATTERN``) are
+  wheel faces;
+- otherwise the mesh is split into connected parts, the largest ground-
+  touching disc nearest each wheel offset is taken as the tyre, and every
+  part inside a tyre's bounds (rim, brake disc, wheel nuts) joins it.
+
+Each wheel's parts are assigned to the nearest wheel offset, and the centre
+of their bounds becomes the wheel's pivot. The tags are written to the
+mesh's ``wheel`` vertex column, and ``WHEEL_SHADER`` (Ursina's lit-with-
+shadows shader plus a wheel transform) spins each tagged vertex about its
+pivot's axle and steers the front wheels. The angles come from one small
+uniform array per car (``WheelUniforms``) that is rewritten in place from
+the vehicle state. No wheel nodes exist, so turning the wheels costs no
+scene-graph updates.
+"""
+
+import re
+from dataclasses import dataclass
+from math import tau
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+from panda3d.core import PTA_LVecBase2f, PTA_LVecBase3f
+from ursina.shader import Shader
+from ursina.shaders import lit_with_shadows_shader
+
+from .objimport import build_obj_node, load_obj_mesh
+from .vehicle import WHEEL_COUNT, WHEEL_OFFSETS
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+    from panda3d.core import NodePath
+
+    from .objimport import ObjMesh
+
+type FloatArray = NDArray[np.float64]
+type IndexArray = NDArray[np.int64]
+
+WHEEL_GROUP_PATTERN = re.compile(r"wheel|tire|tyre|rim", re.IGNORECASE)
+STEERED_WHEELS = 2
+# Python tag under which a car node keeps its ``WheelUniforms``.
+WHEELS_TAG = "fooproj_wheels"
+# Vertices closer than this are welded when finding connected parts.
+WELD_DECIMALS = 5
+# A tyre's height and length may differ by this fraction of its diameter.
+DISC_TOLERANCE = 0.1
+# A tyre is narrower than this fraction of its diameter.
+MAX_TYRE_WIDTH = 0.75
+# A tyre's lowest point is within this fraction of the car height of y=0.
+GROUND_TOLERANCE = 0.05
+# Parts poking out of a tyre's bounds by this fraction still belong to it.
+CONTAINMENT_MARGIN = 0.05
+
+WHEEL_VERTEX_SHADER = """#version 150
+uniform struct {
+    vec4 position;
+    vec3 color;
+    vec3 attenuation;
+    vec3 spotDirection;
+    float spotCosCutoff;
+    float spotExponent;
+    sampler2DShadow shadowMap;
+    mat4 shadowViewMatrix;
+} p3d_LightSource[1];
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform mat4 p3d_ModelViewMatrix;
+uniform mat3 p3d_NormalMatrix;
+uniform mat4 p3d_ModelMatrix;
+uniform vec2 texture_scale;
+uniform vec2 texture_offset;
+// Per wheel: pivot in model space, and (spin, steer) angles in radians.
+uniform vec3 wheel_pivots[4];
+uniform vec2 wheel_angles[4];
+
+in vec4 vertex;
+in vec3 normal;
+in vec4 p3d_Color;
+in vec2 p3d_MultiTexCoord0;
+// 0 for the body, 1-4 for the wheel a vertex turns with.
+in float wheel;
+
+out vec2 texcoords;
+out vec4 vertex_color;
+out vec3 vertex_position;
+out vec3 normal_vector;
+out vec4 shadow_coord[1];
+out vec3 vertex_world_position;
+
+void main() {
+    vec4 position = vertex;
+    vec3 model_normal = normal;
+    int index = int(wheel + 0.5) - 1;
+    if (index >= 0) {
+        vec2 angles = wheel_angles[index];
+        float spin_cos = cos(angles.x);
+        float spin_sin = sin(angles.x);
+        float steer_cos = cos(angles.y);
+        float steer_sin = sin(angles.y);
+        // Roll about the axle (x), then turn about the vertical (y).
+        mat3 spin = mat3(1.0, 0.0, 0.0, 0.0, spin_cos, spin_sin, 0.0, -spin_sin, spin_cos);
+        mat3 steer = mat3(steer_cos, 0.0, -steer_sin, 0.0, 1.0, 0.0, steer_sin, 0.0, steer_cos);
+        mat3 turn = steer * spin;
+        vec3 pivot = wheel_pivots[index];
+        position.xyz = turn * (vertex.xyz - pivot) + pivot;
+        model_normal = turn * normal;
+    }
+    gl_Position = p3d_ModelViewProjectionMatrix * position;
+    vertex_position = vec3(p3d_ModelViewMatrix * position);
+    vertex_world_position = (p3d_ModelMatrix * position).xyz;
+    normal_vector = normalize(p3d_NormalMatrix * model_normal);
+    shadow_coord[0] = p3d_LightSource[0].shadowViewMatrix * vec4(vertex_position, 1);
+    texcoords = (p3d_MultiTexCoord0 * texture_scale) + texture_offset;
+    vertex_color = p3d_Color;
+}
+"""
+
+WHEEL_SHADER = Shader(
+    name="lit_with_shadows_wheels_shader",
+    language=Shader.GLSL,
+    vertex=WHEEL_VERTEX_SHADER,
+    fragment=lit_with_shadows_shader.fragment,
+    default_input=dict(lit_with_shadows_shader.default_input),
+    continuous_input=dict(lit_with_shadows_shader.continuous_input),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class WheelSplit:
+    """Wheel tag per mesh vertex and each wheel's pivot in model space."""
+
+    vertex_wheels: NDArray[np.float32]
+    pivots: FloatArray
+    radius: float
+
+
+def mesh_parts(mesh: ObjMesh) -> IndexArray:
+    """Return the connected part of every triangle, welding equal positions.
+
+    Parts are numbered by their lowest welded vertex, so the ids are not
+    contiguous.
+    """
+    _, welded = np.unique(
+        np.round(mesh.positions, WELD_DECIMALS),
+        axis=0,
+        return_inverse=True,
+    )
+    corners = welded.reshape(-1)[mesh.triangles.astype(np.int64)]
+    labels = np.arange(int(welded.max(initial=-1)) + 1)
+    while True:
+        lowest = labels[corners].min(axis=1)
+        merged = labels.copy()
+        for column in range(corners.shape[1]):
+            np.minimum.at(merged, corners[:, column], lowest)
+        merged = merged[merged]
+        if np.array_equal(merged, labels):
+            return labels[corners[:, 0]]
+        labels = merged
+
+
+def part_bounds(
+    mesh: ObjMesh,
+    parts: IndexArray,
+) -> tuple[IndexArray, FloatArray, FloatArray]:
+    """Return each part's id and the min and max corners of its bounds."""
+    ids, triangle_part = np.unique(parts, return_inverse=True)
+    corners = mesh.positions[mesh.triangles].astype(np.float64)
+    lower = np.full((ids.size, 3), np.inf)
+    upper = np.full((ids.size, 3), -np.inf)
+    np.minimum.at(lower, triangle_part, corners.min(axis=1))
+    np.maximum.at(upper, triangle_part, corners.max(axis=1))
+    return ids, lower, upper
+
+
+def nearest_wheel(centers: FloatArray, offsets: FloatArray) -> IndexArray:
+    """Return the wheel offset nearest each centre on the ground plane."""
+    delta = centers[:, None, [0, 2]] - offsets[None, :, :]
+    return np.argmin(np.einsum("ijk,ijk->ij", delta, delta), axis=1)
+
+
+def find_tyres(lower: FloatArray, upper: FloatArray, offsets: FloatArray) -> IndexArray:
+    """Return the tyre part index for each wheel offset, or -1 where none fits."""
+    size = upper - lower
+    diameter = np.maximum(size[:, 1], size[:, 2])
+    height = float(upper[:, 1].max(initial=0.0) - lower[:, 1].min(initial=0.0))
+    is_disc = (
+        (np.abs(size[:, 1] - size[:, 2]) <= DISC_TOLERANCE * diameter)
+        & (size[:, 0] < MAX_TYRE_WIDTH * diameter)
+        & (lower[:, 1] <= GROUND_TOLERANCE * height)
+        & (diameter > 0.0)
+    )
+    wheel = nearest_wheel(0.5 * (lower + upper), offsets)
+    tyres = np.full(offsets.shape[0], -1, dtype=np.int64)
+    for index in range(offsets.shape[0]):
+        candidates = np.flatnonzero(is_disc & (wheel == index))
+        if candidates.size:
+            tyres[index] = candidates[np.argmax(diameter[candidates])]
+    return tyres
+
+
+def find_wheels(
+    mesh: ObjMesh,
+    offsets: tuple[tuple[float, float], ...] = WHEEL_OFFSETS,
+) -> WheelSplit | None:
+    """Tag the mesh vertices of each wheel; return None unless all are found."""
+    wheel_offsets = np.array(offsets, dtype=np.float64)
+    parts = mesh_parts(mesh)
+    ids, lower, upper = part_bounds(mesh, parts)
+    centers = 0.5 * (lower + upper)
+    part_wheel = np.full(ids.size, -1, dtype=np.int64)
+
+    wheel_groups = [
+        group_id
+        for group_id, name in enumerate(mesh.group_names)
+        if WHEEL_GROUP_PATTERN.search(name)
+    ]
+    if wheel_groups:
+        grouped = np.isin(mesh.triangle_groups, wheel_groups)
+        in_group = np.isin(ids, parts[grouped])
+        part_wheel[in_group] = nearest_wheel(centers[in_group], wheel_offsets)
+    else:
+        tyres = find_tyres(lower, upper, wheel_offsets)
+        if (tyres < 0).any():
+            return None
+        for index, tyre in enumerate(tyres):
+            margin = CONTAINMENT_MARGIN * (upper[tyre] - lower[tyre]).max()
+            inside = np.all(
+                (lower >= lower[tyre] - margin) & (upper <= upper[tyre] + margin),
+                axis=1,
+            )
+            part_wheel[inside & (part_wheel < 0)] = index
+
+    pivots = np.zeros((wheel_offsets.shape[0], 3))
+    radii = np.zeros(wheel_offsets.shape[0])
+    for index in range(wheel_offsets.shape[0]):
+        members = part_wheel == index
+        if not members.any():
+            return None
+        wheel_lower = lower[members].min(axis=0)
+        wheel_upper = upper[members].max(axis=0)
+        pivots[index] = 0.5 * (wheel_lower + wheel_upper)
+        radii[index] = 0.5 * float((wheel_upper - wheel_lower)[1:].max())
+
+    triangle_wheel = part_wheel[np.searchsorted(ids, parts)]
+    vertex_wheels = np.zeros(mesh.positions.shape[0], dtype=np.float32)
+    tagged = triangle_wheel >= 0
+    vertex_wheels[mesh.triangles[tagged]] = (triangle_wheel[tagged] + 1)[:, None]
+    return WheelSplit(
+        vertex_wheels=vertex_wheels,
+        pivots=pivots,
+        radius=float(radii.mean()),
+    )
+
+
+class WheelUniforms:
+    """Wheel pivots and angles of one car, bound to its node as shader inputs.
+
+    The arrays are shared with Panda3D, so ``update`` rewrites them in place
+    and the next frame draws the new angles without touching the node.
+    """
+
+    def __init__(self, pivots: FloatArray, radius: float) -> None:
+        """Hold the pivots and mesh wheel radius; wheels start unturned."""
+        self.radius = radius
+        self._pivots = PTA_LVecBase3f.emptyArray(WHEEL_COUNT)
+        self._angles = PTA_LVecBase2f.emptyArray(WHEEL_COUNT)
+        np.asarray(memoryview(self._pivots))[:] = pivots
+        self.angles = np.asarray(memoryview(self._angles))
+
+    def attach(self, node: NodePath) -> None:
+        """Bind the arrays to a car node drawn with ``WHEEL_SHADER``.
+
+        The node keeps this object as a Python tag; see ``wheel_uniforms``.
+        """
+        node.setShaderInput("wheel_pivots", self._pivots)
+        node.setShaderInput("wheel_angles", self._angles)
+        node.setPythonTag(WHEELS_TAG, self)
+
+    def update(
+        self,
+        wheel_spin: FloatArray,
+        steer_angle: float,
+        wheel_radius: float,
+    ) -> None:
+        """Set each wheel's roll angle and the front wheels' steer angle.
+
+        ``wheel_spin`` was integrated for wheels of ``wheel_radius``; it is
+        rescaled so the mesh's wheels roll without slipping.
+        """
+        roll = wheel_spin * (wheel_radius / self.radius)
+        self.angles[:, 0] = np.mod(roll, tau)
+        self.angles[:STEERED_WHEELS, 1] = steer_angle
+
+
+def wheel_uniforms(node: NodePath) -> WheelUniforms | None:
+    """Return the wheel uniforms attached to a car node, if any."""
+    if not node.hasPythonTag(WHEELS_TAG):
+        return None
+    return cast("WheelUniforms", node.getPythonTag(WHEELS_TAG))
+
+
+def load_wheeled_obj(
+    path: Path,
+    target_length: float | None = None,
+    *,
+    flip_winding: bool = False,
+) -> tuple[NodePath, WheelUniforms | None]:
+    """Import an OBJ with its wheels tagged for ``WHEEL_SHADER``.
+
+    Returns the node and the uniforms to ``attach`` to the car drawing it,
+    or no uniforms and an untagged node when the wheels cannot be found.
+    """
+    mesh, materials = load_obj_mesh(path, target_length, flip_winding=flip_winding)
+    split = find_wheels(mesh)
+    if split is None:
+        return build_obj_node(mesh, path.stem, materials), None
+    node = build_obj_node(mesh, path.stem, materials, split.vertex_wheels)
+    return node, WheelUniforms(split.pivots, split.radius)
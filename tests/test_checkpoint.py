@@ -0,0 +1,160 @@
+"""Tests for the binary world-state checkpoint format."""
+
+from unittest import TestCase
+
+import numpy as np
+import ursina
+from ursina import Entity, Vec3, destroy
+from ursina.shaders import unlit_shader
+
+from fooproj.game.checkpoint import (
+    CHECKPOINT_VERSION,
+    HEADER,
+    CheckpointError,
+    WorldCheckpoint,
+    capture_prop_bodies,
+    decode_checkpoint,
+    encode_checkpoint,
+    pack_vehicle_state,
+    restore_prop_bodies,
+    unpack_vehicle_state,
+)
+from fooproj.game.clock import FixedStepClock
+from fooproj.game.materials import MaterialRegistry
+from fooproj.game.physics import create_prop_bodies
+from fooproj.game.runtime import (
+    OrbitControlState,
+    PlayerControls,
+    capture_checkpoint,
+    destroy_world,
+    install_prop_physics_controller,
+    restore_checkpoint,
+    spawn_world_entities,
+)
+from fooproj.game.scene import EntityBlueprint
+from fooproj.game.scene import Vec3 as BlueprintVec3
+from fooproj.game.vehicle import create_vehicle_state
+
+CHECKER = TestCase()
+
+
+def _checkpoint(prop_count: int, view_distance: float | None) -> WorldCheckpoint:
+    """Return a checkpoint with distinct values in every field."""
+    rng = np.random.default_rng(7)
+    vehicle = create_vehicle_state(np.array([[1.0, 0.6, -2.0]]), np.array([0.3]))
+    vehicle.forward_speed[:] = 12.5
+    return WorldCheckpoint(
+        player_position=np.array([1.0, 0.5, -2.0]),
+        player_rotation=np.array([2.0, 17.2, -1.5]),
+        yaw_angle=17.2,
+        pitch_angle=18.0,
+        camera_distance=9.0,
+        view_distance=view_distance,
+        vehicle=pack_vehicle_state(vehicle),
+        prop_position=rng.normal(size=(prop_count, 3)),
+        prop_velocity=rng.normal(size=(prop_count, 3)),
+        prop_sleeping=rng.random(prop_count) < 0.5,
+        prop_rest_steps=rng.integers(0, 30, prop_count, dtype=np.int32),
+    )
+
+
+def test_checkpoint_round_trips_exactly() -> None:
+    """Decode every field bit for bit, including an unset view distance."""
+    for prop_count, view_distance in ((0, None), (13, 7.25)):
+        original = _checkpoint(prop_count, view_distance)
+        decoded = decode_checkpoint(encode_checkpoint(original))
+
+        CHECKER.assertEqual(decoded.view_distance, view_distance)
+        CHECKER.assertEqual(decoded.camera_distance, original.camera_distance)
+        CHECKER.assertEqual(decoded.prop_count, prop_count)
+        for name in (
+            "player_position",
+            "player_rotation",
+            "vehicle",
+            "prop_position",
+            "prop_velocity",
+            "prop_sleeping",
+            "prop_rest_steps",
+        ):
+            np.testing.assert_array_equal(
+                getattr(decoded, name),
+                getattr(original, name),
+            )
+
+
+def test_decode_rejects_foreign_versions_and_truncated_data() -> None:
+    """Raise CheckpointError rather than reading garbage."""
+    data = encode_checkpoint(_checkpoint(5, None))
+    _, _, reserved, count, vehicle_size = HEADER.unpack_from(data)
+    newer = HEADER.pack(b"FPCK", CHECKPOINT_VERSION + 1, reserved, count, vehicle_size)
+    for corrupt, reason in (
+        (b"PNG" + data[3:], "not a fooproj checkpoint"),
+        (newer + data[HEADER.size :], "version"),
+        (data[:-1], "bytes, expected"),
+        (data[:4], "truncated"),
+    ):
+        with CHECKER.assertRaisesRegex(CheckpointError, reason):
+            decode_checkpoint(corrupt)
+
+
+def test_restore_overwrites_bodies_and_vehicle_in_place() -> None:
+    """Copy state into live arrays, mark props moved, and check sizes."""
+    checkpoint = decode_checkpoint(encode_checkpoint(_checkpoint(13, None)))
+    bodies = create_prop_bodies(np.zeros((13, 3)), np.ones(13), np.ones(13))
+    position = bodies.position
+
+    restore_prop_bodies(checkpoint, bodies)
+    CHECKER.assertIs(bodies.position, position)
+    CHECKER.assertTrue(bodies.dirty.all())
+    np.testing.assert_array_equal(
+        capture_prop_bodies(bodies)[2],
+        checkpoint.prop_sleeping,
+    )
+    with CHECKER.assertRaisesRegex(CheckpointError, "13 props"):
+        restore_prop_bodies(
+            checkpoint,
+            create_prop_bodies(np.zeros((2, 3)), np.ones(2), np.ones(2)),
+        )
+
+    vehicle = create_vehicle_state(np.zeros((1, 3)), np.zeros(1))
+    unpack_vehicle_state(checkpoint.vehicle, vehicle)
+    CHECKER.assertEqual(float(vehicle.forward_speed[0]), 12.5)
+    CHECKER.assertAlmostEqual(float(vehicle.heading[0]), 0.3)
+    with CHECKER.assertRaises(CheckpointError):
+        unpack_vehicle_state(checkpoint.vehicle[:-1], vehicle)
+
+
+def test_restoring_a_checkpoint_does_not_count_as_an_impact() -> None:
+    """Teleport the player back beside a crate without knocking it away."""
+    crate = EntityBlueprint(
+        model="cube",
+        color_name="orange",
+        scale=BlueprintVec3(1.0, 1.0, 1.0),
+        position=BlueprintVec3(0.0, 0.5, 0.0),
+        category="prop",
+    )
+    world = spawn_world_entities((crate,), MaterialRegistry(unlit_shader, "unlit", {}))
+    player = Entity(position=Vec3(1.5, 0.5, 0.0))
+    controls = PlayerControls(OrbitControlState(0.0, 20.0, 10.0))
+    controller = install_prop_physics_controller(
+        player,
+        world,
+        FixedStepClock(step=1.0 / 60.0),
+    )
+    frame_dt = getattr(ursina.time, "dt", 0.0)
+    ursina.time.dt = 1.0 / 60.0
+    try:
+        checkpoint = capture_checkpoint(player, controls, world)
+        player.position = Vec3(50.0, 0.5, 0.0)
+        controller.update()
+        restore_checkpoint(checkpoint, player, controls, world)
+        controller.update()
+        bodies = world.bodies
+        CHECKER.assertIsNotNone(bodies)
+        if bodies is not None:
+            np.testing.assert_array_equal(bodies.velocity[0, [0, 2]], [0.0, 0.0])
+    finally:
+        ursina.time.dt = frame_dt
+        destroy(controller)
+        destroy(player)
+        destroy_world(world)
@@ -8,20 +8,117 @@ from unittest import TestCase
 from fooproj import cli
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     import pytest
 
+    from fooproj.game.config import GameSettings
+
 
 CHECKER = TestCase()
 
 
+def _capture_run_game(monkeypatch: pytest.MonkeyPatch) -> list[GameSettings]:
+    """Replace the game runtime with a stub that records its settings."""
+    calls: list[GameSettings] = []
+
+    def fake_run_game(settings: GameSettings) -> None:
+        calls.append(settings)
+
+    monkeypatch.setattr("fooproj.cli.run_game", fake_run_game)
+    return calls
+
+
 def test_main_calls_run_game(monkeypatch: pytest.MonkeyPatch) -> None:
     """Launch the game runtime from the CLI entrypoint."""
-    calls: list[str] = []
+    calls = _capture_run_game(monkeypatch)
+    cli.main([])
 
-    def fake_run_game() -> None:
-        calls.append("run")
+    CHECKER.assertEqual(len(calls), 1)
+    CHECKER.assertEqual(calls[0].render.shadow_map_resolution, 8192)
 
-    monkeypatch.setattr("fooproj.cli.run_game", fake_run_game)
-    cli.main()
 
-    CHECKER.assertEqual(calls, ["run"])
+def test_main_applies_preset_over_config_file(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Let --preset win over the file's preset but keep its overrides."""
+    config_path = tmp_path / "fooproj.toml"
+    config_path.write_text(
+        'preset = "high"\n[physics]\nmax_steps = 3\n',
+        encoding="utf-8",
+    )
+    calls = _capture_run_game(monkeypatch)
+    cli.main(["--preset", "low", "--config", str(config_path)])
+
+    CHECKER.assertEqual(calls[0].render.shadow_map_resolution, 2048)
+    CHECKER.assertEqual(calls[0].physics.max_steps, 3)
+
+
+def test_main_rejects_invalid_config(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Exit with a usage error instead of starting with bad settings."""
+    config_path = tmp_path / "fooproj.toml"
+    config_path.write_text("[render]\nshadow_resolution = 1\n", encoding="utf-8")
+    calls = _capture_run_game(monkeypatch)
+
+    with CHECKER.assertRaises(SystemExit):
+        cli.main(["--config", str(config_path)])
+    CHECKER.assertEqual(calls, [])
+
+
+def test_main_rejects_unknown_telemetry_protocol(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Refuse a misspelt telemetry protocol before opening the window."""
+    config_path = tmp_path / "fooproj.toml"
+    config_path.write_text('[telemetry]\nprotocol = "statds"\n', encoding="utf-8")
+    calls = _capture_run_game(monkeypatch)
+
+    with CHECKER.assertRaises(SystemExit):
+        cli.main(["--config", str(config_path)])
+    CHECKER.assertEqual(calls, [])
+
+
+def test_main_routes_network_modes_with_address_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Start the server or client runtime with --host/--port applied."""
+    calls: list[tuple[str, GameSettings]] = []
+    monkeypatch.setattr(
+        "fooproj.cli.run_server",
+        lambda settings: calls.append(("server", settings)),
+    )
+    monkeypatch.setattr(
+        "fooproj.cli.run_client",
+        lambda settings: calls.append(("client", settings)),
+    )
+    cli.main(["--server", "--port", "47999"])
+    cli.main(["--client", "--host", "10.0.0.2"])
+
+    CHECKER.assertEqual([mode for mode, _ in calls], ["server", "client"])
+    CHECKER.assertEqual(calls[0][1].network.port, 47999)
+    CHECKER.assertEqual(calls[1][1].network.host, "10.0.0.2")
+    with CHECKER.assertRaises(SystemExit):
+        cli.main(["--server", "--client"])
+
+
+def test_main_rejects_too_few_memory_stress_cycles(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Refuse runs too short for the steady-state check to compare cycles."""
+    calls: list[int] = []
+
+    def fake_run_memory_stress(_: GameSettings, cycles: int) -> list[str]:
+        calls.append(cycles)
+        return []
+
+    monkeypatch.setattr("fooproj.cli.run_memory_stress", fake_run_memory_stress)
+    for cycles in ("1", "2"):
+        with CHECKER.assertRaises(SystemExit):
+            cli.main(["--memory-stress", cycles])
+    cli.main(["--memory-stress", "3"])
+    CHECKER.assertEqual(calls, [3])
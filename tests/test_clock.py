@@ -0,0 +1,29 @@
+"""Tests for the fixed-step simulation clock."""
+
+from unittest import TestCase
+
+from fooproj.game.clock import FixedStepClock
+
+CHECKER = TestCase()
+
+
+def test_fixed_step_clock_accumulates_partial_steps() -> None:
+    """Carry leftover frame time over to the next frame."""
+    clock = FixedStepClock(step=0.01)
+    CHECKER.assertEqual(clock.advance(0.015), 1)
+    CHECKER.assertEqual(clock.advance(0.006), 1)
+    CHECKER.assertAlmostEqual(clock.accumulator, 0.001, places=6)
+
+
+def test_fixed_step_clock_caps_steps_after_stall() -> None:
+    """Drop the backlog instead of simulating an unbounded number of steps."""
+    clock = FixedStepClock(step=0.01, max_steps=4)
+    CHECKER.assertEqual(clock.advance(1.0), 4)
+    CHECKER.assertEqual(clock.accumulator, 0.0)
+
+
+def test_fixed_step_clock_ignores_non_positive_dt() -> None:
+    """Return zero steps for paused or invalid frames."""
+    clock = FixedStepClock(step=0.01)
+    CHECKER.assertEqual(clock.advance(0.0), 0)
+    CHECKER.assertEqual(clock.advance(-1.0), 0)
@@ -0,0 +1,88 @@
+"""Tests for quality presets and config-file overrides."""
+
+from unittest import TestCase
+
+from fooproj.game.config import (
+    QUALITY_PRESETS,
+    GameSettings,
+    apply_quality_preset,
+    override_settings,
+)
+
+CHECKER = TestCase()
+
+
+def test_high_preset_matches_defaults() -> None:
+    """Keep the default settings equal to the high preset."""
+    CHECKER.assertEqual(apply_quality_preset(GameSettings(), "high"), GameSettings())
+
+
+def test_low_preset_scales_every_knob_down() -> None:
+    """Lower shadows, physics rate, props, and draw distances together."""
+    low = apply_quality_preset(GameSettings(), "low")
+    default = GameSettings()
+    CHECKER.assertLess(low.render.shadow_map_resolution, 8192)
+    CHECKER.assertLess(low.physics.rate, default.physics.rate)
+    CHECKER.assertLess(low.scene.props_per_ring, default.scene.props_per_ring)
+    CHECKER.assertAlmostEqual(
+        low.culling.draw_distances["prop"],
+        default.culling.draw_distances["prop"]
+        * QUALITY_PRESETS["low"].draw_distance_scale,
+    )
+
+
+def test_bench_preset_disables_vsync() -> None:
+    """Leave the frame rate uncapped for benchmarking."""
+    CHECKER.assertFalse(apply_quality_preset(GameSettings(), "bench").render.vsync)
+
+
+def test_unknown_preset_is_rejected() -> None:
+    """Raise a ValueError naming the bad preset."""
+    with CHECKER.assertRaisesRegex(ValueError, "ultra"):
+        apply_quality_preset(GameSettings(), "ultra")
+
+
+def test_override_settings_converts_whole_numbers_to_float() -> None:
+    """Accept TOML integers for float-valued settings."""
+    settings = override_settings(GameSettings(), {"physics": {"rate": 90}})
+    CHECKER.assertIsInstance(settings.physics.rate, float)
+    CHECKER.assertEqual(settings.physics.rate, 90.0)
+
+
+def test_override_settings_rejects_wrong_types() -> None:
+    """Refuse values whose type does not match the setting."""
+    with CHECKER.assertRaisesRegex(ValueError, "vsync"):
+        override_settings(GameSettings(), {"render": {"vsync": "no"}})
+
+
+def test_bench_preset_disables_frame_governor() -> None:
+    """Keep quality fixed so benchmark runs stay comparable."""
+    CHECKER.assertFalse(apply_quality_preset(GameSettings(), "bench").governor.enabled)
+    CHECKER.assertTrue(GameSettings().governor.enabled)
+
+
+def test_override_settings_merges_tables_into_defaults() -> None:
+    """Keep entries a partial table leaves out and coerce the ones it sets."""
+    default = GameSettings().culling.draw_distances
+    settings = override_settings(
+        GameSettings(),
+        {"culling": {"draw_distances": {"prop": 40}}},
+    )
+    distances = settings.culling.draw_distances
+    CHECKER.assertEqual(distances["prop"], 40.0)
+    CHECKER.assertIsInstance(distances["prop"], float)
+    CHECKER.assertEqual({**default, "prop": 40.0}, dict(distances))
+
+
+def test_override_settings_rejects_bad_table_entries() -> None:
+    """Refuse unknown keys and values of the wrong type inside a table."""
+    with CHECKER.assertRaisesRegex(ValueError, "draw_distances.prop"):
+        override_settings(
+            GameSettings(),
+            {"culling": {"draw_distances": {"prop": "far"}}},
+        )
+    with CHECKER.assertRaisesRegex(ValueError, "'boulder'"):
+        override_settings(
+            GameSettings(),
+            {"culling": {"draw_distances": {"boulder": 10.0}}},
+        )
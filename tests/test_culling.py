@@ -0,0 +1,195 @@
+"""Tests for frustum and draw-distance culling."""
+
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.culling import (
+    CameraFrustum,
+    CullingManager,
+    ShadowCasterCuller,
+    SpatialGrid,
+    build_frustum,
+    frustum_from_planes,
+    spheres_in_frustum,
+)
+
+CHECKER = TestCase()
+
+
+class FakeNode:
+    """Record stash state like a Panda3D node path."""
+
+    def __init__(self) -> None:
+        """Start visible."""
+        self.stashed = False
+
+    def stash(self) -> None:
+        """Hide the node."""
+        self.stashed = True
+
+    def unstash(self) -> None:
+        """Show the node."""
+        self.stashed = False
+
+
+class FakeCaster:
+    """Record shadow-camera visibility like a Panda3D node path."""
+
+    def __init__(self) -> None:
+        """Start drawn for every camera."""
+        self.hidden_mask = 0
+
+    def hide(self, camera_mask: int) -> None:
+        """Hide the node from the masked cameras."""
+        self.hidden_mask |= camera_mask
+
+    def show(self, camera_mask: int) -> None:
+        """Show the node to the masked cameras."""
+        self.hidden_mask &= ~camera_mask
+
+
+def _box_volume(half: float = 10.0) -> tuple[CameraFrustum, float]:
+    """Build an axis-aligned cube volume around the origin from outward planes."""
+    axes = np.eye(3)
+    outward = np.array(
+        [[*(sign * axis), -half] for axis in axes for sign in (1.0, -1.0)],
+    )
+    corners = np.array(
+        [
+            [x_pos, y_pos, z_pos]
+            for x_pos in (-half, half)
+            for y_pos in (-half, half)
+            for z_pos in (-half, half)
+        ],
+    )
+    return frustum_from_planes(corners, outward)
+
+
+def _forward_frustum(far: float = 500.0) -> CameraFrustum:
+    """Build a camera at the origin looking down +z."""
+    return build_frustum(
+        np.zeros(3),
+        forward=np.array([0.0, 0.0, 1.0]),
+        right=np.array([1.0, 0.0, 0.0]),
+        up=np.array([0.0, 1.0, 0.0]),
+        fov=(90.0, 60.0),
+        clip=(0.1, far),
+    )
+
+
+def test_spheres_in_frustum_rejects_behind_and_outside() -> None:
+    """Keep spheres in front and reject ones behind or far to the side."""
+    frustum = _forward_frustum()
+    centers = np.array(
+        [[0.0, 0.0, 10.0], [0.0, 0.0, -10.0], [30.0, 0.0, 10.0], [10.5, 0.0, 10.0]],
+    )
+    inside = spheres_in_frustum(frustum, centers, np.full(4, 1.0))
+    CHECKER.assertEqual(inside.tolist(), [True, False, False, True])
+
+
+def test_spheres_in_frustum_margin_keeps_nearby_casters() -> None:
+    """Grow the frustum by a margin so near off-screen objects survive."""
+    frustum = _forward_frustum()
+    centers = np.array([[0.0, 0.0, -3.0]])
+    CHECKER.assertFalse(bool(spheres_in_frustum(frustum, centers, np.ones(1))[0]))
+    kept = spheres_in_frustum(frustum, centers, np.ones(1), margin=4.0)
+    CHECKER.assertTrue(bool(kept[0]))
+
+
+def test_spatial_grid_query_returns_nearby_cells_only() -> None:
+    """Return points from cells around the query and skip distant ones."""
+    grid = SpatialGrid(cell_size=10.0)
+    far_points = [[-60.0 - offset, 0.0, 3.0] for offset in range(8)]
+    points = np.array(
+        [[1.0, 0.0, 1.0], [-4.0, 0.0, 8.0], [95.0, 0.0, 95.0], *far_points],
+    )
+    grid.rebuild(points)
+    CHECKER.assertEqual(sorted(grid.query(0.0, 0.0, 9.0).tolist()), [0, 1])
+    CHECKER.assertEqual(grid.query(95.0, 95.0, 1.0).tolist(), [2])
+
+
+def test_culling_manager_stashes_far_and_offscreen_entities() -> None:
+    """Stash entities past their category distance or outside the frustum."""
+    nodes = [FakeNode() for _ in range(4)]
+    manager = CullingManager(
+        nodes=nodes,
+        centers=np.array(
+            [[0.0, 0.0, 0.0], [0.0, 0.0, 20.0], [0.0, 0.0, 80.0], [0.0, 0.0, -20.0]],
+        ),
+        radii=np.ones(4),
+        categories=["ground", "prop", "prop", "prop"],
+        draw_distances={"prop": 50.0},
+        cell_size=16.0,
+    )
+    changes = manager.update(_forward_frustum())
+    CHECKER.assertEqual(changes, 2)
+    CHECKER.assertEqual([node.stashed for node in nodes], [False, False, True, True])
+    CHECKER.assertEqual(manager.visible_count, 2)
+
+
+def test_culling_manager_unstashes_moved_entities() -> None:
+    """Show an entity again once it moves back into view."""
+    nodes = [FakeNode()]
+    manager = CullingManager(
+        nodes=nodes,
+        centers=np.array([[0.0, 0.0, -20.0]]),
+        radii=np.ones(1),
+        categories=["prop"],
+        draw_distances={"prop": 50.0},
+        cell_size=16.0,
+    )
+    manager.update(_forward_frustum())
+    CHECKER.assertTrue(nodes[0].stashed)
+    manager.move(np.array([0]), np.array([[0.0, 0.0, 20.0]]))
+    manager.update(_forward_frustum())
+    CHECKER.assertFalse(nodes[0].stashed)
+
+
+def test_culling_manager_scales_draw_distances() -> None:
+    """Hide entities that fall outside a reduced draw distance."""
+    nodes = [FakeNode(), FakeNode()]
+    culler = CullingManager(
+        nodes=nodes,
+        centers=np.array([[0.0, 0.0, 20.0], [0.0, 0.0, 80.0]]),
+        radii=np.array([1.0, 1.0]),
+        categories=["prop", "prop"],
+        draw_distances={"prop": 100.0},
+        cell_size=16.0,
+    )
+    frustum = _forward_frustum()
+    CHECKER.assertEqual(culler.compute_visibility(frustum).tolist(), [True, True])
+    culler.scale_draw_distances(0.5)
+    CHECKER.assertEqual(culler.compute_visibility(frustum).tolist(), [True, False])
+
+
+def test_frustum_from_planes_flips_outward_planes() -> None:
+    """Turn outward planes into an inward frustum centred on the corners."""
+    frustum, radius = _box_volume()
+    CHECKER.assertEqual(frustum.position.tolist(), [0.0, 0.0, 0.0])
+    CHECKER.assertAlmostEqual(radius, float(np.sqrt(300.0)))
+    centers = np.array([[0.0, 0.0, 0.0], [10.5, 0.0, 0.0], [0.0, -12.0, 0.0]])
+    inside = spheres_in_frustum(frustum, centers, np.ones(3))
+    CHECKER.assertEqual(inside.tolist(), [True, True, False])
+
+
+def test_shadow_caster_culler_hides_casters_outside_the_volume() -> None:
+    """Hide out-of-volume casters from the shadow camera and skip non-casters."""
+    nodes = [FakeCaster() for _ in range(4)]
+    casters = ShadowCasterCuller(
+        nodes=nodes,
+        centers=np.array(
+            [[0.0, 0.0, 0.0], [5.0, 0.0, 5.0], [60.0, 0.0, 0.0], [70.0, 0.0, 0.0]],
+        ),
+        radii=np.ones(4),
+        casts_shadow=[False, True, True, True],
+        cell_size=16.0,
+    )
+    frustum, radius = _box_volume()
+    CHECKER.assertEqual(casters.update(frustum, radius), 1)
+    CHECKER.assertEqual([node.hidden_mask for node in nodes], [0, 0, 1, 1])
+
+    casters.move(np.array([0, 2]), np.array([[80.0, 0.0, 0.0], [2.0, 0.0, 0.0]]))
+    CHECKER.assertEqual(casters.update(frustum, radius), 2)
+    CHECKER.assertEqual([node.hidden_mask for node in nodes], [0, 0, 0, 1])
+    CHECKER.assertEqual(casters.caster_count, 2)
@@ -0,0 +1,73 @@
+"""Tests for pooled bulk entity spawning."""
+
+from dataclasses import replace
+from unittest import TestCase
+
+from ursina import Entity, color
+from ursina.shaders import unlit_shader
+
+from fooproj.game.culling import SHADOW_CAMERA_MASK
+from fooproj.game.entitypool import EntityPool
+from fooproj.game.materials import MaterialRegistry
+from fooproj.game.scene import EntityBlueprint, Vec3
+
+CHECKER = TestCase()
+
+
+def _pool() -> EntityPool:
+    """Create a pool over a fresh unlit material registry."""
+    materials = MaterialRegistry(unlit_shader, "unlit", {})
+    return EntityPool(materials, lambda name: getattr(color, name))
+
+
+def _crate(x_pos: float, color_name: str = "orange") -> EntityBlueprint:
+    """Return a 1x2x1 cube blueprint at (x_pos, 1, 4)."""
+    return EntityBlueprint(
+        model="cube",
+        color_name=color_name,
+        scale=Vec3(1.0, 2.0, 1.0),
+        position=Vec3(x_pos, 1.0, 4.0),
+    )
+
+
+def test_spawn_blueprints_places_entities_in_material_groups() -> None:
+    """Spawn in blueprint order with transforms and one group per model."""
+    pool = _pool()
+    blueprints = (
+        _crate(0.0),
+        _crate(3.0, "azure"),
+        replace(_crate(6.0), casts_shadow=False),
+    )
+    entities = pool.spawn_blueprints(blueprints)
+
+    CHECKER.assertEqual(len(entities), 3)
+    CHECKER.assertEqual(entities[1].name, "world_cube_3_4")
+    CHECKER.assertEqual(tuple(entities[2].getPos()), (6.0, 1.0, 4.0))
+    CHECKER.assertEqual(tuple(entities[2].getScale()), (1.0, 2.0, 1.0))
+    CHECKER.assertTrue(all(entity.enabled for entity in entities))
+    parents = {entity.getParent().getName() for entity in entities}
+    CHECKER.assertEqual(parents, {"material_cube_unlit"})
+    CHECKER.assertEqual(entities[0].findAllMatches("**/+GeomNode").getNumPaths(), 1)
+    CHECKER.assertEqual((pool.created, pool.reused), (3, 0))
+    CHECKER.assertFalse(entities[0].isHidden(SHADOW_CAMERA_MASK))
+    CHECKER.assertTrue(entities[2].isHidden(SHADOW_CAMERA_MASK))
+
+
+def test_despawned_entities_are_reused_by_material_and_colour() -> None:
+    """Reuse detached entities only for blueprints of the same kind."""
+    pool = _pool()
+    first = pool.spawn_blueprints((_crate(0.0), _crate(3.0, "azure")))
+    pool.despawn(first)
+    CHECKER.assertEqual(pool.free_count, 2)
+    CHECKER.assertFalse(first[0].hasParent())
+    CHECKER.assertFalse(first[0].enabled)
+
+    second = pool.spawn_blueprints((_crate(9.0), _crate(12.0)))
+    CHECKER.assertIs(second[0], first[0])
+    CHECKER.assertIsNot(second[1], first[1])
+    CHECKER.assertEqual(second[0].name, "world_cube_9_4")
+    CHECKER.assertEqual(tuple(second[0].getPos()), (9.0, 1.0, 4.0))
+    CHECKER.assertEqual((pool.created, pool.reused, pool.free_count), (3, 1, 1))
+
+    with CHECKER.assertRaises(ValueError):
+        pool.despawn([Entity(name="stranger")])
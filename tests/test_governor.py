@@ -0,0 +1,73 @@
+"""Tests for the frame-budget governor's hysteresis."""
+
+from unittest import TestCase
+
+from fooproj.game.governor import (
+    GOVERNOR_LEVELS,
+    MIN_SHADOW_MAP_RESOLUTION,
+    FrameBudgetGovernor,
+    resolve_quality,
+)
+
+CHECKER = TestCase()
+BUDGET_MS = 16.0
+
+
+def _feed(governor: FrameBudgetGovernor, frame_ms: float, seconds: float) -> list[int]:
+    """Feed constant frames for a duration and collect level changes."""
+    changes: list[int] = []
+    dt = frame_ms / 1000.0
+    for _ in range(round(seconds / dt)):
+        level = governor.update(dt)
+        if level is not None:
+            changes.append(level)
+    return changes
+
+
+def test_governor_waits_for_full_window_before_downgrading() -> None:
+    """Ignore a slow spike shorter than the rolling window."""
+    governor = FrameBudgetGovernor(target_ms=BUDGET_MS, window=1.0)
+    _feed(governor, BUDGET_MS, 2.0)
+    CHECKER.assertEqual(_feed(governor, 40.0, 0.2), [])
+    CHECKER.assertEqual(governor.level, 0)
+
+
+def test_governor_steps_down_one_level_per_window() -> None:
+    """Let each downgrade settle for a full window before the next one."""
+    governor = FrameBudgetGovernor(target_ms=BUDGET_MS, window=1.0)
+    CHECKER.assertEqual(_feed(governor, 40.0, 2.1), [1, 2])
+
+
+def test_governor_holds_level_inside_hysteresis_band() -> None:
+    """Neither downgrade nor upgrade between the two thresholds."""
+    governor = FrameBudgetGovernor(target_ms=BUDGET_MS, window=1.0, level=2)
+    CHECKER.assertEqual(_feed(governor, BUDGET_MS * 1.1, 20.0), [])
+
+
+def test_governor_backs_off_after_failed_upgrade() -> None:
+    """Double the upgrade hold for a level that could not keep the budget."""
+    governor = FrameBudgetGovernor(
+        target_ms=BUDGET_MS,
+        window=1.0,
+        upgrade_hold=2.0,
+        level=1,
+    )
+    CHECKER.assertEqual(_feed(governor, BUDGET_MS, 3.5), [0])
+    CHECKER.assertEqual(_feed(governor, 40.0, 0.6), [1])
+    CHECKER.assertEqual(_feed(governor, BUDGET_MS, 3.5), [])
+    CHECKER.assertEqual(_feed(governor, BUDGET_MS, 2.0), [0])
+
+
+def test_resolve_quality_clamps_to_minimums() -> None:
+    """Never drop shadow resolution or physics rate below their floors."""
+    quality = resolve_quality(GOVERNOR_LEVELS[-1], 1024, 40.0)
+    CHECKER.assertEqual(quality.shadow_map_resolution, MIN_SHADOW_MAP_RESOLUTION)
+    CHECKER.assertGreaterEqual(quality.physics_rate, 30.0)
+    CHECKER.assertGreater(quality.shadow_update_interval, 1)
+
+
+def test_governor_ignores_startup_grace_period() -> None:
+    """Skip loading hitches before the first window is measured."""
+    governor = FrameBudgetGovernor(target_ms=BUDGET_MS, startup_grace=2.0)
+    CHECKER.assertEqual(_feed(governor, 250.0, 1.5), [])
+    CHECKER.assertEqual(governor.level, 0)
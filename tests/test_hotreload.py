@@ -0,0 +1,101 @@
+"""Tests for diffing reloaded scene blueprints and applying the diff."""
+
+from dataclasses import replace
+from unittest import TestCase
+
+from ursina.shaders import unlit_shader
+
+from fooproj.game.hotreload import blueprint_identities, diff_blueprints
+from fooproj.game.materials import MaterialRegistry
+from fooproj.game.runtime import (
+    apply_blueprint_diff,
+    destroy_world,
+    spawn_world_entities,
+)
+from fooproj.game.scene import EntityBlueprint, Vec3
+
+CHECKER = TestCase()
+
+CRATE = EntityBlueprint(
+    model="cube",
+    color_name="orange",
+    scale=Vec3(1.0, 1.0, 1.0),
+    position=Vec3(0.0, 0.5, 0.0),
+    category="prop",
+)
+PILLAR = EntityBlueprint(
+    model="cube",
+    color_name="gray",
+    scale=Vec3(1.0, 4.0, 1.0),
+    position=Vec3(10.0, 2.0, 0.0),
+    category="column",
+)
+
+
+def test_diff_matches_blueprints_by_identity() -> None:
+    """Keep, move, respawn, and destroy by name rather than by index."""
+    # Same cell, new height: moved. New colour: destroyed and respawned.
+    raised = replace(CRATE, position=Vec3(0.2, 1.5, 0.1))
+    recoloured = replace(PILLAR, color_name="white")
+    added = replace(CRATE, position=Vec3(20.0, 0.5, 0.0))
+    removed = replace(CRATE, position=Vec3(-20.0, 0.5, 0.0))
+
+    diff = diff_blueprints(
+        (CRATE, PILLAR, removed),
+        (added, recoloured, raised),
+    )
+    CHECKER.assertEqual(diff.kept, ())
+    CHECKER.assertEqual(diff.moved, ((0, 2),))
+    CHECKER.assertEqual(diff.spawned, (0, 1))
+    CHECKER.assertEqual(diff.destroyed, (1, 2))
+    CHECKER.assertFalse(diff.unchanged)
+    CHECKER.assertTrue(diff_blueprints((CRATE, PILLAR), (CRATE, PILLAR)).unchanged)
+
+
+def test_repeated_names_get_numbered_identities() -> None:
+    """Tell apart blueprints that share a model, colour, and cell."""
+    stacked = replace(CRATE, position=Vec3(0.0, 1.5, 0.0))
+    identities = blueprint_identities((CRATE, stacked, PILLAR))
+    CHECKER.assertEqual(len(set(identities)), 3)
+    CHECKER.assertEqual(identities[1], f"{identities[0]}#1")
+
+    diff = diff_blueprints((CRATE, stacked), (CRATE,))
+    CHECKER.assertEqual((diff.kept, diff.destroyed), (((0, 0),), (1,)))
+
+
+def test_apply_diff_reuses_pooled_entities_and_prop_state() -> None:
+    """Carry kept props over and recycle destroyed entities for spawns."""
+    far_crate = replace(CRATE, position=Vec3(20.0, 0.5, 0.0))
+    world = spawn_world_entities(
+        (CRATE, PILLAR, far_crate),
+        MaterialRegistry(unlit_shader, "unlit", {}),
+    )
+    kept_entity, kept_prop = world.entities[0], world.props[0]
+    pillar_entity, doomed = world.entities[1], world.entities[2]
+
+    moved_pillar = replace(PILLAR, position=Vec3(10.0, 3.0, 0.0))
+    new_crate = replace(CRATE, position=Vec3(-20.0, 0.5, 0.0))
+    blueprints = (moved_pillar, CRATE, new_crate)
+    kept_props = apply_blueprint_diff(
+        world,
+        blueprints,
+        diff_blueprints(world.blueprints, blueprints),
+    )
+    try:
+        CHECKER.assertEqual(world.blueprints, blueprints)
+        CHECKER.assertEqual(kept_props, ((0, 1),))
+        CHECKER.assertIs(world.entities[0], pillar_entity)
+        CHECKER.assertAlmostEqual(pillar_entity.getY(), 3.0)
+        CHECKER.assertIs(world.entities[1], kept_entity)
+        CHECKER.assertIs(world.entities[2], doomed)
+        CHECKER.assertAlmostEqual(doomed.getX(), -20.0)
+        CHECKER.assertEqual(world.prop_entity_indices, [0, 1, 2])
+        CHECKER.assertIsNot(world.props[0], kept_prop)
+        CHECKER.assertIs(world.props[1], kept_prop)
+        CHECKER.assertIs(world.props[2].entity, doomed)
+        pool = world.pool
+        CHECKER.assertIsNotNone(pool)
+        if pool is not None:
+            CHECKER.assertEqual((pool.created, pool.reused), (3, 1))
+    finally:
+        destroy_world(world)
@@ -0,0 +1,95 @@
+"""Tests for memory accounting and the steady-state check."""
+
+from dataclasses import replace
+from unittest import TestCase
+
+from panda3d.core import NodePath, Texture
+from ursina.shaders import unlit_shader
+
+from fooproj.game.materials import MaterialRegistry
+from fooproj.game.memory import MemoryReport, measure_memory, steady_state_problems
+from fooproj.game.runtime import (
+    destroy_world,
+    spawn_world_entities,
+    world_entity_counts,
+)
+from fooproj.game.scene import EntityBlueprint, Vec3
+
+CHECKER = TestCase()
+
+
+def _report(python_bytes: int = 1_000_000, node_count: int = 10) -> MemoryReport:
+    """Return a report with fixed sizes apart from the given fields."""
+    return MemoryReport(
+        python_bytes=python_bytes,
+        python_peak_bytes=python_bytes,
+        texture_bytes=0,
+        texture_count=0,
+        geom_bytes=0,
+        geom_count=0,
+        node_count=node_count,
+        entity_count=4,
+    )
+
+
+def test_measure_memory_counts_shared_geometry_and_textures_once() -> None:
+    """Count an instanced model's geom and a shared texture a single time."""
+    root = NodePath("memory_root")
+    model = MaterialRegistry(unlit_shader, "unlit", {}).geometry(
+        "cube",
+        "orange",
+        (1.0, 0.5, 0.0, 1.0),
+    )
+    texture = Texture("checker")
+    texture.setup2dTexture(64, 64, Texture.T_unsigned_byte, Texture.F_rgba8)
+    for index in range(3):
+        holder = root.attachNewNode(f"cube_{index}")
+        model.instanceTo(holder)
+        holder.setTexture(texture)
+
+    report = measure_memory(root, entities_by_category={"prop": 3})
+    single = measure_memory(model)
+
+    CHECKER.assertEqual(report.geom_count, 1)
+    CHECKER.assertGreater(report.geom_bytes, 0)
+    CHECKER.assertEqual(report.geom_bytes, single.geom_bytes)
+    CHECKER.assertEqual(report.texture_count, 1)
+    CHECKER.assertEqual(report.texture_bytes, 64 * 64 * 4)
+    CHECKER.assertEqual(report.counters()["entities_prop"], 3.0)
+
+
+def test_steady_state_problems_report_growth_after_warmup() -> None:
+    """Ignore the warm-up cycle, then flag node and heap growth."""
+    steady = [_report(2_000_000, 30), _report(), _report(1_010_000), _report()]
+    CHECKER.assertEqual(steady_state_problems(steady), [])
+
+    leaking = [_report(), _report(), _report(1_100_000), _report(1_200_000, 12)]
+    problems = steady_state_problems(leaking, python_growth_tolerance=64 * 1024)
+    CHECKER.assertEqual(len(problems), 2)
+    CHECKER.assertIn("node_count grew from 10 to 12", problems)
+    CHECKER.assertIn("Python heap grew", problems[1])
+
+
+def test_destroy_world_removes_entities_and_material_groups() -> None:
+    """Destroy pooled entities and groups and stop counting them."""
+    crate = EntityBlueprint(
+        model="cube",
+        color_name="orange",
+        scale=Vec3(1.0, 1.0, 1.0),
+        position=Vec3(0.0, 0.5, 0.0),
+        category="column",
+    )
+    blueprints = (crate, replace(crate, position=Vec3(3.0, 0.5, 0.0)))
+    world = spawn_world_entities(
+        blueprints,
+        MaterialRegistry(unlit_shader, "unlit", {}),
+    )
+    entities = list(world.entities)
+    group = entities[0].getParent()
+    CHECKER.assertEqual(world_entity_counts(world), {"column": 2})
+
+    destroy_world(world)
+    CHECKER.assertTrue(all(entity.isEmpty() for entity in entities))
+    CHECKER.assertFalse(group.hasParent())
+    CHECKER.assertEqual(world_entity_counts(world), {})
+    CHECKER.assertIsNone(world.materials)
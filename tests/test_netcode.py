@@ -0,0 +1,237 @@
+"""Tests for the snapshot protocol, server, and client."""
+
+from __future__ import annotations
+
+import time
+from math import tau
+from typing import TYPE_CHECKING
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.config import NetworkSettings, VehicleSettings
+from fooproj.game.netcode import (
+    InputRecorder,
+    ProtocolError,
+    SimulationClient,
+    SimulationServer,
+    Snapshot,
+    SnapshotInterpolator,
+    decode_input,
+    decode_snapshot,
+    encode_input,
+    encode_snapshot,
+    load_input_recording,
+    max_snapshot_size,
+    quantize_headings,
+)
+from fooproj.game.scene import EntityBlueprint, Vec3
+from fooproj.game.simulation import create_simulation
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CHECKER = TestCase()
+
+
+def _snapshot(tick: int, players: list[list[int]], props: list[list[int]]) -> Snapshot:
+    """Build a snapshot with every player active."""
+    return Snapshot(
+        tick=tick,
+        players=np.array(players, dtype=np.int32).reshape(-1, 4),
+        props=np.array(props, dtype=np.int32).reshape(-1, 3),
+        active=np.ones(len(players), dtype=np.bool_),
+    )
+
+
+def test_snapshot_delta_round_trips_and_skips_resting_props() -> None:
+    """Rebuild the state from a baseline while sending only changed rows."""
+    rng = np.random.default_rng(5)
+    props = rng.integers(-50_000, 50_000, (200, 3))
+    baseline = _snapshot(10, [[0, 245, 0, 65_530], [4000, 245, 0, 0]], props.tolist())
+    moved = props.copy()
+    moved[7] += (3, -1, 2)
+    current = _snapshot(12, [[40, 245, 90, 4], [4000, 245, 0, 0]], moved.tolist())
+
+    full = encode_snapshot(current, None, 3)
+    delta = encode_snapshot(current, baseline, 3)
+    CHECKER.assertLess(len(delta), 60)
+    CHECKER.assertLess(len(delta), len(full) // 10)
+
+    decoded, input_ack = decode_snapshot(delta, {baseline.tick: baseline})
+    CHECKER.assertEqual(input_ack, 3)
+    CHECKER.assertEqual(decoded.tick, 12)
+    np.testing.assert_array_equal(decoded.players, current.players)
+    np.testing.assert_array_equal(decoded.props, current.props)
+    np.testing.assert_array_equal(decoded.active, current.active)
+
+    decoded_full, _ = decode_snapshot(full, {})
+    np.testing.assert_array_equal(decoded_full.props, current.props)
+    with CHECKER.assertRaises(ProtocolError):
+        decode_snapshot(delta, {})
+    with CHECKER.assertRaises(ProtocolError):
+        decode_snapshot(delta[:-1], {baseline.tick: baseline})
+
+
+def test_quantized_headings_wrap_into_one_turn() -> None:
+    """Map negative and over-full headings to the same angle steps."""
+    headings = quantize_headings(np.array([0.0, -np.pi / 2, 5.0 * np.pi / 2]))
+    CHECKER.assertEqual(headings.tolist(), [0, 49_152, 16_384])
+
+
+def test_input_round_trip_clamps_axes() -> None:
+    """Quantize axes to int8 and clamp out-of-range values."""
+    message = decode_input(encode_input(9, 4, (1.0, -0.5, 3.0)))
+    CHECKER.assertEqual((message.sequence, message.acked_tick), (9, 4))
+    np.testing.assert_allclose(message.axes, (1.0, -0.5, 1.0), atol=1.0 / 127.0)
+
+
+def test_interpolator_blends_positions_and_takes_short_heading_arc() -> None:
+    """Sample halfway between snapshots a fixed delay behind the server."""
+    interpolator = SnapshotInterpolator(tick_rate=10.0, delay=0.1)
+    CHECKER.assertIsNone(interpolator.sample(0.0))
+    interpolator.push(_snapshot(10, [[0, 0, 0, 65_000]], [[0, 0, 0]]), 1.0)
+    interpolator.push(_snapshot(11, [[512, 0, 0, 500]], [[1024, 0, 0]]), 1.1)
+
+    state = interpolator.sample(1.15)
+    CHECKER.assertIsNotNone(state)
+    np.testing.assert_allclose(state.player_positions, [[0.5, 0.0, 0.0]])
+    np.testing.assert_allclose(state.prop_positions, [[1.0, 0.0, 0.0]])
+    expected = (65_000 + (500 + 65_536 - 65_000) / 2) * tau / 65_536
+    CHECKER.assertAlmostEqual(float(state.player_headings[0]), expected)
+
+    latest = interpolator.sample(5.0)
+    np.testing.assert_allclose(latest.player_positions, [[1.0, 0.0, 0.0]])
+
+
+def test_input_recorder_samples_once_per_tick(tmp_path: Path) -> None:
+    """Hold each frame's axes for as many ticks as the frame covered."""
+    recorder = InputRecorder(tick_rate=10.0)
+    recorder.record((1.0, 0.0, 0.0), 0.25)
+    recorder.record((0.0, 0.0, -1.0), 0.1)
+    path = tmp_path / "input.npy"
+    recorder.save(path)
+    recording = load_input_recording(path)
+    CHECKER.assertEqual(recording.shape, (3, 3))
+    CHECKER.assertEqual(recording[:, 0].tolist(), [1.0, 1.0, 0.0])
+
+
+def test_server_streams_snapshots_to_a_loopback_client() -> None:
+    """Join over UDP, drive with input, and track the server's state."""
+    settings = NetworkSettings(port=0, tick_rate=30.0, snapshot_rate=30.0)
+    crate = EntityBlueprint(
+        model="cube",
+        color_name="orange",
+        scale=Vec3(1.0, 1.0, 1.0),
+        position=Vec3(0.0, 0.5, 30.0),
+    )
+    simulation = create_simulation((crate,), 2, VehicleSettings(), 1.0 / 30.0)
+    server = SimulationServer(simulation, settings)
+    host, port = server.address
+    client = SimulationClient(NetworkSettings(host=host, port=port))
+    try:
+        client.send_input((0.0, 0.0, 0.0))
+        server.receive()
+        CHECKER.assertEqual(server.sessions, {})
+
+        deadline = time.perf_counter() + 2.0
+        while client.welcome is None and time.perf_counter() < deadline:
+            server.receive()
+            try:
+                client.connect(timeout=0.05)
+            except TimeoutError:
+                continue
+        CHECKER.assertIsNotNone(client.welcome)
+        CHECKER.assertEqual((client.welcome.slot, client.welcome.prop_count), (0, 1))
+        CHECKER.assertTrue(simulation.active[0])
+
+        for _ in range(30):
+            client.send_input((1.0, 0.0, 0.0))
+            server.step()
+            time.sleep(0.001)
+            client.poll()
+        CHECKER.assertIsNotNone(client.latest)
+        np.testing.assert_allclose(
+            client.latest.players[0, :3] / 512.0,
+            simulation.vehicles.position[0],
+            atol=0.01,
+        )
+        CHECKER.assertGreater(float(simulation.vehicles.forward_speed[0]), 0.0)
+        CHECKER.assertGreater(server.stats.snapshots_sent, 20)
+
+        client.close()
+        server.receive()
+        CHECKER.assertEqual(server.sessions, {})
+        CHECKER.assertFalse(simulation.active[0])
+    finally:
+        server.close()
+
+
+def _crates(count: int) -> tuple[EntityBlueprint, ...]:
+    """Return ``count`` crate blueprints in a row along x."""
+    return tuple(
+        EntityBlueprint(
+            model="cube",
+            color_name="orange",
+            scale=Vec3(1.0, 1.0, 1.0),
+            position=Vec3(float(index), 0.5, 30.0),
+        )
+        for index in range(count)
+    )
+
+
+def test_server_rejects_worlds_whose_snapshots_overflow_a_datagram() -> None:
+    """Refuse at start-up rather than failing to send the first snapshot."""
+    players = 2
+    props = 1
+    while max_snapshot_size(players, props) <= 65507:
+        props += 500
+    full = encode_snapshot(
+        _snapshot(1, [[70_000, 0, 0, 0]] * players, [[70_000, 1, -70_000]] * props),
+        None,
+        0,
+    )
+    CHECKER.assertEqual(len(full), max_snapshot_size(players, props))
+
+    simulation = create_simulation(_crates(props), players, VehicleSettings(), 0.1)
+    with CHECKER.assertRaisesRegex(ValueError, "props_per_ring"):
+        SimulationServer(simulation, NetworkSettings(port=0))
+
+
+def test_client_rejoins_after_the_server_timed_it_out() -> None:
+    """Answer input from a forgotten client so that it says hello again."""
+    now = [0.0]
+    settings = NetworkSettings(port=0, client_timeout=5.0)
+    simulation = create_simulation(_crates(1), 2, VehicleSettings(), 1.0 / 30.0)
+    server = SimulationServer(simulation, settings, clock=lambda: now[0])
+    host, port = server.address
+    client = SimulationClient(NetworkSettings(host=host, port=port))
+    try:
+        deadline = time.perf_counter() + 2.0
+        while client.welcome is None and time.perf_counter() < deadline:
+            server.receive()
+            try:
+                client.connect(timeout=0.05)
+            except TimeoutError:
+                continue
+        CHECKER.assertIsNotNone(client.welcome)
+        # Drain hello retries still in flight before the session times out.
+        time.sleep(0.01)
+        server.receive()
+
+        now[0] = 10.0
+        server.step()
+        CHECKER.assertEqual(server.sessions, {})
+
+        deadline = time.perf_counter() + 2.0
+        while not server.sessions and time.perf_counter() < deadline:
+            client.send_input((1.0, 0.0, 0.0))
+            time.sleep(0.002)
+            server.receive()
+            time.sleep(0.002)
+            client.poll()
+        CHECKER.assertEqual(len(server.sessions), 1)
+        CHECKER.assertTrue(simulation.active[client.welcome.slot])
+    finally:
+        client.close()
+        server.close()
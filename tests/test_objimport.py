@@ -0,0 +1,117 @@
+"""Tests for the memory-mapped OBJ/MTL importer."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.objimport import (
+    ObjImportError,
+    build_obj_node,
+    normalize_mesh,
+    parse_mtl,
+    parse_obj,
+    reverse_winding,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CHECKER = TestCase()
+
+QUAD_AND_TRIANGLE = """\
+mtllib box.mtl
+o body
+v 0 0 0
+v 2 0 0
+v 2 0 4
+v 0 0 4
+v 1 3 2
+vt 0 0 0
+vt 1 0 0
+vt 1 1 0
+vt 0 1 0
+vn 0 1 0
+usemtl paint
+f 1/1/1 2/2/1 3/3/1 4/4/1
+g wheel
+usemtl rubber
+f -5/1/1 -4/2/1 -1/3/1
+"""
+
+
+def _write(tmp_path: Path, name: str, text: str) -> Path:
+    """Write a fixture file and return its path."""
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_parse_obj_triangulates_and_tracks_materials(tmp_path: Path) -> None:
+    """Fan-split quads, resolve negative indices, and tag each triangle."""
+    mesh = parse_obj(_write(tmp_path, "box.obj", QUAD_AND_TRIANGLE))
+    CHECKER.assertEqual(mesh.triangles.shape, (3, 3))
+    CHECKER.assertEqual(mesh.material_library, "box.mtl")
+    materials = [mesh.material_names[index] for index in mesh.triangle_materials]
+    groups = [mesh.group_names[index] for index in mesh.triangle_groups]
+    CHECKER.assertEqual(materials, ["paint", "paint", "rubber"])
+    CHECKER.assertEqual(groups, ["body", "body", "wheel"])
+    apex = mesh.positions[mesh.triangles[2, 2]]
+    CHECKER.assertEqual(apex.tolist(), [1.0, 3.0, 2.0])
+    CHECKER.assertEqual(mesh.bounds_max.tolist(), [2.0, 3.0, 4.0])
+
+
+def test_parse_obj_shares_identical_corners(tmp_path: Path) -> None:
+    """Emit one vertex per distinct position/texcoord/normal triple."""
+    mesh = parse_obj(_write(tmp_path, "box.obj", QUAD_AND_TRIANGLE))
+    CHECKER.assertEqual(mesh.positions.shape[0], 5)
+
+
+def test_parse_obj_computes_missing_normals(tmp_path: Path) -> None:
+    """Fall back to smooth normals when the file has none."""
+    text = "v 0 0 0\nv 0 0 1\nv 1 0 0\nf 1 2 3\n"
+    mesh = parse_obj(_write(tmp_path, "tri.obj", text))
+    np.testing.assert_allclose(mesh.normals, np.tile([0.0, 1.0, 0.0], (3, 1)))
+    CHECKER.assertEqual(mesh.texcoords.shape, (3, 2))
+
+
+def test_parse_obj_rejects_out_of_range_faces(tmp_path: Path) -> None:
+    """Raise ObjImportError for faces that reference missing vertices."""
+    path = _write(tmp_path, "bad.obj", "v 0 0 0\nv 1 0 0\nf 1 2 3\n")
+    with CHECKER.assertRaises(ObjImportError):
+        parse_obj(path)
+
+
+def test_normalize_and_reverse_winding(tmp_path: Path) -> None:
+    """Centre on x/z, rest on y=0, scale length, and flip triangle order."""
+    mesh = parse_obj(_write(tmp_path, "box.obj", QUAD_AND_TRIANGLE))
+    normalized = reverse_winding(normalize_mesh(mesh, target_length=8.0))
+    np.testing.assert_allclose(normalized.bounds_min, [-2.0, 0.0, -4.0])
+    np.testing.assert_allclose(normalized.bounds_max, [2.0, 6.0, 4.0])
+    CHECKER.assertEqual(
+        normalized.triangles[0].tolist(), mesh.triangles[0][::-1].tolist()
+    )
+
+
+def test_parse_mtl_and_build_node(tmp_path: Path) -> None:
+    """Read MTL colours and build one geom per used material."""
+    _write(tmp_path, "box.mtl", "newmtl paint\nKd 1 0 0\nNs 32\nnewmtl rubber\n")
+    mesh = parse_obj(_write(tmp_path, "box.obj", QUAD_AND_TRIANGLE))
+    materials = parse_mtl(tmp_path / "box.mtl")
+    CHECKER.assertEqual(materials["paint"].diffuse, (1.0, 0.0, 0.0))
+    CHECKER.assertEqual(materials["paint"].shininess, 32.0)
+
+    node = build_obj_node(mesh, "box", materials)
+    geom_nodes = node.findAllMatches("**/+GeomNode")
+    CHECKER.assertEqual(geom_nodes.getNumPaths(), 2)
+    vertex_data = geom_nodes[0].node().getGeom(0).getVertexData()
+    CHECKER.assertEqual(vertex_data.getNumRows(), 5)
+
+
+def test_parse_mtl_rejects_malformed_numbers(tmp_path: Path) -> None:
+    """Raise ObjImportError naming the line of a number that does not parse."""
+    _write(tmp_path, "box.mtl", "newmtl paint\nKd 1 zero 0\n")
+    with CHECKER.assertRaisesRegex(ObjImportError, "box.mtl:2"):
+        parse_mtl(tmp_path / "box.mtl")
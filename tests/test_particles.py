@@ -0,0 +1,80 @@
+"""Tests for pooled impact particles."""
+
+from unittest import TestCase
+
+import numpy as np
+from panda3d.core import NodePath
+
+from fooproj.game.particles import (
+    DUST,
+    SPARK_MIN_SPEED,
+    ImpactEffects,
+    ParticleBatch,
+    ParticlePool,
+)
+
+CHECKER = TestCase()
+
+UP = np.array([[0.0, 1.0, 0.0]])
+
+
+def test_particle_pool_overwrites_oldest_when_full() -> None:
+    """Keep capacity fixed and reuse the oldest slots for new bursts."""
+    pool = ParticlePool(DUST, capacity=DUST.burst * 2)
+    origins = np.array([[0.0, 1.0, 0.0], [5.0, 1.0, 0.0], [9.0, 1.0, 0.0]])
+    directions = np.repeat(UP, 3, axis=0)
+    CHECKER.assertEqual(pool.emit(origins, directions), pool.capacity)
+    CHECKER.assertEqual(pool.alive_count, pool.capacity)
+    CHECKER.assertEqual(sorted(set(pool.position[:, 0].tolist())), [5.0, 9.0])
+
+    pool.emit(origins[:1], UP)
+    CHECKER.assertEqual(pool.position.shape, (pool.capacity, 3))
+    CHECKER.assertEqual(sorted(set(pool.position[:, 0].tolist())), [0.0, 9.0])
+
+
+def test_particle_pool_steps_to_the_ground_and_expires() -> None:
+    """Fall under gravity, stop at the ground, and die after their lifetime."""
+    pool = ParticlePool(DUST, capacity=64)
+    pool.emit(np.array([[0.0, 0.2, 0.0]]), UP)
+    for _ in range(30):
+        pool.step(1.0 / 60.0, lambda x_pos, _z: np.full_like(x_pos, 0.1))
+    live = pool.alive
+    CHECKER.assertGreater(int(live.sum()), 0)
+    CHECKER.assertTrue(bool(np.all(pool.position[live, 1] >= 0.1)))
+
+    pool.step(DUST.lifetime)
+    CHECKER.assertEqual(pool.alive_count, 0)
+
+
+def test_particle_batch_draws_live_particles_only() -> None:
+    """Upload one point per live particle into the batch's single geom."""
+    pool = ParticlePool(DUST, capacity=64)
+    batch = ParticleBatch(pool, NodePath("root"))
+    CHECKER.assertEqual(batch.sync(), 0)
+    pool.emit(np.array([[1.0, 2.0, 3.0]]), UP)
+    CHECKER.assertEqual(batch.sync(), DUST.burst)
+    geom = batch.node.node().getGeom(0)
+    CHECKER.assertEqual(geom.getPrimitive(0).getNumVertices(), DUST.burst)
+
+    pool.step(DUST.lifetime)
+    CHECKER.assertEqual(batch.sync(), 0)
+
+
+def test_impact_effects_add_sparks_on_fast_impacts() -> None:
+    """Throw dust on every impact and sparks only at speed."""
+    effects = ImpactEffects(NodePath("root"), dust_capacity=256, spark_capacity=256)
+    props = np.array([[0.0, 0.5, 5.0], [2.0, 0.5, 5.0]])
+    radii = np.array([0.5, 0.5])
+    player = np.zeros(3)
+
+    effects.emit_impacts(props, radii, player, SPARK_MIN_SPEED * 0.5)
+    CHECKER.assertEqual(effects.dust.pool.alive_count, 2 * DUST.burst)
+    CHECKER.assertEqual(effects.sparks.pool.alive_count, 0)
+    CHECKER.assertAlmostEqual(float(effects.dust.pool.position[0, 2]), 4.5)
+
+    effects.emit_impacts(props, radii, player, SPARK_MIN_SPEED)
+    CHECKER.assertGreater(effects.sparks.pool.alive_count, 0)
+    CHECKER.assertEqual(
+        effects.update(1.0 / 60.0),
+        effects.dust.pool.alive_count + effects.sparks.pool.alive_count,
+    )
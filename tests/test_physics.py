@@ -0,0 +1,188 @@
+"""Tests for batched prop physics."""
+
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.physics import (
+    apply_player_impacts,
+    carry_prop_bodies,
+    create_prop_bodies,
+    resolve_ground_contacts,
+    step_prop_bodies,
+)
+from fooproj.game.runtime import take_moved_bodies, write_back_prop_bodies
+from fooproj.game.terrain import Heightfield
+
+CHECKER = TestCase()
+STEP = 1.0 / 120.0
+
+
+def test_resolve_ground_contacts_matches_scalar_rules() -> None:
+    """Clamp sunk props, bounce fast falls, and zero out tiny bounces."""
+    position = np.array([[0.0, 0.1, 0.0], [0.0, 0.1, 0.0], [0.0, 0.8, 0.0]])
+    velocity = np.array([[0.0, -3.0, 0.0], [0.0, -0.5, 0.0], [0.0, 0.2, 0.0]])
+    normal = np.zeros((3, 3))
+    normal[:, 1] = 1.0
+    on_ground = resolve_ground_contacts(
+        position,
+        velocity,
+        np.array([0.45, 0.45, 0.45]),
+        np.zeros(3),
+        normal,
+    )
+    np.testing.assert_allclose(position[:, 1], [0.45, 0.45, 0.8])
+    np.testing.assert_allclose(velocity[:, 1], [1.05, 0.0, 0.2])
+    CHECKER.assertEqual(on_ground.tolist(), [True, True, False])
+
+
+def test_resolve_ground_contacts_bounces_along_slope_normal() -> None:
+    """Reflect velocity about a sloped normal instead of straight up."""
+    normal = np.array([[-0.6, 0.8, 0.0]])
+    position = np.array([[0.0, 0.0, 0.0]])
+    velocity = np.array([[0.0, -5.0, 0.0]])
+    resolve_ground_contacts(position, velocity, np.array([0.4]), np.zeros(1), normal)
+    CHECKER.assertAlmostEqual(float(position[0, 1]), 0.5)
+    # Only the normal component (-4) is reflected and damped.
+    np.testing.assert_allclose(velocity[0], [-0.6 * 5.4, -5.0 + 0.8 * 5.4, 0.0])
+
+
+def test_resting_props_fall_asleep() -> None:
+    """Put props to sleep after they settle on the ground."""
+    bodies = create_prop_bodies(
+        np.array([[0.0, 2.0, 0.0], [5.0, 0.5, 0.0]]),
+        np.array([0.5, 0.5]),
+        np.array([1.0, 1.0]),
+    )
+    for _ in range(240):
+        step_prop_bodies(bodies, STEP)
+    CHECKER.assertTrue(bool(bodies.sleeping.all()))
+    np.testing.assert_allclose(bodies.position[:, 1], [0.5, 0.5])
+
+
+def test_sleeping_props_are_not_integrated() -> None:
+    """Leave sleeping props untouched and clean by a physics step."""
+    bodies = create_prop_bodies(
+        np.array([[0.0, 3.0, 0.0]]),
+        np.array([0.5]),
+        np.array([1.0]),
+    )
+    bodies.sleeping[:] = True
+    step_prop_bodies(bodies, STEP)
+    CHECKER.assertEqual(float(bodies.position[0, 1]), 3.0)
+    CHECKER.assertFalse(bool(bodies.dirty[0]))
+
+
+def test_player_impact_wakes_and_pushes_prop() -> None:
+    """Wake a sleeping prop and push it away from a moving player."""
+    bodies = create_prop_bodies(
+        np.array([[1.0, 0.5, 0.0], [30.0, 0.5, 0.0]]),
+        np.array([0.5, 0.5]),
+        np.array([2.0, 2.0]),
+    )
+    bodies.sleeping[:] = True
+    hit = apply_player_impacts(
+        bodies,
+        player_position=np.zeros(3),
+        player_velocity=np.array([10.0, 0.0, 0.0]),
+        player_forward=np.array([1.0, 0.0, 0.0]),
+    )
+    CHECKER.assertEqual(hit.tolist(), [0])
+    CHECKER.assertFalse(bool(bodies.sleeping[0]))
+    CHECKER.assertTrue(bool(bodies.sleeping[1]))
+    CHECKER.assertGreater(float(bodies.velocity[0, 0]), 0.0)
+    CHECKER.assertGreaterEqual(float(bodies.velocity[0, 1]), 1.6)
+
+
+def test_slow_player_does_not_push_props() -> None:
+    """Ignore contact when the player is essentially stationary."""
+    bodies = create_prop_bodies(
+        np.array([[1.0, 0.5, 0.0]]),
+        np.array([0.5]),
+        np.array([1.0]),
+    )
+    hit = apply_player_impacts(
+        bodies,
+        player_position=np.zeros(3),
+        player_velocity=np.array([0.05, 0.0, 0.0]),
+        player_forward=np.array([1.0, 0.0, 0.0]),
+    )
+    CHECKER.assertEqual(hit.size, 0)
+
+
+def test_player_impacts_only_test_candidates() -> None:
+    """Skip bodies the broad phase did not report as nearby."""
+    bodies = create_prop_bodies(
+        np.array([[1.0, 0.5, 0.0], [0.0, 0.5, 1.0]]),
+        np.array([0.5, 0.5]),
+        np.array([1.0, 1.0]),
+    )
+    hit = apply_player_impacts(
+        bodies,
+        player_position=np.zeros(3),
+        player_velocity=np.array([10.0, 0.0, 0.0]),
+        player_forward=np.array([1.0, 0.0, 0.0]),
+        candidates=np.array([1]),
+    )
+    CHECKER.assertEqual(hit.tolist(), [1])
+    CHECKER.assertEqual(float(bodies.velocity[0, 0]), 0.0)
+
+
+def test_props_settle_on_terrain_height() -> None:
+    """Rest props on the sampled terrain instead of the y=0 plane."""
+    terrain = Heightfield(
+        heights=np.full((3, 3), 2.0),
+        spacing=5.0,
+        origin_x=-5.0,
+        origin_z=-5.0,
+    )
+    bodies = create_prop_bodies(
+        np.array([[0.0, 3.0, 0.0], [4.0, 2.1, -3.0]]),
+        np.array([0.5, 0.5]),
+        np.array([1.0, 1.0]),
+    )
+    for _ in range(240):
+        step_prop_bodies(bodies, STEP, terrain)
+    np.testing.assert_allclose(bodies.position[:, 1], [2.5, 2.5])
+    CHECKER.assertTrue(bool(bodies.sleeping.all()))
+
+
+def test_culled_props_are_indexed_once_while_write_back_waits() -> None:
+    """Hand moved bodies to the indexes once even while they stay dirty."""
+    bodies = create_prop_bodies(
+        np.array([[0.0, 3.0, 0.0], [5.0, 0.5, 0.0]]),
+        np.array([0.5, 0.5]),
+        np.array([1.0, 1.0]),
+    )
+    bodies.sleeping[1] = True
+    step_prop_bodies(bodies, STEP)
+    np.testing.assert_array_equal(take_moved_bodies(bodies), [0])
+
+    hidden = np.zeros(bodies.count, dtype=np.bool_)
+    CHECKER.assertEqual(write_back_prop_bodies([], bodies, hidden), 0)
+    CHECKER.assertTrue(bool(bodies.dirty[0]))
+    CHECKER.assertEqual(take_moved_bodies(bodies).size, 0)
+
+
+def test_carry_prop_bodies_copies_motion_state_by_row() -> None:
+    """Move kept rows' motion into rebuilt bodies, leaving the rest fresh."""
+    old = create_prop_bodies(
+        np.array([[0.0, 3.0, 0.0], [5.0, 0.5, 0.0]]),
+        np.array([0.5, 0.5]),
+        np.array([1.0, 1.0]),
+    )
+    old.velocity[0] = (4.0, 1.0, 0.0)
+    old.sleeping[1] = True
+    old.rest_steps[1] = 7
+    new = create_prop_bodies(
+        np.zeros((3, 3)),
+        np.array([0.5, 0.5, 0.5]),
+        np.array([2.0, 2.0, 2.0]),
+    )
+    carry_prop_bodies(old, new, np.array([0, 1]), np.array([2, 0]))
+    np.testing.assert_allclose(new.position[2], [0.0, 3.0, 0.0])
+    np.testing.assert_allclose(new.velocity[2], [4.0, 1.0, 0.0])
+    CHECKER.assertEqual(new.sleeping.tolist(), [True, False, False])
+    CHECKER.assertEqual(new.rest_steps.tolist(), [7, 0, 0])
+    np.testing.assert_allclose(new.velocity[1], [0.0, 0.0, 0.0])
+    np.testing.assert_allclose(new.mass, [2.0, 2.0, 2.0])
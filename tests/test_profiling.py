@@ -0,0 +1,56 @@
+"""Tests for the runtime profiler's rolling timings and summary."""
+
+from unittest import TestCase
+
+from fooproj.game.profiling import Profiler
+
+CHECKER = TestCase()
+
+
+def test_profiler_keeps_rolling_frame_window() -> None:
+    """Drop frames that fall out of the window from the averages."""
+    profiler = Profiler(frame_window=2)
+    for dt in (0.1, 0.01, 0.03):
+        profiler.record_frame(dt)
+    CHECKER.assertAlmostEqual(profiler.mean_frame_ms(), 20.0)
+    CHECKER.assertAlmostEqual(profiler.worst_frame_ms(), 30.0)
+
+
+def test_profiler_ignores_non_positive_frames() -> None:
+    """Report zero timings until a real frame is recorded."""
+    profiler = Profiler()
+    profiler.record_frame(0.0)
+    CHECKER.assertEqual(profiler.mean_frame_ms(), 0.0)
+    CHECKER.assertEqual(profiler.worst_frame_ms(), 0.0)
+
+
+def test_profiler_summary_lists_counters_and_events() -> None:
+    """Show sorted counters after the frame line and events last."""
+    profiler = Profiler()
+    profiler.record_frame(0.016)
+    profiler.set_counter("state_changes", 12)
+    profiler.set_counter("geoms", 140)
+    profiler.event("shadow map lowered")
+    CHECKER.assertEqual(
+        profiler.summary_lines(),
+        [
+            "frame: 16.00 ms avg, 16.00 ms worst",
+            "geoms: 140",
+            "state_changes: 12",
+            "> shadow map lowered",
+        ],
+    )
+
+
+def test_profiler_keeps_longest_startup_frame() -> None:
+    """Report the worst frame of the start-up window once it has elapsed."""
+    profiler = Profiler(frame_window=2, startup_window=1.0)
+    for dt in (0.02, 0.25, 0.02, 0.5, 0.3, 0.9):
+        profiler.record_frame(dt)
+    CHECKER.assertAlmostEqual(profiler.startup_worst_frame_ms(), 500.0)
+    CHECKER.assertAlmostEqual(profiler.worst_frame_ms(), 900.0)
+    CHECKER.assertEqual(profiler.counters["startup_worst_ms"], 500.0)
+    CHECKER.assertEqual(
+        list(profiler.events),
+        ["longest frame in first 1 s: 500.0 ms"],
+    )
@@ -2,16 +2,25 @@
 
 from unittest import TestCase
 
+import numpy as np
 from ursina import Vec3
 
 from fooproj.game.runtime import (
     compute_keyboard_axes,
     compute_look_angles,
+    compute_occluded_distance,
     compute_player_velocity,
-    compute_prop_mass,
+    compute_vehicle_inputs,
+    compute_vehicle_tilt,
+    compute_view_distance,
     compute_zoom_distance,
     resolve_ground_contact,
 )
+from fooproj.game.scene import EntityBlueprint, compute_prop_mass
+from fooproj.game.scene import Vec3 as BlueprintVec3
+from fooproj.game.scenequery import BoundingVolumeHierarchy, SceneQuery
+from fooproj.game.terrain import Heightfield, place_blueprints_on_terrain
+from fooproj.game.vehicle import create_vehicle_state
 
 CHECKER = TestCase()
 
@@ -36,6 +45,20 @@ def test_compute_keyboard_axes_combines_opposites() -> None:
     CHECKER.assertEqual(axes, (0.75, 0.5, 0.75))
 
 
+def test_compute_vehicle_inputs_splits_forward_axis() -> None:
+    """Map forward to throttle and backward to brake/reverse."""
+    CHECKER.assertEqual(compute_vehicle_inputs(1.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    CHECKER.assertEqual(compute_vehicle_inputs(-0.5, 0.0, 0.0), (0.0, 0.5, 0.0))
+
+
+def test_compute_vehicle_inputs_clamps_combined_steering() -> None:
+    """Combine strafe and turn keys into one clamped steering input."""
+    _, _, steer = compute_vehicle_inputs(0.0, 1.0, 1.0)
+    _, _, counter_steer = compute_vehicle_inputs(0.0, -1.0, 1.0)
+    CHECKER.assertEqual(steer, 1.0)
+    CHECKER.assertEqual(counter_steer, 0.0)
+
+
 def test_compute_look_angles_updates_yaw_and_pitch() -> None:
     """Apply mouse velocity to both yaw and pitch."""
     yaw, pitch = compute_look_angles(10.0, 15.0, Vec3(0.2, -0.1, 0.0), 100.0)
@@ -116,3 +139,73 @@ def test_compute_prop_mass_scales_with_size() -> None:
     small = compute_prop_mass(Vec3(0.8, 0.8, 0.8))
     large = compute_prop_mass(Vec3(1.0, 2.5, 1.0))
     CHECKER.assertGreater(large, small)
+
+
+def test_compute_view_distance_snaps_in_and_eases_out() -> None:
+    """Pull the camera in immediately but return it gradually."""
+    CHECKER.assertEqual(compute_view_distance(None, 10.0, 12.0, 0.1), 10.0)
+    CHECKER.assertEqual(compute_view_distance(10.0, 3.0, 12.0, 0.1), 3.0)
+    CHECKER.assertAlmostEqual(compute_view_distance(3.0, 10.0, 12.0, 0.1), 4.2)
+    CHECKER.assertEqual(compute_view_distance(9.5, 10.0, 12.0, 0.1), 10.0)
+
+
+def test_compute_occluded_distance_stops_before_blocker() -> None:
+    """Keep the camera padded in front of geometry between it and the pivot."""
+    query = SceneQuery(
+        static=BoundingVolumeHierarchy(np.empty((0, 3)), np.empty((0, 3))),
+        dynamic=BoundingVolumeHierarchy(
+            centers=np.array([[0.0, 0.0, -6.0]]),
+            half_extents=np.array([[1.0, 1.0, 1.0]]),
+        ),
+    )
+    back = np.array([0.0, 0.0, -1.0])
+    distance = compute_occluded_distance(query, np.zeros(3), back, 10.0, 0.3)
+    CHECKER.assertAlmostEqual(distance, 4.7)
+    CHECKER.assertIsNone(
+        compute_occluded_distance(query, np.zeros(3), -back, 10.0, 0.3),
+    )
+
+
+def _ramp(rise_per_unit: float) -> Heightfield:
+    """Return terrain rising by ``rise_per_unit`` towards +z."""
+    axis = np.arange(-10.0, 11.0, 5.0)
+    heights = np.broadcast_to(rise_per_unit * axis[:, None], (5, 5)).copy()
+    return Heightfield(heights=heights, spacing=5.0, origin_x=-10.0, origin_z=-10.0)
+
+
+def test_compute_vehicle_tilt_follows_slope_under_wheels() -> None:
+    """Raise the nose uphill and stay level across a flat side slope."""
+    ramp = _ramp(0.25)
+    state = create_vehicle_state(np.zeros((1, 3)), np.zeros(1))
+    rotation_x, rotation_z = compute_vehicle_tilt(state, ramp.heights_at)
+    CHECKER.assertAlmostEqual(float(rotation_x[0]), -np.degrees(np.arctan(0.25)))
+    CHECKER.assertAlmostEqual(float(rotation_z[0]), 0.0)
+
+    # Facing +x (heading 90 degrees) the same ramp rises to the car's left.
+    state = create_vehicle_state(np.zeros((1, 3)), np.array([np.pi / 2.0]))
+    rotation_x, rotation_z = compute_vehicle_tilt(state, ramp.heights_at)
+    CHECKER.assertAlmostEqual(float(rotation_x[0]), 0.0)
+    CHECKER.assertAlmostEqual(float(rotation_z[0]), np.degrees(np.arctan(0.25)))
+
+
+def test_place_blueprints_on_terrain_drops_flat_ground() -> None:
+    """Replace the ground plane and lift blueprints by the terrain height."""
+    blueprints = (
+        EntityBlueprint(
+            model="plane",
+            color_name="gray",
+            scale=BlueprintVec3(10.0, 1.0, 10.0),
+            position=BlueprintVec3(0.0, 0.0, 0.0),
+            category="ground",
+        ),
+        EntityBlueprint(
+            model="cube",
+            color_name="red",
+            scale=BlueprintVec3(1.0, 2.0, 1.0),
+            position=BlueprintVec3(3.0, 1.0, 8.0),
+        ),
+    )
+    placed = place_blueprints_on_terrain(blueprints, _ramp(0.25))
+    CHECKER.assertEqual(len(placed), 1)
+    CHECKER.assertAlmostEqual(placed[0].position.y, 3.0)
+    CHECKER.assertEqual(placed[0].position.x, 3.0)
@@ -34,3 +34,21 @@ def test_starter_scene_spans_large_distances() -> None:
         for blueprint in blueprints
     )
     CHECKER.assertGreaterEqual(max_axis_distance, 110.0)
+
+
+def test_starter_scene_categories() -> None:
+    """Tag every blueprint with the category culling and shadows key off."""
+    blueprints = starter_scene_blueprints()
+    categories = {blueprint.category for blueprint in blueprints}
+    CHECKER.assertEqual(blueprints[0].category, "ground")
+    CHECKER.assertEqual(categories, {"ground", "column", "prop", "landmark"})
+    casters = [blueprint for blueprint in blueprints if blueprint.casts_shadow]
+    CHECKER.assertFalse(blueprints[0].casts_shadow)
+    CHECKER.assertEqual(len(casters), len(blueprints) - 1)
+
+
+def test_starter_scene_props_per_ring() -> None:
+    """Scale the number of orbital props with the requested ring density."""
+    sparse = starter_scene_blueprints(props_per_ring=8)
+    dense = starter_scene_blueprints(props_per_ring=40)
+    CHECKER.assertEqual(len(dense) - len(sparse), 5 * (40 - 8))
@@ -0,0 +1,198 @@
+"""Tests for bounding-volume-hierarchy scene queries."""
+
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.scenequery import (
+    FLAT_LEAF_LIMIT,
+    TERRAIN_INDEX,
+    BoundingVolumeHierarchy,
+    SceneQuery,
+)
+from fooproj.game.terrain import Heightfield
+
+CHECKER = TestCase()
+
+
+def _random_tree(
+    count: int,
+    seed: int = 7,
+    *,
+    flat: bool = False,
+    sphere_share: float = 0.5,
+) -> BoundingVolumeHierarchy:
+    """Build a tree over a random mix of boxes and spheres.
+
+    ``flat`` picks the all-items path instead of the hierarchy.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-50.0, 50.0, (count, 3))
+    half_extents = rng.uniform(0.2, 2.0, (count, 3))
+    spherical = rng.random(count) < sphere_share
+    half_extents[spherical] = half_extents[spherical, :1]
+    return BoundingVolumeHierarchy(
+        centers,
+        half_extents,
+        spherical,
+        leaf_size=4,
+        flat_leaf_limit=count if flat else 0,
+    )
+
+
+def _brute_force_surface_distance(
+    tree: BoundingVolumeHierarchy,
+    point: np.ndarray,
+) -> np.ndarray:
+    """Return point-to-surface distances by testing every item."""
+    lower = tree.centers - tree.half_extents
+    upper = tree.centers + tree.half_extents
+    offset = np.maximum(np.maximum(lower - point, point - upper), 0.0)
+    distance = np.linalg.norm(offset, axis=1)
+    spheres = tree.spherical
+    distance[spheres] = np.maximum(
+        np.linalg.norm(tree.centers[spheres] - point, axis=1)
+        - tree.half_extents[spheres, 0],
+        0.0,
+    )
+    return distance
+
+
+def test_raycast_hits_closest_box_face() -> None:
+    """Report the nearer of two boxes along a ray, with the face normal."""
+    tree = BoundingVolumeHierarchy(
+        centers=np.array([[10.0, 0.0, 0.0], [5.0, 0.0, 0.0]]),
+        half_extents=np.array([[1.0, 1.0, 1.0], [0.5, 0.5, 0.5]]),
+    )
+    hit = tree.raycast(np.zeros(3), np.array([1.0, 0.0, 0.0]))
+    CHECKER.assertIsNotNone(hit)
+    CHECKER.assertEqual(hit.index, 1)
+    CHECKER.assertAlmostEqual(hit.distance, 4.5)
+    CHECKER.assertEqual(hit.normal.tolist(), [-1.0, 0.0, 0.0])
+
+
+def test_raycast_hits_sphere_surface_and_respects_max_distance() -> None:
+    """Intersect spheres exactly and ignore hits beyond the limit."""
+    tree = BoundingVolumeHierarchy(
+        centers=np.array([[0.0, 0.0, 6.0]]),
+        half_extents=np.array([[2.0, 2.0, 2.0]]),
+        spherical=np.array([True]),
+    )
+    direction = np.array([0.0, 0.0, 1.0])
+    hit = tree.raycast(np.zeros(3), direction)
+    CHECKER.assertIsNotNone(hit)
+    CHECKER.assertAlmostEqual(hit.distance, 4.0)
+    np.testing.assert_allclose(hit.normal, [0.0, 0.0, -1.0])
+    CHECKER.assertIsNone(tree.raycast(np.zeros(3), direction, max_distance=3.0))
+    CHECKER.assertIsNone(tree.raycast(np.array([5.0, 0.0, 0.0]), direction))
+
+
+def test_queries_match_brute_force() -> None:
+    """Agree with exhaustive tests on both paths and any mix of shapes."""
+    for sphere_share in (0.0, 0.5, 1.0):
+        tree = _random_tree(300, sphere_share=sphere_share)
+        flat = _random_tree(300, sphere_share=sphere_share, flat=True)
+        CHECKER.assertEqual((tree.flat, flat.flat), (False, True))
+        rng = np.random.default_rng(3)
+        for _ in range(20):
+            point = rng.uniform(-60.0, 60.0, 3)
+            distance = _brute_force_surface_distance(tree, point)
+            direction = rng.normal(size=3)
+            for query in (tree, flat):
+                overlap = query.overlap_sphere(point, 8.0)
+                CHECKER.assertEqual(
+                    sorted(overlap.tolist()),
+                    np.flatnonzero(distance <= 8.0).tolist(),
+                )
+
+                nearest = query.nearest(point)
+                CHECKER.assertIsNotNone(nearest)
+                CHECKER.assertAlmostEqual(nearest.distance, float(distance.min()))
+
+                hit = query.raycast(point, direction)
+                if hit is not None and hit.distance > 1e-6:
+                    # Stepping slightly short of the hit must leave the ray
+                    # outside every item, so nothing closer was missed.
+                    unit = direction / np.linalg.norm(direction)
+                    before = point + unit * (hit.distance - 1e-6)
+                    gap = _brute_force_surface_distance(tree, before)
+                    CHECKER.assertGreater(float(gap.min()), 0.0)
+
+            tree_hit = tree.raycast(point, direction)
+            flat_hit = flat.raycast(point, direction)
+            CHECKER.assertEqual(tree_hit is None, flat_hit is None)
+            if tree_hit is not None and flat_hit is not None:
+                CHECKER.assertAlmostEqual(tree_hit.distance, flat_hit.distance)
+                np.testing.assert_allclose(tree_hit.normal, flat_hit.normal)
+
+
+def test_refit_tracks_moved_items_and_rebuilds_when_loose() -> None:
+    """Find items at their new centers and rebuild after large moves."""
+    tree = _random_tree(64)
+    moved = tree.centers.copy()
+    moved[0] = (200.0, 0.0, 0.0)
+    CHECKER.assertFalse(tree.refit(moved))
+    CHECKER.assertIn(0, tree.overlap_sphere(np.array([200.0, 0.0, 0.0]), 0.1).tolist())
+
+    scattered = tree.centers * 10.0
+    CHECKER.assertTrue(tree.refit(scattered))
+    CHECKER.assertEqual(tree.overlap_sphere(scattered[5], 0.0).tolist(), [5])
+
+    flat = _random_tree(64, flat=True)
+    CHECKER.assertFalse(flat.refit(scattered))
+    CHECKER.assertEqual(flat.overlap_sphere(scattered[5], 0.0).tolist(), [5])
+
+
+def test_only_trees_with_many_leaves_build_the_hierarchy() -> None:
+    """Query scene-sized trees flat and build the tree past the limit."""
+    for count, flat in ((120, True), (8 * FLAT_LEAF_LIMIT + 1, False)):
+        tree = BoundingVolumeHierarchy(np.zeros((count, 3)), np.ones((count, 3)))
+        CHECKER.assertEqual(tree.flat, flat)
+
+
+def test_scene_query_prefers_closer_dynamic_hit() -> None:
+    """Combine both trees and flag hits that came from the dynamic tree."""
+    query = SceneQuery(
+        static=BoundingVolumeHierarchy(
+            centers=np.array([[0.0, 0.0, 10.0]]),
+            half_extents=np.array([[5.0, 5.0, 0.5]]),
+        ),
+        dynamic=BoundingVolumeHierarchy(
+            centers=np.array([[0.0, 0.0, 5.0]]),
+            half_extents=np.array([[0.5, 0.5, 0.5]]),
+        ),
+    )
+    hit = query.raycast(np.zeros(3), np.array([0.0, 0.0, 1.0]))
+    CHECKER.assertIsNotNone(hit)
+    CHECKER.assertTrue(hit.dynamic)
+    CHECKER.assertAlmostEqual(hit.distance, 4.5)
+
+    side_hit = query.raycast(np.array([3.0, 0.0, 0.0]), np.array([0.0, 0.0, 1.0]))
+    CHECKER.assertIsNotNone(side_hit)
+    CHECKER.assertFalse(side_hit.dynamic)
+    CHECKER.assertAlmostEqual(side_hit.distance, 9.5)
+
+    static_items, dynamic_items = query.overlap_sphere(np.zeros(3), 4.6)
+    CHECKER.assertEqual(static_items.tolist(), [])
+    CHECKER.assertEqual(dynamic_items.tolist(), [0])
+
+
+def test_scene_query_stops_rays_at_terrain() -> None:
+    """Report terrain hits before items that lie beyond the surface."""
+    terrain = Heightfield(
+        heights=np.zeros((5, 5)),
+        spacing=10.0,
+        origin_x=-20.0,
+        origin_z=-20.0,
+    )
+    buried = BoundingVolumeHierarchy(
+        centers=np.array([[0.0, -3.0, 0.0]]),
+        half_extents=np.array([[1.0, 1.0, 1.0]]),
+    )
+    empty = BoundingVolumeHierarchy(np.empty((0, 3)), np.empty((0, 3)))
+    query = SceneQuery(static=empty, dynamic=buried, terrain=terrain)
+    hit = query.raycast(np.array([0.0, 5.0, 0.0]), np.array([0.0, -1.0, 0.0]), 20.0)
+    CHECKER.assertIsNotNone(hit)
+    CHECKER.assertEqual(hit.index, TERRAIN_INDEX)
+    CHECKER.assertAlmostEqual(hit.distance, 5.0)
+    np.testing.assert_allclose(hit.normal, [0.0, 1.0, 0.0])
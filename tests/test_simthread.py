@@ -0,0 +1,78 @@
+"""Tests for the double-buffered simulation thread."""
+
+import threading
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.clock import FixedStepClock
+from fooproj.game.config import VehicleSettings
+from fooproj.game.scene import EntityBlueprint, Vec3
+from fooproj.game.simthread import FrameBuffer, SimulationThread, capture_world_frame
+from fooproj.game.simulation import Simulation, create_simulation
+
+CHECKER = TestCase()
+
+
+def _simulation() -> Simulation:
+    """Create a one-player simulation with a single crate ahead of the car."""
+    crate = EntityBlueprint(
+        model="cube",
+        color_name="orange",
+        scale=Vec3(1.0, 1.0, 1.0),
+        position=Vec3(0.0, 0.5, 30.0),
+    )
+    simulation = create_simulation((crate,), 1, VehicleSettings(), 1.0 / 120.0)
+    simulation.active[0] = True
+    return simulation
+
+
+def test_publish_waits_for_the_reader_and_swaps_after_it() -> None:
+    """Keep the frame being read intact until the read ends."""
+    simulation = _simulation()
+    buffer = FrameBuffer(simulation)
+    simulation.tick = 5
+    capture_world_frame(simulation, buffer.back)
+
+    with buffer.read() as frame:
+        writer = threading.Thread(target=buffer.publish)
+        writer.start()
+        writer.join(0.05)
+        CHECKER.assertTrue(writer.is_alive())
+        CHECKER.assertEqual(frame.tick, 0)
+        CHECKER.assertEqual(buffer.published, 0)
+    writer.join(1.0)
+    CHECKER.assertFalse(writer.is_alive())
+    CHECKER.assertEqual(buffer.published, 1)
+
+    with buffer.read() as frame:
+        CHECKER.assertEqual(frame.tick, 5)
+    buffer.publish()
+    with buffer.read() as frame:
+        CHECKER.assertEqual(frame.tick, 0)
+
+
+def test_simulation_thread_drives_the_player_in_real_time() -> None:
+    """Publish frames that show the throttled car moving, then stop cleanly."""
+    simulation = _simulation()
+    simulation_thread = SimulationThread(simulation, FixedStepClock(1.0 / 120.0))
+    with simulation_thread.buffer.read() as frame:
+        start = frame.player_position[0].copy()
+    simulation_thread.set_axes((1.0, 0.0, 0.0))
+    simulation_thread.start()
+    try:
+        deadline = time.perf_counter() + 2.0
+        while simulation.tick < 60 and time.perf_counter() < deadline:
+            with simulation_thread.buffer.read() as frame:
+                CHECKER.assertEqual(frame.player_position.shape, (1, 3))
+            time.sleep(0.005)
+    finally:
+        simulation_thread.stop()
+
+    CHECKER.assertGreaterEqual(simulation.tick, 60)
+    CHECKER.assertGreater(simulation_thread.buffer.published, 0)
+    with simulation_thread.buffer.read() as frame:
+        CHECKER.assertGreater(frame.tick, 0)
+        travelled = frame.player_position[0] - start
+    CHECKER.assertGreater(float(np.linalg.norm(travelled[[0, 2]])), 0.1)
@@ -0,0 +1,59 @@
+"""Tests for the headless vehicle and prop simulation."""
+
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.config import GameSettings, VehicleSettings
+from fooproj.game.scene import EntityBlueprint, Vec3, is_dynamic_prop
+from fooproj.game.simulation import (
+    create_simulation,
+    load_world,
+    player_spawn_positions,
+    set_player_axes,
+    step_simulation,
+)
+
+CHECKER = TestCase()
+
+
+def test_player_spawns_are_spread_on_a_ring() -> None:
+    """Keep a lone player at the origin and space several players apart."""
+    np.testing.assert_allclose(player_spawn_positions(1), [[0.0, 0.0]])
+    spawns = player_spawn_positions(4)
+    gaps = np.linalg.norm(spawns[:, None] - spawns[None], axis=2)
+    CHECKER.assertGreater(float(gaps[~np.eye(4, dtype=np.bool_)].min()), 5.0)
+
+
+def test_load_world_keeps_blueprint_props_in_order() -> None:
+    """Create one prop body per dynamic blueprint of the loaded world."""
+    blueprints, terrain = load_world(GameSettings())
+    simulation = create_simulation(blueprints, 2, VehicleSettings(), 1.0 / 60.0)
+    props = [blueprint for blueprint in blueprints if is_dynamic_prop(blueprint)]
+    CHECKER.assertIsNotNone(terrain)
+    CHECKER.assertEqual(simulation.bodies.count, len(props))
+    np.testing.assert_allclose(
+        simulation.bodies.position[0],
+        (props[0].position.x, props[0].position.y, props[0].position.z),
+    )
+
+
+def test_step_simulation_drives_only_the_throttled_player() -> None:
+    """Move a throttled player forward while the other stays parked."""
+    blueprint = EntityBlueprint(
+        model="cube",
+        color_name="orange",
+        scale=Vec3(1.0, 1.0, 1.0),
+        position=Vec3(0.0, 0.5, 40.0),
+    )
+    simulation = create_simulation((blueprint,), 2, VehicleSettings(), 1.0 / 60.0)
+    simulation.active[:] = True
+    start = simulation.vehicles.position.copy()
+    set_player_axes(simulation, 0, (1.0, 0.0, 0.0))
+    for _ in range(60):
+        step_simulation(simulation)
+
+    CHECKER.assertEqual(simulation.tick, 60)
+    travelled = simulation.vehicles.position - start
+    CHECKER.assertGreater(float(np.linalg.norm(travelled[0, [0, 2]])), 1.0)
+    np.testing.assert_allclose(travelled[1, [0, 2]], [0.0, 0.0], atol=1e-9)
@@ -0,0 +1,99 @@
+"""Tests for the telemetry exporter and its StatsD and Prometheus sinks."""
+
+import socket
+import urllib.request
+from typing import cast
+from unittest import TestCase
+
+from fooproj.game.config import TelemetrySettings
+from fooproj.game.profiling import Profiler
+from fooproj.game.runtime import SpawnedWorld, start_telemetry
+from fooproj.game.telemetry import (
+    MAX_DATAGRAM_BYTES,
+    PrometheusSink,
+    StatsdSink,
+    TelemetryExporter,
+    format_statsd,
+)
+
+CHECKER = TestCase()
+
+
+def test_statsd_lines_are_sanitized_and_packed_into_datagrams() -> None:
+    """Keep every line, in order, in datagrams no larger than the limit."""
+    CHECKER.assertEqual(
+        format_statsd([{"frame ms": 16.5}, {"props.awake": 3.0}], "fooproj"),
+        [b"fooproj_frame_ms:16.5|g\nfooproj_props_awake:3|g"],
+    )
+    many = [{f"gauge_{index}": float(index) for index in range(200)}]
+    datagrams = format_statsd(many, "fooproj")
+    CHECKER.assertGreater(len(datagrams), 1)
+    CHECKER.assertTrue(
+        all(len(datagram) <= MAX_DATAGRAM_BYTES for datagram in datagrams),
+    )
+    lines = b"\n".join(datagrams).split(b"\n")
+    CHECKER.assertEqual(len(lines), 200)
+    CHECKER.assertEqual(lines[-1], b"fooproj_gauge_199:199|g")
+
+
+def test_exporter_drops_samples_when_the_queue_is_full() -> None:
+    """Never block the caller; count what did not fit and send the rest."""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(2.0)
+    port = receiver.getsockname()[1]
+    exporter = TelemetryExporter(
+        StatsdSink("127.0.0.1", port, "fooproj"),
+        queue_size=2,
+        batch_size=8,
+    )
+    try:
+        results = [exporter.submit({"frame_ms": float(index)}) for index in range(3)]
+        CHECKER.assertEqual(results, [True, True, False])
+        CHECKER.assertEqual((exporter.submitted, exporter.dropped), (2, 1))
+
+        exporter.start()
+        exporter.stop()
+        CHECKER.assertEqual(
+            receiver.recv(MAX_DATAGRAM_BYTES),
+            b"fooproj_frame_ms:0|g\nfooproj_frame_ms:1|g",
+        )
+    finally:
+        receiver.close()
+
+
+def test_prometheus_sink_serves_the_latest_gauges() -> None:
+    """Expose the most recent value of each gauge over HTTP."""
+    sink = PrometheusSink("127.0.0.1", 0, "fooproj")
+    try:
+        sink.write([{"frame_ms": 20.0, "entities": 5.0}, {"frame_ms": 16.0}])
+        host, port = sink.address
+        with urllib.request.urlopen(
+            f"http://{host}:{port}/metrics",
+            timeout=2.0,
+        ) as reply:
+            body = reply.read().decode()
+    finally:
+        sink.close()
+
+    CHECKER.assertIn("# TYPE fooproj_frame_ms gauge\nfooproj_frame_ms 16\n", body)
+    CHECKER.assertIn("fooproj_entities 5\n", body)
+
+
+def test_start_telemetry_runs_on_without_a_sink_it_cannot_open() -> None:
+    """Log and skip telemetry when the Prometheus port is already taken."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        settings = TelemetrySettings(
+            enabled=True,
+            protocol="prometheus",
+            prometheus_port=taken.getsockname()[1],
+        )
+        with CHECKER.assertLogs("fooproj.game.runtime", "WARNING"):
+            exporter = start_telemetry(
+                settings,
+                Profiler(),
+                cast("SpawnedWorld", None),
+            )
+    CHECKER.assertIsNone(exporter)
@@ -0,0 +1,129 @@
+"""Tests for heightfield terrain sampling, generation, and chunking."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest import TestCase
+
+import numpy as np
+from panda3d.core import LODNode
+from PIL import Image
+
+from fooproj.game.terrain import (
+    Heightfield,
+    TerrainError,
+    build_chunk_mesh,
+    build_terrain_node,
+    generate_heightfield,
+    load_heightfield_image,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CHECKER = TestCase()
+
+
+def _sloped_field() -> Heightfield:
+    """Return the plane y = 0.5 x - 0.25 z sampled every 2 units."""
+    axis = np.arange(-4.0, 5.0, 2.0)
+    heights = 0.5 * axis[None, :] - 0.25 * axis[:, None]
+    return Heightfield(heights=heights, spacing=2.0, origin_x=-4.0, origin_z=-4.0)
+
+
+def test_sample_interpolates_heights_and_normals() -> None:
+    """Reproduce a plane exactly, with its normal, for a batch of points."""
+    terrain = _sloped_field()
+    x_pos = np.array([-3.3, 0.0, 1.7, 3.9])
+    z_pos = np.array([2.2, 0.0, -3.1, 3.9])
+    heights, normals = terrain.sample(x_pos, z_pos)
+    np.testing.assert_allclose(heights, 0.5 * x_pos - 0.25 * z_pos)
+    np.testing.assert_allclose(terrain.heights_at(x_pos, z_pos), heights)
+    expected = np.array([-0.5, 1.0, 0.25]) / np.linalg.norm([-0.5, 1.0, 0.25])
+    np.testing.assert_allclose(normals, np.broadcast_to(expected, (4, 3)))
+
+
+def test_sample_clamps_points_outside_the_grid() -> None:
+    """Extend edge heights outward instead of indexing past the grid."""
+    terrain = _sloped_field()
+    heights = terrain.heights_at(np.array([100.0, -100.0]), np.array([0.0, 0.0]))
+    np.testing.assert_allclose(heights, [2.0, -2.0])
+
+
+def test_raycast_finds_terrain_crossing() -> None:
+    """Return where a downward ray meets the surface."""
+    terrain = Heightfield(
+        heights=np.zeros((5, 5)),
+        spacing=1.0,
+        origin_x=-2.0,
+        origin_z=-2.0,
+    )
+    down = np.array([0.0, -1.0, 0.0])
+    distance = terrain.raycast(np.array([0.0, 3.0, 0.0]), down, 10.0)
+    CHECKER.assertIsNotNone(distance)
+    CHECKER.assertAlmostEqual(distance, 3.0)
+    CHECKER.assertIsNone(terrain.raycast(np.array([0.0, 3.0, 0.0]), down, 2.0))
+
+
+def test_generated_terrain_is_flat_near_spawn() -> None:
+    """Blend generated hills to zero inside the flat radius."""
+    terrain = generate_heightfield(
+        size=100.0,
+        resolution=50,
+        height_scale=5.0,
+        seed=3,
+        flat_radius=20.0,
+    )
+    CHECKER.assertEqual(terrain.heights.shape, (51, 51))
+    centre = terrain.heights_at(np.array([0.0, 10.0]), np.array([0.0, -10.0]))
+    np.testing.assert_allclose(centre, [0.0, 0.0])
+    CHECKER.assertGreater(float(np.ptp(terrain.heights)), 1.0)
+    CHECKER.assertLessEqual(float(np.abs(terrain.heights).max()), 5.0)
+
+
+def test_load_heightfield_image_maps_gray_to_height(tmp_path: Path) -> None:
+    """Map black to zero and white to the height scale, top row to +z."""
+    path = tmp_path / "height.png"
+    pixels = np.zeros((3, 4), dtype=np.uint8)
+    pixels[0, :] = 255
+    Image.fromarray(pixels).save(path)
+
+    terrain = load_heightfield_image(path, size=30.0, height_scale=8.0)
+    CHECKER.assertEqual(terrain.heights.shape, (3, 4))
+    CHECKER.assertAlmostEqual(terrain.spacing, 10.0)
+    np.testing.assert_allclose(terrain.heights[-1], [8.0] * 4)
+    np.testing.assert_allclose(terrain.heights[0], [0.0] * 4)
+    CHECKER.assertAlmostEqual(terrain.origin_z, -10.0)
+
+    with CHECKER.assertRaises(TerrainError):
+        load_heightfield_image(tmp_path / "missing.png", 30.0, 8.0)
+
+
+def test_chunk_lods_halve_vertex_rows() -> None:
+    """Sample coarser LODs at every second grid point plus a skirt."""
+    terrain = generate_heightfield(size=64.0, resolution=16, height_scale=2.0)
+    normals = terrain.grid_normals()
+    fine = build_chunk_mesh(terrain, normals, (0, 0), 8, 1)
+    coarse = build_chunk_mesh(terrain, normals, (8, 8), 8, 2)
+    # 9x9 grid + 32 skirt vertices; 5x5 grid + 16 skirt vertices.
+    CHECKER.assertEqual(fine.positions.shape, (81 + 32, 3))
+    CHECKER.assertEqual(coarse.positions.shape, (25 + 16, 3))
+    CHECKER.assertEqual(fine.triangles.shape, (2 * 64 + 4 * 32, 3))
+    CHECKER.assertLess(int(coarse.triangles.max()), coarse.positions.shape[0])
+    np.testing.assert_allclose(
+        fine.positions[:81, 1],
+        terrain.heights[:9, :9].reshape(-1),
+        rtol=1e-6,
+    )
+
+
+def test_build_terrain_node_creates_lod_per_chunk() -> None:
+    """Create one LOD switch per chunk with one geom per level."""
+    terrain = generate_heightfield(size=64.0, resolution=16, height_scale=2.0)
+    root = build_terrain_node(terrain, chunk_cells=8, lod_distances=(20.0, 40.0))
+    lod_paths = root.findAllMatches("+LODNode")
+    CHECKER.assertEqual(lod_paths.getNumPaths(), 4)
+    lod_node = lod_paths.getPath(0).node()
+    CHECKER.assertIsInstance(lod_node, LODNode)
+    CHECKER.assertEqual(lod_node.getNumSwitches(), 3)
+    CHECKER.assertEqual(lod_node.getNumChildren(), 3)
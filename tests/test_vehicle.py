@@ -0,0 +1,81 @@
+"""Tests for the batched vehicle-dynamics integrator."""
+
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.config import VehicleSettings
+from fooproj.game.vehicle import (
+    VehicleState,
+    create_vehicle_inputs,
+    create_vehicle_state,
+    step_vehicles,
+    wheel_world_positions,
+)
+
+CHECKER = TestCase()
+SETTINGS = VehicleSettings()
+STEP = 1.0 / 120.0
+
+
+def _run(state_count: int, steps: int, throttle: float, steer: float) -> VehicleState:
+    """Drive a batch of identical vehicles with constant inputs."""
+    state = create_vehicle_state(
+        np.tile([0.0, 0.48, 0.0], (state_count, 1)),
+        np.zeros(state_count),
+    )
+    inputs = create_vehicle_inputs(state_count)
+    inputs.throttle[:] = throttle
+    inputs.steer[:] = steer
+    for _ in range(steps):
+        step_vehicles(state, inputs, SETTINGS, STEP)
+    return state
+
+
+def test_suspension_settles_and_carries_vehicle_weight() -> None:
+    """Settle the chassis on its springs with wheel loads matching weight."""
+    state = _run(1, 240, throttle=0.0, steer=0.0)
+    weight = SETTINGS.mass * 9.81
+    CHECKER.assertAlmostEqual(float(state.wheel_load.sum()), weight, delta=1.0)
+    CHECKER.assertAlmostEqual(float(state.vertical_speed[0]), 0.0, places=3)
+    CHECKER.assertGreater(float(state.position[0, 1]), SETTINGS.wheel_radius)
+
+
+def test_throttle_accelerates_along_heading() -> None:
+    """Drive forward along +z when the heading is zero."""
+    state = _run(1, 240, throttle=1.0, steer=0.0)
+    CHECKER.assertGreater(float(state.forward_speed[0]), 3.0)
+    CHECKER.assertGreater(float(state.position[0, 2]), 1.0)
+    CHECKER.assertAlmostEqual(float(state.position[0, 0]), 0.0, places=6)
+
+
+def test_positive_steer_turns_right() -> None:
+    """Increase heading (clockwise, like Ursina rotation_y) for right steer."""
+    state = _run(1, 360, throttle=1.0, steer=1.0)
+    CHECKER.assertGreater(float(state.heading[0]), 0.1)
+    CHECKER.assertGreater(float(state.position[0, 0]), 0.0)
+
+
+def test_brake_reverses_from_standstill() -> None:
+    """Use the brake input as reverse drive once the car is stopped."""
+    state = create_vehicle_state(np.array([[0.0, 0.48, 0.0]]), np.zeros(1))
+    inputs = create_vehicle_inputs(1)
+    inputs.brake[:] = 1.0
+    for _ in range(240):
+        step_vehicles(state, inputs, SETTINGS, STEP)
+    CHECKER.assertLess(float(state.forward_speed[0]), -1.0)
+
+
+def test_batched_step_matches_single_vehicle() -> None:
+    """Produce identical per-vehicle results regardless of batch size."""
+    single = _run(1, 120, throttle=0.7, steer=0.4)
+    batch = _run(64, 120, throttle=0.7, steer=0.4)
+    np.testing.assert_allclose(batch.position, np.tile(single.position, (64, 1)))
+
+
+def test_wheel_world_positions_follow_heading() -> None:
+    """Rotate the front-left wheel offset with the vehicle heading."""
+    state = create_vehicle_state(np.zeros((1, 3)), np.array([np.pi / 2.0]))
+    wheel_x, wheel_z = wheel_world_positions(state)
+    CHECKER.assertAlmostEqual(float(wheel_x[0, 0]), 1.55, places=6)
+    CHECKER.assertAlmostEqual(float(wheel_z[0, 0]), 1.12, places=6)
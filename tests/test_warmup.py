@@ -0,0 +1,32 @@
+"""Tests for shader warm-up helpers."""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from ursina.shader import Shader
+
+from fooproj.game.warmup import write_shader_sources
+
+CHECKER = TestCase()
+
+VERTEX = "#version 140\nvoid main() { gl_Position = vec4(0.0); }\n"
+FRAGMENT = "#version 140\nout vec4 color;\nvoid main() { color = vec4(1.0); }\n"
+
+
+def test_shader_sources_are_content_addressed() -> None:
+    """Write each stage once and give edited sources new file names."""
+    shader = Shader(name="warmup_test", vertex=VERTEX, fragment=FRAGMENT)
+    with TemporaryDirectory() as directory:
+        root = Path(directory)
+        paths = write_shader_sources(shader, root)
+        CHECKER.assertEqual(sorted(paths), ["fragment", "vertex"])
+        CHECKER.assertIn("gl_Position", paths["vertex"].read_text(encoding="utf-8"))
+        CHECKER.assertEqual(paths["fragment"].suffix, ".frag")
+        CHECKER.assertEqual(write_shader_sources(shader, root), paths)
+
+        shader.fragment = FRAGMENT.replace("1.0", "0.5")
+        edited = write_shader_sources(shader, root)
+        CHECKER.assertEqual(edited["vertex"], paths["vertex"])
+        CHECKER.assertNotEqual(edited["fragment"], paths["fragment"])
+        CHECKER.assertEqual(len(list(root.iterdir())), 3)
@@ -0,0 +1,126 @@
+"""Tests for splitting car wheels out of a mesh and driving their uniforms."""
+
+from math import tau
+from unittest import TestCase
+
+import numpy as np
+
+from fooproj.game.objimport import ObjMesh, build_obj_node
+from fooproj.game.vehicle import WHEEL_OFFSETS
+from fooproj.game.wheels import WheelUniforms, find_wheels, wheel_uniforms
+
+CHECKER = TestCase()
+
+BOX_TRIANGLES = np.array(
+    [
+        [0, 1, 3],
+        [0, 3, 2],
+        [4, 6, 7],
+        [4, 7, 5],
+        [0, 4, 5],
+        [0, 5, 1],
+        [2, 3, 7],
+        [2, 7, 6],
+        [0, 2, 6],
+        [0, 6, 4],
+        [1, 5, 7],
+        [1, 7, 3],
+    ],
+    dtype=np.uint32,
+)
+TYRE_SIZE = (0.3, 0.6, 0.6)
+HUB_SIZE = (0.1, 0.2, 0.2)
+
+
+def _box(center: tuple[float, float, float], size: tuple[float, ...]) -> np.ndarray:
+    """Return the eight corners of an axis-aligned box."""
+    corners = np.array(
+        [[x, y, z] for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)],
+    )
+    return corners * np.array(size) + np.array(center)
+
+
+def _car(group_names: tuple[str, ...] = ("default",)) -> ObjMesh:
+    """Return a body box over four tyres, each with a hub inside it.
+
+    With two group names, the tyres and hubs are in the second group.
+    """
+    boxes = [_box((0.0, 0.9, 0.0), (2.0, 1.0, 4.0))]
+    for x, z in WHEEL_OFFSETS:
+        center = (x, 0.3, z)
+        boxes += [_box(center, TYRE_SIZE), _box(center, HUB_SIZE)]
+    positions = np.concatenate(boxes)
+    triangles = np.concatenate(
+        [BOX_TRIANGLES + 8 * index for index in range(len(boxes))],
+    )
+    groups = np.zeros(triangles.shape[0], dtype=np.int64)
+    groups[BOX_TRIANGLES.shape[0] :] = len(group_names) - 1
+    return ObjMesh(
+        positions=positions,
+        normals=np.tile([0.0, 1.0, 0.0], (positions.shape[0], 1)),
+        texcoords=np.zeros((positions.shape[0], 2)),
+        triangles=triangles,
+        triangle_materials=np.zeros(triangles.shape[0], dtype=np.int64),
+        triangle_groups=groups,
+        material_names=("default",),
+        group_names=group_names,
+        material_library=None,
+        bounds_min=positions.min(axis=0),
+        bounds_max=positions.max(axis=0),
+    )
+
+
+def test_find_wheels_splits_tyres_and_hubs_from_the_body() -> None:
+    """Tag tyre and hub vertices per wheel, by shape or by group name."""
+    for group_names in (("default",), ("body", "Wheels")):
+        split = find_wheels(_car(group_names))
+        CHECKER.assertIsNotNone(split)
+        if split is None:
+            continue
+        expected = np.repeat(np.arange(5.0), [8, 16, 16, 16, 16])
+        np.testing.assert_array_equal(split.vertex_wheels, expected)
+        np.testing.assert_allclose(
+            split.pivots,
+            [(x, 0.3, z) for x, z in WHEEL_OFFSETS],
+        )
+        CHECKER.assertAlmostEqual(split.radius, 0.3)
+
+
+def test_find_wheels_gives_up_without_four_tyres() -> None:
+    """Return None when a wheel has no tyre-shaped part."""
+    mesh = _car()
+    keep = np.arange(mesh.triangles.shape[0]) < 12 * 7
+    partial = ObjMesh(
+        positions=mesh.positions,
+        normals=mesh.normals,
+        texcoords=mesh.texcoords,
+        triangles=mesh.triangles[keep],
+        triangle_materials=mesh.triangle_materials[keep],
+        triangle_groups=mesh.triangle_groups[keep],
+        material_names=mesh.material_names,
+        group_names=mesh.group_names,
+        material_library=None,
+        bounds_min=mesh.bounds_min,
+        bounds_max=mesh.bounds_max,
+    )
+    CHECKER.assertIsNone(find_wheels(partial))
+
+
+def test_wheel_uniforms_roll_and_steer_in_place() -> None:
+    """Rescale spin to the mesh radius, wrap it, and steer the front only."""
+    split = find_wheels(_car())
+    CHECKER.assertIsNotNone(split)
+    if split is None:
+        return
+    node = build_obj_node(_car(), "car", wheels=split.vertex_wheels)
+    geom = node.findAllMatches("**/+GeomNode")[0].node().getGeom(0)
+    CHECKER.assertEqual(geom.getVertexData().getNumArrays(), 2)
+    wheels = WheelUniforms(split.pivots, split.radius)
+    wheels.attach(node)
+    CHECKER.assertIs(wheel_uniforms(node), wheels)
+
+    angles = wheels.angles
+    wheels.update(np.array([1.0, 1.0, 2.0, tau + 0.5]), 0.25, 0.6)
+    CHECKER.assertIs(wheels.angles, angles)
+    np.testing.assert_allclose(angles[:, 0], [2.0, 2.0, 4.0, 1.0], atol=1e-6)
+    np.testing.assert_allclose(angles[:, 1], [0.25, 0.25, 0.0, 0.0])